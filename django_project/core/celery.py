@@ -82,6 +82,11 @@ app.conf.beat_schedule = {
         # Run everyday at 00:00 UTC
         'schedule': crontab(minute='00', hour='00'),
     },
+    'compact-parquet-fragments': {
+        'task': 'compact_parquet_fragments',
+        # Run everyday at 02:00 UTC, after the daily ingestor
+        'schedule': crontab(minute='0', hour='2'),
+    },
     'store-api-logs': {
         'task': 'store_api_logs',
         # Run every 5minutes
@@ -11,18 +11,108 @@ import boto3
 import base64
 import logging
 import json
+from botocore.config import Config
 from google.cloud import storage
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 from django.http import StreamingHttpResponse
 from django.utils import timezone
 
 from core.models.background_task import TaskStatus
+from core.utils.local_cache import VersionedLocalCache
 
 
 logger = logging.getLogger(__name__)
 DEFAULT_CONNECTION_NAME = 'default'
 DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1 MB
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+
+class ObjectStorageCache(VersionedLocalCache):
+    """Process-local cache of S3 env vars and S3 clients.
+
+    The env vars are keyed by connection name and the clients are keyed
+    by their arguments, so the clients are shared by the readers,
+    ingestors and outputs. Boto3 client is thread safe and keeps
+    the HTTP connections in its pool.
+    Available settings:
+    OBJECT_STORAGE_CACHE_ENABLED: enable the cache, defaults to True
+    OBJECT_STORAGE_CACHE_CHECK_INTERVAL: interval in seconds, defaults to 5
+    S3_MAX_POOL_CONNECTIONS: max connections in client pool, defaults to 10
+    """
+
+    def __init__(self):
+        """Initialize ObjectStorageCache class."""
+        super().__init__(
+            'object-storage-manager-version',
+            'OBJECT_STORAGE_CACHE_ENABLED',
+            'OBJECT_STORAGE_CACHE_CHECK_INTERVAL'
+        )
+        self._env_vars = {}
+        self._clients = {}
+
+    def _clear(self):
+        """Remove the cached env vars and clients."""
+        self._env_vars = {}
+        self._clients = {}
+
+    def get_env_vars(self, connection_name: str, loader) -> dict:
+        """Get S3 env vars of a connection.
+
+        :param connection_name: Connection name for Object Storage Manager
+        :type connection_name: str
+        :param loader: function to resolve the env vars
+        :type loader: Callable
+        :return: copy of Dictionary of S3 env vars
+        :rtype: dict
+        """
+        if not self.is_enabled:
+            return loader()
+
+        self.check_version()
+        with self._lock:
+            s3 = self._env_vars.get(connection_name)
+            if s3 is not None:
+                self.hit_count += 1
+                return dict(s3)
+            version = self._version
+
+        s3 = loader()
+        with self._lock:
+            # skip the env vars that are loaded before the version changed
+            if self._version == version:
+                self._env_vars[connection_name] = dict(s3)
+            self.load_count += 1
+        return s3
+
+    def get_client(self, client_kwargs: dict, factory):
+        """Get shared S3 client for the client arguments.
+
+        :param client_kwargs: arguments of boto3 client
+        :type client_kwargs: dict
+        :param factory: function to create the client
+        :type factory: Callable
+        :return: Boto3 S3 client
+        :rtype: boto3.client
+        """
+        if not self.is_enabled:
+            return factory()
+
+        self.check_version()
+        key = tuple(sorted(client_kwargs.items()))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                # boto3 default session is not thread safe
+                client = factory()
+                self._clients[key] = client
+            return client
+
+
+object_storage_cache = ObjectStorageCache()
 
 
 class ProtocolType(models.TextChoices):
@@ -167,10 +257,23 @@ class ObjectStorageManager(models.Model):
     def get_s3_env_vars(cls, connection_name = None) -> dict:
         """Get S3 environment variables for Object Storage Manager.
 
+        The result is cached per connection name in the process.
         :return: Dictionary of S3 env vars
         :rtype: dict
         """
         connection_name = connection_name or DEFAULT_CONNECTION_NAME
+        return object_storage_cache.get_env_vars(
+            connection_name,
+            lambda: cls._load_s3_env_vars(connection_name)
+        )
+
+    @classmethod
+    def _load_s3_env_vars(cls, connection_name: str) -> dict:
+        """Load S3 environment variables from database.
+
+        :return: Dictionary of S3 env vars
+        :rtype: dict
+        """
         try:
             manager = cls.objects.get(connection_name=connection_name)
         except cls.DoesNotExist:
@@ -248,7 +351,20 @@ class ObjectStorageManager(models.Model):
         s3_client_kwargs = cls.get_s3_client_kwargs(connection_name, s3)
         s3_client_kwargs['aws_access_key_id'] = s3['S3_ACCESS_KEY_ID']
         s3_client_kwargs['aws_secret_access_key'] = s3['S3_SECRET_ACCESS_KEY']
-        return boto3.client("s3", **s3_client_kwargs)
+        max_pool_connections = getattr(
+            settings, 'S3_MAX_POOL_CONNECTIONS', DEFAULT_MAX_POOL_CONNECTIONS
+        )
+        return object_storage_cache.get_client(
+            dict(
+                s3_client_kwargs,
+                max_pool_connections=max_pool_connections
+            ),
+            lambda: boto3.client(
+                "s3",
+                config=Config(max_pool_connections=max_pool_connections),
+                **s3_client_kwargs
+            )
+        )
 
     @classmethod
     def upload_file_to_s3(
@@ -374,6 +490,14 @@ class ObjectStorageManager(models.Model):
         return client.bucket(bucket_name)
 
 
+@receiver(post_save, sender=ObjectStorageManager)
+def object_storage_manager_post_save(sender, instance, **kwargs):
+    """Invalidate cached S3 env vars and clients in all processes."""
+    object_storage_cache.clear()
+    # other processes must not reload before the change is committed
+    transaction.on_commit(object_storage_cache.invalidate)
+
+
 class DeletionLog(models.Model):
     """Model to log deletions of files in Object Storage."""
 
@@ -6,8 +6,12 @@ Tomorrow Now GAP.
 
 """
 
+import copy
+
 from django.db import models
 
+from core.utils.local_cache import VersionedLocalCache
+
 
 class SingletonModel(models.Model):
     """Singleton Abstract Model that just have 1 data on database."""
@@ -29,3 +33,56 @@ class SingletonModel(models.Model):
         """Load the singleton model with 1 object."""
         obj, created = cls.objects.get_or_create(pk=1)
         return obj
+
+
+class SingletonCache(VersionedLocalCache):
+    """Process-local cache of a singleton object.
+
+    The object is loaded from database when the version is changed.
+    Each call returns a copy, so the cached object is never modified.
+    Available settings:
+    SINGLETON_CACHE_ENABLED: enable the cache, defaults to True
+    SINGLETON_CACHE_CHECK_INTERVAL: interval in seconds, defaults to 5
+    """
+
+    def __init__(self, version_key: str):
+        """Initialize SingletonCache class.
+
+        :param version_key: cache key of the object version
+        :type version_key: str
+        """
+        super().__init__(
+            version_key, 'SINGLETON_CACHE_ENABLED',
+            'SINGLETON_CACHE_CHECK_INTERVAL'
+        )
+        self._obj = None
+
+    def _clear(self):
+        """Remove the cached object."""
+        self._obj = None
+
+    def get(self, loader):
+        """Get the object from cache or load it using loader.
+
+        :param loader: function to load the object from database
+        :type loader: Callable
+        :return: copy of the object
+        :rtype: models.Model
+        """
+        if not self.is_enabled:
+            return loader()
+
+        self.check_version()
+        with self._lock:
+            if self._obj is not None:
+                self.hit_count += 1
+                return copy.deepcopy(self._obj)
+            version = self._version
+
+        obj = loader()
+        with self._lock:
+            # skip the object that is loaded before the version changed
+            if self._version == version:
+                self._obj = copy.deepcopy(obj)
+            self.load_count += 1
+        return obj
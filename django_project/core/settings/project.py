@@ -131,3 +131,20 @@ SWAGGER_SETTINGS = {
 CELERY_DATA_REQUEST_QUEUE = os.getenv(
     "CELERY_DATA_REQUEST_QUEUE", "data_request_queue"
 )
+
+# Process-local cache of singleton models (Preferences)
+SINGLETON_CACHE_ENABLED = os.getenv(
+    "SINGLETON_CACHE_ENABLED", "true"
+).lower() == "true"
+SINGLETON_CACHE_CHECK_INTERVAL = int(
+    os.getenv("SINGLETON_CACHE_CHECK_INTERVAL", "5")
+)
+
+# Process-local cache of S3 env vars and clients (ObjectStorageManager)
+OBJECT_STORAGE_CACHE_ENABLED = os.getenv(
+    "OBJECT_STORAGE_CACHE_ENABLED", "true"
+).lower() == "true"
+OBJECT_STORAGE_CACHE_CHECK_INTERVAL = int(
+    os.getenv("OBJECT_STORAGE_CACHE_CHECK_INTERVAL", "5")
+)
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "10"))
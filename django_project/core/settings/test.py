@@ -16,4 +16,7 @@ CACHES = {
         'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
     }
 }
+# Preferences and env vars are changed and rolled back in the tests
+SINGLETON_CACHE_ENABLED = False
+OBJECT_STORAGE_CACHE_ENABLED = False
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
@@ -6,11 +6,14 @@ Tomorrow Now GAP.
 """
 
 import os
+from unittest.mock import patch, MagicMock
+
+from django.core.cache import cache
 from django.db import IntegrityError
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from core.models.object_storage_manager import (
-    ObjectStorageManager, ProtocolType
+    ObjectStorageManager, ProtocolType, object_storage_cache
 )
 
 
@@ -164,3 +167,96 @@ class ObjectStorageManagerModelTest(TestCase):
         envs['S3_DIR_PREFIX'] = 'prefix'
         url = ObjectStorageManager.get_s3_base_url(envs)
         self.assertEqual(url, 's3://bucket-test/prefix/')
+
+
+@override_settings(
+    OBJECT_STORAGE_CACHE_ENABLED=True,
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+)
+class ObjectStorageCacheTest(TestCase):
+    """Unit tests for cached S3 env vars and clients."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.env_vars = {
+            'TEST_ACCESS_KEY': 'AKIA_TEST',
+            'TEST_SECRET_KEY': 'SECRET_TEST',
+            'TEST_BUCKET': 'bucket-test'
+        }
+        os.environ.update(self.env_vars)
+        self.manager = ObjectStorageManager.objects.create(
+            connection_name='test_conn',
+            protocol=ProtocolType.S3,
+            access_key_id_var='TEST_ACCESS_KEY',
+            secret_access_key_var='TEST_SECRET_KEY',
+            bucket_name='TEST_BUCKET',
+            use_env_vars=True
+        )
+        object_storage_cache.clear()
+        self.addCleanup(object_storage_cache.clear)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        for k in self.env_vars:
+            os.environ.pop(k, None)
+
+    def test_get_s3_env_vars_cached(self):
+        """Test S3 env vars are resolved once per connection."""
+        envs = ObjectStorageManager.get_s3_env_vars('test_conn')
+        envs['S3_DIR_PREFIX'] = 'changed'
+        with self.assertNumQueries(0):
+            envs = ObjectStorageManager.get_s3_env_vars('test_conn')
+        self.assertEqual(envs['S3_BUCKET_NAME'], 'bucket-test')
+        self.assertEqual(envs['S3_DIR_PREFIX'], '')
+
+        # saving the manager invalidates the cache
+        os.environ['TEST_BUCKET'] = 'bucket-new'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.manager.save()
+        envs = ObjectStorageManager.get_s3_env_vars('test_conn')
+        self.assertEqual(envs['S3_BUCKET_NAME'], 'bucket-new')
+
+    @override_settings(OBJECT_STORAGE_CACHE_CHECK_INTERVAL=0)
+    def test_get_s3_env_vars_version_changed_while_loading(self):
+        """Test env vars loaded before the version changed are not cached."""
+        stale_envs = ObjectStorageManager.get_s3_env_vars('test_conn')
+        object_storage_cache.clear()
+
+        def loader():
+            # other process commits a change while the env vars are loaded
+            os.environ['TEST_BUCKET'] = 'bucket-new'
+            cache.set(object_storage_cache.version_key, 'new-version')
+            # other thread picks up the new version
+            object_storage_cache.check_version()
+            return stale_envs
+
+        envs = object_storage_cache.get_env_vars('test_conn', loader)
+        self.assertEqual(envs['S3_BUCKET_NAME'], 'bucket-test')
+        envs = ObjectStorageManager.get_s3_env_vars('test_conn')
+        self.assertEqual(envs['S3_BUCKET_NAME'], 'bucket-new')
+
+    @override_settings(S3_MAX_POOL_CONNECTIONS=20)
+    @patch('core.models.object_storage_manager.boto3.client')
+    def test_get_s3_client_cached(self, mock_client):
+        """Test S3 client is shared for the same connection."""
+        mock_client.side_effect = lambda *args, **kwargs: MagicMock()
+        client = ObjectStorageManager.get_s3_client(
+            connection_name='test_conn'
+        )
+        self.assertIs(
+            ObjectStorageManager.get_s3_client(connection_name='test_conn'),
+            client
+        )
+        mock_client.assert_called_once()
+        config = mock_client.call_args.kwargs['config']
+        self.assertEqual(config.max_pool_connections, 20)
+
+        # other credentials use another client
+        s3 = ObjectStorageManager.get_s3_env_vars('test_conn')
+        s3['S3_ACCESS_KEY_ID'] = 'AKIA_OTHER'
+        self.assertIsNot(ObjectStorageManager.get_s3_client(s3), client)
+        self.assertEqual(mock_client.call_count, 2)
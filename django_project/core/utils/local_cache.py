@@ -0,0 +1,111 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP.
+
+.. note:: Process-local cache with shared version.
+"""
+
+import time
+import uuid
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class VersionedLocalCache:
+    """Base class of process-local cache with a shared version.
+
+    The version is stored in Django cache (Redis), so invalidating
+    the cache in one process clears the cache in the other processes.
+    The version is checked at most every check_interval seconds.
+    """
+
+    DEFAULT_CHECK_INTERVAL = 5
+
+    def __init__(
+        self, version_key: str, enabled_setting: str,
+        check_interval_setting: str
+    ):
+        """Initialize VersionedLocalCache class.
+
+        :param version_key: cache key of the version
+        :type version_key: str
+        :param enabled_setting: setting name to enable the cache
+        :type enabled_setting: str
+        :param check_interval_setting: setting name of the check interval
+        :type check_interval_setting: str
+        """
+        self.version_key = version_key
+        self.enabled_setting = enabled_setting
+        self.check_interval_setting = check_interval_setting
+        self._lock = threading.RLock()
+        self._version = None
+        self._checked_on = 0
+        self.hit_count = 0
+        self.load_count = 0
+
+    @property
+    def is_enabled(self) -> bool:
+        """Check whether the cache is enabled."""
+        return getattr(settings, self.enabled_setting, True)
+
+    @property
+    def check_interval(self) -> float:
+        """Return interval in seconds to check the version."""
+        return getattr(
+            settings, self.check_interval_setting,
+            self.DEFAULT_CHECK_INTERVAL
+        )
+
+    def get_version(self) -> str:
+        """Get current version from Django cache.
+
+        :return: version string
+        :rtype: str
+        """
+        return cache.get(self.version_key, None) or '0'
+
+    def check_version(self):
+        """Clear the cached values when the version is changed."""
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self._version is not None and
+                now - self._checked_on < self.check_interval
+            ):
+                return
+        version = self.get_version()
+        with self._lock:
+            if version != self._version:
+                self._clear()
+                self._version = version
+            self._checked_on = now
+
+    def _clear(self):
+        """Remove the cached values, called with the lock held."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Clear the cached values in this process."""
+        with self._lock:
+            self._clear()
+            self._version = None
+            self._checked_on = 0
+
+    def invalidate(self):
+        """Invalidate the cached values in all processes."""
+        self.clear()
+        cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+
+    def get_stats(self) -> dict:
+        """Return cache statistics of this process.
+
+        hit_count is the number of loads that are avoided.
+        :return: dictionary of hit_count and load_count
+        :rtype: dict
+        """
+        return {
+            'hit_count': self.hit_count,
+            'load_count': self.load_count
+        }
@@ -5,8 +5,10 @@ Tomorrow Now GAP.
 .. note:: DCAS Functions to process row data.
 """
 
+import numpy as np
 import pandas as pd
 
+from dcas.data_type import DCASDataType, DCASDataVariable
 from dcas.rules.rule_engine import DCASRuleEngine
 from dcas.rules.variables import DCASData
 from dcas.service import GrowthStageService, MessagePriorityService
@@ -94,6 +96,124 @@ def calculate_growth_stage(
     return row
 
 
+def calculate_growth_stage_batch(
+    df: pd.DataFrame, epoch_list: list, growth_stage_matrix: dict
+) -> pd.DataFrame:
+    """Identify the growth stage and its start date for all rows.
+
+    This is the vectorized version of calculate_growth_stage.
+    :param df: DataFrame with gdd_sum_{epoch} columns
+    :type df: pd.DataFrame
+    :param epoch_list: list of processing date epoch
+    :type epoch_list: list
+    :param growth_stage_matrix: GDD matrix arrays from
+        GrowthStageService.get_matrix_arrays
+    :type growth_stage_matrix: dict
+    :return: DataFrame with growth_stage_start_date, growth_stage_id
+        and total_gdd columns
+    :rtype: pd.DataFrame
+    """
+    total_rows = len(df)
+    total_gdd = df[f'gdd_sum_{epoch_list[-1]}'].to_numpy(
+        dtype='f8', na_value=np.nan
+    )
+
+    # find growth stage and its lower threshold from cumulative GDD
+    stage_id = np.full(total_rows, np.nan)
+    gdd_threshold = np.full(total_rows, np.nan)
+    has_stage = np.zeros(total_rows, dtype=bool)
+    key_df = df[['crop_id', 'crop_stage_type_id', 'config_id']].reset_index(
+        drop=True
+    )
+    for key, indices in key_df.groupby(
+        ['crop_id', 'crop_stage_type_id', 'config_id'], sort=False
+    ).indices.items():
+        matrix = growth_stage_matrix.get(tuple(int(k) for k in key))
+        if matrix is None:
+            continue
+        thresholds, stage_ids = matrix
+        stage_idx = np.searchsorted(
+            thresholds, total_gdd[indices], side='left'
+        )
+        # total GDD exceeds all thresholds, use the last stage
+        is_last = stage_idx >= len(thresholds)
+        stage_id[indices] = stage_ids[
+            np.minimum(stage_idx, len(thresholds) - 1)
+        ]
+        gdd_threshold[indices] = np.where(
+            is_last,
+            thresholds[-1],
+            np.where(
+                stage_idx == 0, 0, thresholds[np.maximum(stage_idx - 1, 0)]
+            )
+        )
+        has_stage[indices] = True
+
+    prev_stage_id = df['prev_growth_stage_id'].to_numpy(
+        dtype='f8', na_value=np.nan
+    )
+    prev_start_date = df['prev_growth_stage_start_date'].to_numpy(
+        dtype='f8', na_value=np.nan
+    )
+    planting_date = df['planting_date_epoch'].to_numpy(
+        dtype='f8', na_value=np.nan
+    )
+
+    # no lookup value or growth stage is not changed: use previous values
+    growth_stage_id = np.where(has_stage, stage_id, prev_stage_id)
+    start_date = prev_start_date.copy()
+    is_changed = has_stage & ~(stage_id == prev_stage_id)
+
+    # if threshold is 0, then we use the planting date
+    is_zero = is_changed & (gdd_threshold == 0)
+    start_date[is_zero] = planting_date[is_zero]
+
+    # find the date that growth stage is changed
+    to_search = is_changed & ~is_zero
+    epochs = np.array(epoch_list, dtype='f8')
+    start_date[to_search] = epochs[0]
+    if len(epoch_list) > 1 and to_search.any():
+        search_epochs = epochs[:-1]
+        gdd_sum = df[
+            [f'gdd_sum_{epoch}' for epoch in epoch_list[:-1]]
+        ].to_numpy(dtype='f8', na_value=np.nan)[to_search]
+        before_planting = (
+            search_epochs[np.newaxis, :] <
+            planting_date[to_search][:, np.newaxis]
+        )
+        # sum_gdd that is lesser than or equal to the lower threshold
+        below_threshold = gdd_sum <= gdd_threshold[to_search][:, np.newaxis]
+        is_found = before_planting | below_threshold
+        # the last epoch that satisfies the condition
+        last_idx = (
+            len(search_epochs) - 1 -
+            np.argmax(is_found[:, ::-1], axis=1)
+        )
+        row_idx = np.arange(len(last_idx))
+        found_date = np.where(
+            before_planting[row_idx, last_idx],
+            planting_date[to_search],
+            epochs[last_idx + 1]
+        )
+        start_date[to_search] = np.where(
+            is_found.any(axis=1), found_date, epochs[0]
+        )
+
+    return df.assign(
+        growth_stage_start_date=pd.array(
+            pd.Series(start_date).astype(DCASDataType.MAP_TYPES[
+                DCASDataVariable.GROWTH_STAGE_START_DATE_EPOCH
+            ])
+        ),
+        growth_stage_id=pd.array(
+            pd.Series(growth_stage_id).astype(DCASDataType.MAP_TYPES[
+                DCASDataVariable.GROWTH_STAGE_ID
+            ])
+        ),
+        total_gdd=total_gdd
+    )
+
+
 def calculate_message_output(
     row: pd.Series, rule_engine: DCASRuleEngine, attrib_dict: dict
 ) -> pd.Series:
@@ -178,64 +178,76 @@ class DCASPipelineInput:
         """
         ds = xr.open_dataset(nc_file_path, engine="h5netcdf")
         tolerance = self.NEAREST_TOLERANCE if tolerance is None else tolerance
-        indices = []
-        for idx, lat in enumerate(grid_df['lat']):
-            lon = grid_df['lon'].iloc[idx]
+        lat_idx = self._find_nearest_indices(
+            ds['lat'], grid_df['lat'], tolerance
+        )
+        lon_idx = self._find_nearest_indices(
+            ds['lon'], grid_df['lon'], tolerance
+        )
 
-            lat_idx, lon_idx = self._find_nearest_with_tolerance(
-                ds['lat'], ds['lon'], lat, lon, tolerance
-            )
-            indices.append((lat_idx, lon_idx))
+        # read all dates and attributes of the points in one go
+        values = self._read_points(
+            ds[attribute_list], lat_idx, lon_idx
+        ).reindex(date=dates).load()
 
-        columns = []
+        data = {}
         for attribute in attribute_list:
-            for date in dates:
+            # shape: (point, date)
+            attr_values = values[attribute].transpose('point', 'date').values
+            for date_idx, date in enumerate(dates):
                 epoch = int(date.timestamp())
-                columns.append(f'{column_mapping[attribute]}_{epoch}')
-        result = []
-        for i, (lat_idx, lon_idx) in enumerate(indices):
-            if lat_idx is None or lon_idx is None:
-                # add empty df
-                empty_df = pd.DataFrame(columns=columns)
-                empty_df.loc[0] = np.nan
-                result.append(empty_df)
-                continue
-            filtered_ds = ds[attribute_list].isel(lat=lat_idx, lon=lon_idx)
-            df = filtered_ds.to_dataframe()
-            df = df.reindex(dates, fill_value=None)
-            df.index.name = 'date'
-            df['lat'] = grid_df['lat'].iloc[idx]
-            df['lon'] = grid_df['lon'].iloc[idx]
-            df = df.reset_index()
-            df = df.set_index(['lat', 'lon'])
-            pivot_df = df.pivot(columns='date', values=attribute_list)
-            pivot_df.columns = [
-                f'{column_mapping[col[0]]}_'
-                f'{int(pd.to_datetime(col[1]).timestamp())}'
-                for col in pivot_df.columns
-            ]
-
-            pivot_df = pivot_df.reset_index(drop=True)
-            result.append(pivot_df)
-
-        merged_rows = pd.concat(result, axis=0)
-        merged_rows = merged_rows.set_index(grid_df.index)
+                data[f'{column_mapping[attribute]}_{epoch}'] = (
+                    attr_values[:, date_idx]
+                )
+
+        merged_rows = pd.DataFrame(data, index=grid_df.index)
         merged_df = pd.concat([grid_df, merged_rows], axis=1)
 
         return merged_df
 
-    def _find_nearest_with_tolerance(
-        self, lats, lons, target_lat, target_lon, tolerance
-    ):
-        lat_diff = np.abs(lats - target_lat)
-        lon_diff = np.abs(lons - target_lon)
+    def _find_nearest_indices(
+        self, coords, targets, tolerance
+    ) -> np.ndarray:
+        """Find nearest index of coordinate for each target.
+
+        :param coords: sorted coordinate values, e.g. ds['lat']
+        :type coords: xr.DataArray
+        :param targets: target values
+        :type targets: pd.Series
+        :param tolerance: maximum distance to the nearest coordinate
+        :type tolerance: float
+        :return: array of index, -1 if tolerance is exceeded
+        :rtype: np.ndarray
+        """
+        return pd.Index(np.asarray(coords)).get_indexer(
+            np.asarray(targets, dtype='f8'),
+            method='nearest',
+            tolerance=tolerance
+        )
 
-        if lat_diff.min() <= tolerance and lon_diff.min() <= tolerance:
-            lat_index = lat_diff.argmin()
-            lon_index = lon_diff.argmin()
-            return lat_index.values, lon_index.values
-        else:
-            return None, None
+    def _read_points(
+        self, ds: xrDataset, lat_idx: np.ndarray, lon_idx: np.ndarray
+    ) -> xrDataset:
+        """Read values at points using pointwise indexing.
+
+        Points that have negative index are filled with NaN.
+        :param ds: Dataset with lat and lon dimensions
+        :type ds: xrDataset
+        :param lat_idx: array of lat index for each point
+        :type lat_idx: np.ndarray
+        :param lon_idx: array of lon index for each point
+        :type lon_idx: np.ndarray
+        :return: Dataset with new point dimension
+        :rtype: xrDataset
+        """
+        is_valid = (lat_idx >= 0) & (lon_idx >= 0)
+        points_ds = ds.isel(
+            lat=xr.DataArray(np.where(is_valid, lat_idx, 0), dims='point'),
+            lon=xr.DataArray(np.where(is_valid, lon_idx, 0), dims='point')
+        )
+        return points_ds.where(
+            xr.DataArray(is_valid, dims='point')
+        )
 
     def _get_values_at_points(
         self, ds: xrDataset, attribute_list: list, column_mapping: dict,
@@ -245,27 +257,22 @@ class DCASPipelineInput:
         epoch = int(date.timestamp())
         tolerance = self.NEAREST_TOLERANCE if tolerance is None else tolerance
 
-        data = {attribute: [] for attribute in attribute_list}
-
-        for idx, lat in enumerate(lat_arr):
-            lon = lon_arr.iloc[idx]
+        lat_idx = self._find_nearest_indices(ds['lat'], lat_arr, tolerance)
+        lon_idx = self._find_nearest_indices(ds['lon'], lon_arr, tolerance)
 
-            try:
-                values_at_point = ds[attribute_list].sel(
-                    date=date
-                ).sel(
-                    lat=lat,
-                    lon=lon,
-                    method='nearest',
-                    tolerance=tolerance
-                )
-                for attribute in attribute_list:
-                    data[attribute].append(
-                        values_at_point[attribute].values.tolist()
-                    )
-            except KeyError:
-                for attribute in attribute_list:
-                    data[attribute].append(np.nan)
+        if date in ds.indexes['date']:
+            values = self._read_points(
+                ds[attribute_list].sel(date=date), lat_idx, lon_idx
+            ).load()
+            data = {
+                attribute: values[attribute].values
+                for attribute in attribute_list
+            }
+        else:
+            data = {
+                attribute: np.full(len(lat_idx), np.nan)
+                for attribute in attribute_list
+            }
 
         vap_df = pd.DataFrame(data, index=df_index)
         # rename columns
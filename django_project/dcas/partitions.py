@@ -11,16 +11,21 @@ import numpy as np
 from gap.models import Attribute
 from dcas.models import GDDConfig
 from dcas.rules.rule_engine import DCASRuleEngine
+from dcas.rules.vectorized import (
+    DCASRuleEngineMode,
+    DCASVectorizedRuleEngine
+)
 from dcas.utils import (
     read_grid_data,
     read_grid_crop_data,
     get_previous_week_message
 )
 from dcas.functions import (
-    calculate_growth_stage,
+    calculate_growth_stage_batch,
     calculate_message_output
 )
 from dcas.data_type import DCASDataType, DCASDataVariable
+from dcas.service import GrowthStageService
 
 
 def process_partition_total_gdd(
@@ -213,29 +218,12 @@ def process_partition_growth_stage(
         growth_stage_start_date columns
     :rtype: pd.DataFrame
     """
-    last_gdd_epoch = epoch_list[-1]
-    df = df.assign(
-        growth_stage_start_date=pd.Series(
-            dtype=DCASDataType.MAP_TYPES[
-                DCASDataVariable.GROWTH_STAGE_START_DATE_EPOCH
-            ]
-        ),
-        growth_stage_id=pd.Series(
-            dtype=DCASDataType.MAP_TYPES[
-                DCASDataVariable.GROWTH_STAGE_ID
-            ]
-        ),
-        total_gdd=df[f'gdd_sum_{last_gdd_epoch}']
-    )
+    growth_stage_matrix = GrowthStageService.get_matrix_arrays()
 
-    df = df.apply(
-        calculate_growth_stage,
-        axis=1,
-        args=(epoch_list,)
+    return calculate_growth_stage_batch(
+        df, epoch_list, growth_stage_matrix
     )
 
-    return df
-
 
 def process_partition_growth_stage_precipitation(
     df: pd.DataFrame, parquet_file_path: str, epoch_list: list,
@@ -292,7 +280,8 @@ def process_partition_growth_stage_precipitation(
 
 
 def process_partition_message_output(
-    df: pd.DataFrame, previous_message_db: str
+    df: pd.DataFrame, previous_message_db: str,
+    rule_engine_mode: str = DCASRuleEngineMode.DURABLE
 ) -> pd.DataFrame:
     """Calculate message codes for DataFrame partition.
 
@@ -300,6 +289,8 @@ def process_partition_message_output(
     :type df: pd.DataFrame
     :param previous_message_db: Path to the previous message database
     :type previous_message_db: str
+    :param rule_engine_mode: durable or vectorized rule engine
+    :type rule_engine_mode: str
     :return: DataFrame with message columns
     :rtype: pd.DataFrame
     """
@@ -373,6 +364,11 @@ def process_partition_message_output(
         ).id
     }
 
+    if rule_engine_mode == DCASRuleEngineMode.VECTORIZED:
+        rule_engine = DCASVectorizedRuleEngine()
+        rule_engine.initialize()
+        return rule_engine.execute(df, attrib_dict)
+
     rule_engine = DCASRuleEngine()
     rule_engine.initialize()
 
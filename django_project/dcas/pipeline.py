@@ -37,6 +37,7 @@ from dcas.partitions import (
     process_partition_farm_registry
 )
 from dcas.queries import DataQuery
+from dcas.rules.vectorized import DCASRuleEngineMode
 from dcas.outputs import DCASPipelineOutput, OutputType
 from dcas.inputs import DCASPipelineInput
 from dcas.functions import filter_messages_by_weeks
@@ -60,7 +61,8 @@ class DCASDataPipeline:
         self, farm_registry_group_ids: list,
         request_date: datetime.date, farm_num_partitions = None,
         grid_crop_num_partitions = None, duck_db_num_threads=None,
-        previous_days_to_check=7, dask_num_threads=None
+        previous_days_to_check=7, dask_num_threads=None,
+        rule_engine_mode=DCASRuleEngineMode.DURABLE
     ):
         """Initialize DCAS Data Pipeline.
 
@@ -79,6 +81,8 @@ class DCASDataPipeline:
         :type previous_days_to_check: int
         :param dask_num_threads: number of threads for dask
         :type dask_num_threads: int
+        :param rule_engine_mode: durable or vectorized rule engine
+        :type rule_engine_mode: str
         """
         self.farm_registry_group_ids = farm_registry_group_ids
         self.fs = None
@@ -105,6 +109,7 @@ class DCASDataPipeline:
             days=previous_days_to_check
         )
         self.previous_message_db = None
+        self.rule_engine_mode = rule_engine_mode
 
     def setup(self):
         """Set the data pipeline."""
@@ -489,6 +494,7 @@ class DCASDataPipeline:
         grid_crop_df = grid_crop_df.map_partitions(
             process_partition_message_output,
             self.previous_message_db,
+            self.rule_engine_mode,
             meta=grid_crop_df_meta
         )
 
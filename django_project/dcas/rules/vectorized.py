@@ -0,0 +1,209 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP DCAS.
+
+.. note:: DCAS Vectorized Rule Engine
+"""
+
+import numpy as np
+import pandas as pd
+
+from dcas.models import DCASRule, DCASMessagePriority
+from dcas.data_type import DCASDataType, DCASDataVariable
+from dcas.service import MessagePriorityService
+
+
+class DCASRuleEngineMode:
+    """Available rule engine mode for DCAS pipeline."""
+
+    DURABLE = 'durable'
+    VECTORIZED = 'vectorized'
+
+
+class DCASVectorizedRuleEngine:
+    """Rule engine that evaluates a whole DataFrame partition.
+
+    DCASRule is compiled into a lookup table, the partition is
+    unpivoted by parameter and joined with the table on
+    (config, crop, stage_type, growth_stage, parameter), then
+    filtered by the interval min_range <= value < max_range.
+    The result is the same as calling DCASRuleEngine and
+    calculate_message_output for each row. Messages with the same
+    priority are ordered by their code.
+    """
+
+    RULE_KEYS = [
+        'config_id', 'crop_id', 'crop_stage_type_id',
+        'growth_stage_id', 'parameter_id'
+    ]
+    MESSAGE_COLUMNS = [
+        DCASDataVariable.MESSAGE,
+        DCASDataVariable.MESSAGE_2,
+        DCASDataVariable.MESSAGE_3,
+        DCASDataVariable.MESSAGE_4,
+        DCASDataVariable.MESSAGE_5
+    ]
+
+    def __init__(self):
+        """Initialize DCASVectorizedRuleEngine."""
+        self.rule_df = None
+        self.priority_df = None
+
+    def initialize(self):
+        """Load rule and message priority tables."""
+        rules = list(
+            DCASRule.objects.order_by('id').values_list(
+                'config_id', 'crop_id', 'crop_stage_type_id',
+                'crop_growth_stage_id', 'parameter_id',
+                'min_range', 'max_range', 'code'
+            )
+        )
+        self.rule_df = pd.DataFrame(
+            rules,
+            columns=self.RULE_KEYS + ['min_range', 'max_range', 'code']
+        )
+        # rule order is used when one value matches more than one rule
+        self.rule_df['rule_order'] = np.arange(len(self.rule_df))
+        for key in self.RULE_KEYS:
+            self.rule_df[key] = self.rule_df[key].astype('int64')
+        self.rule_df['code'] = self.rule_df['code'].astype('int64')
+
+        priorities = list(
+            DCASMessagePriority.objects.values_list(
+                'config_id', 'code', 'priority'
+            )
+        )
+        self.priority_df = pd.DataFrame(
+            priorities, columns=['config_id', 'code', 'priority']
+        )
+        self.priority_df = self.priority_df.astype({
+            'config_id': 'int64',
+            'code': 'int64',
+            'priority': 'int64'
+        }).drop_duplicates(subset=['config_id', 'code'])
+
+    def _normalize_value(self, values: pd.Series) -> np.ndarray:
+        """Normalize nan and inf values like DCASData does."""
+        values = values.to_numpy(dtype='f8', na_value=np.nan)
+        values = np.where(np.isnan(values), 0, values)
+        return np.where(np.isinf(values), 999999, values)
+
+    def _match_rules(
+        self, df: pd.DataFrame, attrib_dict: dict
+    ) -> pd.DataFrame:
+        """Find message codes for each row of df.
+
+        :param df: partition with rule keys and parameter columns
+        :type df: pd.DataFrame
+        :param attrib_dict: parameter column and its attribute id
+        :type attrib_dict: dict
+        :return: DataFrame with columns row_idx, code, and priority
+        :rtype: pd.DataFrame
+        """
+        key_df = pd.DataFrame({
+            'row_idx': np.arange(len(df)),
+            'config_id': df['config_id'].to_numpy(),
+            'crop_id': df['crop_id'].to_numpy(),
+            'crop_stage_type_id': df['crop_stage_type_id'].to_numpy(),
+            'growth_stage_id': df['growth_stage_id'].to_numpy()
+        })
+        # rows without growth stage cannot match any rule
+        key_df = key_df.dropna()
+        valid_rows = key_df['row_idx'].to_numpy()
+
+        param_dfs = []
+        for column, attribute_id in attrib_dict.items():
+            param_df = key_df.astype('int64')
+            param_df['parameter_id'] = attribute_id
+            param_df['value'] = self._normalize_value(
+                df[column].iloc[valid_rows]
+            )
+            param_dfs.append(param_df)
+
+        if len(param_dfs) == 0 or len(key_df) == 0:
+            return pd.DataFrame(columns=['row_idx', 'code', 'priority'])
+
+        long_df = pd.concat(param_dfs, ignore_index=True)
+        matched_df = long_df.merge(
+            self.rule_df, on=self.RULE_KEYS, how='inner'
+        )
+        matched_df = matched_df[
+            (matched_df['value'] >= matched_df['min_range']) &
+            (matched_df['value'] < matched_df['max_range'])
+        ]
+
+        # each parameter produces at most one message code
+        matched_df = matched_df.sort_values(
+            ['row_idx', 'parameter_id', 'rule_order']
+        ).drop_duplicates(subset=['row_idx', 'parameter_id'])
+        # message codes of a row are unique
+        matched_df = matched_df.drop_duplicates(subset=['row_idx', 'code'])
+
+        matched_df = matched_df[['row_idx', 'config_id', 'code']].merge(
+            self.priority_df, on=['config_id', 'code'], how='left'
+        )
+        matched_df['priority'] = matched_df['priority'].fillna(
+            MessagePriorityService.LOWEST_PRIORITY
+        )
+        return matched_df[['row_idx', 'code', 'priority']]
+
+    def execute(self, df: pd.DataFrame, attrib_dict: dict) -> pd.DataFrame:
+        """Execute rules for all rows in the DataFrame.
+
+        The DataFrame must have message, message_2 - message_5,
+        is_empty_message, has_repetitive_message, final_message and
+        prev_week_message columns.
+        :param df: Grid crop DataFrame partition
+        :type df: pd.DataFrame
+        :param attrib_dict: parameter column and its attribute id
+        :type attrib_dict: dict
+        :return: DataFrame with message output columns
+        :rtype: pd.DataFrame
+        """
+        if self.rule_df is None:
+            self.initialize()
+
+        matched_df = self._match_rules(df, attrib_dict)
+
+        # sort messages by priority in descending order
+        matched_df = matched_df.sort_values(
+            ['row_idx', 'priority', 'code'],
+            ascending=[True, False, True]
+        )
+        matched_df['position'] = matched_df.groupby('row_idx').cumcount()
+
+        messages = {}
+        for position, column in enumerate(self.MESSAGE_COLUMNS):
+            position_df = matched_df[matched_df['position'] == position]
+            values = np.full(len(df), np.nan)
+            values[position_df['row_idx'].to_numpy(dtype='int64')] = (
+                position_df['code'].to_numpy(dtype='f8')
+            )
+            messages[column] = values
+
+        message = messages[DCASDataVariable.MESSAGE]
+        message_2 = messages[DCASDataVariable.MESSAGE_2]
+        prev_week_message = df[DCASDataVariable.PREV_WEEK_MESSAGE].to_numpy(
+            dtype='f8', na_value=np.nan
+        )
+
+        is_empty = np.isnan(message)
+        # nan never equals to any value
+        has_repetitive = message == prev_week_message
+        # use the second message when final message is repeated
+        final_message = np.where(
+            has_repetitive & ~np.isnan(message_2), message_2, message
+        )
+        messages[DCASDataVariable.FINAL_MESSAGE] = final_message
+
+        return df.assign(
+            **{
+                column: pd.array(
+                    pd.Series(values).astype(
+                        DCASDataType.MAP_TYPES[column]
+                    )
+                ) for column, values in messages.items()
+            },
+            is_empty_message=is_empty,
+            has_repetitive_message=has_repetitive
+        )
@@ -5,6 +5,7 @@ Tomorrow Now GAP.
 .. note:: Service for Growth Stage
 """
 
+import numpy as np
 from django.core.cache import cache
 from dcas.models import GDDMatrix, DCASMessagePriority
 
@@ -136,6 +137,44 @@ class GrowthStageService:
         # Efficient bulk cache set
         cache.set_many(cache_map, timeout=None)
 
+    @staticmethod
+    def get_matrix_arrays():
+        """Load all GDD matrices as sorted NumPy arrays.
+
+        :return: Dictionary with (crop_id, crop_stage_type_id, config_id)
+            as key and tuple of (gdd thresholds, growth stage ids) that
+            are sorted by gdd threshold
+        :rtype: dict
+        """
+        all_matrices = (
+            GDDMatrix.objects.all()
+            .order_by("gdd_threshold", "id")
+            .values_list(
+                "crop_id",
+                "crop_stage_type_id",
+                "config_id",
+                "gdd_threshold",
+                "crop_growth_stage_id"
+            )
+        )
+
+        matrix_map = {}
+        for crop_id, stage_type_id, config_id, threshold, stage_id in (
+            all_matrices
+        ):
+            key = (crop_id, stage_type_id, config_id)
+            if key not in matrix_map:
+                matrix_map[key] = ([], [])
+            matrix_map[key][0].append(threshold)
+            matrix_map[key][1].append(stage_id)
+
+        return {
+            key: (
+                np.array(thresholds, dtype='f8'),
+                np.array(stage_ids, dtype='f8')
+            ) for key, (thresholds, stage_ids) in matrix_map.items()
+        }
+
     @staticmethod
     def cleanup_matrix():
         """
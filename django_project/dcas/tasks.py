@@ -24,6 +24,7 @@ from dcas.models import (
     DCASErrorLog, DCASRequest, DCASOutput, DCASDeliveryMethod
 )
 from dcas.pipeline import DCASDataPipeline
+from dcas.rules.vectorized import DCASRuleEngineMode
 from dcas.outputs import DCASPipelineOutput
 from dcas.utils import remove_dcas_output_file
 
@@ -120,6 +121,13 @@ class DCASPreferences:
         """Get the dask threads number."""
         return self.dcas_config.get('dask_threads_number', None)
 
+    @property
+    def rule_engine_mode(self):
+        """Get the rule engine mode: durable or vectorized."""
+        return self.dcas_config.get(
+            'rule_engine', DCASRuleEngineMode.DURABLE
+        )
+
     @property
     def store_csv_to_minio(self):
         """Check if process should store csv to minio."""
@@ -158,7 +166,8 @@ class DCASPreferences:
             'trigger_error_handling': self.trigger_error_handling,
             'csv_columns': self.csv_columns,
             'duckdb_memory_limit': self.duck_db_memory_limit,
-            'dask_threads_number': self.dask_threads_number
+            'dask_threads_number': self.dask_threads_number,
+            'rule_engine': self.rule_engine_mode
         }
 
     @staticmethod
@@ -353,6 +362,7 @@ def run_dcas(request_id=None):
         duck_db_num_threads=dcas_config.duck_db_num_threads,
         previous_days_to_check=7,
         dask_num_threads=dcas_config.dask_threads_number,
+        rule_engine_mode=dcas_config.rule_engine_mode
     )
 
     errors = None
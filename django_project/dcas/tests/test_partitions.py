@@ -6,11 +6,14 @@ Tomorrow Now GAP.
 """
 
 from mock import patch
+import numpy as np
 import pandas as pd
 
 from dcas.tests.base import DCASPipelineBaseTest
+from dcas.functions import calculate_growth_stage
 from dcas.partitions import (
     _merge_partition_gdd_config,
+    process_partition_growth_stage,
     process_partition_farm_registry,
     process_partition_seasonal_precipitation,
     process_partition_other_params,
@@ -40,6 +43,58 @@ class DCASPartitionsTest(DCASPipelineBaseTest):
         expected_df['gdd_cap'] = expected_df['gdd_cap'].astype('float64')
         pd.testing.assert_frame_equal(df, expected_df)
 
+    def test_process_partition_growth_stage(self):
+        """Test process_partition_growth_stage against row function."""
+        epoch_list = [123, 124, 125, 126]
+        df = pd.DataFrame({
+            'crop_id': pd.array([2, 2, 2, 2, 2, 9999], dtype='UInt16'),
+            'crop_stage_type_id': pd.array(
+                [2, 2, 2, 2, 2, 9999], dtype='UInt16'
+            ),
+            'config_id': pd.array([1, 1, 1, 1, 1, 1], dtype='UInt16'),
+            'planting_date_epoch': pd.array(
+                [123, 123, 123, 125, 123, 123], dtype='UInt32'
+            ),
+            'prev_growth_stage_id': pd.array(
+                [None, None, 2, None, None, 111], dtype='UInt16'
+            ),
+            'prev_growth_stage_start_date': pd.array(
+                [None, None, 111, None, None, 111], dtype='UInt32'
+            ),
+            'gdd_sum_123': [420, 410, 420, 10, 50, 10],
+            'gdd_sum_124': [440, 400, 430, 20, 60, 20],
+            'gdd_sum_125': [450, 420, 435, 30, 70, 30],
+            'gdd_sum_126': [490, 440, 440, 40, 80, 40],
+        }, index=[5, 6, 7, 8, 9, 10])
+
+        result_df = process_partition_growth_stage(df, epoch_list)
+
+        expected_df = df.assign(
+            growth_stage_start_date=pd.Series(dtype='UInt32'),
+            growth_stage_id=pd.Series(dtype='UInt16'),
+            total_gdd=df['gdd_sum_126']
+        ).apply(calculate_growth_stage, axis=1, args=(epoch_list,))
+        self.assertEqual(
+            list(result_df.columns), list(expected_df.columns)
+        )
+        for column in ['growth_stage_id', 'growth_stage_start_date']:
+            expected = [
+                None if pd.isna(val) else int(val)
+                for val in expected_df[column]
+            ]
+            result = [
+                None if pd.isna(val) else int(val)
+                for val in result_df[column]
+            ]
+            self.assertEqual(result, expected, column)
+        self.assertEqual(result_df.loc[5, 'growth_stage_id'], 13)
+        self.assertEqual(result_df.loc[5, 'growth_stage_start_date'], 125)
+        self.assertEqual(result_df.loc[7, 'growth_stage_start_date'], 111)
+        self.assertEqual(result_df.loc[10, 'growth_stage_id'], 111)
+        np.testing.assert_array_equal(
+            result_df['total_gdd'].to_numpy(), df['gdd_sum_126'].to_numpy()
+        )
+
     @patch('dcas.partitions.read_grid_crop_data')
     def test_process_partition_farm_registry(self, mock_read_grid_data):
         """Test process_partition_farm_registry."""
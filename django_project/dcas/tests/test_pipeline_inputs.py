@@ -121,6 +121,39 @@ class DCASPipelineInputsTest(TestCase):
         )
         self.assertTrue(vap_df.isna().all().all())
 
+    def test_get_values_at_points_partial(self):
+        """Test points with tolerance exceeded and missing date."""
+        epoch = int(self.dates[0].timestamp())
+        in_lat = pd.Series([2, 15, 4])
+        in_lon = pd.Series([2, 4, 4])
+        vap_df = self.input._get_values_at_points(
+            self.ds, ['temperature'], {
+                'temperature': 'temperature'
+            },
+            in_lat,
+            in_lon,
+            self.dates[0],
+            [3, 4, 5]
+        )
+        self.assertEqual(list(vap_df.index), [3, 4, 5])
+        np.testing.assert_allclose(
+            vap_df[f'temperature_{epoch}'].values, [22, np.nan, 34],
+            atol=1e-5
+        )
+
+        # date is not in the dataset
+        missing_date = self.dates[0] - datetime.timedelta(days=1)
+        vap_df = self.input._get_values_at_points(
+            self.ds, ['temperature'], {
+                'temperature': 'temperature'
+            },
+            in_lat,
+            in_lon,
+            missing_date,
+            [3, 4, 5]
+        )
+        self.assertTrue(vap_df.isna().all().all())
+
     def test_multiple_attributes(self):
         """Test selection with multiple attributes."""
         # sel with nearest will result to 2, 6, 10
@@ -6,14 +6,20 @@ Tomorrow Now GAP.
 """
 
 import numpy as np
+import pandas as pd
+from mock import patch
 from django.test import TestCase
 
 from gap.models import (
     Attribute, CropGrowthStage, CropStageType, Crop
 )
-from dcas.models import DCASConfig
+from dcas.models import DCASConfig, DCASRule, DCASMessagePriority
 from dcas.rules.rule_engine import DCASRuleEngine
 from dcas.rules.variables import DCASData
+from dcas.rules.vectorized import DCASVectorizedRuleEngine
+from dcas.functions import calculate_message_output
+from dcas.service import MessagePriorityService
+from dcas.data_type import DCASDataType, DCASDataVariable
 from dcas.tests.base import BaseRuleEngineTest
 
 
@@ -101,3 +107,137 @@ class DCASRuleEngineTest(TestCase, BaseRuleEngineTest):
 
         # assert
         self.assertEqual(len(data.message_codes), 0)
+
+
+def sort_messages_from_db(messages, config_id, bypass_db=False):
+    """Sort messages using priority from database."""
+    return MessagePriorityService.sort_messages(messages, config_id, False)
+
+
+class DCASVectorizedRuleEngineTest(TestCase, BaseRuleEngineTest):
+    """DCAS Vectorized Rule Engine test case."""
+
+    fixtures = [
+        '1.object_storage_manager.json',
+        '6.unit.json',
+        '7.attribute.json',
+        '12.crop_stage_type.json',
+        '13.crop_growth_stage.json',
+        '1.dcas_config.json'
+    ]
+
+    def setUp(self):
+        """Set the test class."""
+        self.default_config = DCASConfig.objects.get(id=1)
+        self._ingest_rule()
+        self.p_pet = Attribute.objects.get(variable_name='p_pet')
+        self.temperature = Attribute.objects.get(variable_name='temperature')
+        self.growth_stage = CropGrowthStage.objects.get(name='Germination')
+        self.stage_type = CropStageType.objects.get(name='Early')
+        self.crop = Crop.objects.get(name='Cassava')
+        for min_range, max_range, code in [
+            (0, 20, '300001'), (20, 30, '300002'), (30, 99, '300003')
+        ]:
+            DCASRule.objects.create(
+                config=self.default_config,
+                crop=self.crop,
+                crop_stage_type=self.stage_type,
+                crop_growth_stage=self.growth_stage,
+                parameter=self.temperature,
+                min_range=min_range,
+                max_range=max_range,
+                code=code
+            )
+        for code, priority in [
+            ('202400000', 10), ('202400001', 5),
+            ('300001', 8), ('300002', 20), ('300003', 1)
+        ]:
+            DCASMessagePriority.objects.create(
+                config=self.default_config, code=code, priority=priority
+            )
+        self.attrib_dict = {
+            'p_pet': self.p_pet.id,
+            'temperature': self.temperature.id
+        }
+
+    def _create_df(self):
+        """Create grid crop DataFrame with message columns."""
+        p_pet = [0.5, 1.0, 0.5, np.nan, np.inf, 999, 0.5, 1.1]
+        temperature = [10, 25, 25, 35, 10, 999, np.nan, 25]
+        prev_week_message = [
+            None, 300002, 300002, None, None, 300003, None, 202400001
+        ]
+        total = len(p_pet)
+        growth_stage_id = [self.growth_stage.id] * total
+        df = pd.DataFrame({
+            'grid_id': pd.array(range(1, total + 1), dtype='UInt32'),
+            'config_id': pd.array(
+                [self.default_config.id] * total, dtype='UInt16'
+            ),
+            'crop_id': pd.array([self.crop.id] * total, dtype='UInt16'),
+            'crop_stage_type_id': pd.array(
+                [self.stage_type.id] * total, dtype='UInt16'
+            ),
+            'growth_stage_id': pd.array(growth_stage_id, dtype='UInt16'),
+            'p_pet': p_pet,
+            'temperature': temperature,
+            'prev_week_message': pd.array(
+                prev_week_message, dtype='UInt32'
+            )
+        }, index=range(10, 10 + total))
+        message_columns = {}
+        for column in DCASVectorizedRuleEngine.MESSAGE_COLUMNS + [
+            DCASDataVariable.FINAL_MESSAGE
+        ]:
+            message_columns[column] = pd.Series(
+                dtype=DCASDataType.MAP_TYPES[column]
+            )
+        return df.assign(
+            **message_columns,
+            is_empty_message=False,
+            has_repetitive_message=False
+        )
+
+    @patch(
+        'dcas.functions.MessagePriorityService.sort_messages',
+        side_effect=sort_messages_from_db
+    )
+    def test_parity_with_durable_engine(self, mock_sort_messages):
+        """Test vectorized engine has the same output as durable engine."""
+        df = self._create_df()
+        durable_engine = DCASRuleEngine()
+        durable_engine.initialize()
+        expected_df = df.apply(
+            calculate_message_output,
+            axis=1,
+            args=(durable_engine, self.attrib_dict,)
+        )
+
+        rule_engine = DCASVectorizedRuleEngine()
+        rule_engine.initialize()
+        result_df = rule_engine.execute(df, self.attrib_dict)
+
+        self.assertEqual(list(result_df.index), list(df.index))
+        for column in DCASVectorizedRuleEngine.MESSAGE_COLUMNS + [
+            DCASDataVariable.FINAL_MESSAGE,
+            DCASDataVariable.IS_EMPTY_MESSAGE,
+            DCASDataVariable.HAS_REPETITIVE_MESSAGE
+        ]:
+            expected = [
+                None if pd.isna(val) else val
+                for val in expected_df[column]
+            ]
+            result = [
+                None if pd.isna(val) else val
+                for val in result_df[column]
+            ]
+            self.assertEqual(result, expected, column)
+
+        # check some of the rows
+        self.assertEqual(result_df.loc[10, 'message'], 202400000)
+        self.assertEqual(result_df.loc[10, 'message_2'], 300001)
+        self.assertTrue(result_df.loc[11, 'has_repetitive_message'])
+        self.assertEqual(result_df.loc[11, 'final_message'], 202400001)
+        self.assertEqual(result_df.loc[12, 'message'], 300002)
+        self.assertEqual(result_df.loc[12, 'final_message'], 202400000)
+        self.assertTrue(result_df.loc[15, 'is_empty_message'])
@@ -24,7 +24,7 @@ from gap.tasks.ingestor import (
     run_ingestor_session, convert_dataset_to_parquet,
     reset_measurements
 )
-from gap.utils.zarr import BaseZarrReader
+from gap.utils.zarr import BaseZarrReader, zarr_dataset_pool
 
 
 @admin.register(Unit)
@@ -220,6 +220,7 @@ def _clear_zarr_cache(source: DataSourceFile, modeladmin, request):
     zarr_path = BaseZarrReader.get_zarr_cache_dir(source)
     if os.path.exists(zarr_path):
         shutil.rmtree(zarr_path)
+    zarr_dataset_pool.invalidate(source.id)
 
     modeladmin.message_user(
         request,
@@ -66,6 +66,8 @@ class PreferencesAdmin(admin.ModelAdmin):
                 'fields': (
                     'dask_threads_num_api',
                     'api_log_batch_size',
+                    'api_log_insert_chunk_size',
+                    'api_log_max_batches',
                     'api_use_x_accel_redirect',
                     'api_use_parquet',
                     'user_file_uploader_config'
@@ -13,6 +13,10 @@ from django.contrib.gis.geos import Point
 
 from gap.ingestor.base import BaseIngestor
 from gap.ingestor.exceptions import ApiKeyNotFoundException
+from gap.ingestor.measurement_writer import (
+    MeasurementBulkWriter,
+    bulk_upsert_stations
+)
 from gap.models import (
     Provider, Station, StationType, IngestorSession, Dataset, DatasetType,
     Country, Measurement, DatasetStore
@@ -64,6 +68,7 @@ class ArableIngestor(BaseIngestor):
         )
         self.dataset = self._init_dataset()
         self.data_source_file = None
+        self.writer = None
 
         self.attributes = {}
         for dataset_attr in self.dataset.datasetattribute_set.all():
@@ -149,26 +154,29 @@ class ArableIngestor(BaseIngestor):
                 try:
                     value = row[source]
                     if value is not None:
-                        Measurement.objects.get_or_create(
-                            station=station,
-                            dataset_attribute_id=attr_id,
-                            date_time=row['time'],
-                            defaults={
-                                'value': value
-                            }
+                        self.writer.add(
+                            station.id, attr_id, row['time'], value
                         )
                 except KeyError:
                     pass
         return min_time, max_time
 
-    def run(self):
-        """Run the ingestor."""
-        self.api_key = os.environ.get(API_KEY_ENV_NAME, None)
+    def _save_stations(self, devices: list) -> list:
+        """Create new stations of the devices in one query.
 
-        # Get stations or devices
-        devices = self.get(ArableAPI().DEVICES)
-        min_time = None
-        max_time = None
+        :param devices: devices from Arable API
+        :type devices: list
+        :return: List of station that has location
+        :rtype: List[Station]
+        """
+        stations = {
+            station.code: station for station in Station.objects.filter(
+                provider=self.provider,
+                code__in=[device.get('id') for device in devices]
+            )
+        }
+        codes = []
+        new_stations = []
         for device in devices:
             # Skip device that does not have location
             try:
@@ -179,6 +187,9 @@ class ArableIngestor(BaseIngestor):
                 )
             except (KeyError, IndexError):
                 continue
+            codes.append(device['id'])
+            if device['id'] in stations:
+                continue
 
             # Get country
             try:
@@ -188,18 +199,28 @@ class ArableIngestor(BaseIngestor):
             except IndexError:
                 country = None
 
-            # Create station
-            station, _ = Station.objects.get_or_create(
-                code=device['id'],
-                provider=self.provider,
-                defaults={
-                    'name': device['name'],
-                    'geometry': point,
-                    'country': country,
-                    'station_type': self.station_type,
-                }
+            new_stations.append(
+                Station(
+                    code=device['id'],
+                    name=device['name'],
+                    geometry=point,
+                    country=country,
+                    station_type=self.station_type,
+                )
             )
+        stations.update(bulk_upsert_stations(self.provider, new_stations))
+        return [stations[code] for code in codes]
 
+    def run(self):
+        """Run the ingestor."""
+        self.api_key = os.environ.get(API_KEY_ENV_NAME, None)
+
+        # Get stations or devices
+        devices = self.get(ArableAPI().DEVICES)
+        min_time = None
+        max_time = None
+        self.writer = MeasurementBulkWriter(update_existing=False)
+        for station in self._save_stations(devices):
             # Get station data
             epoch_min, epoch_max = self.get_data(station)
             if epoch_min:
@@ -210,6 +231,8 @@ class ArableIngestor(BaseIngestor):
                 min_time, max_time = find_max_min_epoch_dates(
                     min_time, max_time, epoch_max
                 )
+        self.writer.flush()
+        self._add_measurement_progress('measurements', self.writer)
 
         # update the ingested max and min dates
         if min_time:
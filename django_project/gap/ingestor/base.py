@@ -6,6 +6,7 @@ Tomorrow Now GAP.
 """
 
 from typing import Union, List, Tuple
+import json
 import logging
 import datetime
 import pytz
@@ -178,6 +179,22 @@ class BaseIngestor:
             notes=notes
         )
 
+    def _add_measurement_progress(self, progress_name, writer):
+        """Add progress with the counts of MeasurementBulkWriter.
+
+        :param progress_name: name of the progress
+        :type progress_name: str
+        :param writer: writer of the measurements
+        :type writer: MeasurementBulkWriter
+        """
+        progress = self._add_progress(
+            progress_name, notes=json.dumps(writer.counts)
+        )
+        progress.row_count = writer.inserted + writer.updated
+        progress.status = IngestorSessionStatus.SUCCESS
+        progress.save()
+        return progress
+
     def _init_s3(self):
         """Initialize S3 variables for this ingestor."""
         if self.s3 is None:
@@ -290,6 +307,8 @@ class BaseZarrIngestor(BaseIngestor):
             for source_cache in source_caches:
                 source_cache.expired_on = timezone.now()
                 source_cache.save()
+        # API result cache is built from the old data
+        self.datasource_file.dataset.invalidate_cache()
 
     def _find_chunk_slices(
             self, arr_length: int, chunk_size: int) -> List:
@@ -14,6 +14,9 @@ import s3fs
 import traceback
 import numpy as np
 import pandas as pd
+import xarray as xr
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
 from xarray.core.dataset import Dataset as xrDataset
 from django.utils import timezone
 
@@ -141,9 +144,20 @@ class CBAMIngestor(BaseIngestor):
     """Ingestor for CBAM Historical Data."""
 
     DEFAULT_FORMAT = DatasetStore.ZARR
+    DATE_CHUNKSIZE = 3 * 30  # 3 months
+    LAT_LON_CHUNKSIZE = 300
 
     def __init__(self, session: IngestorSession, working_dir: str = '/tmp'):
-        """Initialize CBAMIngestor."""
+        """Initialize CBAMIngestor.
+
+        Available config in session additional_config:
+        use_batch: write consecutive sources per zarr chunk,
+            defaults to False
+        batch_size: max number of sources in a batch,
+            defaults to DATE_CHUNKSIZE
+        batch_num_threads: number of threads to read the sources,
+            defaults to 4
+        """
         super().__init__(session, working_dir)
         self.dataset = self._init_dataset()
 
@@ -173,6 +187,10 @@ class CBAMIngestor(BaseIngestor):
         self.reindex_tolerance = 0.001
         self.existing_dates = None
 
+        # batch ingestion config
+        self.use_batch = self.get_config('use_batch', False)
+        self.batch_size = self.get_config('batch_size', self.DATE_CHUNKSIZE)
+        self.batch_num_threads = self.get_config('batch_num_threads', 4)
 
     def _init_dataset(self) -> Dataset:
         """Fetch dataset for this ingestor.
@@ -201,16 +219,17 @@ class CBAMIngestor(BaseIngestor):
         np_date = np.datetime64(f'{date.isoformat()}')
         return np_date in self.existing_dates
 
-    def store_as_zarr(self, dataset: xrDataset, date: datetime.date):
-        """Store dataset from NetCDF into CBAM Zarr file.
-
-        if zarr doesn't exist, 'w' mode will be used, otherwise
-        it's going to use 'a' mode with append_dim date.
+    def _prepare_dataset(
+        self, dataset: xrDataset, date: datetime.date
+    ) -> xrDataset:
+        """Assign the date and reindex dataset from NetCDF to GAP grid.
 
-        :param dataset: Dataset to be added
+        :param dataset: Dataset from NetCDF
         :type dataset: xrDataset
         :param date: Date of a dataset
         :type date: datetime.date
+        :return: Dataset with date dimension in GAP grid
+        :rtype: xrDataset
         """
         new_date = pd.date_range(f'{date.isoformat()}', periods=1)
         dataset = dataset.assign_coords(date=new_date)
@@ -228,11 +247,22 @@ class CBAMIngestor(BaseIngestor):
             min_lon, self.lon_metadata['max'] + self.lon_metadata['inc'],
             self.lon_metadata['inc']
         )
-        expanded_ds = dataset.reindex(
+        return dataset.reindex(
             lat=new_lat, lon=new_lon, method='nearest',
             tolerance=self.reindex_tolerance
         )
 
+    def _write_zarr(self, dataset: xrDataset, date: datetime.date):
+        """Write dataset into CBAM Zarr file.
+
+        if zarr doesn't exist, 'w' mode will be used, otherwise
+        it's going to use 'a' mode with append_dim date.
+
+        :param dataset: Dataset in GAP grid
+        :type dataset: xrDataset
+        :param date: First date of the dataset
+        :type date: datetime.date
+        """
         # generate the zarr_url
         zarr_url = (
             BaseZarrReader.get_zarr_base_url(self.s3) +
@@ -240,15 +270,17 @@ class CBAMIngestor(BaseIngestor):
         )
 
         # create chunks for data variables
-        date_chunksize = 3 * 30  # 3 months
         encoding = {
             'date': {
                 'units': f'days since {date.isoformat()}',
-                'chunks': date_chunksize
+                'chunks': self.DATE_CHUNKSIZE
             }
         }
-        chunks = (date_chunksize, 300, 300)
-        for var_name, da in expanded_ds.data_vars.items():
+        chunks = (
+            self.DATE_CHUNKSIZE, self.LAT_LON_CHUNKSIZE,
+            self.LAT_LON_CHUNKSIZE
+        )
+        for var_name, da in dataset.data_vars.items():
             encoding[var_name] = {
                 'chunks': chunks
             }
@@ -256,18 +288,126 @@ class CBAMIngestor(BaseIngestor):
         # store to zarr
         if self.created:
             self.created = False
-            x = expanded_ds.to_zarr(
+            x = dataset.to_zarr(
                 zarr_url, mode='w', consolidated=True,
                 storage_options=self.s3_options, encoding=encoding,
                 compute=False
             )
         else:
-            x = expanded_ds.to_zarr(
+            x = dataset.to_zarr(
                 zarr_url, mode='a-', append_dim='date', consolidated=True,
                 storage_options=self.s3_options, compute=False
             )
         execute_dask_compute(x)
 
+    def store_as_zarr(self, dataset: xrDataset, date: datetime.date):
+        """Store dataset from NetCDF into CBAM Zarr file.
+
+        :param dataset: Dataset to be added
+        :type dataset: xrDataset
+        :param date: Date of a dataset
+        :type date: datetime.date
+        """
+        expanded_ds = self._prepare_dataset(dataset, date)
+        self._write_zarr(expanded_ds, date)
+
+    def store_batch_as_zarr(
+        self, datasets: List[Tuple[xrDataset, datetime.date]]
+    ):
+        """Store consecutive datasets from NetCDF into CBAM Zarr file.
+
+        The datasets are reindexed concurrently, then concatenated
+        along date and written in one pass. Each date chunk of the zarr
+        is written once when the batch is aligned with the chunks.
+
+        :param datasets: List of dataset and its date, sorted by date
+        :type datasets: List[Tuple[xrDataset, datetime.date]]
+        """
+        with ThreadPoolExecutor(
+            max_workers=self.batch_num_threads
+        ) as executor:
+            expanded_ds_list = list(
+                executor.map(
+                    lambda item: self._prepare_dataset(*item), datasets
+                )
+            )
+        batch_ds = xr.concat(expanded_ds_list, dim='date').chunk({
+            'date': -1,
+            'lat': self.LAT_LON_CHUNKSIZE,
+            'lon': self.LAT_LON_CHUNKSIZE
+        })
+        self._write_zarr(batch_ds, datasets[0][1])
+
+    def _get_batches(self, sources: list, existing_count: int) -> List[list]:
+        """Split sources into batches aligned with zarr date chunks.
+
+        :param sources: Sources that are not in the zarr, sorted by date
+        :type sources: list
+        :param existing_count: Number of dates in the zarr
+        :type existing_count: int
+        :return: List of batch of sources
+        :rtype: List[list]
+        """
+        batches = []
+        idx = 0
+        offset = existing_count
+        while idx < len(sources):
+            # fill the remaining of current date chunk
+            size = min(
+                self.DATE_CHUNKSIZE - (offset % self.DATE_CHUNKSIZE),
+                self.batch_size
+            )
+            batches.append(sources[idx:idx + size])
+            idx += size
+            offset += size
+        return batches
+
+    def _run_batch(self, sources, source_reader: CBAMNetCDFReader):
+        """Process CBAM NetCDF Files in batches of zarr date chunk.
+
+        :param sources: NetCDF DataSourceFile, sorted by date
+        :type sources: QuerySet
+        :param source_reader: Reader for the NetCDF files
+        :type source_reader: CBAMNetCDFReader
+        """
+        sources = [
+            source for source in sources
+            if not self.is_date_in_zarr(source.start_date_time.date())
+        ]
+        existing_count = (
+            0 if self.created or self.existing_dates is None else
+            len(self.existing_dates)
+        )
+        for batch in self._get_batches(sources, existing_count):
+            # check if cancelled
+            if self.is_cancelled():
+                break
+
+            start_date = batch[0].start_date_time.date()
+            end_date = batch[-1].start_date_time.date()
+            if self.metadata['start_date'] is None:
+                self.metadata['start_date'] = start_date
+            progress = IngestorSessionProgress.objects.create(
+                session=self.session,
+                filename=f'{start_date.isoformat()} - {end_date.isoformat()}',
+                row_count=0
+            )
+
+            # merge source_ds to target zarr
+            self.store_batch_as_zarr([
+                (
+                    source_reader.open_dataset(source),
+                    source.start_date_time.date()
+                ) for source in batch
+            ])
+
+            # update progress
+            self.metadata['total_processed'] += len(batch)
+            self.metadata['end_date'] = end_date
+            progress.row_count = len(batch)
+            progress.status = IngestorSessionStatus.SUCCESS
+            progress.save()
+
     def _run(self):
         """Process CBAM NetCDF Files into GAP Zarr file."""
         self.metadata = {
@@ -291,6 +431,10 @@ class CBAMIngestor(BaseIngestor):
         # Initialize NetCDFReader
         source_reader = CBAMNetCDFReader(self.dataset, [], None, None, None)
         source_reader.setup_reader()
+        if self.use_batch:
+            self._run_batch(sources, source_reader)
+            return
+
         total_monthyear = 0
         progress = None
         curr_monthyear = None
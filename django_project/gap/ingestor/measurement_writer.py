@@ -0,0 +1,261 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP.
+
+.. note:: Bulk writer of station measurements.
+"""
+
+import io
+import csv
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from gap.models import Provider, Station, StationHistory, Measurement
+
+
+class MeasurementBulkWriter:
+    """Write measurements in batches with COPY and INSERT ON CONFLICT.
+
+    Rows are staged in a temporary table with COPY FROM STDIN,
+    then merged into the measurement table in one statement.
+    When update_existing is True, existing measurements are updated
+    like update_or_create, otherwise they are kept like get_or_create.
+    Duplicate rows in a batch are merged into one row:
+    the last one when updating, the first one otherwise.
+    """
+
+    DEFAULT_BATCH_SIZE = 50000
+    STAGING_TABLE = 'tmp_measurement_staging'
+    COLUMNS = [
+        'station_id', 'dataset_attribute_id', 'date_time', 'value',
+        'station_history_id'
+    ]
+
+    def __init__(self, update_existing=True, batch_size=DEFAULT_BATCH_SIZE):
+        """Initialize MeasurementBulkWriter class.
+
+        :param update_existing: update value of existing measurements,
+            defaults to True
+        :type update_existing: bool, optional
+        :param batch_size: number of rows in a COPY batch
+        :type batch_size: int, optional
+        """
+        self.update_existing = update_existing
+        self.batch_size = batch_size
+        self.inserted = 0
+        self.updated = 0
+        self._reset_buffer()
+
+    def _reset_buffer(self):
+        """Clear the rows of current batch."""
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._row_count = 0
+
+    @property
+    def counts(self) -> dict:
+        """Return inserted and updated counts of the written batches."""
+        return {
+            'inserted': self.inserted,
+            'updated': self.updated
+        }
+
+    def add(
+        self, station_id: int, dataset_attribute_id: int, date_time,
+        value: float, station_history_id: int = None
+    ):
+        """Add a measurement, the batch is written when it is full.
+
+        :param station_id: id of the station
+        :type station_id: int
+        :param dataset_attribute_id: id of the dataset attribute
+        :type dataset_attribute_id: int
+        :param date_time: time of the measurement, datetime or ISO string
+        :type date_time: datetime or str
+        :param value: value of the measurement
+        :type value: float
+        :param station_history_id: id of the station history,
+            defaults to None
+        :type station_history_id: int, optional
+        """
+        if isinstance(date_time, str):
+            date_time = parse_datetime(date_time)
+        if timezone.is_naive(date_time):
+            date_time = timezone.make_aware(
+                date_time, timezone.get_default_timezone()
+            )
+        self._writer.writerow([
+            station_id, dataset_attribute_id, date_time.isoformat(),
+            float(value), station_history_id
+        ])
+        self._row_count += 1
+        if self._row_count >= self.batch_size:
+            self.flush()
+
+    def _get_merge_sql(self) -> str:
+        """Get SQL that merges staged rows into the measurement table."""
+        table = Measurement._meta.db_table
+        columns = ', '.join(self.COLUMNS)
+        order = 'DESC' if self.update_existing else 'ASC'
+        conflict = 'DO NOTHING'
+        if self.update_existing:
+            # skip unchanged rows, so they are not rewritten
+            conflict = (
+                'DO UPDATE SET value = EXCLUDED.value, '
+                'station_history_id = EXCLUDED.station_history_id '
+                f'WHERE {table}.value IS DISTINCT FROM EXCLUDED.value OR '
+                f'{table}.station_history_id IS DISTINCT FROM '
+                'EXCLUDED.station_history_id'
+            )
+        return (
+            f"""
+            WITH merged AS (
+                INSERT INTO {table} ({columns})
+                SELECT DISTINCT ON (
+                    station_id, dataset_attribute_id, date_time
+                ) {columns}
+                FROM {self.STAGING_TABLE}
+                ORDER BY station_id, dataset_attribute_id, date_time,
+                seq {order}
+                ON CONFLICT (station_id, dataset_attribute_id, date_time)
+                {conflict}
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT
+                COUNT(*) FILTER (WHERE inserted),
+                COUNT(*) FILTER (WHERE NOT inserted)
+            FROM merged
+            """
+        )
+
+    def flush(self) -> Tuple[int, int]:
+        """Write rows of current batch to the database.
+
+        :return: inserted and updated count of the batch
+        :rtype: Tuple[int, int]
+        """
+        if self._row_count == 0:
+            return 0, 0
+
+        self._buffer.seek(0)
+        with transaction.atomic(), connection.cursor() as cursor:
+            # temporary table lives until the connection is closed
+            cursor.execute(
+                f"""
+                CREATE TEMPORARY TABLE IF NOT EXISTS {self.STAGING_TABLE} (
+                    seq BIGSERIAL,
+                    station_id BIGINT,
+                    dataset_attribute_id BIGINT,
+                    date_time TIMESTAMPTZ,
+                    value DOUBLE PRECISION,
+                    station_history_id BIGINT
+                )
+                """
+            )
+            cursor.execute(f'TRUNCATE {self.STAGING_TABLE}')
+            cursor.copy_expert(
+                f'COPY {self.STAGING_TABLE} ({", ".join(self.COLUMNS)}) '
+                'FROM STDIN WITH (FORMAT csv)',
+                self._buffer
+            )
+            cursor.execute(self._get_merge_sql())
+            inserted, updated = cursor.fetchone()
+
+        self._reset_buffer()
+        self.inserted += inserted
+        self.updated += updated
+        return inserted, updated
+
+    def __enter__(self):
+        """Return the writer."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Write remaining rows when there is no error."""
+        if exc_type is None:
+            self.flush()
+
+
+def bulk_upsert_stations(
+    provider: Provider, stations: List[Station], update_fields=None
+) -> Dict[str, Station]:
+    """Create stations of a provider in one query.
+
+    Existing stations are kept like get_or_create, or updated
+    with update_fields like update_or_create.
+    :param provider: provider of the stations
+    :type provider: Provider
+    :param stations: List of unsaved station
+    :type stations: List[Station]
+    :param update_fields: fields to be updated, defaults to None
+    :type update_fields: List[str], optional
+    :return: Dictionary of station by code
+    :rtype: Dict[str, Station]
+    """
+    unique_stations = {}
+    for station in stations:
+        station.provider = provider
+        if update_fields:
+            unique_stations[station.code] = station
+        else:
+            unique_stations.setdefault(station.code, station)
+    if not unique_stations:
+        return {}
+
+    if update_fields:
+        Station.objects.bulk_create(
+            list(unique_stations.values()),
+            update_conflicts=True,
+            unique_fields=['code', 'provider'],
+            update_fields=update_fields
+        )
+    else:
+        Station.objects.bulk_create(
+            list(unique_stations.values()), ignore_conflicts=True
+        )
+    return {
+        station.code: station for station in Station.objects.filter(
+            provider=provider,
+            code__in=list(unique_stations.keys())
+        )
+    }
+
+
+def bulk_upsert_station_histories(
+    histories: List[StationHistory]
+) -> Dict[Tuple[int, datetime], int]:
+    """Create or update station histories in one query.
+
+    Geometry and altitude of existing histories are updated
+    like update_or_create.
+    :param histories: List of unsaved station history
+    :type histories: List[StationHistory]
+    :return: Dictionary of history id by station id and date_time
+    :rtype: Dict[Tuple[int, datetime], int]
+    """
+    unique_histories = {
+        (history.station_id, history.date_time): history
+        for history in histories
+    }
+    if not unique_histories:
+        return {}
+
+    StationHistory.objects.bulk_create(
+        list(unique_histories.values()),
+        update_conflicts=True,
+        unique_fields=['station', 'date_time'],
+        update_fields=['geometry', 'altitude']
+    )
+    rows = StationHistory.objects.filter(
+        station_id__in={key[0] for key in unique_histories.keys()},
+        date_time__in={key[1] for key in unique_histories.keys()}
+    ).values_list('station_id', 'date_time', 'id')
+    return {
+        (station_id, date_time): _id
+        for station_id, date_time, _id in rows
+        if (station_id, date_time) in unique_histories
+    }
@@ -24,6 +24,10 @@ from gap.models import (
     Measurement, Dataset, DatasetType, DatasetAttribute
 )
 from gap.ingestor.base import BaseIngestor
+from gap.ingestor.measurement_writer import (
+    MeasurementBulkWriter,
+    bulk_upsert_stations
+)
 
 
 logger = logging.getLogger(__name__)
@@ -111,8 +115,19 @@ class TahmoIngestor(BaseIngestor):
                             filename=filename,
                             row_count=len(rows)  # noqa
                         )
+                        existing_codes = set(
+                            Station.objects.filter(
+                                provider=self.provider,
+                                code__in=[
+                                    data.get('station code') for data in rows
+                                ]
+                            ).values_list('code', flat=True)
+                        )
+                        stations = []
                         for data in rows:
                             try:
+                                if data['station code'] in existing_codes:
+                                    continue
                                 point = Point(
                                     x=float(data['longitude']),
                                     y=float(data['latitude']),
@@ -124,15 +139,14 @@ class TahmoIngestor(BaseIngestor):
                                     )[0]
                                 except IndexError:
                                     country = None
-                                Station.objects.get_or_create(
-                                    code=data['station code'],
-                                    provider=self.provider,
-                                    defaults={
-                                        'name': data['name'],
-                                        'geometry': point,
-                                        'country': country,
-                                        'station_type': self.station_type,
-                                    }
+                                stations.append(
+                                    Station(
+                                        code=data['station code'],
+                                        name=data['name'],
+                                        geometry=point,
+                                        country=country,
+                                        station_type=self.station_type,
+                                    )
                                 )
                             except KeyError as e:
                                 raise Exception(
@@ -142,6 +156,7 @@ class TahmoIngestor(BaseIngestor):
                                         'error': f'{e}'
                                     })
                                 )
+                        bulk_upsert_stations(self.provider, stations)
                         progress.status = IngestorSessionStatus.SUCCESS
                         progress.save()
                 except UnicodeDecodeError:
@@ -166,7 +181,7 @@ class TahmoIngestor(BaseIngestor):
                         filename=filename,
                         row_count=len(rows)  # noqa
                     )
-                    measurements = []
+                    writer = MeasurementBulkWriter(update_existing=False)
                     for data in rows:
                         date = data['Timestamp']  # noqa
                         if not date:
@@ -224,13 +239,9 @@ class TahmoIngestor(BaseIngestor):
                                     continue
 
                                 # Save the measurements
-                                measurements.append(
-                                    Measurement(
-                                        station_id=station.id,
-                                        dataset_attribute=attr,
-                                        date_time=date_time,
-                                        value=float(value)
-                                    )
+                                writer.add(
+                                    station.id, attr.id, date_time,
+                                    float(value)
                                 )
                             except (KeyError, ValueError) as e:
                                 raise Exception(
@@ -240,10 +251,10 @@ class TahmoIngestor(BaseIngestor):
                                         'error': f'{e}'
                                     })
                                 )
-                    Measurement.objects.bulk_create(
-                        measurements, ignore_conflicts=True
-                    )
+                    writer.flush()
                     progress.status = IngestorSessionStatus.SUCCESS
+                    if not progress.notes:
+                        progress.notes = json.dumps(writer.counts)
                     progress.save()
                 except Station.DoesNotExist:
                     pass
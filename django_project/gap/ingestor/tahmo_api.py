@@ -15,6 +15,10 @@ from requests.auth import HTTPBasicAuth
 
 from gap.ingestor.base import BaseIngestor
 from gap.ingestor.exceptions import EnvIsNotSetException
+from gap.ingestor.measurement_writer import (
+    MeasurementBulkWriter,
+    bulk_upsert_stations
+)
 from gap.models import (
     Country, Provider, StationType, IngestorSession, Dataset,
     DatasetType, DatasetAttribute, Station,
@@ -143,21 +147,35 @@ class TahmoAPIIngestor(BaseIngestor):
             return first_measurement.date_time
         return timezone.now() - timedelta(days=365)
 
-    def run(self):
-        """Run the ingestor."""
-        api = TahmoAPI()
-        stations = api.stations
-        for station in stations:
-            """Save station data."""
+    def _save_stations(self, api_stations: list) -> list:
+        """Create new stations in one query.
+
+        :param api_stations: stations from Tahmo API
+        :type api_stations: list
+        :return: List of station that has location
+        :rtype: List[Station]
+        """
+        stations = {
+            station.code: station for station in Station.objects.filter(
+                provider=self.provider,
+                code__in=[data.get('code') for data in api_stations]
+            )
+        }
+        codes = []
+        new_stations = []
+        for data in api_stations:
             # Skip device that does not have location
             try:
                 point = Point(
-                    x=station['location']['longitude'],
-                    y=station['location']['latitude'],
+                    x=data['location']['longitude'],
+                    y=data['location']['latitude'],
                     srid=4326
                 )
             except (KeyError, IndexError):
                 continue
+            codes.append(data['code'])
+            if data['code'] in stations:
+                continue
 
             # Get country
             try:
@@ -167,21 +185,27 @@ class TahmoAPIIngestor(BaseIngestor):
             except IndexError:
                 country = None
 
-            # Create station
-            station, _ = Station.objects.get_or_create(
-                code=station['code'],
-                provider=self.provider,
-                defaults={
-                    'name': station['location']['name'],
-                    'geometry': point,
-                    'country': country,
-                    'station_type': self.station_type,
-                    'metadata': {
-                        'type': station['location']['type'],
-                        'created': station['created']
+            new_stations.append(
+                Station(
+                    code=data['code'],
+                    name=data['location']['name'],
+                    geometry=point,
+                    country=country,
+                    station_type=self.station_type,
+                    metadata={
+                        'type': data['location']['type'],
+                        'created': data['created']
                     }
-                }
+                )
             )
+        stations.update(bulk_upsert_stations(self.provider, new_stations))
+        return [stations[code] for code in codes]
+
+    def run(self):
+        """Run the ingestor."""
+        api = TahmoAPI()
+        writer = MeasurementBulkWriter(update_existing=False)
+        for station in self._save_stations(api.stations):
             # Save measurements
             end_date = timezone.now()
             min_time = None
@@ -204,13 +228,9 @@ class TahmoAPIIngestor(BaseIngestor):
                             min_time, max_time = find_max_min_epoch_dates(
                                 min_time, max_time, epoch
                             )
-                            Measurement.objects.get_or_create(
-                                station=station,
-                                dataset_attribute=dataset_attribute,
-                                date_time=measurement[0],
-                                defaults={
-                                    'value': measurement[4]
-                                }
+                            writer.add(
+                                station.id, dataset_attribute.id,
+                                measurement[0], measurement[4]
                             )
                     except KeyError:
                         pass
@@ -225,3 +245,5 @@ class TahmoAPIIngestor(BaseIngestor):
                 self.max_ingested_date = datetime.fromtimestamp(
                     max_time, tz=timezone.utc
                 )
+        writer.flush()
+        self._add_measurement_progress('measurements', writer)
@@ -119,9 +119,22 @@ class TioShortTermDuckDBIngestor(TioShortTermIngestor):
         )
 
     def _fetch_data(self, conn, grid_ids):
+        """Fetch weather rows for the given grid ids.
+
+        Besides the weather columns, the result contains
+        forecast_day_idx (dense rank of date per grid, starting from 0)
+        and time_idx (hour of the time column, 0-23).
+        """
+        if len(grid_ids) == 0:
+            return None
         df = conn.sql(
             f"""
-            SELECT * FROM weather
+            SELECT *,
+                DENSE_RANK() OVER (
+                    PARTITION BY grid_id ORDER BY date
+                ) - 1 AS forecast_day_idx,
+                hour(time) AS time_idx
+            FROM weather
             WHERE grid_id IN {grid_ids}
             ORDER BY grid_id asc, date, time asc
             """
@@ -163,8 +176,11 @@ class TioShortTermDuckDBIngestor(TioShortTermIngestor):
         for variable in self.variables:
             new_data[variable] = np.full(data_shape, np.nan, dtype='f8')
 
+        # map each lat/lon cell to its grid id
         precision = self.get_config('geohash_precision', 8)
-        grid_ids = {}
+        cell_grid_ids = []
+        cell_lat_indices = []
+        cell_lon_indices = []
         for idx_lat, lat in enumerate(lat_arr):
             for idx_lon, lon in enumerate(lon_arr):
                 # find grid id by geohash of lat and lon
@@ -175,10 +191,12 @@ class TioShortTermDuckDBIngestor(TioShortTermIngestor):
                     warnings['missing_hash'] += 1
                     continue
 
-                grid_ids[f'{idx_lat}_{idx_lon}'] = grids[grid_hash]
+                cell_grid_ids.append(grids[grid_hash])
+                cell_lat_indices.append(idx_lat)
+                cell_lon_indices.append(idx_lon)
 
         # load weather by grid_ids
-        weather_df = self._fetch_data(conn, list(grid_ids.values()))
+        weather_df = self._fetch_data(conn, list(set(cell_grid_ids)))
 
         if weather_df is None:
             logger.warning(
@@ -187,68 +205,54 @@ class TioShortTermDuckDBIngestor(TioShortTermIngestor):
             )
             return warnings, count
 
-        for idx_lat, lat in enumerate(lat_arr):
-            for idx_lon, lon in enumerate(lon_arr):
-                grid_key = f'{idx_lat}_{idx_lon}'
-                if grid_key not in grid_ids:
-                    # skip because missing_hash
-                    continue
-
-                grid_id = grid_ids[grid_key]
-                df = (
-                    weather_df[weather_df["grid_id"] == grid_id].sort_values(
-                        by="date"
-                    )
-                )
-                # open the grid json file using grid id from grid_hash
-                if df.shape[0] == 0:
-                    warnings['missing_json'] += 1
-                    continue
-
-                # validate total days
-                row_count = df.shape[0]
-                if self.TIME_STEP == DatasetTimeStep.HOURLY:
-                    row_count = len(df['date'].unique())
-                assert (
-                    row_count ==
-                    self.default_chunks['forecast_day_idx']
-                )
-
-                # iterate for each item in data
-                forecast_day_idx = 0
-                current_dt = None
-                for index, item in df.iterrows():
-                    if current_dt is None:
-                        # initialize first date
-                        current_dt = item['date']
-
-                    time_idx = None
-                    if (
-                        self.TIME_STEP == DatasetTimeStep.HOURLY and
-                        item['time'] is not None
-                    ):
-                        # Convert to index 0–23
-                        time_idx = item['time'].hour
-
-                    for var in self.variables:
-                        if var not in df.columns:
-                            continue
-                        # assign the variable value into new data
-                        if self.TIME_STEP == DatasetTimeStep.HOURLY:
-                            if time_idx is not None:
-                                new_data[var][
-                                    0, forecast_day_idx, time_idx,
-                                    idx_lat, idx_lon
-                                ] = item[var]
-                        else:
-                            new_data[var][
-                                0, forecast_day_idx, idx_lat, idx_lon] = (
-                                    item[var]
-                            )
-                    if current_dt != item['date']:
-                        forecast_day_idx += 1
-                        current_dt = item['date']
-                count += 1
+        # validate total days for each grid
+        grouped = weather_df.groupby('grid_id')['date']
+        if self.TIME_STEP == DatasetTimeStep.HOURLY:
+            row_counts = grouped.nunique()
+        else:
+            row_counts = grouped.size()
+        assert (
+            row_counts == self.default_chunks['forecast_day_idx']
+        ).all()
+
+        cells_df = pd.DataFrame({
+            'grid_id': np.array(cell_grid_ids, dtype='int64'),
+            'lat_idx': np.array(cell_lat_indices, dtype='int64'),
+            'lon_idx': np.array(cell_lon_indices, dtype='int64')
+        })
+        has_data = cells_df['grid_id'].isin(weather_df['grid_id'])
+        # grid without any row in the weather table
+        warnings['missing_json'] += int((~has_data).sum())
+        count = int(has_data.sum())
+
+        # scatter all rows into the dense arrays in one step
+        merged_df = cells_df[has_data].merge(
+            weather_df, on='grid_id', how='inner'
+        )
+        if self.TIME_STEP == DatasetTimeStep.HOURLY:
+            merged_df = merged_df[merged_df['time_idx'].notna()]
+            index = (
+                0,
+                merged_df['forecast_day_idx'].to_numpy(dtype='int64'),
+                merged_df['time_idx'].to_numpy(dtype='int64'),
+                merged_df['lat_idx'].to_numpy(),
+                merged_df['lon_idx'].to_numpy()
+            )
+        else:
+            index = (
+                0,
+                merged_df['forecast_day_idx'].to_numpy(dtype='int64'),
+                merged_df['lat_idx'].to_numpy(),
+                merged_df['lon_idx'].to_numpy()
+            )
+        for var in self.variables:
+            if var not in merged_df.columns:
+                continue
+            # assign the variable value into new data
+            new_data[var][index] = merged_df[var].to_numpy(
+                dtype='f8', na_value=np.nan
+            )
+        del merged_df
 
         # update new data to zarr using region
         self._update_by_region(forecast_date, lat_arr, lon_arr, new_data)
@@ -16,9 +16,14 @@ from requests.auth import HTTPBasicAuth
 
 from gap.ingestor.base import BaseIngestor
 from gap.ingestor.exceptions import EnvIsNotSetException
+from gap.ingestor.measurement_writer import (
+    MeasurementBulkWriter,
+    bulk_upsert_stations,
+    bulk_upsert_station_histories
+)
 from gap.models import (
     Provider, StationType, IngestorSession, Dataset,
-    DatasetType, Station, StationHistory, Measurement,
+    DatasetType, Station, StationHistory,
     DatasetStore
 )
 from core.utils.date import find_max_min_epoch_dates
@@ -130,9 +135,90 @@ class WindBorneSystemsIngestor(BaseIngestor):
         mission_ids.extend([mission['id'] for mission in api.missions()])
         return list(set(mission_ids))
 
+    def _save_observations(self, observations, writer, min_time, max_time):
+        """Save stations, histories and measurements of observations.
+
+        Stations and histories are updated in one query each,
+        the latest observation of a station updates the station.
+        :param observations: observations from the API
+        :type observations: list
+        :param writer: writer of the measurements
+        :type writer: MeasurementBulkWriter
+        :param min_time: current min epoch of ingested data
+        :type min_time: int
+        :param max_time: current max epoch of ingested data
+        :type max_time: int
+        :return: min and max epoch of ingested data
+        :rtype: Tuple[int, int]
+        """
+        stations = []
+        for observation in observations:
+            stations.append(
+                Station(
+                    code=observation['mission_id'],
+                    name=observation['mission_name'],
+                    geometry=Point(
+                        x=observation['longitude'],
+                        y=observation['latitude'],
+                        srid=4326
+                    ),
+                    altitude=observation['altitude'],
+                    station_type=self.station_type
+                )
+            )
+        stations = bulk_upsert_stations(
+            self.provider, stations,
+            update_fields=['name', 'geometry', 'altitude']
+        )
+
+        histories = []
+        date_times = []
+        for observation in observations:
+            # Get date time
+            date_time = datetime.fromtimestamp(
+                observation['timestamp']
+            )
+            min_time, max_time = find_max_min_epoch_dates(
+                min_time, max_time, observation['timestamp']
+            )
+            date_time = timezone.make_aware(
+                date_time, timezone.get_default_timezone()
+            )
+            date_times.append(date_time)
+            histories.append(
+                StationHistory(
+                    station=stations[observation['mission_id']],
+                    date_time=date_time,
+                    geometry=Point(
+                        x=observation['longitude'],
+                        y=observation['latitude'],
+                        srid=4326
+                    ),
+                    altitude=observation['altitude']
+                )
+            )
+        history_ids = bulk_upsert_station_histories(histories)
+
+        # Save the measurements
+        for observation, date_time in zip(observations, date_times):
+            station = stations[observation['mission_id']]
+            history_id = history_ids[(station.id, date_time)]
+            for variable, attribute in self.attributes.items():
+                try:
+                    value = observation[variable]
+                    if value is not None:
+                        writer.add(
+                            station.id, attribute.id, date_time, value,
+                            station_history_id=history_id
+                        )
+                except KeyError:
+                    pass
+        return min_time, max_time
+
     def run(self):
         """Run the ingestor."""
         api = WindBorneSystemsAPI()
+        writer = MeasurementBulkWriter()
         additional_config = self.session.additional_config
         global_since = additional_config.get('since', None)
         min_time = None
@@ -157,65 +243,18 @@ class WindBorneSystemsIngestor(BaseIngestor):
 
                 # Process if it has observations
                 if len(observations):
-                    for observation in observations:
-                        # Get date time
-                        date_time = datetime.fromtimestamp(
-                            observation['timestamp']
-                        )
-                        min_time, max_time = find_max_min_epoch_dates(
-                            min_time, max_time, observation['timestamp']
-                        )
-                        date_time = timezone.make_aware(
-                            date_time, timezone.get_default_timezone()
-                        )
-
-                        # Points
-                        point = Point(
-                            x=observation['longitude'],
-                            y=observation['latitude'],
-                            srid=4326
-                        )
-                        station, _ = Station.objects.update_or_create(
-                            provider=self.provider,
-                            station_type=self.station_type,
-                            code=observation['mission_id'],
-                            defaults={
-                                'name': observation['mission_name'],
-                                'geometry': point,
-                                'altitude': observation['altitude'],
-                            }
-                        )
-                        history, _ = StationHistory.objects.update_or_create(
-                            station=station,
-                            date_time=date_time,
-                            defaults={
-                                'geometry': point,
-                                'altitude': observation['altitude'],
-                            }
-                        )
-
-                        # Save the measurements
-                        for variable, attribute in self.attributes.items():
-                            try:
-                                value = observation[variable]
-                                if value is not None:
-                                    Measurement.objects.update_or_create(
-                                        station=station,
-                                        dataset_attribute=attribute,
-                                        date_time=date_time,
-                                        defaults={
-                                            'value': observation[variable],
-                                            'station_history': history
-                                        }
-                                    )
-                            except KeyError:
-                                pass
+                    min_time, max_time = self._save_observations(
+                        observations, writer, min_time, max_time
+                    )
+                    writer.flush()
 
                     # Save last since for mission
                     additional_config[mission_since_key] = since
                     self.session.additional_config = additional_config
                     self.session.save()
 
+        self._add_measurement_progress('measurements', writer)
+
         # update the ingested max and min dates
         if min_time:
             self.min_ingested_date = datetime.fromtimestamp(
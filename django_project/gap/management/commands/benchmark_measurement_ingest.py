@@ -0,0 +1,139 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP.
+
+.. note:: Command to benchmark ingesting station measurements.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from gap.ingestor.measurement_writer import (
+    MeasurementBulkWriter,
+    bulk_upsert_stations
+)
+from gap.models import Dataset, Measurement, Provider, Station, StationType
+
+
+class Command(BaseCommand):
+    """Command to ingest synthetic measurements.
+
+    The bulk writer is compared with get_or_create per value.
+    All rows are rolled back, so the command can be run
+    in any environment.
+    """
+
+    help = 'Benchmark ingesting synthetic measurements in bulk'
+
+    def add_arguments(self, parser):
+        """Add command line arguments."""
+        parser.add_argument(
+            '--dataset', type=str, default='Tahmo Ground Observational',
+            help='Dataset name for the attributes.'
+        )
+        parser.add_argument(
+            '--count', type=int, default=1000000,
+            help='Number of synthetic measurements.'
+        )
+        parser.add_argument(
+            '--stations', type=int, default=100,
+            help='Number of synthetic stations.'
+        )
+        parser.add_argument(
+            '--baseline-count', type=int, default=10000,
+            help='Number of measurements saved with get_or_create.'
+        )
+
+    def _iter_rows(self, stations, attribute_ids, count: int):
+        """Yield hourly synthetic measurements of the stations."""
+        start_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        idx = 0
+        hour = 0
+        while True:
+            date_time = start_date + timedelta(hours=hour)
+            for station in stations:
+                for attribute_id in attribute_ids:
+                    if idx >= count:
+                        return
+                    yield station.id, attribute_id, date_time, idx % 100
+                    idx += 1
+            hour += 1
+
+    def _write(self, rows, update_existing=True) -> tuple:
+        """Write the rows with bulk writer."""
+        start_time = time.time()
+        with MeasurementBulkWriter(update_existing=update_existing) as writer:
+            for station_id, attribute_id, date_time, value in rows:
+                writer.add(station_id, attribute_id, date_time, value)
+        return time.time() - start_time, writer.counts
+
+    def _report(self, title: str, count: int, elapsed_time: float):
+        """Write the result of a step."""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{title}: {count} measurements in {elapsed_time:.2f}s '
+                f'({count / max(elapsed_time, 1e-6):.0f} rows/s)'
+            )
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        dataset = Dataset.objects.get(name=options['dataset'])
+        attribute_ids = list(
+            dataset.datasetattribute_set.values_list('id', flat=True)
+        )
+        count = options['count']
+        baseline_count = options['baseline_count']
+
+        with transaction.atomic():
+            provider = Provider.objects.create(name='Benchmark Provider')
+            station_type = StationType.objects.first()
+            stations = bulk_upsert_stations(provider, [
+                Station(
+                    code=f'benchmark-{idx}', name=f'benchmark-{idx}',
+                    geometry=Point(36 + idx * 0.01, -1, srid=4326),
+                    station_type=station_type
+                ) for idx in range(options['stations'])
+            ])
+            stations = list(stations.values())
+
+            elapsed_time, counts = self._write(
+                self._iter_rows(stations, attribute_ids, count)
+            )
+            self._report(
+                f'Bulk insert {counts}', counts['inserted'], elapsed_time
+            )
+
+            # every value is changed, so all rows are updated
+            elapsed_time, counts = self._write(
+                (row[:3] + (row[3] + 1,)) for row in
+                self._iter_rows(stations, attribute_ids, count)
+            )
+            self._report(
+                f'Bulk update {counts}', counts['updated'], elapsed_time
+            )
+
+            Measurement.objects.filter(station__provider=provider).delete()
+            start_time = time.time()
+            for station_id, attribute_id, date_time, value in (
+                self._iter_rows(stations, attribute_ids, baseline_count)
+            ):
+                Measurement.objects.get_or_create(
+                    station_id=station_id,
+                    dataset_attribute_id=attribute_id,
+                    date_time=date_time,
+                    defaults={
+                        'value': value
+                    }
+                )
+            elapsed_time = time.time() - start_time
+            self._report('get_or_create', baseline_count, elapsed_time)
+            self.stdout.write(
+                f'Estimated get_or_create time for {count} measurements: '
+                f'{elapsed_time * count / max(baseline_count, 1):.0f}s'
+            )
+            transaction.set_rollback(True)
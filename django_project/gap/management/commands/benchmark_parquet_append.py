@@ -0,0 +1,196 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP.
+
+.. note:: Command to benchmark appending daily data to parquet.
+"""
+
+import io
+import os
+import time
+import shutil
+import tempfile
+import contextlib
+from datetime import date, timedelta
+
+import duckdb
+from django.core.management.base import BaseCommand
+
+from gap.models import Dataset, DataSourceFile
+from gap.utils.parquet import ParquetConverter
+
+
+class LocalParquetConverter(ParquetConverter):
+    """ParquetConverter that writes to a local directory."""
+
+    def __init__(
+        self, dataset: Dataset, output_dir: str, bbox, use_fragments
+    ):
+        """Initialize LocalParquetConverter class."""
+        super().__init__(
+            dataset, DataSourceFile(name='benchmark'), mode='a'
+        )
+        self.output_dir = output_dir
+        self.bbox = bbox
+        self.use_fragments = use_fragments
+        self.s3 = {}
+
+    def _get_directory_path(self, data_source: DataSourceFile):
+        return f'{self.output_dir}/'
+
+    def _get_station_bounds(self):
+        return self.bbox
+
+    def _get_connection(self, s3):
+        conn = duckdb.connect(config={'threads': 1})
+        conn.install_extension('spatial')
+        conn.load_extension('spatial')
+        return conn
+
+    def _list_files(self, path: str) -> list:
+        return [
+            (os.path.join(root, name),
+             os.path.getsize(os.path.join(root, name)))
+            for root, _, names in os.walk(path) for name in names
+            if name.endswith('.parquet')
+        ]
+
+    def _delete_files(self, paths: list):
+        for path in paths:
+            os.remove(path)
+
+    def _upload_file(self, local_path: str, path: str):
+        shutil.copy(local_path, path)
+
+
+class Command(BaseCommand):
+    """Command to compare append latency of parquet strategies.
+
+    A year of daily appends is simulated with synthetic stations
+    in a local directory. The 'rewrite' strategy rewrites the year
+    partition on each append, the 'fragment' strategy writes
+    fragment files and runs the compaction after each day.
+    """
+
+    help = 'Benchmark daily appends to parquet with rewrite and fragments'
+
+    def add_arguments(self, parser):
+        """Add command line arguments."""
+        parser.add_argument(
+            '--dataset', type=str, default='Tahmo Ground Observational',
+            help='Dataset name for the attributes and ingestor config.'
+        )
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='Number of daily appends.'
+        )
+        parser.add_argument(
+            '--stations', type=int, default=200,
+            help='Number of synthetic stations.'
+        )
+
+    def _write_day(
+        self, converter: ParquetConverter, day: date, stations: int
+    ) -> str:
+        """Write hourly data of a day like _process_measurements."""
+        tmp_dir = tempfile.mkdtemp(prefix='gap-parquet-')
+        data_path = os.path.join(tmp_dir, 'weather.parquet')
+        attributes = ', '.join(
+            f'random() * 100 AS "{attr}"' for attr in converter.attributes
+        )
+        conn = converter._get_connection(converter.s3)
+        conn.sql(
+            f"""
+            COPY (
+                SELECT
+                TIMESTAMPTZ '{day.isoformat()} 00:00:00+00' +
+                INTERVAL (h) HOUR AS date_time,
+                s AS st_id, {day.year} AS year, {day.month} AS month,
+                {day.day} AS day, {attributes},
+                1000.0::DOUBLE AS altitude, 1 AS country_id,
+                33 + (s % 100) * 0.1 AS loc_x,
+                -4 + (s // 100) * 0.1 AS loc_y,
+                'ST' || s AS st_code, 'KEN' AS iso_a3,
+                ST_AsWKB(ST_Point(loc_x, loc_y)) AS geom
+                FROM range(1, {stations + 1}) t(s), range(24) r(h)
+            ) TO '{data_path}' (FORMAT 'parquet')
+            """
+        )
+        conn.close()
+        return data_path
+
+    def _run_strategy(
+        self, dataset: Dataset, use_fragments, days: int, stations: int
+    ) -> dict:
+        """Append the days and measure the latency."""
+        output_dir = tempfile.mkdtemp(prefix='gap-parquet-benchmark-')
+        bbox = (33, -4, 43, -4 + (stations // 100 + 1) * 0.1)
+        converter = LocalParquetConverter(
+            dataset, output_dir, bbox, use_fragments
+        )
+        s3_path = converter._get_directory_path(converter.data_source)
+        start_date = date(2024, 1, 1)
+        append_times = []
+        compaction_time = 0
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                for idx in range(days):
+                    day = start_date + timedelta(days=idx)
+                    data_path = self._write_day(converter, day, stations)
+                    start_time = time.time()
+                    converter._write_subset(
+                        data_path, s3_path, bbox, day.year,
+                        parquet_exists=idx > 0
+                    )
+                    if idx > 0:
+                        append_times.append(time.time() - start_time)
+                    if use_fragments:
+                        start_time = time.time()
+                        converter.compact()
+                        compaction_time += time.time() - start_time
+
+            conn = duckdb.connect()
+            total_rows = conn.sql(
+                f"""
+                SELECT COUNT(DISTINCT (st_id, date_time))
+                FROM read_parquet('{s3_path}year=*/*.parquet')
+                """
+            ).fetchone()[0]
+            conn.close()
+            total_files = len(converter._list_files(s3_path))
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+        append_times.sort()
+        return {
+            'total': sum(append_times),
+            'mean': sum(append_times) / max(len(append_times), 1),
+            'p95': append_times[int((len(append_times) - 1) * 0.95)],
+            'max': append_times[-1],
+            'compaction': compaction_time,
+            'rows': total_rows,
+            'files': total_files
+        }
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        dataset = Dataset.objects.get(name=options['dataset'])
+        days = options['days']
+        stations = options['stations']
+        for strategy, use_fragments in [
+            ('rewrite', False), ('fragment', True)
+        ]:
+            result = self._run_strategy(
+                dataset, use_fragments, days, stations
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'{strategy}: {days - 1} appends in '
+                    f'{result["total"]:.2f}s, '
+                    f'mean {result["mean"] * 1000:.0f}ms, '
+                    f'p95 {result["p95"] * 1000:.0f}ms, '
+                    f'max {result["max"] * 1000:.0f}ms, '
+                    f'compaction {result["compaction"]:.2f}s, '
+                    f'{result["rows"]} rows in {result["files"]} files'
+                )
+            )
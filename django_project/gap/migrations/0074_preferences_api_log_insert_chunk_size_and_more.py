@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gap', '0073_farmgroup_config_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='preferences',
+            name='api_log_insert_chunk_size',
+            field=models.IntegerField(default=500, help_text='Number of API Request logs in one insert query.'),
+        ),
+        migrations.AddField(
+            model_name='preferences',
+            name='api_log_max_batches',
+            field=models.IntegerField(default=100, help_text='Max number of API Request log batches to be saved in one task run.'),
+        ),
+    ]
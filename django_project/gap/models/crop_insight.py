@@ -8,13 +8,14 @@ import os.path
 import uuid
 import logging
 import re
+import tempfile
 from datetime import date, timedelta, tzinfo, datetime
 from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.gis.db import models
-from django.core.files.base import ContentFile
+from django.core.files.base import File
 from django.core.files.storage import storages
 from django.core.mail import EmailMessage
 from django.utils import timezone
@@ -29,6 +30,7 @@ from gap.models.measurement import DatasetAttribute
 from gap.models.preferences import Preferences
 from gap.models.pest import Pest
 from spw.models import SPWOutput
+from spw.utils.plumber import get_plumber_ports
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -590,6 +592,265 @@ class CropPlanData:
         return output
 
 
+class CropPlanBulkData:
+    """The set-based report model for the Insight Request Report.
+
+    Data of a list of farms is loaded with a query per table,
+    then the output of each farm is same with CropPlanData.data.
+    """
+
+    def __init__(
+            self, generated_date: date, forecast_days: int = 13,
+            forecast_fields: list = None, tamsat_spw_df=None,
+            farm_group: FarmGroup = None
+    ):
+        """Initialize the set-based report model."""
+        from prise.generator import PriseMessageBulkGenerator
+
+        self.generated_date = generated_date
+        self.farm_group = farm_group
+        self.lat_lon_digits = Preferences.lat_lon_decimal_digits()
+
+        # Make default forecast_fields
+        if not forecast_fields:
+            forecast_fields = CropPlanData.forecast_default_fields()
+        self.forecast_fields = forecast_fields
+        self.forecast_days = forecast_days
+
+        # Get config from farm group
+        self.filter_same_tier_1_signal = False
+        if self.farm_group:
+            self.filter_same_tier_1_signal = self.farm_group.get_config(
+                'filter_same_tier_1_signal', False
+            )
+
+        self.pests = list(Pest.objects.all())
+        self.prise_generator = PriseMessageBulkGenerator(
+            self.pests, self.generated_date
+        )
+        self.rainfall_classifications = list(
+            RainfallClassification.objects.order_by('pk')
+        )
+        self.rainfall_types = {}
+        self.spw_outputs = {}
+        self.tamsat_outputs = self._get_tamsat_outputs(tamsat_spw_df)
+
+        # data of loaded farms
+        self.spw_signals = {}
+        self.forecasts = {}
+
+    def _get_tamsat_outputs(self, tamsat_spw_df) -> dict:
+        """Return TAMSAT SPW fields of each farm_unique_id."""
+        if tamsat_spw_df is None:
+            return {}
+
+        # use the first row of each farm
+        df = tamsat_spw_df.drop_duplicates(
+            'farm_unique_id'
+        ).set_index('farm_unique_id')
+        outputs = {farm_unique_id: {} for farm_unique_id in df.index}
+        for field in CropPlanData.tamsat_fields():
+            field_source = field.replace('tamsat_', '')
+            # add underscore, e.g. spw20 to spw_20
+            field_source = re.sub(
+                r'([a-zA-Z]+)(\d+)', r'\1_\2', field_source
+            )
+            if field_source not in df.columns:
+                continue
+            for farm_unique_id, is_plant in (df[field_source] == 1).items():
+                outputs[farm_unique_id][field] = (
+                    'Plant' if is_plant else 'Do Not Plant'
+                )
+        return outputs
+
+    def _get_spw_output(self, signal: str):
+        """Return SPW output messages of a signal."""
+        if signal not in self.spw_outputs:
+            try:
+                spw_output = SPWOutput.get_output_by_farm_group(
+                    signal, self.farm_group
+                )
+                spw_description_sw = ''
+                if self.farm_group.has_desc_sw_field:
+                    spw_description_sw = spw_output.get_description(
+                        language_code='sw'
+                    )
+                self.spw_outputs[signal] = (
+                    spw_output.plant_now_string,
+                    spw_output.get_description(language_code='en'),
+                    spw_description_sw
+                )
+            except SPWOutput.DoesNotExist:
+                self.spw_outputs[signal] = (signal, '', '')
+        return self.spw_outputs[signal]
+
+    def _classify_rainfall(self, value):
+        """Return RainfallClassification of a value."""
+        if value not in self.rainfall_types:
+            self.rainfall_types[value] = None
+            for _class in self.rainfall_classifications:
+                min_valid = (
+                    _class.min_value is not None and
+                    _class.min_value <= value
+                )
+                max_valid = (
+                    _class.max_value is not None and
+                    _class.max_value >= value
+                )
+                if (
+                    (min_valid and max_valid) or
+                    (min_valid and _class.max_value is None) or
+                    (_class.min_value is None and max_valid)
+                ):
+                    self.rainfall_types[value] = _class
+                    break
+        return self.rainfall_types[value]
+
+    def load(self, farms: list):
+        """Load data of the farms.
+
+        :param farms: list of farm
+        :type farms: list
+        """
+        farm_ids = [farm.id for farm in farms]
+
+        # Spw data
+        self.spw_signals = {}
+        for spw in FarmSuitablePlantingWindowSignal.objects.filter(
+            farm_id__in=farm_ids,
+            generated_date=self.generated_date
+        ).order_by('farm_id', 'id'):
+            self.spw_signals.setdefault(spw.farm_id, spw)
+
+        # Forecast
+        forecast_ids = {}
+        for farm_id, forecast_id in FarmShortTermForecast.objects.filter(
+            farm_id__in=farm_ids,
+            forecast_date=self.generated_date
+        ).order_by('farm_id', 'id').values_list('farm_id', 'id'):
+            forecast_ids.setdefault(farm_id, forecast_id)
+        forecast_farms = {
+            forecast_id: farm_id
+            for farm_id, forecast_id in forecast_ids.items()
+        }
+
+        self.forecasts = {}
+        for forecast_id, value_date, var, value in (
+            FarmShortTermForecastData.objects.filter(
+                forecast_id__in=forecast_farms.keys(),
+                dataset_attribute__source__in=self.forecast_fields
+            ).order_by('forecast_id', 'value_date').values_list(
+                'forecast_id', 'value_date', 'dataset_attribute__source',
+                'value'
+            )
+        ):
+            self.forecasts.setdefault(
+                forecast_farms[forecast_id], []
+            ).append((value_date, var, value))
+
+        # Prise message
+        self.prise_generator.load(farm_ids)
+
+    def get_data(self, farm: Farm) -> dict:
+        """Return the data of a loaded farm."""
+        # ---------------------------------------
+        # Spw data
+        spw_top_message = ''
+        spw_description = ''
+        too_wet = ''
+        last_4_days = ''
+        last_2_days = ''
+        today_tomorrow = ''
+        # Swahili version
+        spw_description_sw = ''
+        spw = self.spw_signals.get(farm.id)
+        if spw:
+            # if filter_same_tier_1_signal is True,
+            # then check is_sent_before
+            if self.filter_same_tier_1_signal and spw.is_sent_before:
+                return None
+
+            spw_top_message, spw_description, spw_description_sw = (
+                self._get_spw_output(spw.signal)
+            )
+
+            if spw.too_wet_indicator is not None:
+                too_wet = spw.too_wet_indicator
+            if spw.last_4_days is not None:
+                last_4_days = spw.last_4_days
+            if spw.last_2_days is not None:
+                last_2_days = spw.last_2_days
+            if spw.today_tomorrow is not None:
+                today_tomorrow = spw.today_tomorrow
+
+        # load farm lat lon
+        latitude = ''
+        longitude = ''
+        if farm.geometry:
+            latitude = (
+                round(farm.geometry.y, self.lat_lon_digits) if
+                self.lat_lon_digits != -1 else farm.geometry.y
+            )
+            longitude = (
+                round(farm.geometry.x, self.lat_lon_digits) if
+                self.lat_lon_digits != -1 else farm.geometry.x
+            )
+
+        default_fields = CropPlanData.default_fields()
+        output = {
+            default_fields[0]: farm.unique_id,
+            default_fields[1]: farm.phone_number,
+            default_fields[2]: latitude,
+            default_fields[3]: longitude,
+            default_fields[4]: spw_top_message,
+            default_fields[5]: spw_description,
+            default_fields[6]: too_wet,
+            default_fields[7]: last_4_days,
+            default_fields[8]: last_2_days,
+            default_fields[9]: today_tomorrow,
+            'SPWDescription_sw': spw_description_sw
+        }
+
+        # ----------------------------------------
+        # Short term forecast data
+        for idx in range(self.forecast_days):
+            for field in self.forecast_fields:
+                output[CropPlanData.forecast_key(idx + 1, field)] = ''
+
+        forecasts = self.forecasts.get(farm.id, [])
+        if forecasts:
+            first_date = forecasts[0][0]
+            for value_date, var, value in forecasts:
+                day_n = (value_date - first_date).days + 1
+                output[CropPlanData.forecast_key(day_n, var)] = value
+
+                if (var == 'rainAccumulationSum' and
+                        'rainAccumulationType' in self.forecast_fields):
+                    # we get the rain type
+                    _class = self._classify_rainfall(value)
+                    if _class:
+                        output[
+                            CropPlanData.forecast_key(
+                                day_n, 'rainAccumulationType'
+                            )
+                        ] = _class.name
+
+        # ----------------------------------------
+        # Prise message
+        for pest in self.pests:
+            prise_messages = self.prise_generator.generate(farm.id, pest)
+            for idx, prise_message in enumerate(prise_messages):
+                output[
+                    CropPlanData.prise_message_key(pest, idx + 1)
+                ] = prise_message
+
+        # ----------------------------------------
+        # Tamsat SPW data
+        output.update(self.tamsat_outputs.get(farm.unique_id, {}))
+
+        return output
+
+
 class CropInsightMethod(models.TextChoices):
     """Crop Insight Method Choices."""
 
@@ -626,6 +887,8 @@ class CropInsightRequest(models.Model):
     )
 
     task_names = ['generate_insight_report', 'generate_crop_plan']
+    report_chunk_size = 1000
+    spw_batch_size = 50
 
     @property
     def last_background_task(self) -> BackgroundTask:
@@ -765,23 +1028,70 @@ class CropInsightRequest(models.Model):
 
     def _process_chunk(self, chunk, port):
         from spw.generator.crop_insight import CropInsightFarmGenerator
+        from spw.generator.main import calculate_from_grids
         farms = self.farm_group.farms.select_related('grid').filter(
             grid_id__in=chunk
         )
         print(f'{timezone.now()} Farms in port {port} count {farms.count()}')
-        count = 0
+
+        # SPW is saved to all farms in the grid, so use a farm per grid
+        # that does not have the signal of today yet
+        today = timezone.now().date()
+        generated_farm_ids = set(
+            FarmSuitablePlantingWindowSignal.objects.filter(
+                farm__in=farms,
+                generated_date=today
+            ).values_list('farm_id', flat=True)
+        )
+        attributes_dict = CropInsightFarmGenerator.get_attributes_dict()
+        generators = {}
         for farm in farms:
-            if farm.pk:
-                CropInsightFarmGenerator(
+            if (
+                farm.pk and farm.id not in generated_farm_ids and
+                farm.grid_id not in generators
+            ):
+                generators[farm.grid_id] = CropInsightFarmGenerator(
                     farm,
                     self.farm_group,
-                    port=port
-                ).generate_spw()
-            count += 1
-            if count % 500 == 0:
-                print(
-                    f'{timezone.now()} Farms in port {port} processed {count}'
+                    port=port,
+                    attributes_dict=attributes_dict
                 )
+        generators = list(generators.values())
+
+        batch_size = Preferences.load().crop_plan_config.get(
+            'spw_batch_size', self.spw_batch_size
+        )
+        count = 0
+        for i in range(0, len(generators), batch_size):
+            batch = generators[i:i + batch_size]
+            retry = 1
+            while True:
+                try:
+                    results = calculate_from_grids(
+                        [
+                            generator.farm.grid.geometry.centroid
+                            for generator in batch
+                        ],
+                        port=port
+                    )
+                    break
+                except Exception as e:
+                    # When error, retry until 3 times
+                    if retry >= 3:
+                        print(f'Generate SPW Error: {str(e)}')
+                        for generator in batch:
+                            generator._add_error(
+                                'SPW Error: {}'.format(str(e))
+                            )
+                            generator.save_errors()
+                        raise e
+                    retry += 1
+            for generator, (output, historical_dict) in zip(batch, results):
+                generator.save_output(output, historical_dict)
+            count += len(batch)
+            print(
+                f'{timezone.now()} Grids in port {port} processed {count}'
+            )
 
     def _chunk_list(self, data):
         """Split the list into smaller chunks."""
@@ -802,7 +1112,12 @@ class CropInsightRequest(models.Model):
         grids = farms.values('grid').distinct()
         grid_ids = list(grids.values_list('grid', flat=True))
         chunks = list(self._chunk_list(grid_ids))
-        ports = [8282, 8282, 8282, 8282]
+        # spread the chunks to the plumber processes
+        plumber_ports = get_plumber_ports()
+        ports = [
+            plumber_ports[idx % len(plumber_ports)]
+            for idx in range(len(chunks))
+        ]
         with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
             results = list(
                 executor.map(
@@ -833,6 +1148,17 @@ class CropInsightRequest(models.Model):
             )
             return None
 
+    def _chunk_farms(self, farms):
+        """Split the farms into lists of farm."""
+        farms = list(farms)
+        for i in range(0, len(farms), self.report_chunk_size):
+            yield farms[i:i + self.report_chunk_size]
+
+    @staticmethod
+    def _csv_row(row):
+        """Return csv line of a row."""
+        return ','.join(map(str, row)) + '\n'
+
     def _generate_report(self):
         """Generate reports."""
         from spw.generator.crop_insight import CropInsightFarmGenerator
@@ -843,67 +1169,70 @@ class CropInsightRequest(models.Model):
         else:
             raise FarmGroupIsNotSetException()
 
-        output = [
-            self.farm_group.headers
-        ]
         fields = self.farm_group.fields
         has_tamsat_spw_column = fields.filter(
             field__in= CropPlanData.tamsat_fields()
         ).exists()
+        field_names = [field.field for field in fields]
 
         # init tamsat spw reader
         tamsat_spw_df = None
         if has_tamsat_spw_column:
             tamsat_spw_df = self._init_tamsat_spw_reader()
 
-        # Get farms
-        for farm in farms:
-            # If it has farm id, generate spw
-            if farm.pk:
-                # self.update_note('Generating SPW for farm: {}'.format(farm))
-                CropInsightFarmGenerator(
-                    farm,
-                    self.farm_group
-                ).generate_spw()
-
-            data = CropPlanData(
-                farm, self.requested_at.date(),
-                forecast_fields=[
-                    'rainAccumulationSum', 'precipitationProbability',
-                    'rainAccumulationType'
-                ],
-                tamsat_spw_df=tamsat_spw_df,
-                farm_group=self.farm_group
-            ).data
-
-            # Skip if no data
-            if not data:
-                continue
+        report_data = CropPlanBulkData(
+            self.requested_at.date(),
+            forecast_fields=[
+                'rainAccumulationSum', 'precipitationProbability',
+                'rainAccumulationType'
+            ],
+            tamsat_spw_df=tamsat_spw_df,
+            farm_group=self.farm_group
+        )
 
-            # Create header
-            row_data = []
-            for field in fields:
-                try:
-                    row_data.append(data[field.field])
-                except KeyError:
-                    row_data.append('')
-            output.append(row_data)
+        attributes_dict = CropInsightFarmGenerator.get_attributes_dict()
 
         # Render csv
         self.update_note('Generate CSV')
-        csv_content = ''
-
-        # Save to csv
-        for row in output:
-            csv_content += ','.join(map(str, row)) + '\n'
-        content_file = ContentFile(csv_content)
-        self.file.save(
-            os.path.join(
-                f'{self.farm_group.id}',
-                self.filename
-            ),
-            content_file
-        )
+        with tempfile.NamedTemporaryFile(
+            mode='w+', encoding='utf-8', newline='', suffix='.csv'
+        ) as csv_file:
+            csv_file.write(self._csv_row(self.farm_group.headers))
+
+            # Get farms
+            for chunk in self._chunk_farms(farms):
+                for farm in chunk:
+                    # If it has farm id, generate spw
+                    if farm.pk:
+                        CropInsightFarmGenerator(
+                            farm,
+                            self.farm_group,
+                            attributes_dict=attributes_dict
+                        ).generate_spw()
+
+                report_data.load(chunk)
+                for farm in chunk:
+                    data = report_data.get_data(farm)
+
+                    # Skip if no data
+                    if not data:
+                        continue
+
+                    csv_file.write(
+                        self._csv_row(
+                            [data.get(field, '') for field in field_names]
+                        )
+                    )
+
+            # Save to csv
+            csv_file.seek(0)
+            self.file.save(
+                os.path.join(
+                    f'{self.farm_group.id}',
+                    self.filename
+                ),
+                File(csv_file)
+            )
         self.save()
 
         # Send email
@@ -5,7 +5,9 @@ Tomorrow Now GAP.
 .. note:: Models
 """
 
+import uuid
 from django.contrib.gis.db import models
+from django.core.cache import cache
 from datetime import timedelta
 from django.utils import timezone
 
@@ -162,6 +164,25 @@ class Dataset(Definition):
         default=DatasetObservationType.NOT_SPECIFIED
     )
 
+    CACHE_VERSION_PREFIX_KEY = 'gap-dataset-version-'
+
+    @property
+    def cache_version_key(self):
+        """Return cache key that stores version of this dataset."""
+        return f'{Dataset.CACHE_VERSION_PREFIX_KEY}{self.id}'
+
+    def get_cache_version(self) -> str:
+        """Get version of dataset, used to build result cache keys.
+
+        :return: version string
+        :rtype: str
+        """
+        return cache.get(self.cache_version_key, None) or '0'
+
+    def invalidate_cache(self):
+        """Invalidate result cache that is built from this dataset."""
+        cache.set(self.cache_version_key, uuid.uuid4().hex, timeout=None)
+
 
 class DataSourceFile(models.Model):
     """Model representing a datasource file that is stored in S3 Storage."""
@@ -13,7 +13,7 @@ from django.contrib.auth import get_user_model
 from django.db import models
 from django.utils import timezone
 
-from gap.models.dataset import DataSourceFile
+from gap.models.dataset import Dataset, DataSourceFile
 
 User = get_user_model()
 
@@ -324,6 +324,11 @@ class IngestorSession(BaseSession):
                 )
                 converter.setup()
                 converter.run()
+
+            # invalidate API result cache of the ingested dataset
+            dataset = getattr(ingestor_obj, 'dataset', None)
+            if isinstance(dataset, Dataset):
+                dataset.invalidate_cache()
         else:
             raise Exception(
                 f'No Ingestor class for {self.ingestor_type}'
@@ -10,10 +10,13 @@ from datetime import datetime, tzinfo
 
 from django.contrib.gis.db import models
 from django.contrib.gis.geos import Polygon
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 from boto3.s3.transfer import TransferConfig
 
-from core.models.singleton import SingletonModel
+from core.models.singleton import SingletonModel, SingletonCache
 from gap.utils.dms import dms_string_to_point
 
 sw_point = dms_string_to_point('''-27°0'0"S 21°8'0"E''')
@@ -163,6 +166,17 @@ class Preferences(SingletonModel):
         default=500,
         help_text='Number of API Request logs to be saved in a batch.'
     )
+    api_log_insert_chunk_size = models.IntegerField(
+        default=500,
+        help_text='Number of API Request logs in one insert query.'
+    )
+    api_log_max_batches = models.IntegerField(
+        default=100,
+        help_text=(
+            'Max number of API Request log batches to be saved '
+            'in one task run.'
+        )
+    )
 
     # api use x-accel-redirect
     api_use_x_accel_redirect = models.BooleanField(
@@ -259,6 +273,19 @@ class Preferences(SingletonModel):
     def __str__(self):
         return 'Preferences'
 
+    @classmethod
+    def load(cls):
+        """Load the preferences from process-local cache.
+
+        Do not modify the returned object without saving it.
+        """
+        return preferences_cache.get(super().load)
+
+    @staticmethod
+    def cache_stats() -> dict:
+        """Return statistics of the preferences cache in this process."""
+        return preferences_cache.get_stats()
+
     @staticmethod
     def lat_lon_decimal_digits() -> int:
         """Return decimal digits for latitude and longitude."""
@@ -293,3 +320,14 @@ class Preferences(SingletonModel):
                 conf.get('max_concurrency', 4)
             )
         )
+
+
+preferences_cache = SingletonCache('gap-preferences-version')
+
+
+@receiver(post_save, sender=Preferences)
+def preferences_post_save(sender, instance, **kwargs):
+    """Invalidate cached preferences in all processes."""
+    preferences_cache.clear()
+    # other processes must not reload before the change is committed
+    transaction.on_commit(preferences_cache.invalidate)
@@ -169,24 +169,7 @@ class CBAMNetCDFReader(BaseNetCDFReader):
             self, dataset: xrDataset, variables: List[str],
             start_dt: np.datetime64,
             end_dt: np.datetime64) -> xrDataset:
-        # use the first variable to get its dimension
-        # use the 0 index for it's date variable
-        mask = np.zeros_like(dataset[variables[0]][0], dtype=bool)
-        # Iterate through the points and update the mask
-        for lon, lat in self.location_input.points:
-            # Find nearest lat and lon indices
-            lat_idx = np.abs(dataset['lat'] - lat).argmin()
-            lon_idx = np.abs(dataset['lon'] - lon).argmin()
-            mask[lat_idx, lon_idx] = True
-        mask_da = xr.DataArray(
-            mask,
-            coords={
-                'lat': dataset['lat'], 'lon': dataset['lon']
-            },
-            dims=['lat', 'lon']
-        )
-        # Apply the mask to the dataset
-        return dataset[variables].where(mask_da, drop=True)
+        return self._read_points(dataset[variables])
 
 
 class CBAMZarrReader(BaseZarrReader, CBAMNetCDFReader):
@@ -306,25 +289,10 @@ class CBAMZarrReader(BaseZarrReader, CBAMNetCDFReader):
         :return: Dataset that has been filtered
         :rtype: xrDataset
         """
-        mask = np.zeros_like(dataset[variables[0]][0], dtype=bool)
-        # Iterate through the points and update the mask
-        for lon, lat in self.location_input.points:
-            # Find nearest lat and lon indices
-            lat_idx = np.abs(dataset['lat'] - lat).argmin()
-            lon_idx = np.abs(dataset['lon'] - lon).argmin()
-            mask[lat_idx, lon_idx] = True
-        mask_da = xr.DataArray(
-            mask,
-            coords={
-                'lat': dataset['lat'], 'lon': dataset['lon']
-            }, dims=['lat', 'lon']
-        )
-        # Apply the mask to the dataset
-        return dataset[variables].sel(
-            **{self.date_variable: slice(start_dt, end_dt)}
-        ).where(
-            mask_da,
-            drop=True
+        return self._read_points(
+            dataset[variables].sel(
+                **{self.date_variable: slice(start_dt, end_dt)}
+            )
         )
 
     def read_historical_data(self, start_date: datetime, end_date: datetime):
@@ -5,6 +5,7 @@ Tomorrow Now GAP.
 .. note:: Observation Data Reader
 """
 
+import os
 import json
 import duckdb
 import numpy as np
@@ -38,6 +39,8 @@ from gap.utils.reader import (
     DatasetReaderValue
 )
 from gap.utils.dask import execute_dask_compute
+from gap.utils.duckdb import duckdb_connection_pool
+from gap.utils.parquet import ParquetConverter
 from gap.utils.geometry import ST_X, ST_Y
 
 
@@ -208,7 +211,7 @@ class ObservationReaderValue(DatasetReaderValue):
     def to_csv(
         self, suffix='.csv', separator=',',
         date_chunk_size=None, lat_chunk_size=None,
-        lon_chunk_size=None
+        lon_chunk_size=None, location_chunk_size=None
     ):
         """Generate csv file to object storage."""
         headers, _ = self._get_headers(use_station_id=True)
@@ -519,7 +522,7 @@ class ObservationParquetReaderValue(DatasetReaderValue):
             attributes: List[DatasetAttribute],
             start_date: datetime,
             end_date: datetime,
-            query) -> None:
+            query, query_params: dict = None) -> None:
         """Initialize ObservationParquetReaderValue class.
 
         :param val: value that has been read
@@ -528,6 +531,10 @@ class ObservationParquetReaderValue(DatasetReaderValue):
         :type location_input: DatasetReaderInput
         :param attributes: list of dataset attributes
         :type attributes: List[DatasetAttribute]
+        :param query: DuckDB query
+        :type query: str
+        :param query_params: parameters of the query, defaults to None
+        :type query_params: dict, optional
         """
         super().__init__(
             val, location_input, attributes, result_count=1
@@ -538,6 +545,7 @@ class ObservationParquetReaderValue(DatasetReaderValue):
             self.attributes, key=lambda x: x.attribute.id
         )
         self.query = query
+        self.query_params = query_params
 
     @property
     def conn(self) -> duckdb.DuckDBPyConnection:
@@ -550,7 +558,7 @@ class ObservationParquetReaderValue(DatasetReaderValue):
             'geometry': json.loads(self.location_input.geometry.json),
         }
         # Convert query results to a DataFrame
-        df = self.conn.sql(self.query).df()
+        df = self.conn.execute(self.query, self.query_params).df()
 
         if self.has_time_column and 'time' in df.columns:
             # Combine date and time columns if time column exists
@@ -595,7 +603,7 @@ class ObservationParquetReaderValue(DatasetReaderValue):
                 """
             )
 
-            self.conn.sql(export_query)
+            self.conn.execute(export_query, self.query_params)
             self.conn.close()
 
             with open(tmp_file.name, 'r') as f:
@@ -608,7 +616,7 @@ class ObservationParquetReaderValue(DatasetReaderValue):
     def to_csv(
         self, suffix='.csv', separator=',',
         date_chunk_size=None, lat_chunk_size=None,
-        lon_chunk_size=None
+        lon_chunk_size=None, location_chunk_size=None
     ):
         """Generate CSV file save directly to object storage.
 
@@ -631,7 +639,7 @@ class ObservationParquetReaderValue(DatasetReaderValue):
                 """
             )
 
-            self.conn.sql(export_query)
+            self.conn.execute(export_query, self.query_params)
 
         except Exception as e:
             print(f"Error generating CSV: {e}")
@@ -655,7 +663,7 @@ class ObservationParquetReaderValue(DatasetReaderValue):
             delete_on_close=False
         ) as tmp_file:
             # Convert query results to a DataFrame
-            df = self.conn.sql(self.query).df()
+            df = self.conn.execute(self.query, self.query_params).df()
 
             # Convert DataFrame to Xarray Dataset
             ds = xr.Dataset.from_dataframe(df)
@@ -681,7 +689,7 @@ class ObservationParquetReaderValue(DatasetReaderValue):
 
         try:
             # Execute the DuckDB query and fetch data
-            df = self.conn.sql(self.query).df()
+            df = self.conn.execute(self.query, self.query_params).df()
 
             # Convert DataFrame to Xarray Dataset
             ds = xr.Dataset.from_dataframe(df)
@@ -770,6 +778,7 @@ class ObservationParquetReader(ObservationDatasetReader):
             raise ValueError(
                 "No valid DataSourceFile found for this dataset."
             )
+        self.data_source = data_source
 
         return (
             f"s3://{self.s3['S3_BUCKET_NAME']}/"
@@ -792,16 +801,85 @@ class ObservationParquetReader(ObservationDatasetReader):
         # Only add 'threads' key if a valid thread count exists
         if duckdb_threads:
             config['threads'] = duckdb_threads
-        conn = duckdb.connect(config=config)
-        conn.install_extension("httpfs")
-        conn.load_extension("httpfs")
-        conn.install_extension("spatial")
-        conn.load_extension("spatial")
-        return conn
+        # cursor of pooled database with httpfs and spatial loaded
+        return duckdb_connection_pool.get_connection(config)
+
+    def _get_partition_paths(
+        self, s3_path: str, start_date: datetime, end_date: datetime
+    ) -> List[str]:
+        """Get parquet path of each partition in the date range.
+
+        :param s3_path: directory path of the parquet files
+        :type s3_path: str
+        :param start_date: start date for reading historical data
+        :type start_date: datetime
+        :param end_date: end date for reading historical data
+        :type end_date: datetime
+        :return: List of glob path for each year or month partition
+        :rtype: List[str]
+        """
+        paths = []
+        for year in range(start_date.year, end_date.year + 1):
+            if not self.has_month_partition:
+                paths.append(f'{s3_path}year={year}/*.parquet')
+                continue
+            start_month = start_date.month if year == start_date.year else 1
+            end_month = end_date.month if year == end_date.year else 12
+            for month in range(start_month, end_month + 1):
+                paths.append(
+                    f'{s3_path}year={year}/month={month}/*.parquet'
+                )
+        return paths
+
+    def _get_parquet_files(self, conn: duckdb.DuckDBPyConnection):
+        """Find parquet files of the partitions in the date range.
+
+        Only the partitions in the date range are listed, so an empty
+        window does not list or open the other partitions.
+        :param conn: DuckDB connection
+        :type conn: duckdb.DuckDBPyConnection
+        :return: List of parquet files
+        :rtype: List[str]
+        """
+        files = []
+        for path in self.partition_paths:
+            files.extend(
+                row[0] for row in conn.execute(
+                    'SELECT file FROM glob(?)', [path]
+                ).fetchall()
+            )
+        return self._filter_files_by_station(files)
+
+    def _filter_files_by_station(self, files: List[str]) -> List[str]:
+        """Exclude files that do not contain the queried stations.
+
+        The station min/max of each file is stored in DataSourceFile
+        metadata by ParquetConverter with station layout.
+        :param files: List of parquet files
+        :type files: List[str]
+        :return: List of parquet files that may contain the stations
+        :rtype: List[str]
+        """
+        data_source = getattr(self, 'data_source', None)
+        metadata = data_source.metadata if data_source else None
+        station_stats = (metadata or {}).get('station_stats', None)
+        if not self.station_ids or not station_stats:
+            return files
+        results = []
+        for file in files:
+            stats = station_stats.get(file.replace(self.directory_path, ''))
+            if stats is None or any(
+                stats[0] <= station_id <= stats[1]
+                for station_id in self.station_ids
+            ):
+                results.append(file)
+        return results
 
     def read_historical_data(self, start_date: datetime, end_date: datetime):
         """Read historical data from dataset.
 
+        The query reads only the partitions in the date range
+        and the filter values are bound as parameters.
         :param start_date: start date for reading historical data
         :type start_date: datetime
         :param end_date:  end date for reading historical data
@@ -813,10 +891,11 @@ class ObservationParquetReader(ObservationDatasetReader):
         if self.has_altitudes:
             attributes = 'altitude, ' + attributes
         s3_path = self._get_directory_path()
-        if self.has_month_partition:
-            s3_path += 'year=*/month=*/*.parquet'
-        else:
-            s3_path += 'year=*/*.parquet'
+        self.directory_path = s3_path
+        self.station_ids = None
+        self.partition_paths = self._get_partition_paths(
+            s3_path, start_date, end_date
+        )
 
         # Determine if dataset has time column
         time_column = (
@@ -824,22 +903,24 @@ class ObservationParquetReader(ObservationDatasetReader):
             self.has_time_column else ""
         )
         self.query = None
+        self.query_params = {
+            'start_year': start_date.year,
+            'end_year': end_date.year,
+            'start_date': start_date,
+            'end_date': end_date
+        }
         # Handle BBOX Query
         if self.location_input.type == LocationInputType.BBOX:
             points = self.location_input.points
-            self.query = (
-                f"""
-                SELECT date_time::date as date,
-                {time_column} loc_y as lat, loc_x as lon,
-                st_code as station_id,
-                {attributes}
-                FROM read_parquet('{s3_path}', hive_partitioning=true)
-                WHERE year>={start_date.year} AND year<={end_date.year} AND
-                date_time>='{start_date}' AND date_time<='{end_date}' AND
-                ST_Within(geometry, ST_MakeEnvelope(
-                {points[0].x}, {points[0].y}, {points[1].x}, {points[1].y}))
-                ORDER BY date_time
-                """
+            self.query_params.update({
+                'xmin': points[0].x,
+                'ymin': points[0].y,
+                'xmax': points[1].x,
+                'ymax': points[1].y
+            })
+            location_cond = (
+                'ST_Within(geometry, ST_MakeEnvelope('
+                '$xmin, $ymin, $xmax, $ymax))'
             )
 
         # Handle Point Query
@@ -855,34 +936,13 @@ class ObservationParquetReader(ObservationDatasetReader):
 
             nearest_station = nearest_stations[0]
             # **Step 2: Use the nearest station ID in the DuckDB query**
-            self.query = (
-                f"""
-                SELECT date_time::date as date,
-                {time_column} loc_y as lat, loc_x as lon,
-                st_code as station_id, {attributes}
-                FROM read_parquet('{s3_path}', hive_partitioning=true)
-                WHERE year>={start_date.year} AND year<={end_date.year} AND
-                date_time>='{start_date}' AND date_time<='{end_date}' AND
-                {self.station_id_key} = '{nearest_station.id}'
-                ORDER BY date_time
-                """
-            )
+            self.query_params['station_id'] = nearest_station.id
+            self.station_ids = [nearest_station.id]
+            location_cond = f'{self.station_id_key} = $station_id'
         # Handle Polygon Query
         elif self.location_input.type == LocationInputType.POLYGON:
-            polygon_wkt = self.location_input.polygon.wkt
-            self.query = (
-                f"""
-                SELECT date_time::date as date,
-                {time_column} loc_y as lat, loc_x as lon,
-                st_code as station_id,
-                {attributes}
-                FROM read_parquet('{s3_path}', hive_partitioning=true)
-                WHERE year>={start_date.year} AND year<={end_date.year} AND
-                date_time>='{start_date}' AND date_time<='{end_date}' AND
-                ST_Within(geometry, ST_GeomFromText('{polygon_wkt}'))
-                ORDER BY date_time
-                """
-            )
+            self.query_params['polygon'] = self.location_input.polygon.wkt
+            location_cond = 'ST_Within(geometry, ST_GeomFromText($polygon))'
         # Handle List of Points Query
         elif self.location_input.type == LocationInputType.LIST_OF_POINT:
             nearest_stations = self.get_nearest_stations()
@@ -892,38 +952,93 @@ class ObservationParquetReader(ObservationDatasetReader):
             ):
                 raise ValueError("No nearest station found!")
 
-            station_ids = ", ".join(f"'{s.id}'" for s in nearest_stations)
-            self.query = (
-                f"""
-                SELECT date_time::date as date,
-                {time_column} loc_y as lat, loc_x as lon,
-                st_code as station_id, {attributes}
-                FROM read_parquet('{s3_path}', hive_partitioning=true)
-                WHERE year>={start_date.year} AND year<={end_date.year} AND
-                date_time>='{start_date}' AND date_time<='{end_date}' AND
-                {self.station_id_key} IN ({station_ids})
-                ORDER BY date_time
-                """
+            station_ids = []
+            self.station_ids = []
+            for idx, station in enumerate(nearest_stations):
+                self.query_params[f'station_id_{idx}'] = station.id
+                self.station_ids.append(station.id)
+                station_ids.append(f'$station_id_{idx}')
+            location_cond = (
+                f'{self.station_id_key} IN ({", ".join(station_ids)})'
             )
 
         else:
             raise NotImplementedError(
                 'Only BBOX and Point queries are supported!'
             )
-        if self.query is None:
-            raise ValueError(
-                "Failed to generate SQL query for the given location input."
+
+        self._query_parts = (time_column, attributes, location_cond)
+        self.query = self._get_query()
+
+    def _get_query(self, deduplicate=False) -> str:
+        """Build DuckDB query of the historical data.
+
+        :param deduplicate: keep only the row of the latest file
+            for each station and date_time, defaults to False
+        :type deduplicate: bool, optional
+        :return: DuckDB query
+        :rtype: str
+        """
+        time_column, attributes, location_cond = self._query_parts
+        source = 'read_parquet($files, hive_partitioning=true)'
+        qualify = ''
+        if deduplicate:
+            # rows of fragment (part-*) files override older files
+            source = (
+                'read_parquet($files, hive_partitioning=true, filename=true)'
+            )
+            qualify = (
+                'QUALIFY ROW_NUMBER() OVER ('
+                f'PARTITION BY {self.station_id_key}, date_time '
+                'ORDER BY filename DESC) = 1'
             )
+        return (
+            f"""
+            SELECT date_time::date as date,
+            {time_column} loc_y as lat, loc_x as lon,
+            st_code as station_id, {attributes}
+            FROM {source}
+            WHERE year>=$start_year AND year<=$end_year AND
+            date_time>=$start_date AND date_time<=$end_date AND
+            {location_cond}
+            {qualify}
+            ORDER BY date_time
+            """
+        )
 
     def get_data_values(self) -> DatasetReaderValue:
         """Fetch data values from dataset.
 
+        When the files contain fragments from append mode,
+        the rows are deduplicated by station and date_time.
+        When there is no file in the date range, empty value is returned
+        without running the query.
         :return: Data Value.
         :rtype: DatasetReaderValue
         """
+        conn = self._get_connection()
+        files = self._get_parquet_files(conn)
+        if not files:
+            conn.close()
+            return ObservationParquetReaderValue(
+                None, self.location_input, self.attributes,
+                self.start_date, self.end_date, None
+            )
+        query = self.query
+        if any(
+            os.path.basename(file).startswith(
+                ParquetConverter.FRAGMENT_PREFIX
+            ) for file in files
+        ):
+            query = self._get_query(deduplicate=True)
+        query_params = {
+            **self.query_params,
+            'files': files
+        }
         return ObservationParquetReaderValue(
-            self._get_connection(), self.location_input, self.attributes,
-            self.start_date, self.end_date, self.query
+            conn, self.location_input, self.attributes,
+            self.start_date, self.end_date, query,
+            query_params=query_params
         )
 
 
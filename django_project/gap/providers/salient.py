@@ -10,7 +10,6 @@ from typing import List
 from datetime import datetime
 import numpy as np
 import regionmask
-import xarray as xr
 import pandas as pd
 from xarray.core.dataset import Dataset as xrDataset
 from shapely.geometry import shape
@@ -188,31 +187,10 @@ class SalientNetCDFReader(BaseNetCDFReader):
             self, dataset: xrDataset, variables: List[str],
             start_dt: np.datetime64,
             end_dt: np.datetime64) -> xrDataset:
-        # use the first variable to get its dimension
-        if self._has_ensembles():
-            # use 0 idx ensemble and 0 idx forecast_day
-            attr = self._find_first_ensemble_variable()
-            mask = np.zeros_like(dataset[attr.source][0][0], dtype=bool)
-        else:
-            # use the 0 index for it's date variable
-            mask = np.zeros_like(dataset[variables[0]][0], dtype=bool)
-        # Iterate through the points and update the mask
-        for lon, lat in self.location_input.points:
-            # Find nearest lat and lon indices
-            lat_idx = np.abs(dataset['lat'] - lat).argmin()
-            lon_idx = np.abs(dataset['lon'] - lon).argmin()
-            mask[lat_idx, lon_idx] = True
-        mask_da = xr.DataArray(
-            mask,
-            coords={
-                'lat': dataset['lat'], 'lon': dataset['lon']
-            }, dims=['lat', 'lon']
-        )
-        # Apply the mask to the dataset
-        return dataset[variables].where(
-            (mask_da) &
-            (dataset[self.date_variable] >= start_dt) &
-            (dataset[self.date_variable] <= end_dt), drop=True)
+        val = self._read_points(dataset[variables])
+        return val.where(
+            (val[self.date_variable] >= start_dt) &
+            (val[self.date_variable] <= end_dt), drop=True)
 
     def get_data_values(self) -> DatasetReaderValue:
         """Fetch data values from list of xArray Dataset object.
@@ -440,32 +418,11 @@ class SalientZarrReader(BaseZarrReader, SalientNetCDFReader):
         """
         min_idx = self._get_forecast_day_idx(start_dt)
         max_idx = self._get_forecast_day_idx(end_dt)
-        if self._has_ensembles():
-            # use 0 idx ensemble and 0 idx forecast_day
-            attr = self._find_first_ensemble_variable()
-            mask = np.zeros_like(dataset[attr.source][0][0][0], dtype=bool)
-        else:
-            # use the 0 index for it's date variable
-            mask = np.zeros_like(dataset[variables[0]][0][0], dtype=bool)
-        # Iterate through the points and update the mask
-        for lon, lat in self.location_input.points:
-            # Find nearest lat and lon indices
-            lat_idx = np.abs(dataset['lat'] - lat).argmin()
-            lon_idx = np.abs(dataset['lon'] - lon).argmin()
-            mask[lat_idx, lon_idx] = True
-        mask_da = xr.DataArray(
-            mask,
-            coords={
-                'lat': dataset['lat'], 'lon': dataset['lon']
-            }, dims=['lat', 'lon']
-        )
-        # Apply the mask to the dataset
-        return dataset[variables].sel(
-            forecast_date=self.latest_forecast_date,
-            **{self.date_variable: slice(min_idx, max_idx)}
-        ).where(
-            mask_da,
-            drop=True
+        return self._read_points(
+            dataset[variables].sel(
+                forecast_date=self.latest_forecast_date,
+                **{self.date_variable: slice(min_idx, max_idx)}
+            )
         )
 
 
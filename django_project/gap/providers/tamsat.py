@@ -14,7 +14,6 @@ import pytz
 import numpy as np
 import pandas as pd
 import regionmask
-import xarray as xr
 from shapely.geometry import shape
 from xarray.core.dataset import Dataset as xrDataset
 
@@ -211,30 +210,12 @@ class TamsatZarrReader(BaseZarrReader):
             self, dataset: xrDataset, variables: List[str],
             start_dt: np.datetime64,
             end_dt: np.datetime64) -> xrDataset:
-        # use the 0 index for it's date variable
-        mask = np.zeros_like(dataset[variables[0]][0], dtype=bool)
-
-        # Iterate through the points and update the mask
-        for lon, lat in self.location_input.points:
-            # Find nearest lat and lon indices
-            lat_idx = np.abs(dataset['lat'] - lat).argmin()
-            lon_idx = np.abs(dataset['lon'] - lon).argmin()
-            mask[lat_idx, lon_idx] = True
-        mask_da = xr.DataArray(
-            mask,
-            coords={
-                'lat': dataset['lat'], 'lon': dataset['lon']
-            }, dims=['lat', 'lon']
-        )
-
         min_idx = self._get_day_of_year(start_dt)
         max_idx = self._get_day_of_year(end_dt)
-        # Apply the mask to the dataset
-        return dataset[variables].sel(
-            **{self.date_variable: slice(min_idx, max_idx)}
-        ).where(
-            mask_da,
-            drop=True
+        return self._read_points(
+            dataset[variables].sel(
+                **{self.date_variable: slice(min_idx, max_idx)}
+            )
         )
 
 
@@ -771,43 +771,24 @@ class TioZarrReader(BaseZarrReader):
         :return: Dataset that has been filtered
         :rtype: xrDataset
         """
-        # use the 0 index for it's date variable
-        mask = np.zeros_like(dataset[variables[0]][0][0], dtype=bool)
-
-        # Iterate through the points and update the mask
-        for lon, lat in self.location_input.points:
-            # Find nearest lat and lon indices
-            lat_idx = np.abs(dataset['lat'] - lat).argmin()
-            lon_idx = np.abs(dataset['lon'] - lon).argmin()
-            mask[lat_idx, lon_idx] = True
-        mask_da = xr.DataArray(
-            mask,
-            coords={
-                'lat': dataset['lat'], 'lon': dataset['lon']
-            }, dims=['lat', 'lon']
-        )
-
         if start_dt < self.latest_forecast_date:
-            return dataset[variables].sel(
-                forecast_date=slice(
-                    start_dt + np.timedelta64(1, 'D'),
-                    end_dt + np.timedelta64(1, 'D')
-                ),
-                **{self.date_variable: -1}
-            ).where(
-                mask_da,
-                drop=True
+            return self._read_points(
+                dataset[variables].sel(
+                    forecast_date=slice(
+                        start_dt + np.timedelta64(1, 'D'),
+                        end_dt + np.timedelta64(1, 'D')
+                    ),
+                    **{self.date_variable: -1}
+                )
             )
 
         min_idx = self._get_forecast_day_idx(start_dt)
         max_idx = self._get_forecast_day_idx(end_dt)
-        # Apply the mask to the dataset
-        return dataset[variables].sel(
-            forecast_date=self.latest_forecast_date,
-            **{self.date_variable: slice(min_idx, max_idx)}
-        ).where(
-            mask_da,
-            drop=True
+        return self._read_points(
+            dataset[variables].sel(
+                forecast_date=self.latest_forecast_date,
+                **{self.date_variable: slice(min_idx, max_idx)}
+            )
         )
 
 
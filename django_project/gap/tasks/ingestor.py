@@ -134,23 +134,24 @@ def _get_data_source(dataset: Dataset, provider_conf: dict):
     return data_source
 
 
+PARQUET_CONVERTER_CLASSES = {
+    'Tahmo Ground Observational': ParquetConverter,
+    'Arable Ground Observational': ParquetConverter,
+    'Tahmo Disdrometer Observational': ParquetConverter,
+    'WindBorne Balloons Observations': WindborneParquetConverter
+}
+
+
 @app.task(name='convert_dataset_to_parquet')
 def convert_dataset_to_parquet(dataset_id: int):
     """Convert dataset EAV to parquet files."""
     dataset = Dataset.objects.get(id=dataset_id)
-    if dataset.name not in [
-        'Tahmo Ground Observational',
-        'Arable Ground Observational',
-        'Tahmo Disdrometer Observational',
-        'WindBorne Balloons Observations'
-    ]:
+    if dataset.name not in PARQUET_CONVERTER_CLASSES:
         raise ValueError(
             f'Invalid dataset {dataset.name} to be converted into parquet!'
         )
 
-    converter_class = ParquetConverter
-    if dataset.name == 'WindBorne Balloons Observations':
-        converter_class = WindborneParquetConverter
+    converter_class = PARQUET_CONVERTER_CLASSES[dataset.name]
 
     ingestor_conf = Preferences.load().ingestor_config
     provider_conf = ingestor_conf.get(dataset.provider.name, {})
@@ -161,6 +162,36 @@ def convert_dataset_to_parquet(dataset_id: int):
     converter.run()
 
 
+@app.task(name='compact_parquet_fragments')
+def compact_parquet_fragments(force=False):
+    """Merge appended parquet fragments of observation datasets."""
+    for dataset in Dataset.objects.filter(
+        name__in=PARQUET_CONVERTER_CLASSES.keys()
+    ):
+        data_source = DataSourceFile.objects.filter(
+            dataset=dataset,
+            format=DatasetStore.PARQUET,
+            is_latest=True
+        ).last()
+        if data_source is None:
+            continue
+
+        converter = PARQUET_CONVERTER_CLASSES[dataset.name](
+            dataset, data_source, mode='a'
+        )
+        converter.setup()
+        try:
+            partitions = converter.compact(force=force)
+        except Exception as ex:
+            logger.error(
+                f'Failed to compact parquet of {dataset.name}: {ex}'
+            )
+            continue
+        logger.info(
+            f'Compacted {len(partitions)} partitions of {dataset.name}'
+        )
+
+
 @app.task(name='reset_measurements')
 def reset_measurements(dataset_id: int):
     """Reset measurements for a dataset."""
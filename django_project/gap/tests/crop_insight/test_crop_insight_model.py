@@ -6,12 +6,22 @@ Tomorrow Now GAP.
 """
 
 import uuid
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
 
+import pandas as pd
+from django.contrib.gis.geos import Point
 from django.test import TestCase
 
-from gap.factories import CropInsightRequestFactory, FarmGroupFactory
-from gap.models import CropInsightRequest
+from gap.factories import (
+    CropInsightRequestFactory, FarmFactory, FarmGroupFactory, GridFactory
+)
+from gap.models import CropInsightRequest, DatasetAttribute
+from gap.models.crop_insight import (
+    CropPlanBulkData, CropPlanData, FarmSuitablePlantingWindowSignal,
+    FarmShortTermForecast, FarmShortTermForecastData
+)
+from spw.models import SPWErrorLog
 
 
 class CropCRUDTest(TestCase):
@@ -114,3 +124,143 @@ class CropCRUDTest(TestCase):
                 "Monday-01-01-2024 (UTC+03:00)"
             )
         )
+
+
+    @patch('spw.generator.main.calculate_from_grids')
+    @patch(
+        'spw.generator.crop_insight.CropInsightFarmGenerator.save_output',
+        autospec=True
+    )
+    def test_process_chunk(self, mock_save_output, mock_calculate):
+        """Test SPW is generated for grid with farm without signal."""
+        group = FarmGroupFactory()
+        grid_1 = GridFactory()
+        grid_2 = GridFactory()
+        farm_1 = FarmFactory(grid=grid_1)
+        farm_2 = FarmFactory(grid=grid_1)
+        farm_3 = FarmFactory(grid=grid_2)
+        group.farms.add(farm_1, farm_2, farm_3)
+        today = datetime.now(timezone.utc).date()
+        # farm_2 is added after the signal of grid_1 is generated
+        FarmSuitablePlantingWindowSignal.objects.create(
+            farm=farm_1, generated_date=today, signal='Plant NOW'
+        )
+        FarmSuitablePlantingWindowSignal.objects.create(
+            farm=farm_3, generated_date=today, signal='Plant NOW'
+        )
+        mock_calculate.return_value = [(None, {})]
+        obj = self.Factory(farm_group=group)
+        obj._process_chunk([grid_1.id, grid_2.id], 8282)
+        mock_calculate.assert_called_once()
+        self.assertEqual(len(mock_calculate.call_args.args[0]), 1)
+        mock_save_output.assert_called_once()
+        self.assertEqual(mock_save_output.call_args.args[0].farm, farm_2)
+
+    @patch('spw.generator.main.calculate_from_grids')
+    def test_process_chunk_error(self, mock_calculate):
+        """Test error log is saved when SPW is failed."""
+        group = FarmGroupFactory()
+        grid = GridFactory()
+        farm = FarmFactory(grid=grid)
+        group.farms.add(farm)
+        mock_calculate.side_effect = ValueError('plumber error')
+        obj = self.Factory(farm_group=group)
+        with self.assertRaises(ValueError):
+            obj._process_chunk([grid.id], 8282)
+        self.assertEqual(mock_calculate.call_count, 3)
+        error_log = SPWErrorLog.objects.get(farm=farm)
+        self.assertEqual(error_log.error, 'SPW Error: plumber error')
+        self.assertEqual(error_log.grid_unique_id, grid.unique_id)
+
+
+class CropPlanBulkDataTest(TestCase):
+    """CropPlanBulkData test case."""
+
+    fixtures = [
+        '1.object_storage_manager.json',
+        '2.provider.json',
+        '3.station_type.json',
+        '4.dataset_type.json',
+        '5.dataset.json',
+        '6.unit.json',
+        '7.attribute.json',
+        '8.dataset_attribute.json',
+        '9.rainfall_classification.json',
+        '10.pest.json',
+        '1.spw_output.json'
+    ]
+    forecast_fields = [
+        'rainAccumulationSum', 'precipitationProbability',
+        'rainAccumulationType'
+    ]
+
+    def test_get_data(self):
+        """Test bulk data is same with CropPlanData for each farm."""
+        generated_date = date(2023, 7, 18)
+        farm_group = FarmGroupFactory()
+        farm_1 = FarmFactory(geometry=Point(11.1111111, 10.111111111))
+        farm_2 = FarmFactory(geometry=Point(22.22222222, 100.111111111))
+        farm_3 = FarmFactory()
+        farm_group.farms.add(farm_1, farm_2, farm_3)
+        FarmSuitablePlantingWindowSignal.objects.create(
+            farm=farm_1,
+            generated_date=generated_date,
+            signal='Plant NOW Tier 1b',
+            too_wet_indicator='Likely too wet to plant',
+            last_4_days=80,
+            last_2_days=60
+        )
+        FarmSuitablePlantingWindowSignal.objects.create(
+            farm=farm_2,
+            generated_date=generated_date,
+            signal='Unknown signal'
+        )
+        forecast = FarmShortTermForecast.objects.create(
+            farm=farm_1, forecast_date=generated_date
+        )
+        for source, values in [
+            ('rainAccumulationSum', [0.5, 12, 30]),
+            ('precipitationProbability', [10, 50, 90])
+        ]:
+            attribute = DatasetAttribute.objects.filter(
+                source=source
+            ).first()
+            for idx, value in enumerate(values):
+                FarmShortTermForecastData.objects.create(
+                    forecast=forecast,
+                    dataset_attribute=attribute,
+                    value_date=generated_date + timedelta(days=idx + 1),
+                    value=value
+                )
+        tamsat_spw_df = pd.DataFrame({
+            'farm_unique_id': [
+                farm_1.unique_id, farm_2.unique_id, farm_1.unique_id
+            ],
+            'spw_20': [1, 0, 0],
+            'sm_25': [0, 1, 1]
+        })
+
+        bulk_data = CropPlanBulkData(
+            generated_date, forecast_fields=self.forecast_fields,
+            tamsat_spw_df=tamsat_spw_df, farm_group=farm_group
+        )
+        farms = [farm_1, farm_2, farm_3]
+        bulk_data.load(farms)
+        for farm in farms:
+            self.assertEqual(
+                bulk_data.get_data(farm),
+                CropPlanData(
+                    farm, generated_date,
+                    forecast_fields=self.forecast_fields,
+                    tamsat_spw_df=tamsat_spw_df,
+                    farm_group=farm_group
+                ).data
+            )
+        data = bulk_data.get_data(farm_1)
+        self.assertEqual(data['day1_rainAccumulationSum'], 0.5)
+        self.assertEqual(data['day3_precipitationProbability'], 90)
+        self.assertEqual(data['tamsat_spw20'], 'Plant')
+        self.assertEqual(data['tamsat_sm25'], 'Do Not Plant')
+        self.assertEqual(
+            bulk_data.get_data(farm_2)['SPWTopMessage'], 'Unknown signal'
+        )
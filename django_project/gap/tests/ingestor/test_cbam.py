@@ -406,3 +406,117 @@ class CBAMIngestorTest(CBAMIngestorBaseTest):
             compute=False,
         )
         mock_compute.assert_called_once()
+
+    @patch('gap.providers.CBAMNetCDFReader.open_dataset')
+    @patch('gap.utils.zarr.BaseZarrReader.setup_reader')
+    def test_run_batch(self, mock_setup_reader, mock_open_dataset_reader):
+        """Test run ingestor in batch mode."""
+        collector = CollectorSession.objects.create(
+            ingestor_type=IngestorType.CBAM
+        )
+        sources = []
+        for day in range(1, 6):
+            dt = datetime.combine(date=date(2023, 1, day), time=time.min)
+            sources.append(
+                DataSourceFile.objects.create(
+                    name=f'2023-01-0{day}.nc',
+                    dataset=self.dataset,
+                    start_date_time=dt,
+                    end_date_time=dt,
+                    format=DatasetStore.NETCDF,
+                    created_on=dt
+                )
+            )
+        collector.dataset_files.set(sources)
+        session = IngestorSession.objects.create(
+            ingestor_type=IngestorType.CBAM,
+            additional_config={
+                'use_batch': True
+            },
+            trigger_task=False
+        )
+        session.collectors.set([collector])
+        ingestor = CBAMIngestor(session)
+        mock_ds = MagicMock(spec=xrDataset)
+        mock_open_dataset_reader.return_value = mock_ds
+
+        # 88 dates in zarr, first batch fills the date chunk
+        ingestor.created = False
+        ingestor.existing_dates = pd.date_range(
+            '2022-10-01', periods=88
+        ).values
+        ingestor.store_batch_as_zarr = MagicMock()
+        ingestor.store_as_zarr = MagicMock()
+
+        ingestor.run()
+
+        ingestor.store_as_zarr.assert_not_called()
+        self.assertEqual(ingestor.store_batch_as_zarr.call_count, 2)
+        batches = [
+            call.args[0] for call in
+            ingestor.store_batch_as_zarr.call_args_list
+        ]
+        self.assertEqual(
+            [[dt for _, dt in batch] for batch in batches],
+            [
+                [date(2023, 1, 1), date(2023, 1, 2)],
+                [date(2023, 1, 3), date(2023, 1, 4), date(2023, 1, 5)]
+            ]
+        )
+        self.assertEqual(ingestor.metadata['total_processed'], 5)
+        self.assertEqual(ingestor.metadata['start_date'], date(2023, 1, 1))
+        self.assertEqual(ingestor.metadata['end_date'], date(2023, 1, 5))
+        self.assertEqual(session.ingestorsessionprogress_set.count(), 2)
+
+    @patch('gap.utils.zarr.BaseZarrReader.get_zarr_base_url')
+    @patch('xarray.core.dataset.Dataset.to_zarr')
+    @patch('gap.ingestor.cbam.execute_dask_compute')
+    def test_store_batch_as_zarr(
+        self, mock_compute, mock_to_zarr, mock_get_zarr_base_url
+    ):
+        """Test CBAM store_batch_as_zarr method."""
+        lat = np.arange(-12.5969, 16 + 0.03574368, 0.03574368)
+        lon = np.arange(26.9665, 52 + 0.036006329, 0.036006329)
+        datasets = []
+        for day in range(1, 4):
+            datasets.append((
+                xrDataset(
+                    {
+                        'max_total_temperature': (
+                            ['lat', 'lon'],
+                            np.random.rand(len(lat), len(lon))
+                        )
+                    },
+                    coords={
+                        'lat': lat,
+                        'lon': lon
+                    },
+                    attrs={'Date': f'2023-01-0{day}'}
+                ),
+                date(2023, 1, day)
+            ))
+        mock_get_zarr_base_url.return_value = 's3://bucket/'
+        session = IngestorSession.objects.create(
+            ingestor_type=IngestorType.CBAM,
+            trigger_task=False
+        )
+        instance = CBAMIngestor(session=session)
+        instance.created = True
+
+        with patch.object(
+            CBAMIngestor, '_write_zarr', wraps=instance._write_zarr
+        ) as mock_write_zarr:
+            instance.store_batch_as_zarr(datasets)
+
+        # written once for all dates
+        mock_write_zarr.assert_called_once()
+        batch_ds, first_date = mock_write_zarr.call_args[0]
+        self.assertEqual(first_date, date(2023, 1, 1))
+        self.assertEqual(batch_ds.sizes['date'], 3)
+        self.assertEqual(
+            batch_ds['max_total_temperature'].chunks[0], (3,)
+        )
+        self.assertNotIn('Date', batch_ds.attrs)
+        mock_to_zarr.assert_called_once()
+        self.assertEqual(mock_to_zarr.call_args.kwargs['mode'], 'w')
+        mock_compute.assert_called_once()
@@ -0,0 +1,146 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP.
+
+.. note:: Unit tests for measurement bulk writer.
+"""
+
+from datetime import datetime, timezone
+
+from django.contrib.gis.geos import Point
+from django.test import TestCase
+
+from gap.factories import (
+    DatasetAttributeFactory,
+    MeasurementFactory,
+    ProviderFactory,
+    StationFactory,
+    StationTypeFactory
+)
+from gap.ingestor.measurement_writer import (
+    MeasurementBulkWriter,
+    bulk_upsert_stations,
+    bulk_upsert_station_histories
+)
+from gap.models import Measurement, Station, StationHistory
+
+
+class MeasurementBulkWriterTest(TestCase):
+    """Unit tests for MeasurementBulkWriter."""
+
+    def setUp(self):
+        """Set test for MeasurementBulkWriter."""
+        self.station = StationFactory.create()
+        self.attribute = DatasetAttributeFactory.create()
+        self.date_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.existing = MeasurementFactory.create(
+            station=self.station,
+            dataset_attribute=self.attribute,
+            date_time=self.date_time,
+            value=1
+        )
+
+    def _values(self):
+        """Return values of the station ordered by date_time."""
+        return list(
+            Measurement.objects.filter(
+                station=self.station
+            ).order_by('date_time').values_list('value', flat=True)
+        )
+
+    def test_keep_existing(self):
+        """Test existing and duplicate rows are kept like get_or_create."""
+        writer = MeasurementBulkWriter(update_existing=False)
+        writer.add(self.station.id, self.attribute.id, self.date_time, 10)
+        writer.add(
+            self.station.id, self.attribute.id, '2024-01-02T00:00:00Z', 2
+        )
+        writer.add(
+            self.station.id, self.attribute.id,
+            datetime(2024, 1, 2), 20
+        )
+        self.assertEqual(writer.flush(), (1, 0))
+        self.assertEqual(writer.flush(), (0, 0))
+        self.assertEqual(self._values(), [1, 2])
+
+    def test_update_existing(self):
+        """Test existing rows are updated like update_or_create."""
+        with MeasurementBulkWriter(batch_size=2) as writer:
+            writer.add(
+                self.station.id, self.attribute.id, self.date_time, 10
+            )
+            writer.add(
+                self.station.id, self.attribute.id,
+                '2024-01-02T00:00:00Z', 2
+            )
+            # first batch is written when it is full
+            self.assertEqual(writer.counts, {'inserted': 1, 'updated': 1})
+            writer.add(
+                self.station.id, self.attribute.id,
+                '2024-01-02T00:00:00Z', 2
+            )
+        self.assertEqual(writer.counts, {'inserted': 1, 'updated': 1})
+        self.assertEqual(self._values(), [10, 2])
+
+        writer = MeasurementBulkWriter()
+        writer.add(
+            self.station.id, self.attribute.id,
+            '2024-01-02T00:00:00Z', 3
+        )
+        writer.add(
+            self.station.id, self.attribute.id,
+            '2024-01-02T00:00:00Z', 4
+        )
+        self.assertEqual(writer.flush(), (0, 1))
+        self.assertEqual(self._values(), [10, 4])
+
+    def test_upsert_stations(self):
+        """Test stations and histories are created in bulk."""
+        provider = ProviderFactory.create()
+        station_type = StationTypeFactory.create()
+        stations = bulk_upsert_stations(provider, [
+            Station(
+                code='A', name='A', geometry=Point(0, 0),
+                station_type=station_type
+            ),
+            Station(
+                code='A', name='A2', geometry=Point(1, 1),
+                station_type=station_type
+            )
+        ])
+        self.assertEqual(list(stations.keys()), ['A'])
+        self.assertEqual(stations['A'].name, 'A')
+
+        stations = bulk_upsert_stations(provider, [
+            Station(
+                code='A', name='A3', geometry=Point(2, 2), altitude=10,
+                station_type=station_type
+            ),
+            Station(
+                code='B', name='B', geometry=Point(3, 3),
+                station_type=station_type
+            )
+        ], update_fields=['name', 'geometry', 'altitude'])
+        self.assertEqual(Station.objects.filter(provider=provider).count(), 2)
+        self.assertEqual(stations['A'].name, 'A3')
+        self.assertEqual(stations['A'].altitude, 10)
+
+        history_ids = bulk_upsert_station_histories([
+            StationHistory(
+                station=stations['A'], date_time=self.date_time,
+                geometry=Point(0, 0), altitude=1
+            ),
+            StationHistory(
+                station=stations['A'], date_time=self.date_time,
+                geometry=Point(1, 1), altitude=2
+            ),
+            StationHistory(
+                station=stations['B'], date_time=self.date_time,
+                geometry=Point(1, 1), altitude=3
+            )
+        ])
+        self.assertEqual(len(history_ids), 2)
+        history = StationHistory.objects.get(
+            id=history_ids[(stations['A'].id, self.date_time)]
+        )
+        self.assertEqual(history.altitude, 2)
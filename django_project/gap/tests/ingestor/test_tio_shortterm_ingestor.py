@@ -638,6 +638,67 @@ class TestDuckDBTioIngestor(TestCase):
         self.assertEqual(len(self.ingestor.metadata['chunks']), 1)
         self.assertEqual(self.collector.dataset_files.count(), 0)
 
+    def test_process_data_from_conn(self):
+        """Test scatter weather rows into the dense arrays."""
+        conn = duckdb.connect()
+        self.ingestor._init_table(conn)
+        start_date = date(2024, 10, 2)
+        for grid_id, offset in [(10, 0), (20, 100)]:
+            for day in range(21):
+                conn.execute(
+                    """
+                    INSERT INTO weather (
+                        grid_id, lat, lon, date, max_temperature
+                    ) VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [
+                        grid_id, 0, 0, start_date + timedelta(days=day),
+                        offset + day
+                    ]
+                )
+        lat_arr = [
+            CoordMapping(-1.0, 0, -1.0),
+            CoordMapping(-0.5, 1, -0.5)
+        ]
+        lon_arr = [
+            CoordMapping(36.0, 0, 36.0),
+            CoordMapping(36.5, 1, 36.5)
+        ]
+        grids = {
+            # lat -1.0 lon 36.0
+            'kzcd71yq': 10,
+            # lat -0.5 lon 36.5
+            'kzcvnsfr': 20,
+            # lat -1.0 lon 36.5 has no data in weather table
+            'kzcfq9fq': 30
+        }
+
+        with patch.object(
+            self.ingestor, '_update_by_region'
+        ) as mock_update:
+            warnings, count = (
+                self.ingestor._process_tio_shortterm_data_from_conn(
+                    start_date, lat_arr, lon_arr, grids, conn
+                )
+            )
+        conn.close()
+
+        self.assertEqual(count, 2)
+        self.assertEqual(warnings['missing_hash'], 1)
+        self.assertEqual(warnings['missing_json'], 1)
+        mock_update.assert_called_once()
+        new_data = mock_update.call_args[0][3]
+        values = new_data['max_temperature']
+        self.assertEqual(values.shape, (1, 21, 2, 2))
+        np.testing.assert_array_equal(
+            values[0, :, 0, 0], np.arange(21, dtype='f8')
+        )
+        np.testing.assert_array_equal(
+            values[0, :, 1, 1], np.arange(100, 121, dtype='f8')
+        )
+        self.assertTrue(np.isnan(values[0, :, 0, 1]).all())
+        self.assertTrue(np.isnan(values[0, :, 1, 0]).all())
+
 
 class TestDuckDBTioHourlyIngestor(TestCase):
     """Tomorrow.io hourly ingestor test case."""
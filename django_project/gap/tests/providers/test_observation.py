@@ -5,6 +5,9 @@ Tomorrow Now GAP.
 .. note:: Unit tests for Tahmo Reader.
 """
 
+import os
+import shutil
+import tempfile
 from unittest.mock import patch, MagicMock
 import duckdb
 import xarray as xr
@@ -40,6 +43,7 @@ from gap.utils.reader import (
     DatasetReaderInput,
     LocationInputType
 )
+from gap.utils.duckdb import duckdb_connection_pool
 
 
 class TestObservationReader(TestCase):
@@ -302,6 +306,206 @@ class TestObservationParquetReader(TestCase):
         self.start_date = datetime(2020, 1, 1)
         self.end_date = datetime(2020, 12, 31)
 
+    def test_get_partition_paths(self):
+        """Test partition paths for the date range."""
+        location_input = DatasetReaderInput.from_bbox([-180, -90, 180, 90])
+        reader = ObservationParquetReader(
+            self.dataset, [self.dataset_attr], location_input,
+            self.start_date, self.end_date
+        )
+        paths = reader._get_partition_paths(
+            's3://test-bucket/tahmo/',
+            datetime(2019, 11, 1), datetime(2020, 2, 1)
+        )
+        self.assertEqual(paths, [
+            's3://test-bucket/tahmo/year=2019/*.parquet',
+            's3://test-bucket/tahmo/year=2020/*.parquet'
+        ])
+
+        reader.has_month_partition = True
+        paths = reader._get_partition_paths(
+            's3://test-bucket/tahmo/',
+            datetime(2019, 11, 1), datetime(2020, 2, 1)
+        )
+        self.assertEqual(paths, [
+            's3://test-bucket/tahmo/year=2019/month=11/*.parquet',
+            's3://test-bucket/tahmo/year=2019/month=12/*.parquet',
+            's3://test-bucket/tahmo/year=2020/month=1/*.parquet',
+            's3://test-bucket/tahmo/year=2020/month=2/*.parquet'
+        ])
+
+    def test_get_parquet_files(self):
+        """Test finding parquet files of existing partitions."""
+        location_input = DatasetReaderInput.from_bbox([-180, -90, 180, 90])
+        reader = ObservationParquetReader(
+            self.dataset, [self.dataset_attr], location_input,
+            self.start_date, self.end_date
+        )
+        reader.directory_path = 's3://test-bucket/tahmo/'
+        reader.station_ids = None
+        reader.partition_paths = [
+            's3://test-bucket/tahmo/year=2019/*.parquet',
+            's3://test-bucket/tahmo/year=2020/*.parquet'
+        ]
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value.fetchall.side_effect = [
+            [], [('s3://test-bucket/tahmo/year=2020/data_0.parquet',)]
+        ]
+        self.assertEqual(
+            reader._get_parquet_files(mock_conn),
+            ['s3://test-bucket/tahmo/year=2020/data_0.parquet']
+        )
+        mock_conn.execute.assert_any_call(
+            'SELECT file FROM glob(?)',
+            ['s3://test-bucket/tahmo/year=2019/*.parquet']
+        )
+
+        # no file in the date range
+        mock_conn.execute.return_value.fetchall.side_effect = [[], []]
+        self.assertEqual(reader._get_parquet_files(mock_conn), [])
+
+    def test_filter_files_by_station(self):
+        """Test skipping files using station statistics."""
+        location_input = DatasetReaderInput.from_point(Point(36.8, -1.3))
+        reader = ObservationParquetReader(
+            self.dataset, [self.dataset_attr], location_input,
+            self.start_date, self.end_date
+        )
+        reader.directory_path = 's3://test-bucket/tahmo/'
+        reader.data_source = DataSourceFileFactory.create(
+            dataset=self.dataset,
+            format=DatasetStore.PARQUET,
+            metadata={
+                'station_stats': {
+                    'year=2019/data_0.parquet': [1, 10],
+                    'year=2020/data_0.parquet': [11, 20]
+                }
+            }
+        )
+        files = [
+            's3://test-bucket/tahmo/year=2019/data_0.parquet',
+            's3://test-bucket/tahmo/year=2020/data_0.parquet',
+            's3://test-bucket/tahmo/year=2020/data_1.parquet'
+        ]
+        reader.station_ids = [15]
+        self.assertEqual(
+            reader._filter_files_by_station(files), files[1:]
+        )
+        reader.station_ids = [5, 15]
+        self.assertEqual(reader._filter_files_by_station(files), files)
+        reader.station_ids = None
+        self.assertEqual(reader._filter_files_by_station(files), files)
+
+        # no file contains the station
+        reader.station_ids = [30]
+        reader.partition_paths = [
+            's3://test-bucket/tahmo/year=2019/*.parquet'
+        ]
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value.fetchall.return_value = [
+            ('s3://test-bucket/tahmo/year=2019/data_0.parquet',)
+        ]
+        self.assertEqual(reader._get_parquet_files(mock_conn), [])
+
+    @patch(
+        "gap.providers.observation.ObservationParquetReader._get_connection"
+    )
+    @patch(
+        (
+            "gap.providers.observation."
+            "ObservationParquetReader._get_directory_path"
+        )
+    )
+    def test_deduplicate_fragments(
+        self, mock_get_directory_path, mock_connection
+    ):
+        """Test rows of fragments override the compacted file."""
+        station = StationFactory.create(
+            geometry=Point(36.8219, -1.2921, srid=4326),
+            provider=self.dataset.provider
+        )
+        tmp_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(tmp_dir, 'year=2020'))
+        mock_get_directory_path.return_value = f'{tmp_dir}/'
+        conn = duckdb.connect()
+        mock_connection.return_value = conn
+
+        def write_file(name, dates, value):
+            df = pd.DataFrame({
+                'date_time': pd.to_datetime(dates),
+                'st_id': station.id,
+                'st_code': station.code,
+                'loc_x': 36.8219,
+                'loc_y': -1.2921,
+                'surface_air_temperature': value
+            })
+            conn.register('weather_df', df)
+            conn.sql(
+                "COPY weather_df TO "
+                f"'{tmp_dir}/year=2020/{name}' (FORMAT 'parquet')"
+            )
+            conn.unregister('weather_df')
+
+        write_file('data_0.parquet', ['2020-01-01', '2020-01-02'], 10.0)
+        location_input = DatasetReaderInput.from_point(
+            Point(36.8219, -1.2921)
+        )
+        reader = ObservationParquetReader(
+            self.dataset, [self.dataset_attr], location_input,
+            self.start_date, self.end_date
+        )
+        reader.read_historical_data(self.start_date, self.end_date)
+        data_value = reader.get_data_values()
+        self.assertNotIn('QUALIFY', data_value.query)
+
+        write_file(
+            'part-20200102000000000000-aaaa.parquet', ['2020-01-02'], 20.0
+        )
+        write_file(
+            'part-20200103000000000000-bbbb.parquet',
+            ['2020-01-02', '2020-01-03'], 30.0
+        )
+        data_value = reader.get_data_values()
+        self.assertIn('QUALIFY', data_value.query)
+        df = conn.execute(data_value.query, data_value.query_params).df()
+        conn.close()
+        shutil.rmtree(tmp_dir)
+        self.assertEqual(
+            df['surface_air_temperature'].tolist(), [10.0, 30.0, 30.0]
+        )
+
+    @patch(
+        "gap.providers.observation.ObservationParquetReader._get_connection"
+    )
+    @patch(
+        (
+            "gap.providers.observation."
+            "ObservationParquetReader._get_directory_path"
+        )
+    )
+    def test_read_historical_data_empty_window(
+        self, mock_get_directory_path, mock_connection
+    ):
+        """Test empty window does not query all partitions."""
+        mock_get_directory_path.return_value = 's3://test-bucket/tahmo/'
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value.fetchall.return_value = []
+        mock_connection.return_value = mock_conn
+        location_input = DatasetReaderInput.from_bbox([-180, -90, 180, 90])
+        reader = ObservationParquetReader(
+            self.dataset, [self.dataset_attr], location_input,
+            self.start_date, self.end_date
+        )
+        reader.read_historical_data(self.start_date, self.end_date)
+        data_value = reader.get_data_values()
+        self.assertTrue(data_value.is_empty())
+        # only the partition of the window is listed
+        mock_conn.execute.assert_called_once_with(
+            'SELECT file FROM glob(?)',
+            ['s3://test-bucket/tahmo/year=2020/*.parquet']
+        )
+        mock_conn.close.assert_called_once()
+
     def test_get_directory_path(self):
         """Test get_directory_path."""
         # Create a dummy bbox location input
@@ -404,7 +608,8 @@ class TestObservationParquetReader(TestCase):
         # Assert query is generated correctly
         self.assertIn("FROM read_parquet(", reader.query)
         self.assertIn("WHERE year>=", reader.query)
-        self.assertIn("st_id =", reader.query)
+        self.assertIn("st_id = $station_id", reader.query)
+        self.assertEqual(reader.query_params['station_id'], self.station.id)
 
     @patch(
         "gap.providers.observation.ObservationParquetReader._get_connection"
@@ -435,9 +640,17 @@ class TestObservationParquetReader(TestCase):
         reader.read_historical_data(self.start_date, self.end_date)
 
         normalized_query = "".join(reader.query.split())
-        expected_substring = "ST_MakeEnvelope(-180.0,-90.0,180.0,90.0)"
+        expected_substring = "ST_MakeEnvelope($xmin,$ymin,$xmax,$ymax)"
 
         self.assertIn(expected_substring, normalized_query)
+        self.assertEqual(reader.query_params['xmin'], -180.0)
+        self.assertEqual(reader.query_params['ymin'], -90.0)
+        self.assertEqual(reader.query_params['xmax'], 180.0)
+        self.assertEqual(reader.query_params['ymax'], 90.0)
+        self.assertEqual(
+            reader.partition_paths,
+            ['s3://test-bucket/tahmo/year=2020/*.parquet']
+        )
 
     @patch(
         "gap.providers.observation.ObservationParquetReader._get_connection"
@@ -478,6 +691,10 @@ class TestObservationParquetReader(TestCase):
         self.assertIn("FROM read_parquet(", reader.query)
         self.assertIn("WHERE year>=", reader.query)
         self.assertIn("ST_Within(geometry,", reader.query)
+        self.assertEqual(
+            reader.query_params['polygon'],
+            location_input.polygon.wkt
+        )
 
     @patch(
         "gap.providers.observation.ObservationParquetReader._get_connection"
@@ -551,6 +768,14 @@ class TestObservationParquetReader(TestCase):
         self.assertIn("FROM read_parquet(", reader.query)
         self.assertIn("WHERE year>=", reader.query)
         self.assertIn("st_id IN (", reader.query)
+        station_ids = [
+            v for k, v in reader.query_params.items()
+            if k.startswith('station_id_')
+        ]
+        self.assertCountEqual(
+            station_ids,
+            [self.station_1.id, self.station_2.id, self.station_3.id]
+        )
 
     @patch(
         "gap.providers.observation.ObservationParquetReader._get_connection"
@@ -740,7 +965,7 @@ class TestObservationParquetReader(TestCase):
     def test_csv_stream_export_query(self, mock_conn):
         """Test that the DuckDB export query executes correctly."""
         mock_duckdb = MagicMock()
-        mock_conn.sql.return_value = mock_duckdb
+        mock_conn.execute.return_value = mock_duckdb
 
         point = Point(x=26.97, y=-12.56, srid=4326)
         location_input = DatasetReaderInput.from_point(point)
@@ -756,7 +981,7 @@ class TestObservationParquetReader(TestCase):
 
         list(reader_value.to_csv_stream())
 
-        mock_conn.sql.assert_called()
+        mock_conn.execute.assert_called()
 
     @patch(
         (
@@ -806,6 +1031,7 @@ class TestObservationParquetReader(TestCase):
 
         mock_conn = MagicMock()
         mock_duckdb_connect.return_value = mock_conn
+        duckdb_connection_pool.clear()
 
         reader = ObservationParquetReader(
             self.dataset, [self.dataset_attr],
@@ -818,7 +1044,7 @@ class TestObservationParquetReader(TestCase):
 
         # Ensure duckdb.connect was called with a configuration
         mock_duckdb_connect.assert_called_once()
-        self.assertEqual(conn, mock_conn)
+        self.assertEqual(conn, mock_conn.cursor.return_value)
 
         # Ensure extensions are loaded
         mock_conn.install_extension.assert_any_call("httpfs")
@@ -826,6 +1052,13 @@ class TestObservationParquetReader(TestCase):
         mock_conn.install_extension.assert_any_call("spatial")
         mock_conn.load_extension.assert_any_call("spatial")
 
+        # Ensure the database is reused by next request
+        reader._get_connection()
+        mock_duckdb_connect.assert_called_once()
+        self.assertEqual(mock_conn.load_extension.call_count, 2)
+        self.assertEqual(mock_conn.cursor.call_count, 2)
+        duckdb_connection_pool.clear()
+
     @patch(
         (
             "gap.providers.observation."
@@ -838,7 +1071,7 @@ class TestObservationParquetReader(TestCase):
         """Test that to_netcdf drops 'station_id' and sets index correctly."""
         # Create mock DuckDB connection
         mock_conn = MagicMock()
-        mock_conn.sql.return_value.df.return_value = pd.DataFrame({
+        mock_conn.execute.return_value.df.return_value = pd.DataFrame({
             "date": pd.date_range(start="2022-01-01", periods=5),
             "lat": [1.0] * 5,
             "lon": [2.0] * 5,
@@ -867,7 +1100,7 @@ class TestObservationParquetReader(TestCase):
 
         # **Assertions**
         # Ensure station_id column is removed
-        df_result = mock_conn.sql.call_args[0][0]
+        df_result = mock_conn.execute.call_args[0][0]
         self.assertNotIn(
             "station_id",
             df_result, "station_id column was not removed"
@@ -875,7 +1108,7 @@ class TestObservationParquetReader(TestCase):
 
         # Ensure index is set correctly
         ds = xr.Dataset.from_dataframe(
-            mock_conn.sql.return_value.df.return_value
+            mock_conn.execute.return_value.df.return_value
         )
         if "index" in ds:
             ds = ds.drop_vars("index")
@@ -901,7 +1134,7 @@ class TestObservationParquetReader(TestCase):
         mock_duckdb_connect.return_value = mock_conn
 
         # Mock SQL query result
-        mock_conn.sql.return_value.df.return_value = pd.DataFrame({
+        mock_conn.execute.return_value.df.return_value = pd.DataFrame({
             "date": pd.date_range(start="2023-01-01", periods=3),
             "time": ["12:00:00", "14:00:00", None],  # Some missing times
             "lat": [0.5, 0.6, None],  # Drop lat
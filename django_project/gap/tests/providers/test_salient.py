@@ -318,12 +318,12 @@ class TestSalientNetCDFReader(TestCase):
             self.assertTrue(isinstance(data_value._val, xr.Dataset))
             dataset = data_value.xr_dataset
             # temp_clim
-            val = dataset['temp_clim'].sel(lat=p.y, lon=p.x)
+            val = dataset['temp_clim'].isel(location=0)
             self.assertEqual(len(val['forecast_day']), 3)
             self.assertAlmostEqual(
                 val.values[0], 19.461235, 6)
             # precip_anom
-            val = dataset['precip_anom'].sel(lat=p.y, lon=p.x)
+            val = dataset['precip_anom'].isel(location=0)
             self.assertEqual(len(val['forecast_day']), 3)
             self.assertEqual(len(val.values[:, 0]), 50)
 
@@ -6,11 +6,13 @@ Tomorrow Now GAP.
 """
 
 from django.contrib.gis.geos import Polygon
+from django.core.cache import cache
 from django.db.utils import IntegrityError
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from gap.factories import PreferencesFactory
 from gap.models import Preferences
+from gap.models.preferences import preferences_cache
 
 
 class PreferencesCRUDTest(TestCase):
@@ -51,3 +53,75 @@ class PreferencesCRUDTest(TestCase):
         provider_id = provider.id
         provider.delete()
         self.assertTrue(Preferences.objects.filter(id=provider_id).exists())
+
+
+@override_settings(
+    SINGLETON_CACHE_ENABLED=True,
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+)
+class PreferencesCacheTest(TestCase):
+    """Preferences process-local cache test case."""
+
+    def setUp(self):
+        """Set PreferencesCacheTest."""
+        preferences_cache.clear()
+        self.addCleanup(preferences_cache.clear)
+
+    def test_load_from_cache(self):
+        """Test load preferences without querying database."""
+        Preferences.load()
+        hit_count = Preferences.cache_stats()['hit_count']
+        with self.assertNumQueries(0):
+            obj = Preferences.load()
+        self.assertEqual(
+            Preferences.cache_stats()['hit_count'], hit_count + 1
+        )
+
+        # modifying the returned object does not change the cache
+        obj.dask_threads_num = 99
+        self.assertNotEqual(Preferences.load().dask_threads_num, 99)
+
+    def test_invalidate_on_save(self):
+        """Test cached preferences is invalidated after save."""
+        obj = Preferences.load()
+        obj.dask_threads_num = 7
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.save()
+        load_count = Preferences.cache_stats()['load_count']
+        self.assertEqual(Preferences.load().dask_threads_num, 7)
+        self.assertEqual(
+            Preferences.cache_stats()['load_count'], load_count + 1
+        )
+
+    @override_settings(SINGLETON_CACHE_CHECK_INTERVAL=0)
+    def test_invalidate_from_other_process(self):
+        """Test preferences is reloaded when the version is changed."""
+        Preferences.load()
+        # simulate update from other process
+        Preferences.objects.filter(pk=1).update(dask_threads_num=3)
+        self.assertNotEqual(Preferences.load().dask_threads_num, 3)
+        cache.set(preferences_cache.version_key, 'new-version')
+        self.assertEqual(Preferences.load().dask_threads_num, 3)
+
+    @override_settings(SINGLETON_CACHE_CHECK_INTERVAL=0)
+    def test_version_changed_while_loading(self):
+        """Test object loaded before the version changed is not cached."""
+        stale_obj = Preferences.load()
+        preferences_cache.clear()
+
+        def loader():
+            # other process commits a change while the row is loaded
+            Preferences.objects.filter(pk=1).update(dask_threads_num=3)
+            cache.set(preferences_cache.version_key, 'new-version')
+            # other thread picks up the new version
+            preferences_cache.check_version()
+            return stale_obj
+
+        self.assertNotEqual(
+            preferences_cache.get(loader).dask_threads_num, 3
+        )
+        self.assertEqual(Preferences.load().dask_threads_num, 3)
@@ -0,0 +1,80 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP.
+
+.. note:: Unit tests for DuckDB Utils.
+"""
+
+from unittest.mock import patch
+from django.test import TestCase
+
+from gap.utils.duckdb import DuckDBConnectionPool
+
+
+class TestDuckDBConnectionPool(TestCase):
+    """Unit test for DuckDBConnectionPool."""
+
+    def test_reuse_database(self):
+        """Test cursors share the same database."""
+        pool = DuckDBConnectionPool()
+        conn_1 = pool.get_connection({'threads': 2})
+        conn_2 = pool.get_connection({'threads': 2})
+        conn_1.execute('CREATE TABLE test AS SELECT 1 AS val')
+        self.assertEqual(
+            conn_2.execute('SELECT val FROM test').fetchone(), (1,)
+        )
+        # closing a cursor does not close the database
+        conn_1.close()
+        conn_3 = pool.get_connection({'threads': 2})
+        self.assertEqual(
+            conn_3.execute('SELECT val FROM test').fetchone(), (1,)
+        )
+        self.assertEqual(
+            conn_3.execute(
+                "SELECT current_setting('threads')"
+            ).fetchone(),
+            (2,)
+        )
+
+        # different config uses another database
+        conn_4 = pool.get_connection({'threads': 1})
+        self.assertEqual(
+            conn_4.execute(
+                "SELECT COUNT(*) FROM information_schema.tables "
+                "WHERE table_name = 'test'"
+            ).fetchone(),
+            (0,)
+        )
+        conn_2.close()
+        conn_3.close()
+        conn_4.close()
+
+    def test_recycle_database(self):
+        """Test database is recycled after max age and failed check."""
+        pool = DuckDBConnectionPool(max_age=0)
+        conn_1 = pool.get_connection({'threads': 1})
+        conn_1.execute('CREATE TABLE test AS SELECT 1 AS val')
+        conn_2 = pool.get_connection({'threads': 1})
+        self.assertEqual(
+            conn_2.execute(
+                "SELECT COUNT(*) FROM information_schema.tables "
+                "WHERE table_name = 'test'"
+            ).fetchone(),
+            (0,)
+        )
+        # old cursor is still usable
+        self.assertEqual(
+            conn_1.execute('SELECT val FROM test').fetchone(), (1,)
+        )
+
+        pool = DuckDBConnectionPool()
+        pool.get_connection({'threads': 1}).close()
+        with patch.object(pool, '_is_healthy', return_value=False):
+            with patch.object(
+                pool, '_create_connection',
+                wraps=pool._create_connection
+            ) as mock_create:
+                pool.get_connection({'threads': 1}).close()
+                mock_create.assert_called_once()
+        conn_1.close()
+        conn_2.close()
@@ -244,6 +244,63 @@ class TestDatasetReaderValue(TestCase):
         res = list(d)
         self.assertIsNotNone(res)
 
+    def test_to_csv_stream_with_location(self):
+        """Test convert dataset with location dimension to csv."""
+        ds = self.mock_xr_dataset.isel(
+            lat=xr.DataArray([0, 1, 1], dims='location'),
+            lon=xr.DataArray([0, 0, 1], dims='location')
+        )
+        location_input = DatasetReaderInput(
+            MultiPoint([Point(30, 10), Point(30, 20), Point(40, 20)]),
+            LocationInputType.LIST_OF_POINT
+        )
+        reader_value = DatasetReaderValue(
+            val=ds,
+            location_input=location_input,
+            attributes=[self.attribute]
+        )
+        csv_data = b''.join(reader_value.to_csv_stream()).decode()
+        lines = csv_data.splitlines()
+        self.assertEqual(lines[0], 'date,lat,lon,max_temperature')
+        self.assertEqual(len(lines), 31)
+        self.assertTrue(lines[2].startswith('2021-01-01,20,30,'))
+        self.assertTrue(lines[3].startswith('2021-01-01,20,40,'))
+
+        result = reader_value.to_json()
+        self.assertEqual(result['geometry']['type'], 'MultiPoint')
+        self.assertEqual(len(result['data']), 30)
+        self.assertEqual(result['data'][1]['lat'], 20)
+        self.assertEqual(result['data'][1]['lon'], 30)
+
+    def test_to_csv_with_location_chunks(self):
+        """Test csv with location chunks is ordered by date."""
+        ds = self.mock_xr_dataset.isel(
+            lat=xr.DataArray([0, 1, 1], dims='location'),
+            lon=xr.DataArray([0, 0, 1], dims='location')
+        )
+        location_input = DatasetReaderInput(
+            MultiPoint([Point(30, 10), Point(30, 20), Point(40, 20)]),
+            LocationInputType.LIST_OF_POINT
+        )
+        reader_value = DatasetReaderValue(
+            val=ds,
+            location_input=location_input,
+            attributes=[self.attribute]
+        )
+        ds, dim_order, reordered_cols = reader_value._get_dataset_for_csv(
+            date_chunk_size=4, location_chunk_size=2
+        )
+        self.assertEqual(ds.chunksizes['location'], (2, 1))
+        df = pd.concat(
+            reader_value._iter_location_chunks(ds, dim_order, reordered_cols)
+        )
+        self.assertEqual(len(df), 30)
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertEqual(
+            list(zip(df['lat'], df['lon']))[:3],
+            [(10, 30), (20, 30), (20, 40)]
+        )
+
 
 class TestDatasetReaderInput(TestCase):
     """Unit test for DatasetReaderInput class."""
@@ -518,6 +575,32 @@ class TestCBAMNetCDFReader(TestCase):
             np.datetime64(self.end_date)
         )
         self.assertIsInstance(result, xr.Dataset)
+        self.assertEqual(result['var1'].dims, ('time', 'location'))
+        self.assertEqual(result.sizes['location'], 2)
+        # point between two cells uses the first cell
+        np.testing.assert_allclose(result['lat'].values, [-10, 10])
+        np.testing.assert_allclose(result['lon'].values, [-20, 20])
+
+    def test_find_points_indices(self):
+        """Test find nearest indices of list of point."""
+        dataset = xr.Dataset(
+            {'var1': (['lat', 'lon'], np.random.rand(5, 5))},
+            coords={
+                'lat': np.array([4, 3, 2, 1, 0]),
+                'lon': np.array([0, 1, 2, 3, 4])
+            }
+        )
+        self.reader.location_input = DatasetReaderInput(
+            MultiPoint([
+                Point(3.9, 0.1), Point(0.5, 2.5), Point(4.1, 0.2),
+                Point(-5, 10)
+            ]),
+            LocationInputType.LIST_OF_POINT
+        )
+        lat_idx, lon_idx = self.reader._find_points_indices(dataset)
+        # duplicate cell is removed and ties use the first index
+        self.assertEqual(list(lat_idx), [4, 1, 0])
+        self.assertEqual(list(lon_idx), [4, 0, 0])
 
     def test_find_locations(self):
         """Test find locations method."""
@@ -533,6 +616,15 @@ class TestCBAMNetCDFReader(TestCase):
         self.assertEqual(lat_len, 10)
         self.assertEqual(lon_len, 10)
 
+        dataset = dataset.isel(
+            lat=xr.DataArray([0, 9], dims='location'),
+            lon=xr.DataArray([1, 2], dims='location')
+        )
+        locations, lat_len, lon_len = self.reader.find_locations(dataset)
+        self.assertEqual(len(locations), 2)
+        self.assertEqual(lat_len, 2)
+        self.assertEqual(lon_len, 1)
+
     @patch.object(CBAMNetCDFReader, '_read_variables_by_point')
     @patch.object(CBAMNetCDFReader, '_read_variables_by_bbox')
     @patch.object(CBAMNetCDFReader, '_read_variables_by_polygon')
@@ -5,8 +5,13 @@ Tomorrow Now GAP.
 .. note:: Parquet test.
 """
 
+import os
+import shutil
 import datetime
+import tempfile
+import duckdb
 import mock
+import pandas as pd
 from django.test import TestCase, override_settings
 from django.core.files.storage import storages
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -14,14 +19,18 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from core.settings.utils import absolute_path
 from gap.models import (
     Dataset, IngestorType, IngestorSession, DataSourceFile,
-    DatasetStore
+    DatasetStore, Measurement
 )
+from gap.factories import DataSourceFileFactory
 from gap.utils.parquet import (
     ParquetConverter,
     ParquetIngestorAppender,
     WindborneParquetIngestorAppender
 )
-from gap.tasks.ingestor import convert_dataset_to_parquet
+from gap.tasks.ingestor import (
+    convert_dataset_to_parquet,
+    compact_parquet_fragments
+)
 
 
 class ParquetConverterTest(TestCase):
@@ -135,6 +144,57 @@ class ParquetConverterTest(TestCase):
             2018
         )
 
+    def test_process_subset(self):
+        """Test pivot of measurements is the same as pandas pivot table."""
+        session = IngestorSession.objects.create(
+            file=self.correct_file,
+            ingestor_type=self.ingestor_type,
+            trigger_task=False,
+            trigger_parquet=False
+        )
+        session.run()
+        session.refresh_from_db()
+
+        converter = ParquetConverter(
+            self.dataset, DataSourceFile(name='tahmo_test_store')
+        )
+        data_path = converter._process_subset(2018)
+        df = pd.read_parquet(data_path)
+        shutil.rmtree(os.path.dirname(data_path))
+        self.assertIsNone(converter._process_subset(2000))
+
+        # expected output from measurements in Django ORM
+        measurements = Measurement.objects.filter(
+            dataset_attribute__dataset=self.dataset,
+            date_time__year=2018
+        ).annotate(**converter.WEATHER_FIELDS).values(
+            *(list(converter.WEATHER_FIELDS.keys()) + ['value'])
+        )
+        expected_df = pd.DataFrame(list(measurements)).pivot_table(
+            index=['dt', 'st_id', 'year', 'month', 'day'],
+            columns='attr',
+            values='value'
+        ).reset_index().rename(columns={'dt': 'date_time'})
+        attributes = list(expected_df.columns[5:])
+        self.assertEqual(attributes, sorted(attributes))
+        self.assertEqual(
+            list(df.columns),
+            list(expected_df.columns) + [
+                attr for attr in converter.attributes
+                if attr not in attributes
+            ] + [
+                'altitude', 'country_id', 'loc_x', 'loc_y', 'st_code',
+                'iso_a3', 'geom'
+            ]
+        )
+        df = df.sort_values(['date_time', 'st_id']).reset_index(drop=True)
+        expected_df = expected_df.sort_values(
+            ['date_time', 'st_id']
+        ).reset_index(drop=True)
+        pd.testing.assert_frame_equal(
+            df[expected_df.columns], expected_df, check_dtype=False
+        )
+
     def test_appender_not_run(self):
         """Test run appender not called."""
         data_source = DataSourceFile(name='tahmo_test_store')
@@ -181,3 +241,148 @@ class ParquetConverterTest(TestCase):
         appender._process_date_range.return_value = None
         appender.run()
         appender._process_date_range.assert_called_once()
+
+    def test_station_layout(self):
+        """Test station layout options and station statistics."""
+        data_source = DataSourceFileFactory.create(
+            dataset=self.dataset,
+            format=DatasetStore.PARQUET,
+            metadata={
+                'station_stats': {
+                    'year=2019/data_0.parquet': [1, 2],
+                    'year=2020/data_0.parquet': [1, 2]
+                }
+            }
+        )
+        converter = ParquetConverter(self.dataset, data_source)
+        self.assertIn('ST_Hilbert', converter._get_order_by('geom', [0] * 4))
+        self.assertNotIn(
+            'ROW_GROUP_SIZE', converter._get_copy_options('year')
+        )
+
+        converter.layout = ParquetConverter.LAYOUT_STATION
+        converter.row_group_size = 5000
+        self.assertEqual(
+            converter._get_order_by('geom', [0] * 4).strip(),
+            'st_id, date_time'
+        )
+        self.assertIn(
+            'ROW_GROUP_SIZE 5000', converter._get_copy_options('year')
+        )
+
+        tmp_dir = tempfile.mkdtemp()
+        s3_path = f'{tmp_dir}/'
+        df = pd.DataFrame({
+            'st_id': [20, 10, 15],
+            'date_time': pd.to_datetime([
+                '2020-01-02', '2020-01-01', '2020-01-03'
+            ]),
+            'year': [2020, 2020, 2020]
+        })
+        conn = duckdb.connect()
+        conn.register('weather_df', df)
+        conn.sql(
+            f"""
+            COPY (SELECT * FROM weather_df ORDER BY st_id, date_time)
+            TO '{s3_path}'
+            ({converter._get_copy_options('year')});
+            """
+        )
+        converter._update_station_stats(conn, s3_path, ['year=2020'])
+        conn.close()
+        shutil.rmtree(tmp_dir)
+
+        data_source.refresh_from_db()
+        stats = data_source.metadata['station_stats']
+        self.assertEqual(stats['year=2019/data_0.parquet'], [1, 2])
+        files = [
+            key for key in stats.keys() if key.startswith('year=2020/')
+        ]
+        self.assertEqual(len(files), 1)
+        self.assertEqual(stats[files[0]], [10, 20])
+        self.assertEqual(data_source.metadata['parquet_layout'], 'station')
+
+    def test_compact(self):
+        """Test fragments are merged into a deduplicated file."""
+        tmp_dir = tempfile.mkdtemp()
+        s3_path = f'{tmp_dir}/'
+        partition_dir = os.path.join(tmp_dir, 'year=2020')
+        os.makedirs(partition_dir)
+        converter = ParquetConverter(
+            self.dataset, DataSourceFile(name='tahmo_test_compact'),
+            mode='a'
+        )
+        converter.layout = ParquetConverter.LAYOUT_STATION
+        converter.compaction_max_fragments = 3
+        converter._get_directory_path = mock.MagicMock(return_value=s3_path)
+        converter._get_connection = mock.MagicMock(
+            side_effect=lambda s3: duckdb.connect()
+        )
+        converter._get_station_bounds = mock.MagicMock(return_value=[0] * 4)
+        converter._list_files = mock.MagicMock(
+            side_effect=lambda path: [
+                (os.path.join(root, name),
+                 os.path.getsize(os.path.join(root, name)))
+                for root, _, names in os.walk(path) for name in names
+            ]
+        )
+        converter._delete_files = mock.MagicMock(
+            side_effect=lambda paths: [os.remove(path) for path in paths]
+        )
+        converter._upload_file = mock.MagicMock(side_effect=shutil.copy)
+
+        conn = duckdb.connect()
+        for name, st_ids, value in [
+            ('data_0.parquet', [1, 2], 10.0),
+            (converter._get_fragment_name(), [2, 3], 20.0),
+            (converter._get_fragment_name(), [3], 30.0)
+        ]:
+            df = pd.DataFrame({
+                'st_id': st_ids,
+                'date_time': pd.to_datetime(['2020-01-01'] * len(st_ids)),
+                'month': 1,
+                'value': value
+            })
+            conn.register('weather_df', df)
+            conn.sql(
+                "COPY weather_df TO "
+                f"'{os.path.join(partition_dir, name)}' (FORMAT 'parquet')"
+            )
+            conn.unregister('weather_df')
+
+        # fragments do not pass the threshold
+        self.assertEqual(converter.compact(), [])
+        self.assertEqual(len(os.listdir(partition_dir)), 3)
+
+        self.assertEqual(converter.compact(force=True), ['year=2020'])
+        self.assertEqual(os.listdir(partition_dir), ['data_0.parquet'])
+        df = conn.sql(
+            f"SELECT * FROM read_parquet('{partition_dir}/data_0.parquet', "
+            "hive_partitioning=false)"
+        ).df()
+        conn.close()
+        shutil.rmtree(tmp_dir)
+        self.assertEqual(
+            list(df.columns), ['st_id', 'date_time', 'month', 'value']
+        )
+        self.assertEqual(df['st_id'].tolist(), [1, 2, 3])
+        self.assertEqual(df['value'].tolist(), [10.0, 20.0, 30.0])
+        self.assertEqual(
+            list(converter.data_source.metadata['station_stats'].keys()),
+            ['year=2020/data_0.parquet']
+        )
+
+    def test_compact_parquet_fragments(self):
+        """Test compact_parquet_fragments task."""
+        DataSourceFileFactory.create(
+            dataset=self.dataset,
+            format=DatasetStore.PARQUET,
+            is_latest=True
+        )
+        with mock.patch.object(
+            ParquetConverter, 'setup'
+        ), mock.patch.object(
+            ParquetConverter, 'compact', return_value=['year=2020']
+        ) as mock_compact:
+            compact_parquet_fragments()
+        mock_compact.assert_called_once_with(force=False)
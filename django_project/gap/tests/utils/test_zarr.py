@@ -19,7 +19,7 @@ from unittest.mock import MagicMock, patch
 from core.models import ObjectStorageManager
 from gap.models import (
     Provider, Dataset, DatasetAttribute,
-    DatasetStore
+    DatasetStore, DataSourceFileCache
 )
 from gap.utils.reader import (
     DatasetReaderInput
@@ -37,7 +37,9 @@ from gap.factories import (
     DataSourceFileFactory,
     DataSourceFileCacheFactory
 )
-from gap.utils.zarr import BaseZarrReader
+from gap.utils.zarr import (
+    BaseZarrReader, ZarrDatasetPool, zarr_dataset_pool
+)
 
 
 class TestCBAMZarrReader(TestCase):
@@ -256,6 +258,66 @@ class TestCBAMZarrReader(TestCase):
         source_file_cache.refresh_from_db()
         self.assertIsNone(source_file_cache.expired_on)
 
+    @patch.dict('os.environ', {
+        'GAP_S3_ACCESS_KEY_ID': 'test_access_key',
+        'GAP_S3_SECRET_ACCESS_KEY': 'test_secret_key',
+        'GAP_S3_ENDPOINT_URL': 'https://test-endpoint.com',
+        'GAP_S3_REGION_NAME': '',
+        'GAP_S3_PRODUCTS_BUCKET_NAME': 'test-bucket',
+        'GAP_S3_PRODUCTS_DIR_PREFIX': 'test-prefix/'
+    })
+    @patch('xarray.open_zarr')
+    @patch('fsspec.filesystem')
+    @patch('s3fs.S3FileSystem')
+    @patch('os.uname')
+    @patch('os.getpid')
+    def test_open_dataset_from_pool(
+        self, mock_getpid, mock_uname, mock_s3fs,
+        mock_fsspec_filesystem, mock_open_zarr
+    ):
+        """Test open zarr dataset that is reused from the pool."""
+        mock_uname.return_value = [0, 'test-host']
+        mock_getpid.return_value = 1234
+        mock_open_zarr.return_value = MagicMock(spec=xrDataset)
+        zarr_dataset_pool.clear()
+
+        source_file = DataSourceFileFactory.create(
+            name='test_dataset.zarr',
+            metadata={
+                'drop_variables': ['test']
+            }
+        )
+        self.reader.setup_reader()
+        ds = self.reader.open_dataset(source_file)
+        self.assertEqual(
+            self.reader.open_dataset(source_file), ds
+        )
+        mock_open_zarr.assert_called_once()
+        mock_s3fs.assert_called_once()
+        stats = zarr_dataset_pool.stats()
+        self.assertEqual(stats['size'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+        # reader without cache does not use the pool
+        reader = CBAMZarrReader(
+            self.dataset, self.attributes, self.location_input,
+            self.start_date, self.end_date, use_cache=False
+        )
+        reader.setup_reader()
+        with patch('fsspec.get_mapper'):
+            reader.open_dataset(source_file)
+        self.assertEqual(mock_open_zarr.call_count, 2)
+
+        # ingestor updates the zarr
+        DataSourceFileCache.objects.filter(
+            source_file=source_file
+        ).update(expired_on=timezone.now())
+        self.reader.open_dataset(source_file)
+        self.assertEqual(mock_open_zarr.call_count, 3)
+        self.assertEqual(zarr_dataset_pool.stats()['misses'], 2)
+        zarr_dataset_pool.clear()
+
     @patch('gap.utils.zarr.BaseZarrReader.get_s3_variables')
     @patch('gap.utils.zarr.BaseZarrReader.get_s3_client_kwargs')
     def test_setup_reader(
@@ -467,3 +529,31 @@ class TestBaseZarrReader(TestCase):
         expected_cache_dir = f'/tmp/test-hostname_1234_{data_source.id}'
         cache_dir = BaseZarrReader.get_zarr_cache_dir(data_source)
         self.assertEqual(cache_dir, expected_cache_dir)
+
+    def test_zarr_dataset_pool(self):
+        """Test LRU eviction and invalidation of ZarrDatasetPool."""
+        pool = ZarrDatasetPool(max_size=2)
+        key_1 = pool.get_key(1, 'default', ['b', 'a'])
+        key_2 = pool.get_key(2, 'default', [])
+        key_3 = pool.get_key(3, 'default', None)
+        self.assertEqual(key_1, (1, 'default', ('a', 'b')))
+        pool.put(key_1, 'ds_1')
+        pool.put(key_2, 'ds_2')
+        self.assertEqual(pool.get(key_1), 'ds_1')
+        # key_2 is the least recently used
+        pool.put(key_3, 'ds_3')
+        self.assertIsNone(pool.get(key_2))
+        self.assertEqual(pool.get(key_3), 'ds_3')
+        self.assertEqual(
+            pool.stats(),
+            {'size': 2, 'max_size': 2, 'hits': 2, 'misses': 1}
+        )
+
+        pool.invalidate(1)
+        self.assertIsNone(pool.get(key_1))
+        self.assertEqual(pool.stats()['size'], 1)
+
+        # disabled pool
+        pool = ZarrDatasetPool(max_size=0)
+        pool.put(key_1, 'ds_1')
+        self.assertIsNone(pool.get(key_1))
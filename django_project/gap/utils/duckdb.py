@@ -0,0 +1,122 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP.
+
+.. note:: DuckDB Utils.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import List
+
+import duckdb
+
+
+logger = logging.getLogger(__name__)
+
+
+class DuckDBConnectionPool:
+    """Pool of in-memory DuckDB databases in a worker process.
+
+    A database is created once for each config with the extensions
+    loaded, then each request uses a cursor of the database.
+    The cursor shares the extensions, settings and object cache,
+    so the parquet metadata can be reused across requests.
+    Closing the cursor does not close the database.
+    The database is recycled after DUCKDB_POOL_MAX_AGE seconds
+    or when it fails the health check.
+    """
+
+    DEFAULT_MAX_AGE = 3600
+
+    def __init__(self, extensions: List[str] = None, max_age: int = None):
+        """Initialize DuckDBConnectionPool class.
+
+        :param extensions: extensions to be loaded, defaults to None
+        :type extensions: List[str], optional
+        :param max_age: max age of a database in seconds, defaults to None
+        :type max_age: int, optional
+        """
+        self.extensions = extensions or []
+        if max_age is None:
+            max_age = int(
+                os.environ.get('DUCKDB_POOL_MAX_AGE', self.DEFAULT_MAX_AGE)
+            )
+        self.max_age = max_age
+        self._connections = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(config: dict) -> tuple:
+        """Get pool key of a config.
+
+        :param config: DuckDB config
+        :type config: dict
+        :return: key of the config
+        :rtype: tuple
+        """
+        return tuple(sorted(config.items()))
+
+    def _create_connection(self, config: dict) -> duckdb.DuckDBPyConnection:
+        """Create a new database and load the extensions.
+
+        :param config: DuckDB config
+        :type config: dict
+        :return: DuckDB connection
+        :rtype: duckdb.DuckDBPyConnection
+        """
+        conn = duckdb.connect(config=config)
+        for extension in self.extensions:
+            conn.install_extension(extension)
+            conn.load_extension(extension)
+        return conn
+
+    def _is_healthy(self, conn: duckdb.DuckDBPyConnection) -> bool:
+        """Check whether the database can still execute query.
+
+        :param conn: DuckDB connection
+        :type conn: duckdb.DuckDBPyConnection
+        :return: True if the connection is usable
+        :rtype: bool
+        """
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except duckdb.Error as ex:
+            logger.warning(f'DuckDB connection is not healthy: {ex}')
+            return False
+
+    def get_connection(self, config: dict) -> duckdb.DuckDBPyConnection:
+        """Get a cursor of the pooled database.
+
+        :param config: DuckDB config
+        :type config: dict
+        :return: DuckDB cursor, should be closed by the caller
+        :rtype: duckdb.DuckDBPyConnection
+        """
+        key = self.get_key(config)
+        with self._lock:
+            conn, created_on = self._connections.get(key, (None, None))
+            if conn is not None and (
+                time.monotonic() - created_on > self.max_age or
+                not self._is_healthy(conn)
+            ):
+                # cursors that are still in use keep the old database
+                self._connections.pop(key)
+                conn = None
+            if conn is None:
+                conn = self._create_connection(config)
+                self._connections[key] = (conn, time.monotonic())
+            return conn.cursor()
+
+    def clear(self):
+        """Remove all databases from the pool."""
+        with self._lock:
+            self._connections.clear()
+
+
+duckdb_connection_pool = DuckDBConnectionPool(
+    extensions=['httpfs', 'spatial']
+)
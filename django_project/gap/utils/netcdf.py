@@ -7,7 +7,7 @@ Tomorrow Now GAP.
 
 import logging
 import traceback
-from typing import List
+from typing import List, Tuple
 from math import ceil
 from datetime import datetime, timedelta
 from django.contrib.gis.geos import Point
@@ -23,6 +23,7 @@ from gap.models import (
     DataSourceFile
 )
 from gap.utils.reader import (
+    LOCATION_DIM,
     LocationInputType,
     BaseDatasetReader,
     DatasetReaderInput
@@ -173,6 +174,78 @@ class BaseNetCDFReader(BaseDatasetReader):
             end_dt: np.datetime64) -> xrDataset:
         return None
 
+    def _find_nearest_indices(
+            self, coords: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """Find index of the nearest coordinate for each target.
+
+        Coordinates must be sorted (ascending or descending). When a
+        target lies exactly between two coordinates, the first one is
+        used, the same as argmin.
+        :param coords: sorted coordinate values
+        :type coords: np.ndarray
+        :param targets: values to be searched
+        :type targets: np.ndarray
+        :return: index of nearest coordinate for each target
+        :rtype: np.ndarray
+        """
+        coords = np.asarray(coords, dtype='f8')
+        targets = np.asarray(targets, dtype='f8')
+        if coords.size == 1:
+            return np.zeros(targets.size, dtype='int64')
+        if coords[0] > coords[-1]:
+            # negate descending coordinates so they can be searched
+            coords = -coords
+            targets = -targets
+        right = np.clip(np.searchsorted(coords, targets), 1, coords.size - 1)
+        left = right - 1
+        use_left = (
+            np.abs(targets - coords[left]) <= np.abs(coords[right] - targets)
+        )
+        return np.where(use_left, left, right).astype('int64')
+
+    def _find_points_indices(
+            self, dataset: xrDataset) -> Tuple[np.ndarray, np.ndarray]:
+        """Find nearest lat and lon indices of the input points.
+
+        Points that fall into the same grid cell are returned once.
+        :param dataset: Dataset to be read
+        :type dataset: xrDataset
+        :return: lat indices and lon indices
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        points = self.location_input.points
+        lat_idx = self._find_nearest_indices(
+            dataset['lat'].values, [point.y for point in points]
+        )
+        lon_idx = self._find_nearest_indices(
+            dataset['lon'].values, [point.x for point in points]
+        )
+        # remove duplicate cells and keep the order of input points
+        _, unique_idx = np.unique(
+            np.stack([lat_idx, lon_idx], axis=1), axis=0, return_index=True
+        )
+        unique_idx = np.sort(unique_idx)
+        return lat_idx[unique_idx], lon_idx[unique_idx]
+
+    def _read_points(self, dataset: xrDataset) -> xrDataset:
+        """Select the input points from dataset using pointwise indexing.
+
+        The lat and lon dimensions are replaced by location dimension,
+        so only the chunks that contain the points are read.
+        :param dataset: Dataset to be read
+        :type dataset: xrDataset
+        :return: Dataset with location dimension
+        :rtype: xrDataset
+        """
+        lat_idx, lon_idx = self._find_points_indices(dataset)
+        result = dataset.isel(
+            lat=xr.DataArray(lat_idx, dims=LOCATION_DIM),
+            lon=xr.DataArray(lon_idx, dims=LOCATION_DIM)
+        )
+        return result.assign_coords(
+            **{LOCATION_DIM: np.arange(lat_idx.size)}
+        )
+
     def _has_ensembles(self):
         attr = [a for a in self.attributes if a.ensembles]
         return len(attr) > 0
@@ -237,6 +310,10 @@ class BaseNetCDFReader(BaseDatasetReader):
         lon_values = val['lon'].values
         if lat_values.ndim == 0 and lon_values.ndim == 0:
             return [Point(x=float(lon_values), y=float(lat_values))], 1, 1
+        if LOCATION_DIM in val.dims:
+            for lat, lon in zip(lat_values, lon_values):
+                locations.append(Point(x=float(lon), y=float(lat)))
+            return locations, len(locations), 1
         for lat in lat_values:
             for lon in lon_values:
                 locations.append(Point(x=float(lon), y=float(lat)))
@@ -5,9 +5,13 @@ Tomorrow Now GAP.
 .. note:: Helper for reading and writing Parquet Files
 """
 
+import os
+import uuid
+import shutil
 import logging
+import tempfile
 import pandas as pd
-import numpy as np
+from collections import defaultdict
 from datetime import datetime, timezone
 from django.db.models import F
 from django.db.models.functions.datetime import (
@@ -20,6 +24,7 @@ from django.contrib.gis.db.models import Union
 from django.contrib.gis.db.models.functions import AsWKB
 import duckdb
 from django.conf import settings
+from django.db import connection
 from django.core.files.storage import storages
 
 from core.models import ObjectStorageManager
@@ -36,9 +41,33 @@ logger = logging.getLogger(__name__)
 
 
 class ParquetConverter:
-    """Class to convert Measurement data to GeoParquet."""
+    """Class to convert Measurement data to GeoParquet.
+
+    Rows are ordered by Hilbert curve of the station geometry.
+    When parquet_layout in ingestor config is 'station', rows are
+    ordered by station and date_time, so point query can skip
+    row groups and files using the station min/max statistics.
+    Measurements are streamed from Postgres and pivoted in DuckDB
+    by month, parquet_memory_limit in ingestor config limits
+    the memory of DuckDB before spilling to disk.
+    In append mode, new rows are written as immutable fragment files
+    (part-<timestamp>.parquet) in the partition, so the partition
+    is not rewritten. The fragments are merged into data_0.parquet
+    by compact() once they pass parquet_compaction_max_fragments
+    or parquet_compaction_max_size. Readers keep the row of
+    the latest file for each station and date_time.
+    """
 
     STATION_JOIN_KEY = 'st_id'
+    LAYOUT_HILBERT = 'hilbert'
+    LAYOUT_STATION = 'station'
+    STATION_STATS_KEY = 'station_stats'
+    DEFAULT_ROW_GROUP_SIZE = 100000
+    DEFAULT_MEMORY_LIMIT = '2GB'
+    FRAGMENT_PREFIX = 'part-'
+    COMPACTED_FILE = 'data_0.parquet'
+    DEFAULT_COMPACTION_MAX_FRAGMENTS = 30
+    DEFAULT_COMPACTION_MAX_SIZE = 64 * 1024 * 1024
     WEATHER_FIELDS = {
         'dt': F('date_time'),
         'attr': F('dataset_attribute__attribute__variable_name'),
@@ -62,6 +91,21 @@ class ParquetConverter:
         self.mode = mode
         self.config = get_ingestor_config_from_preferences(dataset.provider)
         self.data_source = data_source
+        self.layout = self.config.get('parquet_layout', self.LAYOUT_HILBERT)
+        self.row_group_size = self.config.get(
+            'parquet_row_group_size', self.DEFAULT_ROW_GROUP_SIZE
+        )
+        self.memory_limit = self.config.get(
+            'parquet_memory_limit', self.DEFAULT_MEMORY_LIMIT
+        )
+        self.use_fragments = self.config.get('parquet_use_fragments', True)
+        self.compaction_max_fragments = self.config.get(
+            'parquet_compaction_max_fragments',
+            self.DEFAULT_COMPACTION_MAX_FRAGMENTS
+        )
+        self.compaction_max_size = self.config.get(
+            'parquet_compaction_max_size', self.DEFAULT_COMPACTION_MAX_SIZE
+        )
         self.attributes = [
             a.attribute.variable_name for a in
             DatasetAttribute.objects.select_related(
@@ -150,24 +194,193 @@ class ParquetConverter:
         _, files = s3_storage.listdir(path)
         return len(files) > 0
 
-    def _store_dataframe_as_geoparquet(
-        self, df: pd.DataFrame, s3_path, bbox, use_month=False
+    def _get_partition_path(self, year: int, month=None) -> str:
+        """Get partition path, e.g. year=2020/month=1."""
+        partition = f'year={year}'
+        if month:
+            partition += f'/month={month}'
+        return partition
+
+    def _get_object_key(self, path: str) -> str:
+        """Get object key in the bucket from s3 path."""
+        return path.replace(f's3://{self.s3["S3_BUCKET_NAME"]}/', '', 1)
+
+    def _list_files(self, path: str) -> list:
+        """List parquet files with their size under the directory.
+
+        :param path: directory path of the parquet files
+        :type path: str
+        :return: List of tuple (file path, size in bytes)
+        :rtype: List[Tuple[str, int]]
+        """
+        bucket_name = self.s3['S3_BUCKET_NAME']
+        s3_client = ObjectStorageManager.get_s3_client(self.s3)
+        paginator = s3_client.get_paginator('list_objects_v2')
+        files = []
+        for page in paginator.paginate(
+            Bucket=bucket_name, Prefix=self._get_object_key(path)
+        ):
+            for item in page.get('Contents', []):
+                if item['Key'].endswith('.parquet'):
+                    files.append(
+                        (f's3://{bucket_name}/{item["Key"]}', item['Size'])
+                    )
+        return files
+
+    def _delete_files(self, paths: list):
+        """Delete files from object storage.
+
+        :param paths: List of file path
+        :type paths: List[str]
+        """
+        s3_client = ObjectStorageManager.get_s3_client(self.s3)
+        # delete_objects accepts max 1000 keys
+        for idx in range(0, len(paths), 1000):
+            s3_client.delete_objects(
+                Bucket=self.s3['S3_BUCKET_NAME'],
+                Delete={
+                    'Objects': [
+                        {'Key': self._get_object_key(path)}
+                        for path in paths[idx:idx + 1000]
+                    ],
+                    'Quiet': True
+                }
+            )
+
+    def _upload_file(self, local_path: str, path: str):
+        """Upload local file to object storage.
+
+        :param local_path: path of the local file
+        :type local_path: str
+        :param path: destination file path
+        :type path: str
+        """
+        s3_client = ObjectStorageManager.get_s3_client(self.s3)
+        s3_client.upload_file(
+            local_path, self.s3['S3_BUCKET_NAME'], self._get_object_key(path)
+        )
+
+    def _is_fragment(self, path: str) -> bool:
+        """Check whether the file is a fragment of appended rows."""
+        return os.path.basename(path).startswith(self.FRAGMENT_PREFIX)
+
+    def _get_order_by(self, geometry, bbox):
+        """Get ORDER BY expression of the parquet rows.
+
+        :param geometry: SQL expression of the geometry
+        :type geometry: str
+        :param bbox: extent of the stations
+        :type bbox: tuple
+        :return: ORDER BY expression
+        :rtype: str
+        """
+        if self.layout == self.LAYOUT_STATION:
+            return f'{self.STATION_JOIN_KEY}, date_time'
+        return (
+            f"""
+            ST_Hilbert(
+                {geometry},
+                ST_Extent(ST_MakeEnvelope(
+                {bbox[0]}, {bbox[1]}, {bbox[2]}, {bbox[3]}))
+            )
+            """
+        )
+
+    def _get_copy_options(self, partition_by=None):
+        """Get options of COPY statement to parquet.
+
+        :param partition_by: partition columns, defaults to None
+            for writing a single file
+        :type partition_by: str, optional
+        :return: COPY options
+        :rtype: str
+        """
+        options = "FORMAT 'parquet', COMPRESSION 'zstd'"
+        if partition_by:
+            options += (
+                f", PARTITION_BY ({partition_by}), "
+                "OVERWRITE_OR_IGNORE true"
+            )
+        if self.layout == self.LAYOUT_STATION:
+            options += f', ROW_GROUP_SIZE {self.row_group_size}'
+        return options
+
+    def _update_station_stats(self, conn, s3_path, partitions):
+        """Store station min/max of each file in DataSourceFile metadata.
+
+        :param conn: DuckDB connection
+        :type conn: duckdb.DuckDBPyConnection
+        :param s3_path: directory path of the parquet files
+        :type s3_path: str
+        :param partitions: list of partition path, e.g. year=2020/month=1
+        :type partitions: List[str]
+        """
+        if self.layout != self.LAYOUT_STATION:
+            return
+        metadata = self.data_source.metadata or {}
+        station_stats = {
+            key: value for key, value in
+            metadata.get(self.STATION_STATS_KEY, {}).items()
+            if not any(key.startswith(f'{p}/') for p in partitions)
+        }
+        for partition in partitions:
+            rows = conn.execute(
+                """
+                SELECT file_name,
+                MIN(stats_min_value::BIGINT), MAX(stats_max_value::BIGINT)
+                FROM parquet_metadata(?)
+                WHERE path_in_schema = ?
+                GROUP BY file_name
+                """,
+                [f'{s3_path}{partition}/*.parquet', self.STATION_JOIN_KEY]
+            ).fetchall()
+            for file_name, min_id, max_id in rows:
+                station_stats[file_name.replace(s3_path, '')] = [
+                    min_id, max_id
+                ]
+        metadata[self.STATION_STATS_KEY] = station_stats
+        metadata['parquet_layout'] = self.layout
+        self.data_source.metadata = metadata
+        if self.data_source.pk:
+            self.data_source.save(update_fields=['metadata'])
+
+    def _get_partitions(self, conn, data_path: str, use_month=False):
+        """Get partition path of the data.
+
+        :param conn: DuckDB connection
+        :type conn: duckdb.DuckDBPyConnection
+        :param data_path: local parquet file of the data
+        :type data_path: str
+        :param use_month: whether partitioned by month, defaults to False
+        :type use_month: bool, optional
+        :return: list of partition path, e.g. year=2020/month=1
+        :rtype: List[str]
+        """
+        if use_month:
+            rows = conn.sql(
+                f"""
+                SELECT DISTINCT year, month
+                FROM read_parquet('{data_path}')
+                """
+            ).fetchall()
+            return [f'year={year}/month={month}' for year, month in rows]
+        rows = conn.sql(
+            f"SELECT DISTINCT year FROM read_parquet('{data_path}')"
+        ).fetchall()
+        return [f'year={row[0]}' for row in rows]
+
+    def _store_as_geoparquet(
+        self, data_path: str, s3_path, bbox, use_month=False
     ):
         print('Writing a new parquet file')
         conn = self._get_connection(self.s3)
-        # copy df to duckdb table
-        columns = [c for c in list(df.columns) if c != 'geom']
+        # copy data to duckdb table
         sql = (
             f"""
             CREATE TABLE weather AS
-            SELECT {','.join(columns)}, ST_GeomFromWKB(geom) AS geometry
-            FROM df
-            ORDER BY
-            ST_Hilbert(
-                ST_GeomFromWKB(geom),
-                ST_Extent(ST_MakeEnvelope(
-                {bbox[0]}, {bbox[1]}, {bbox[2]}, {bbox[3]}))
-            );
+            SELECT * EXCLUDE (geom), ST_GeomFromWKB(geom) AS geometry
+            FROM read_parquet('{data_path}')
+            ORDER BY {self._get_order_by('ST_GeomFromWKB(geom)', bbox)};
             """
         )
         conn.sql(sql)
@@ -179,18 +392,26 @@ class ParquetConverter:
             f"""
             COPY (SELECT * FROM weather)
             TO '{s3_path}'
-            (FORMAT 'parquet', COMPRESSION 'zstd',
-            PARTITION_BY ({partition_by}),
-            OVERWRITE_OR_IGNORE true);
+            ({self._get_copy_options(partition_by)});
             """
         )
+        partitions = self._get_partitions(conn, data_path, use_month)
+        fragments = [
+            path for partition in partitions
+            for path, _ in self._list_files(f'{s3_path}{partition}/')
+            if self._is_fragment(path)
+        ]
         conn.sql(sql)
+        # fragments must not override the rows of the new files
+        if fragments:
+            self._delete_files(fragments)
+        self._update_station_stats(conn, s3_path, partitions)
         conn.close()
 
-    def _append_dataframe_to_geoparquet(
-        self, df: pd.DataFrame, s3_path, bbox, year, month=None
+    def _append_to_geoparquet(
+        self, data_path: str, s3_path, bbox, year, month=None
     ):
-        print(f'Appending dataframe to existing {year}')
+        print(f'Appending data to existing {year}')
         conn = self._get_connection(self.s3)
 
         # copy original parquet to duckdb table
@@ -210,13 +431,12 @@ class ParquetConverter:
         )
         conn.sql(sql)
 
-        # insert df to duckdb table
-        columns = [c for c in list(df.columns) if c != 'geom']
+        # insert data to duckdb table
         sql = (
             f"""
             INSERT INTO tmp_weather BY NAME
-            SELECT {','.join(columns)}, ST_GeomFromWKB(geom) AS geometry
-            FROM df
+            SELECT * EXCLUDE (geom), ST_GeomFromWKB(geom) AS geometry
+            FROM read_parquet('{data_path}')
             """
         )
         conn.sql(sql)
@@ -226,32 +446,206 @@ class ParquetConverter:
             f"""
             CREATE TABLE weather AS
             SELECT * FROM tmp_weather
-            ORDER BY
-            ST_Hilbert(
-                geometry,
-                ST_Extent(ST_MakeEnvelope(
-                {bbox[0]}, {bbox[1]}, {bbox[2]}, {bbox[3]}))
-            );
+            ORDER BY {self._get_order_by('geometry', bbox)};
             """
         )
         conn.sql(sql)
 
         # export to parquet file
         partition_by = 'year'
+        partition = f'year={year}'
         if month:
             partition_by += ',month'
+            partition += f'/month={month}'
         sql = (
             f"""
             COPY (SELECT * FROM weather)
             TO '{s3_path}'
-            (FORMAT 'parquet', COMPRESSION 'zstd',
-            PARTITION_BY ({partition_by}),
-            OVERWRITE_OR_IGNORE true);
+            ({self._get_copy_options(partition_by)});
+            """
+        )
+        conn.sql(sql)
+        self._update_station_stats(conn, s3_path, [partition])
+        conn.close()
+
+    def _get_fragment_name(self) -> str:
+        """Get file name of a new fragment.
+
+        The names are sorted by the creation time, so the row
+        of the latest fragment can be selected by the file name.
+        """
+        return (
+            f'{self.FRAGMENT_PREFIX}'
+            f'{datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S%f")}-'
+            f'{uuid.uuid4().hex[:8]}.parquet'
+        )
+
+    def _write_fragment(
+        self, data_path: str, s3_path, bbox, year, month=None
+    ):
+        """Write new rows as a fragment file in the partition.
+
+        :param data_path: local parquet file from _process_measurements
+        :type data_path: str
+        :param s3_path: directory path of the parquet files
+        :type s3_path: str
+        :param bbox: extent of the stations
+        :type bbox: tuple
+        :param year: year of the subset
+        :type year: int
+        :param month: month partition of the subset, defaults to None
+        :type month: int, optional
+        """
+        print(f'Writing fragment to {year}')
+        conn = self._get_connection(self.s3)
+        partition = self._get_partition_path(year, month)
+        # partition columns are not stored in the files
+        exclude = 'geom, year, month' if month else 'geom, year'
+        sql = (
+            f"""
+            COPY (
+                SELECT * EXCLUDE ({exclude}),
+                ST_GeomFromWKB(geom) AS geometry
+                FROM read_parquet('{data_path}')
+                ORDER BY {self._get_order_by('ST_GeomFromWKB(geom)', bbox)}
+            ) TO '{s3_path}{partition}/{self._get_fragment_name()}'
+            ({self._get_copy_options()});
             """
         )
         conn.sql(sql)
+        self._update_station_stats(conn, s3_path, [partition])
         conn.close()
 
+    def _compact_partition(
+        self, s3_path: str, partition: str, files: list, bbox
+    ):
+        """Merge files of a partition into a sorted file.
+
+        Rows of the same station and date_time are deduplicated
+        by keeping the row of the latest file. The merged file
+        replaces data_0.parquet, then the other files are deleted.
+        :param s3_path: directory path of the parquet files
+        :type s3_path: str
+        :param partition: partition path, e.g. year=2020/month=1
+        :type partition: str
+        :param files: List of file path in the partition
+        :type files: List[str]
+        :param bbox: extent of the stations
+        :type bbox: tuple
+        """
+        print(f'Compacting {len(files)} files of {partition}')
+        tmp_dir = tempfile.mkdtemp(prefix='gap-parquet-')
+        compacted_path = os.path.join(tmp_dir, self.COMPACTED_FILE)
+        conn = self._get_connection(self.s3)
+        partition_cols = [p.split('=')[0] for p in partition.split('/')]
+        exclude = ', '.join(['filename'] + partition_cols)
+        file_list = ', '.join(f"'{path}'" for path in files)
+        sql = (
+            f"""
+            COPY (
+                SELECT * EXCLUDE ({exclude})
+                FROM read_parquet(
+                    [{file_list}], hive_partitioning=true, filename=true
+                )
+                QUALIFY ROW_NUMBER() OVER (
+                    PARTITION BY {self.STATION_JOIN_KEY}, date_time
+                    ORDER BY filename DESC
+                ) = 1
+                ORDER BY {self._get_order_by('geometry', bbox)}
+            ) TO '{compacted_path}'
+            ({self._get_copy_options()});
+            """
+        )
+        try:
+            conn.sql(sql)
+            compacted_file = f'{s3_path}{partition}/{self.COMPACTED_FILE}'
+            self._upload_file(compacted_path, compacted_file)
+            # delete fragments last, so the rows are deduplicated
+            # until the old compacted files are removed
+            stale_files = [path for path in files if path != compacted_file]
+            self._delete_files(
+                [path for path in stale_files if not self._is_fragment(path)]
+            )
+            self._delete_files(
+                [path for path in stale_files if self._is_fragment(path)]
+            )
+            self._update_station_stats(conn, s3_path, [partition])
+        finally:
+            conn.close()
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def compact(self, force=False) -> list:
+        """Merge fragments of the partitions that pass the threshold.
+
+        :param force: merge all partitions that have fragments,
+            defaults to False
+        :type force: bool, optional
+        :return: List of compacted partition path
+        :rtype: List[str]
+        """
+        s3_path = self._get_directory_path(self.data_source)
+        partition_files = defaultdict(list)
+        for path, size in self._list_files(s3_path):
+            partition = os.path.dirname(path[len(s3_path):])
+            partition_files[partition].append((path, size))
+
+        compacted = []
+        station_bbox = None
+        for partition, files in sorted(partition_files.items()):
+            fragment_sizes = [
+                size for path, size in files if self._is_fragment(path)
+            ]
+            if not fragment_sizes:
+                continue
+            if not force and (
+                len(fragment_sizes) < self.compaction_max_fragments and
+                sum(fragment_sizes) < self.compaction_max_size
+            ):
+                continue
+            if station_bbox is None:
+                station_bbox = self._get_station_bounds()
+            self._compact_partition(
+                s3_path, partition, [path for path, _ in files],
+                station_bbox
+            )
+            compacted.append(partition)
+        return compacted
+
+    def _write_subset(
+        self, data_path: str, s3_path, bbox, year, parquet_exists,
+        month=None
+    ):
+        """Write data of a subset to GeoParquet and remove the data.
+
+        :param data_path: local parquet file from _process_measurements
+        :type data_path: str
+        :param s3_path: directory path of the parquet files
+        :type s3_path: str
+        :param bbox: extent of the stations
+        :type bbox: tuple
+        :param year: year of the subset
+        :type year: int
+        :param parquet_exists: whether the partition exists
+        :type parquet_exists: bool
+        :param month: month partition of the subset, defaults to None
+        :type month: int, optional
+        """
+        try:
+            if self.mode == 'a' and parquet_exists and self.use_fragments:
+                self._write_fragment(
+                    data_path, s3_path, bbox, year, month=month
+                )
+            elif self.mode == 'a' and parquet_exists:
+                self._append_to_geoparquet(
+                    data_path, s3_path, bbox, year, month=month
+                )
+            else:
+                self._store_as_geoparquet(
+                    data_path, s3_path, bbox, use_month=month is not None
+                )
+        finally:
+            shutil.rmtree(os.path.dirname(data_path), ignore_errors=True)
+
     def _get_station_bounds(self):
         combined_bbox = Station.objects.filter(
             provider=self.dataset.provider
@@ -260,17 +654,7 @@ class ParquetConverter:
         )
         return combined_bbox['combined_geometry'].extent
 
-    def _get_station_df(self, year, month=None):
-        station_ids = Measurement.objects.filter(
-            dataset_attribute__dataset=self.dataset,
-            date_time__year=year
-        )
-
-        station_ids = station_ids.distinct('station_id').values_list(
-            'station_id',
-            flat=True
-        )
-
+    def _get_station_df(self, station_ids: list):
         stations = Station.objects.filter(
             id__in=station_ids
         ).order_by('id')
@@ -289,62 +673,182 @@ class ParquetConverter:
         df['altitude'] = df['altitude'].astype('double')
         return df
 
-    def _process_weather_df(self, year: int, measurements: list, month=None):
-        # Convert to DataFrame
-        df = pd.DataFrame(measurements)
-        # Pivot the data to make attributes as columns
-        df = df.pivot_table(
-            index=[
-                k for k in list(self.WEATHER_FIELDS.keys()) if k != 'attr'
-            ],
-            columns='attr',
-            values='value'
-        ).reset_index()
-        print(f'Year {year} after pivot total_count: {df.shape[0]}')
-        # rename date time column
-        df = df.rename(columns={'dt': 'date_time'})
-
-        # add missing attributes
-        missing_cols = []
-        for attribute in self.attributes:
-            if attribute in df.columns:
-                continue
-            missing_cols.append(
-                pd.Series(
-                    np.nan, dtype='double', index=df.index, name=attribute
+    def _copy_measurements_to_csv(self, measurements, csv_path: str):
+        """Stream measurement rows into a CSV file.
+
+        Rows are read with COPY TO STDOUT in the same connection,
+        so they are not loaded into memory and uncommitted rows
+        of the current transaction are included.
+        :param measurements: Measurement queryset
+        :type measurements: QuerySet
+        :param csv_path: path of the CSV file
+        :type csv_path: str
+        """
+        measurements = measurements.annotate(**self.WEATHER_FIELDS).values(
+            *(list(self.WEATHER_FIELDS.keys()) + ['value'])
+        )
+        sql, params = measurements.query.sql_with_params()
+        # columns are in the same order as _get_csv_columns
+        columns = ', '.join(f'"{c}"' for c in self._get_csv_columns())
+        with connection.cursor() as cursor:
+            query = cursor.mogrify(sql, params)
+            if isinstance(query, bytes):
+                query = query.decode()
+            with open(csv_path, 'wb') as csv_file:
+                cursor.copy_expert(
+                    f'COPY (SELECT {columns} FROM ({query}) AS measurement) '
+                    'TO STDOUT WITH (FORMAT csv, HEADER)',
+                    csv_file
                 )
-            )
-        if missing_cols:
-            print(f'Adding missing columns: {len(missing_cols)}')
-            missing_cols.insert(0, df)
-            df = pd.concat(missing_cols, axis=1)
 
-        station_df = self._get_station_df(year, month=month)
-        # merge df with station_df
-        return df.merge(station_df, on=[self.STATION_JOIN_KEY], how='inner')
+    def _get_csv_columns(self) -> dict:
+        """Get column types of measurement CSV file."""
+        columns = {
+            key: 'BIGINT' for key in self.WEATHER_FIELDS.keys()
+        }
+        columns['dt'] = 'TIMESTAMPTZ'
+        columns['attr'] = 'VARCHAR'
+        columns['value'] = 'DOUBLE'
+        return columns
+
+    def _process_measurements(
+        self, year: int, measurement_batches: list, month=None
+    ):
+        """Pivot measurements into a local parquet file.
+
+        Each batch is streamed from Postgres into a CSV file,
+        then the attributes are pivoted with DuckDB, so the memory
+        does not grow with the number of rows in the subset.
+        The columns are the same as the pivot table of the measurements
+        merged with the stations: date_time, index fields,
+        attributes that have data (sorted), missing attributes,
+        then the station fields.
+        :param year: year of the subset
+        :type year: int
+        :param measurement_batches: list of Measurement queryset
+        :type measurement_batches: list
+        :param month: month of the subset, defaults to None
+        :type month: int, optional
+        :return: path to the parquet file or None if there is no data
+        :rtype: str
+        """
+        tmp_dir = tempfile.mkdtemp(prefix='gap-parquet-')
+        csv_path = os.path.join(tmp_dir, 'measurement.csv')
+        data_path = os.path.join(tmp_dir, 'weather.parquet')
+        conn = duckdb.connect(config={
+            'threads': 1,
+            'temp_directory': tmp_dir,
+            'memory_limit': self.memory_limit
+        })
+
+        column_types = self._get_csv_columns()
+        index_cols = [
+            k for k in list(self.WEATHER_FIELDS.keys()) if k != 'attr'
+        ]
+        table_columns = ', '.join(
+            [f'{c} {column_types[c]}' for c in index_cols] +
+            [f'"{attr}" DOUBLE' for attr in self.attributes]
+        )
+        csv_columns = ', '.join(
+            f"'{key}': '{value}'" for key, value in column_types.items()
+        )
+        not_null_cond = ' AND '.join(f'{c} IS NOT NULL' for c in index_cols)
+        attributes_in = ', '.join(
+            "'" + attr.replace("'", "''") + "'" for attr in self.attributes
+        )
+        group_by = ', '.join(index_cols)
+        try:
+            conn.sql(f'CREATE TABLE weather_pivot ({table_columns})')
+            for measurements in measurement_batches:
+                self._copy_measurements_to_csv(measurements, csv_path)
+                conn.sql(
+                    f"""
+                    INSERT INTO weather_pivot BY NAME
+                    PIVOT (
+                        SELECT * FROM read_csv(
+                            '{csv_path}', header=true,
+                            columns={{{csv_columns}}}
+                        )
+                        WHERE {not_null_cond}
+                    )
+                    ON attr IN ({attributes_in})
+                    USING AVG(value)
+                    GROUP BY {group_by}
+                    """
+                )
+                os.remove(csv_path)
+
+            total_count = conn.sql(
+                'SELECT COUNT(*) FROM weather_pivot'
+            ).fetchone()[0]
+            print(f'Year {year} after pivot total_count: {total_count}')
+            if total_count == 0:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                return None
+
+            # attributes that have data are sorted like pivot_table
+            attr_counts = ', '.join(
+                f'COUNT("{attr}")' for attr in self.attributes
+            )
+            counts = conn.sql(
+                f'SELECT {attr_counts} FROM weather_pivot'
+            ).fetchone()
+            attributes = sorted(
+                attr for attr, count in zip(self.attributes, counts)
+                if count > 0
+            ) + [
+                attr for attr, count in zip(self.attributes, counts)
+                if count == 0
+            ]
+
+            station_ids = [
+                row[0] for row in conn.sql(
+                    f'SELECT DISTINCT {self.STATION_JOIN_KEY} '
+                    'FROM weather_pivot'
+                ).fetchall()
+            ]
+            station_df = self._get_station_df(station_ids)
+            station_cols = [
+                c for c in station_df.columns if c != self.STATION_JOIN_KEY
+            ]
+            conn.register('station_df', station_df)
+
+            columns = ', '.join(
+                ['w.dt AS date_time'] +
+                [f'w.{c}' for c in index_cols if c != 'dt'] +
+                [f'w."{attr}"' for attr in attributes] +
+                [f's.{c}' for c in station_cols]
+            )
+            conn.sql(
+                f"""
+                COPY (
+                    SELECT {columns}
+                    FROM weather_pivot w
+                    JOIN station_df s
+                    ON w.{self.STATION_JOIN_KEY} = s.{self.STATION_JOIN_KEY}
+                ) TO '{data_path}' (FORMAT 'parquet')
+                """
+            )
+            return data_path
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        finally:
+            conn.close()
 
     def _process_subset(self, year: int, month=None):
         measurements = Measurement.objects.filter(
             dataset_attribute__dataset=self.dataset,
             date_time__year=year
         )
-        if month:
-            measurements = measurements.filter(
-                date_time__month=month
-            )
-
-        measurements = measurements.order_by('date_time', 'station_id')
-        print(f'Year {year} total_count: {measurements.count()}')
-
-        if measurements.count() == 0:
-            return None
-
-        measurements = measurements.annotate(**self.WEATHER_FIELDS).values(
-            *(list(self.WEATHER_FIELDS.keys()) + ['value'])
+        months = [month] if month else range(1, 13)
+        return self._process_measurements(
+            year, [
+                measurements.filter(date_time__month=m) for m in months
+            ],
+            month=month
         )
 
-        return self._process_weather_df(year, list(measurements), month=month)
-
     def run(self):
         """Run the converter."""
         s3_path = self._get_directory_path(self.data_source)
@@ -362,17 +866,14 @@ class ParquetConverter:
         station_bbox = self._get_station_bounds()
         for year in years:
             parquet_exists = self._check_parquet_exists(s3_path, year)
-            df = self._process_subset(year)
+            data_path = self._process_subset(year)
 
-            if df is None:
+            if data_path is None:
                 continue
 
-            if self.mode == 'a' and parquet_exists:
-                self._append_dataframe_to_geoparquet(
-                    df, s3_path, station_bbox, year
-                )
-            else:
-                self._store_dataframe_as_geoparquet(df, s3_path, station_bbox)
+            self._write_subset(
+                data_path, s3_path, station_bbox, year, parquet_exists
+            )
 
 
 class WindborneParquetConverter(ParquetConverter):
@@ -407,16 +908,7 @@ class WindborneParquetConverter(ParquetConverter):
         )
         return combined_bbox['combined_geometry'].extent
 
-    def _get_station_df(self, year, month=None):
-        station_hist_ids = Measurement.objects.filter(
-            dataset_attribute__dataset=self.dataset,
-            date_time__year=year,
-            date_time__month=month
-        ).distinct('station_history_id').values_list(
-            'station_history_id',
-            flat=True
-        )
-
+    def _get_station_df(self, station_hist_ids: list):
         stations = StationHistory.objects.filter(
             id__in=station_hist_ids
         ).order_by('id')
@@ -457,19 +949,15 @@ class WindborneParquetConverter(ParquetConverter):
             parquet_exists = self._check_parquet_exists(
                 s3_path, year, month=month
             )
-            df = self._process_subset(year, month=month)
+            data_path = self._process_subset(year, month=month)
 
-            if df is None:
+            if data_path is None:
                 continue
 
-            if self.mode == 'a' and parquet_exists:
-                self._append_dataframe_to_geoparquet(
-                    df, s3_path, station_bbox, year, month=month
-                )
-            else:
-                self._store_dataframe_as_geoparquet(
-                    df, s3_path, station_bbox, use_month=True
-                )
+            self._write_subset(
+                data_path, s3_path, station_bbox, year, parquet_exists,
+                month=month
+            )
 
 
 class ParquetIngestorAppender(ParquetConverter):
@@ -492,19 +980,10 @@ class ParquetIngestorAppender(ParquetConverter):
             date_time__year=year,
             date_time__gte=start_date,
             date_time__lte=end_date
-        ).order_by('date_time', 'station_id')
-        print(
-            f'{start_date} to {end_date} total_count: {measurements.count()}'
         )
+        print(f'Processing {start_date} to {end_date}')
 
-        if measurements.count() == 0:
-            return None
-
-        measurements = measurements.annotate(**self.WEATHER_FIELDS).values(
-            *(list(self.WEATHER_FIELDS.keys()) + ['value'])
-        )
-
-        return self._process_weather_df(year, list(measurements))
+        return self._process_measurements(year, [measurements])
 
     def run(self):
         """Run the converter."""
@@ -522,17 +1001,14 @@ class ParquetIngestorAppender(ParquetConverter):
             end_dt = datetime.fromtimestamp(end_epoch, tz=timezone.utc)
 
             parquet_exists = self._check_parquet_exists(s3_path, year)
-            df = self._process_date_range(year, start_dt, end_dt)
+            data_path = self._process_date_range(year, start_dt, end_dt)
 
-            if df is None:
+            if data_path is None:
                 continue
 
-            if self.mode == 'a' and parquet_exists:
-                self._append_dataframe_to_geoparquet(
-                    df, s3_path, station_bbox, year
-                )
-            else:
-                self._store_dataframe_as_geoparquet(df, s3_path, station_bbox)
+            self._write_subset(
+                data_path, s3_path, station_bbox, year, parquet_exists
+            )
 
 
 class WindborneParquetIngestorAppender(WindborneParquetConverter):
@@ -555,20 +1031,11 @@ class WindborneParquetIngestorAppender(WindborneParquetConverter):
             date_time__year=year,
             date_time__gte=start_date,
             date_time__lte=end_date
-        ).order_by('date_time', 'station_id')
-        print(
-            f'{start_date} to {end_date} total_count: {measurements.count()}'
         )
+        print(f'Processing {start_date} to {end_date}')
 
-        if measurements.count() == 0:
-            return None
-
-        measurements = measurements.annotate(**self.WEATHER_FIELDS).values(
-            *(list(self.WEATHER_FIELDS.keys()) + ['value'])
-        )
-
-        return self._process_weather_df(
-            year, list(measurements), month=start_date.month
+        return self._process_measurements(
+            year, [measurements], month=start_date.month
         )
 
     def run(self):
@@ -589,16 +1056,12 @@ class WindborneParquetIngestorAppender(WindborneParquetConverter):
             parquet_exists = self._check_parquet_exists(
                 s3_path, year, month=month
             )
-            df = self._process_date_range(year, start_dt, end_dt)
+            data_path = self._process_date_range(year, start_dt, end_dt)
 
-            if df is None:
+            if data_path is None:
                 continue
 
-            if self.mode == 'a' and parquet_exists:
-                self._append_dataframe_to_geoparquet(
-                    df, s3_path, station_bbox, year, month=month
-                )
-            else:
-                self._store_dataframe_as_geoparquet(
-                    df, s3_path, station_bbox, use_month=True
-                )
+            self._write_subset(
+                data_path, s3_path, station_bbox, year, parquet_exists,
+                month=month
+            )
@@ -38,6 +38,10 @@ from gap.models import (
 from gap.utils.dask import execute_dask_compute, get_num_of_threads
 
 
+# dimension of the dataset that is read from list of points
+LOCATION_DIM = 'location'
+
+
 class DatasetVariable:
     """Contains Variable from a Dataset."""
 
@@ -472,15 +476,21 @@ class DatasetReaderValue:
         :return: data dictionary
         :rtype: dict
         """
+        geometry = self._get_json_geometry()
         if self.is_empty():
             return {
-                'geometry': json.loads(self.location_input.point.json),
+                'geometry': geometry,
                 'data': []
             }
         ds, dim_order, reordered_cols = self._get_dataset_for_csv()
         df = ds.to_dataframe(dim_order=dim_order)
         df = df[reordered_cols]
-        df = df.drop(columns=['lat', 'lon'])
+        # keep lat and lon of each location
+        has_location = LOCATION_DIM in dim_order
+        if has_location:
+            df = df.droplevel(LOCATION_DIM)
+        else:
+            df = df.drop(columns=['lat', 'lon'])
         df = df.reset_index()
         # Replace NaN with None
         df = df.astype(object).where(pd.notnull(df), None)
@@ -491,11 +501,14 @@ class DatasetReaderValue:
         df = self._filter_df(df)
         if 'ensemble' in df.columns:
             # Sort first to ensure ensemble order is preserved
-            df = df.sort_values(['datetime', 'ensemble'])
+            group_keys = ['datetime']
+            if has_location:
+                group_keys += ['lat', 'lon']
+            df = df.sort_values(group_keys + ['ensemble'])
             # Group by datetime, then aggregate the values:
             # - as lists for ensemble attributes
             # - as first value for non-ensemble attributes
-            df = df.groupby('datetime').agg({
+            df = df.groupby(group_keys, sort=False).agg({
                 **{
                     col.attribute.variable_name: list
                     for col in self.attributes if col.ensembles
@@ -507,17 +520,33 @@ class DatasetReaderValue:
             })
             df = df.reset_index()
         return {
-            'geometry': json.loads(self.location_input.point.json),
+            'geometry': geometry,
             'data': df.to_dict(orient='records')
         }
 
+    def _get_json_geometry(self) -> dict:
+        """Get geometry of location input for json output.
+
+        :return: geojson of point or multipoint
+        :rtype: dict
+        """
+        if self.location_input.type == LocationInputType.LIST_OF_POINT:
+            return json.loads(MultiPoint(self.location_input.points).json)
+        return json.loads(self.location_input.point.json)
+
     def to_json(self) -> dict:
         """Convert result to json.
 
+        List of point is only supported for xarray Dataset.
         :raises TypeError: if location input is not a Point
         :return: data dictionary
         :rtype: dict
         """
+        if (
+            self._is_xr_dataset and
+            self.location_input.type == LocationInputType.LIST_OF_POINT
+        ):
+            return self._xr_dataset_to_dict()
         if self.location_input.type not in [
             LocationInputType.POINT, LocationInputType.POLYGON
         ]:
@@ -619,7 +648,7 @@ class DatasetReaderValue:
 
     def _get_dataset_for_csv(
         self, date_chunk_size=None, lat_chunk_size=None,
-        lon_chunk_size=None
+        lon_chunk_size=None, location_chunk_size=None
     ):
         dim_order = [self.date_variable]
 
@@ -643,6 +672,27 @@ class DatasetReaderValue:
                 rechunk['lat'] = lat_chunk_size or 100
                 rechunk['lon'] = lon_chunk_size or 100
                 rechunk['time'] = 24
+        elif LOCATION_DIM in self.xr_dataset.dims:
+            dim_order.append(LOCATION_DIM)
+            reordered_cols.insert(0, 'lon')
+            reordered_cols.insert(0, 'lat')
+            location_chunk_size = location_chunk_size or 1000
+            # all locations are written for each date chunk to order
+            # the output by date, so the date chunk is reduced
+            # when there are more locations than a location chunk
+            location_chunk_num = -(
+                -self.xr_dataset.sizes[LOCATION_DIM] // location_chunk_size
+            )
+            rechunk[self.date_variable] = (
+                date_chunk_size or max(30 // location_chunk_num, 1)
+            )
+            rechunk[LOCATION_DIM] = location_chunk_size
+            if self.has_time_column:
+                # slightly reducing chunk size for date
+                rechunk[self.date_variable] = (
+                    date_chunk_size or max(10 // location_chunk_num, 1)
+                )
+                rechunk['time'] = 24
         else:
             reordered_cols.insert(0, 'lon')
             reordered_cols.insert(0, 'lat')
@@ -672,6 +722,35 @@ class DatasetReaderValue:
 
         return ds, dim_order, reordered_cols
 
+    def _iter_location_chunks(self, ds, dim_order, reordered_cols):
+        """Iterate dataframe from dataset with location dimension.
+
+        Each dataframe has all locations of a date chunk, so the output
+        is ordered by date like the output from lat and lon dimensions.
+        The location chunks are computed by dask.
+        Location index is replaced by lat and lon columns, so the output
+        has the same columns as the output from lat and lon dimensions.
+        :param ds: dataset with location dimension
+        :type ds: xrDataset
+        :param dim_order: dimension order of the dataframe
+        :type dim_order: List[str]
+        :param reordered_cols: columns of the dataframe
+        :type reordered_cols: List[str]
+        :yield: dataframe for each date chunk
+        :rtype: pd.DataFrame
+        """
+        date_indices = self._get_chunk_indices(
+            ds.chunksizes[self.date_variable]
+        )
+        for date_start, date_stop in date_indices:
+            chunk = ds.isel(**{
+                self.date_variable: slice(date_start, date_stop)
+            })
+            chunk_df = chunk.to_dataframe(dim_order=dim_order)
+            chunk_df = chunk_df[reordered_cols]
+            chunk_df = chunk_df.droplevel(LOCATION_DIM)
+            yield self._filter_df(chunk_df)
+
     def _filter_df(self, df: pd.DataFrame) -> pd.DataFrame:
         """Filter dataframe."""
         if not self.has_time_column:
@@ -754,6 +833,25 @@ class DatasetReaderValue:
                                 index=True, header=False, float_format='%g',
                                 sep=separator
                             )
+            elif LOCATION_DIM in dim_order:
+                write_headers = True
+                for chunk_df in self._iter_location_chunks(
+                    ds, dim_order, reordered_cols
+                ):
+                    if write_headers:
+                        headers = [
+                            dim for dim in dim_order if dim != LOCATION_DIM
+                        ] + list(chunk_df.columns)
+                        yield bytes(
+                            separator.join(headers) + '\n',
+                            'utf-8'
+                        )
+                        write_headers = False
+
+                    yield chunk_df.to_csv(
+                        index=True, header=False, float_format='%g',
+                        sep=separator
+                    )
             else:
                 write_headers = True
                 # iterate foreach chunk
@@ -782,11 +880,12 @@ class DatasetReaderValue:
     def to_csv(
         self, suffix='.csv', separator=',',
         date_chunk_size=None, lat_chunk_size=None,
-        lon_chunk_size=None
+        lon_chunk_size=None, location_chunk_size=None
     ):
         """Generate csv file to object storage."""
         ds, dim_order, reordered_cols = self._get_dataset_for_csv(
-            date_chunk_size, lat_chunk_size, lon_chunk_size
+            date_chunk_size, lat_chunk_size, lon_chunk_size,
+            location_chunk_size
         )
 
         date_indices = self._get_chunk_indices(
@@ -830,6 +929,17 @@ class DatasetReaderValue:
                             )
                             if write_headers:
                                 write_headers = False
+            elif LOCATION_DIM in dim_order:
+                for chunk_df in self._iter_location_chunks(
+                    ds, dim_order, reordered_cols
+                ):
+                    chunk_df.to_csv(
+                        tmp_file.name, index=True, mode='a',
+                        header=write_headers,
+                        float_format='%g', sep=separator
+                    )
+                    if write_headers:
+                        write_headers = False
             else:
                 # iterate foreach chunk
                 for date_start, date_stop in date_indices:
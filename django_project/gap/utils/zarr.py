@@ -10,7 +10,9 @@ import logging
 import s3fs
 import fsspec
 import shutil
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
 from datetime import datetime
 import xarray as xr
 import numpy as np
@@ -34,6 +36,131 @@ from gap.utils.netcdf import BaseNetCDFReader
 logger = logging.getLogger(__name__)
 
 
+class ZarrDatasetPool:
+    """LRU pool of opened zarr datasets in a worker process.
+
+    Opening zarr requires creating s3 filesystem and parsing
+    the consolidated metadata, so the opened dataset is kept
+    and reused by the next requests in the same process.
+    The pool size can be set using ZARR_DATASET_POOL_SIZE env var,
+    0 to disable the pool.
+    """
+
+    DEFAULT_MAX_SIZE = 16
+
+    def __init__(self, max_size: int = None):
+        """Initialize ZarrDatasetPool class.
+
+        :param max_size: maximum number of opened datasets
+        :type max_size: int
+        """
+        if max_size is None:
+            max_size = int(
+                os.environ.get(
+                    'ZARR_DATASET_POOL_SIZE', self.DEFAULT_MAX_SIZE
+                )
+            )
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._datasets = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(
+        source_file_id: int, connection_name: str,
+        drop_variables: List[str]
+    ) -> Tuple:
+        """Get pool key of a dataset.
+
+        :param source_file_id: DataSourceFile id
+        :type source_file_id: int
+        :param connection_name: S3 connection name
+        :type connection_name: str
+        :param drop_variables: variables that are excluded
+        :type drop_variables: List[str]
+        :return: key of the dataset
+        :rtype: Tuple
+        """
+        return (
+            source_file_id,
+            connection_name,
+            tuple(sorted(drop_variables or []))
+        )
+
+    def get(self, key: Tuple) -> xrDataset:
+        """Get opened dataset from the pool.
+
+        :param key: key of the dataset
+        :type key: Tuple
+        :return: xArray Dataset or None if not in the pool
+        :rtype: xrDataset
+        """
+        with self._lock:
+            ds = self._datasets.get(key, None)
+            if ds is None:
+                self.misses += 1
+                return None
+            self._datasets.move_to_end(key)
+            self.hits += 1
+            return ds
+
+    def put(self, key: Tuple, ds: xrDataset):
+        """Store opened dataset to the pool.
+
+        The least recently used dataset is removed
+        when the pool is full.
+        :param key: key of the dataset
+        :type key: Tuple
+        :param ds: xArray Dataset
+        :type ds: xrDataset
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._datasets[key] = ds
+            self._datasets.move_to_end(key)
+            while len(self._datasets) > self.max_size:
+                self._datasets.popitem(last=False)
+
+    def invalidate(self, source_file_id: int):
+        """Remove datasets of a source file from the pool.
+
+        :param source_file_id: DataSourceFile id
+        :type source_file_id: int
+        """
+        with self._lock:
+            keys = [
+                key for key in self._datasets if key[0] == source_file_id
+            ]
+            for key in keys:
+                del self._datasets[key]
+
+    def clear(self):
+        """Remove all datasets and reset the counters."""
+        with self._lock:
+            self._datasets.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Get statistics of the pool.
+
+        :return: Dictionary of size, max_size, hits and misses
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'size': len(self._datasets),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+zarr_dataset_pool = ZarrDatasetPool()
+
+
 class BaseZarrReader(BaseNetCDFReader):
     """Base class for Zarr Reader."""
 
@@ -145,6 +272,7 @@ class BaseZarrReader(BaseNetCDFReader):
     def open_dataset(self, source_file: DataSourceFile) -> xrDataset:
         """Open a zarr file using xArray.
 
+        Dataset is reused from zarr_dataset_pool when use_cache is True.
         :param source_file: zarr file from a dataset
         :type source_file: DataSourceFile
         :return: xArray Dataset object
@@ -177,6 +305,17 @@ class BaseZarrReader(BaseNetCDFReader):
                 )
             }
 
+        drop_variables = metadata.get('drop_variables', [])
+        pool_key = None
+        if use_cache:
+            pool_key = zarr_dataset_pool.get_key(
+                source_file.id, s3.get('S3_CONNECTION_NAME'),
+                drop_variables
+            )
+            ds = zarr_dataset_pool.get(pool_key)
+            if ds is not None:
+                return ds
+
         # get zarr url
         zarr_url = self.get_zarr_base_url(s3)
         zarr_url += f'{source_file.name}'
@@ -202,10 +341,11 @@ class BaseZarrReader(BaseNetCDFReader):
         else:
             s3_mapper = fsspec.get_mapper(zarr_url, **s3_options)
 
-        drop_variables = metadata.get('drop_variables', [])
         # open zarr, use consolidated to read the metadata
         ds = xr.open_zarr(
             s3_mapper, consolidated=True, drop_variables=drop_variables)
+        if pool_key is not None:
+            zarr_dataset_pool.put(pool_key, ds)
 
         return ds
 
@@ -251,6 +391,8 @@ class BaseZarrReader(BaseNetCDFReader):
         :param source_file: DataSourceFile for the zarr
         :type source_file: DataSourceFile
         """
+        # opened dataset may refer to the removed cache files
+        zarr_dataset_pool.invalidate(source_file.id)
         cache_dir = self.get_zarr_cache_dir(source_file)
         if os.path.exists(cache_dir):
             shutil.rmtree(cache_dir)
@@ -50,6 +50,7 @@ from gap_api.models import (
 )
 from gap_api.serializers.common import APIErrorSerializer
 from gap_api.utils.helper import ApiTag
+from gap_api.utils.json_cache import MeasurementJSONCache
 from gap_api.mixins import GAPAPILoggingMixin, CounterSlidingWindowThrottle
 from permission.models import PermissionType
 from gap_api.tasks.job import DataRequestJobExecutor
@@ -544,6 +545,42 @@ class MeasurementAPI(GAPAPILoggingMixin, APIView):
             remote_file_path=user_file.name
         )
 
+    def _get_cached_json_response(
+        self, output_json: dict, is_async: bool
+    ) -> Response:
+        """Prepare response from cached JSON output.
+
+        :param output_json: JSON output from cache
+        :type output_json: dict
+        :param is_async: True if the request is async
+        :type is_async: bool
+        :return: Response object
+        :rtype: Response
+        """
+        if not is_async:
+            return Response(
+                status=200,
+                data=output_json
+            )
+        # prepare completed job with the cached output
+        job = Job(
+            user=self.request.user,
+            parameters=self._get_request_params(),
+            queue_name=settings.CELERY_DATA_REQUEST_QUEUE,
+            wait_type=0,
+            status=TaskStatus.COMPLETED,
+            output_json=output_json,
+            finished_at=timezone.now()
+        )
+        job.save()
+        return Response(
+            status=200,
+            data={
+                'detail': 'Job is submitted successfully.',
+                'job_id': str(job.uuid)
+            }
+        )
+
     def get_response_data(self) -> Response:
         """Read data from dataset.
 
@@ -602,6 +639,7 @@ class MeasurementAPI(GAPAPILoggingMixin, APIView):
         self.validate_date_range(product_filter, start_dt, end_dt)
 
         dataset_dict: Dict[int, BaseDatasetReader] = {}
+        datasets: Dict[int, Dataset] = {}
         for da in dataset_attributes:
             if da.dataset.id in dataset_dict:
                 continue
@@ -616,6 +654,7 @@ class MeasurementAPI(GAPAPILoggingMixin, APIView):
                         )
                     )
                     dataset_dict[da.dataset.id] = 1
+                    datasets[da.dataset.id] = da.dataset
                 except TypeError as e:
                     logger.error(
                         f"Error in building dataset reader: {e}",
@@ -649,6 +688,17 @@ class MeasurementAPI(GAPAPILoggingMixin, APIView):
 
         # Check cache using UserFile
         user_file = self._get_user_file(location)
+        if output_format == DatasetReaderOutputType.JSON:
+            json_cache = MeasurementJSONCache(
+                user_file, list(datasets.values()), start_dt, end_dt,
+                config=self._preferences.job_executor_config
+            )
+            cached_json = json_cache.get()
+            if cached_json is not None:
+                return self._get_cached_json_response(
+                    cached_json, is_async
+                )
+
         cache_exist = user_file.find_in_cache()
         if cache_exist:
             if is_async:
@@ -0,0 +1,103 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP.
+
+.. note:: Command to benchmark API log drain.
+"""
+
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from gap_api.tasks.api_log import drain_api_logs
+
+
+class Command(BaseCommand):
+    """Command to drain synthetic API logs from Redis.
+
+    The logs are pushed to a separate queue and the inserted rows
+    are rolled back, so the command can be run in any environment.
+    """
+
+    help = 'Benchmark draining synthetic API logs from Redis queue'
+
+    QUEUE_KEY = 'gap_logs_queue_benchmark'
+
+    def add_arguments(self, parser):
+        """Add command line arguments."""
+        parser.add_argument(
+            '--count', type=int, default=100000,
+            help='Number of synthetic logs.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Number of logs popped in a batch.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Number of rows in one insert query.'
+        )
+
+    def _push_entries(self, count: int):
+        """Push synthetic log entries to the benchmark queue."""
+        user_ids = list(
+            get_user_model().objects.values_list('id', flat=True)[:100]
+        )
+        requested_at = timezone.now().isoformat()
+        redis_client = cache._cache.get_client()
+        redis_client.delete(self.QUEUE_KEY)
+        pipe = redis_client.pipeline(transaction=False)
+        for idx in range(count):
+            pipe.rpush(self.QUEUE_KEY, json.dumps({
+                'requested_at': requested_at,
+                'remote_addr': '127.0.0.1',
+                'view': 'gap_api.api_views.measurement.MeasurementAPI',
+                'view_method': 'get',
+                'path': '/api/v1/measurement/',
+                'host': 'localhost',
+                'method': 'GET',
+                'query_params': {
+                    'lat': '-1.404244',
+                    'lon': '35.008688',
+                    'attributes': 'max_temperature,min_temperature',
+                    'product': 'cbam_historical_analysis',
+                    'output_type': 'json'
+                },
+                'user': (
+                    user_ids[idx % len(user_ids)] if user_ids else None
+                ),
+                'response_ms': 100,
+                'status_code': 200
+            }))
+            if len(pipe) >= 10000:
+                pipe.execute()
+        pipe.execute()
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        count = options['count']
+        self._push_entries(count)
+
+        with transaction.atomic():
+            start_time = time.time()
+            total = drain_api_logs(
+                queue_key=self.QUEUE_KEY,
+                batch_size=options['batch_size'],
+                chunk_size=options['chunk_size'],
+                max_batches=count // options['batch_size'] + 1
+            )
+            elapsed_time = time.time() - start_time
+            transaction.set_rollback(True)
+        cache._cache.get_client().delete(self.QUEUE_KEY)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Drained {total} logs in {elapsed_time:.2f}s '
+                f'({total / max(elapsed_time, 1e-6):.0f} logs/s)'
+            )
+        )
@@ -21,8 +21,86 @@ class RateLimitKey:
     RATE_LIMIT_DAY_KEY = 1440
 
 
+# Evaluate every window and increment the counters in one round-trip.
+# KEYS: minute hash key, hour hash key
+# ARGV: increment flag, current minute, current hour,
+#   then pairs of duration in minutes and max requests
+RATE_LIMIT_SCRIPT = """
+local minute_key = KEYS[1]
+local hour_key = KEYS[2]
+local increment = tonumber(ARGV[1])
+local current_minute = tonumber(ARGV[2])
+local current_hour = tonumber(ARGV[3])
+
+local exceeding = {}
+local longest_minute_window = 1
+for i = 4, #ARGV, 2 do
+    local duration = tonumber(ARGV[i])
+    local max_requests = tonumber(ARGV[i + 1])
+    local key = hour_key
+    local current = current_hour
+    local size = math.floor(duration / 60)
+    if duration < 60 then
+        key = minute_key
+        current = current_minute
+        size = duration
+        if duration > longest_minute_window then
+            longest_minute_window = duration
+        end
+    end
+    local total = 0
+    if size > 0 then
+        local fields = {}
+        for j = 0, size - 1 do
+            fields[#fields + 1] = string.format('%d', current - j)
+        end
+        local counts = redis.call('HMGET', key, unpack(fields))
+        for _, count in ipairs(counts) do
+            if count then
+                total = total + tonumber(count)
+            end
+        end
+    end
+    if total >= max_requests then
+        exceeding[#exceeding + 1] = duration
+    end
+end
+
+if increment == 0 or #exceeding > 0 then
+    return exceeding
+end
+
+-- 2 hours expiration for minute data
+redis.call('HINCRBY', minute_key, ARGV[2], 1)
+redis.call('EXPIRE', minute_key, 7200)
+-- 25 hours expiration for hour data
+redis.call('HINCRBY', hour_key, ARGV[3], 1)
+redis.call('EXPIRE', hour_key, 90000)
+
+-- remove counters older than the longest window
+local minute_cutoff = current_minute - longest_minute_window
+for _, minute in ipairs(redis.call('HKEYS', minute_key)) do
+    if tonumber(minute) < minute_cutoff then
+        redis.call('HDEL', minute_key, minute)
+    end
+end
+local hour_cutoff = current_hour - 24
+for _, hour in ipairs(redis.call('HKEYS', hour_key)) do
+    if tonumber(hour) < hour_cutoff then
+        redis.call('HDEL', hour_key, hour)
+    end
+end
+return exceeding
+"""
+
+
 class RateLimiter:
-    """RateLimiter using sliding window counter."""
+    """RateLimiter using sliding window counter.
+
+    The counters are stored per minute and per hour in Redis hashes.
+    All windows are checked and the counters are incremented
+    atomically by a Lua script in one round-trip.
+    """
 
     def __init__(self, user_id, rate_limits):
         """Initialize rate limiter.
@@ -35,6 +113,7 @@ class RateLimiter:
         self.user_id = user_id
         self.rate_limits = rate_limits
         self.redis: Redis = cache._cache.get_client()
+        self.script = self.redis.register_script(RATE_LIMIT_SCRIPT)
         self.exceeding_limits = []
 
     def _get_current_minute(self):
@@ -54,99 +133,38 @@ class RateLimiter:
         else:
             raise ValueError("Unsupported granularity")
 
-    def _increment_request_count(self):
-        """Increment the request count for the current minute and hour."""
-        current_minute = self._get_current_minute()
-        current_hour = self._get_current_hour()
-
-        # Increment minute-level requests
-        minute_key = self._get_redis_key('minute')
-        self.redis.hincrby(minute_key, current_minute, 1)
-        # 2 hours expiration for minute data
-        self.redis.expire(minute_key, 2 * 60 * 60)
-
-        # Increment hour-level requests (for daily limit)
-        hour_key = self._get_redis_key('hour')
-        self.redis.hincrby(hour_key, current_hour, 1)
-        # 25 hours expiration for hour data
-        self.redis.expire(hour_key, 25 * 60 * 60)
-
-        # Clean up old minute and hour entries
-        self._cleanup_old_entries()
-
-    def _cleanup_old_entries(self):
-        """Remove counters older than the longest rate limit window."""
-        current_minute = self._get_current_minute()
-        current_hour = self._get_current_hour()
-
-        # Cleanup minute-level data (older than
-        # the longest minute-based window)
-        longest_minute_window = max(
-            [duration for duration in self.rate_limits.keys() if
-             duration < 60]
-        )
-        minute_cutoff = current_minute - longest_minute_window
-        minute_key = self._get_redis_key('minute')
-        minute_buckets = self.redis.hkeys(minute_key)
-        for minute in minute_buckets:
-            if int(minute) < minute_cutoff:
-                self.redis.hdel(minute_key, minute)
-
-        # Cleanup hour-level data (older than the longest hour-based window,
-        # i.e., 24 hours)
-        hour_cutoff = current_hour - 24
-        hour_key = self._get_redis_key('hour')
-        hour_buckets = self.redis.hkeys(hour_key)
-        for hour in hour_buckets:
-            if int(hour) < hour_cutoff:
-                self.redis.hdel(hour_key, hour)
-
-    def _get_request_count(self, duration_in_minutes):
-        """Get the total request count for the last `duration_in_minutes`."""
-        if duration_in_minutes < 60:
-            # Minute-based rate limit
-            # (for short durations like 1 minute or 1 hour)
-            current_minute = self._get_current_minute()
-            redis_key = self._get_redis_key('minute')
-            total_count = 0
-            for i in range(duration_in_minutes):
-                minute = current_minute - i
-                count = self.redis.hget(redis_key, minute)
-                if count:
-                    total_count += int(count)
-            return total_count
+    def _execute_script(self, increment: bool):
+        """Check the windows and increment the counters if allowed.
 
-        else:
-            # Hour-based rate limit (for longer durations like a day)
-            current_hour = self._get_current_hour()
-            redis_key = self._get_redis_key('hour')
-            total_count = 0
-            for i in range(duration_in_minutes // 60):
-                hour = current_hour - i
-                count = self.redis.hget(redis_key, hour)
-                if count:
-                    total_count += int(count)
-            return total_count
+        :param increment: Increment the counters when no limit is exceeded
+        :type increment: bool
+        :return: True if the request is allowed
+        :rtype: bool
+        """
+        args = [
+            1 if increment else 0,
+            self._get_current_minute(),
+            self._get_current_hour()
+        ]
+        for duration_in_minutes, max_requests in self.rate_limits.items():
+            args.extend([duration_in_minutes, max_requests])
+        result = self.script(
+            keys=[
+                self._get_redis_key('minute'),
+                self._get_redis_key('hour')
+            ],
+            args=args
+        )
+        self.exceeding_limits = [int(duration) for duration in result]
+        return len(self.exceeding_limits) == 0
 
     def is_rate_limited(self):
         """Check if the user is rate-limited based on defined rate limits."""
-        self.exceeding_limits = []
-        for duration_in_minutes, max_requests in self.rate_limits.items():
-            request_count = self._get_request_count(duration_in_minutes)
-            if request_count >= max_requests:
-                self.exceeding_limits.append(duration_in_minutes)
-
-        if len(self.exceeding_limits) > 0:
-            return True
-        return False
+        return not self._execute_script(increment=False)
 
     def is_request_allowed(self):
         """Check and increment the counter if request is allowed."""
-        if self.is_rate_limited():
-            return False
-
-        self._increment_request_count()
-        return True
+        return self._execute_script(increment=True)
 
     def get_waiting_time_in_seconds(self):
         """
@@ -31,6 +31,7 @@ class Job(models.Model):
     """Model represents job submitted by user."""
 
     MAX_REDIS_KEY_EXPIRY = 60 * 60 * 1  # 1 hour
+    CHANNEL_PREFIX = 'job-status:'
 
     uuid = models.UUIDField(
         primary_key=True,
@@ -129,6 +130,11 @@ class Job(models.Model):
         """Return cache key for this job."""
         return f'job:{self.uuid}'
 
+    @property
+    def channel_name(self):
+        """Return pub/sub channel for status of this job."""
+        return f'{self.CHANNEL_PREFIX}{self.uuid}'
+
     @property
     def cache_payload(self):
         """Return cache payload for this job."""
@@ -156,13 +162,17 @@ class Job(models.Model):
         }
 
     def save(self, *args, **kwargs):
-        """Override the save method to handle Redis cache."""
+        """Override the save method to handle Redis cache.
+
+        The payload is also published to the job channel,
+        so the waiters do not need to poll the job.
+        """
         super().save(*args, **kwargs)
 
-        # store job in Redis cache
+        # store job in Redis cache and notify the waiters
+        payload = json.dumps(self.cache_payload, cls=DjangoJSONEncoder)
         redis_client: Redis = cache._cache.get_client()
-        redis_client.set(
-            self.cache_key,
-            json.dumps(self.cache_payload, cls=DjangoJSONEncoder),
-            ex=self.MAX_REDIS_KEY_EXPIRY
-        )
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.set(self.cache_key, payload, ex=self.MAX_REDIS_KEY_EXPIRY)
+        pipe.publish(self.channel_name, payload)
+        pipe.execute()
@@ -6,9 +6,13 @@ Tomorrow Now GAP API.
 """
 
 import json
+import logging
+from typing import Tuple
+
 from core.celery import app
 from django.core.cache import cache
 from django.contrib.auth import get_user_model
+from django.db import InterfaceError, OperationalError, transaction
 from django.utils.dateparse import parse_datetime
 
 from gap.models import Preferences
@@ -16,40 +20,214 @@ from gap_api.models import APIRequestLog
 from gap_api.mixins import GAPAPILoggingMixin
 
 
+logger = logging.getLogger(__name__)
 UserModel = get_user_model()
+DEAD_LETTER_SUFFIX = '_dead_letter'
+DEAD_LETTER_MAX_SIZE = 10000
+# errors of database connection, the logs can be saved on next run
+REQUEUE_ERRORS = (InterfaceError, OperationalError)
+
+
+def _get_dead_letter_key(queue_key: str) -> str:
+    """Get key of the Redis list for log entries that cannot be saved.
+
+    :param queue_key: key of the Redis list of the logs
+    :type queue_key: str
+    :return: key of the dead letter list
+    :rtype: str
+    """
+    return f'{queue_key}{DEAD_LETTER_SUFFIX}'
+
+
+def _dead_letter(redis_client, queue_key: str, raw_entries: list):
+    """Move log entries that cannot be saved to the dead letter list.
+
+    Only the latest DEAD_LETTER_MAX_SIZE entries are kept.
+    :param redis_client: Redis client
+    :type redis_client: redis.Redis
+    :param queue_key: key of the Redis list of the logs
+    :type queue_key: str
+    :param raw_entries: JSON log entries
+    :type raw_entries: list
+    """
+    if not raw_entries:
+        return
+    dead_letter_key = _get_dead_letter_key(queue_key)
+    redis_client.rpush(dead_letter_key, *raw_entries)
+    redis_client.ltrim(dead_letter_key, -DEAD_LETTER_MAX_SIZE, -1)
+
+
+def _parse_log_entry(raw_entry) -> dict:
+    """Parse JSON log entry from Redis.
+
+    :param raw_entry: JSON log entry
+    :type raw_entry: str
+    :return: log dictionary
+    :rtype: dict
+    """
+    entry = json.loads(raw_entry)
+    if entry.get('user', None):
+        entry['user'] = int(entry['user'])
+
+    # parse requested_at
+    if entry.get('requested_at', None):
+        entry['requested_at'] = parse_datetime(entry['requested_at'])
+
+    # parse attributes in query_params
+    if entry.get('query_params', None):
+        attributes = entry['query_params'].get('attributes', '')
+        entry['query_params']['attributes'] = (
+            attributes.replace(' ', '').split(',')
+        )
+    return entry
+
+
+def _build_logs(raw_entries: list) -> Tuple[list, list]:
+    """Build unsaved APIRequestLog from JSON log entries.
+
+    :param raw_entries: JSON log entries
+    :type raw_entries: list
+    :return: list of JSON entry and its log, and list of invalid entries
+    :rtype: Tuple[list, list]
+    """
+    entries = []
+    invalid_entries = []
+    for raw_entry in raw_entries:
+        try:
+            entries.append((raw_entry, _parse_log_entry(raw_entry)))
+        except (ValueError, TypeError, AttributeError) as ex:
+            logger.error(f'Invalid API log entry: {ex}')
+            invalid_entries.append(raw_entry)
+
+    # parse user of all entries in one query
+    user_ids = set()
+    for _, entry in entries:
+        if entry.get('user', None):
+            user_ids.add(entry['user'])
+    users = UserModel._default_manager.in_bulk(user_ids) if user_ids else {}
+
+    logs = []
+    for raw_entry, entry in entries:
+        if entry.get('user', None):
+            entry['user'] = users.get(entry['user'])
+        try:
+            logs.append((raw_entry, APIRequestLog(**entry)))
+        except (ValueError, TypeError) as ex:
+            logger.error(f'Invalid API log entry: {ex}')
+            invalid_entries.append(raw_entry)
+    return logs, invalid_entries
+
+
+def _save_logs(
+    redis_client, queue_key: str, raw_entries: list, chunk_size: int
+) -> int:
+    """Save a batch of JSON log entries to the database.
+
+    The batch is saved with bulk_create. When it fails, the logs are
+    saved one by one and the entries that cannot be saved are moved
+    to the dead letter list. On database connection error,
+    the unsaved entries are pushed back to the head of the queue
+    in the same order, then the error is raised.
+    :param redis_client: Redis client
+    :type redis_client: redis.Redis
+    :param queue_key: key of the Redis list of the logs
+    :type queue_key: str
+    :param raw_entries: JSON log entries
+    :type raw_entries: list
+    :param chunk_size: number of rows in one insert query
+    :type chunk_size: int
+    :return: number of saved logs
+    :rtype: int
+    """
+    try:
+        logs, invalid_entries = _build_logs(raw_entries)
+    except REQUEUE_ERRORS:
+        redis_client.lpush(queue_key, *reversed(raw_entries))
+        raise
+    except Exception as ex:
+        logger.error(f'Failed to parse API log batch: {ex}')
+        _dead_letter(redis_client, queue_key, raw_entries)
+        return 0
+    _dead_letter(redis_client, queue_key, invalid_entries)
+
+    try:
+        with transaction.atomic():
+            APIRequestLog.objects.bulk_create(
+                [log for _, log in logs], batch_size=chunk_size
+            )
+        return len(logs)
+    except REQUEUE_ERRORS:
+        redis_client.lpush(
+            queue_key, *reversed([raw_entry for raw_entry, _ in logs])
+        )
+        raise
+    except Exception as ex:
+        logger.error(f'Failed to save API log batch: {ex}')
+
+    # find the entries that fail the batch
+    total = 0
+    for idx, (raw_entry, log) in enumerate(logs):
+        # pk may be set by the failed bulk_create
+        log.pk = None
+        try:
+            with transaction.atomic():
+                log.save()
+            total += 1
+        except REQUEUE_ERRORS:
+            redis_client.lpush(
+                queue_key,
+                *reversed([raw_entry for raw_entry, _ in logs[idx:]])
+            )
+            raise
+        except Exception as ex:
+            logger.error(f'Failed to save API log entry: {ex}')
+            _dead_letter(redis_client, queue_key, [raw_entry])
+    return total
+
+
+def drain_api_logs(
+    queue_key: str = GAPAPILoggingMixin.CACHE_KEY, batch_size: int = None,
+    chunk_size: int = None, max_batches: int = None
+) -> int:
+    """Move API logs from Redis queue into database in batches.
+
+    Each batch is popped atomically with LPOP count. Entries that
+    cannot be saved are moved to the dead letter list, so they do not
+    block the queue. Only on database connection error, the unsaved
+    entries are pushed back to the queue and the error is raised.
+    :param queue_key: key of the Redis list, defaults to logging queue
+    :type queue_key: str
+    :param batch_size: number of logs popped in a batch
+    :type batch_size: int
+    :param chunk_size: number of rows in one insert query
+    :type chunk_size: int
+    :param max_batches: max number of batches in one call
+    :type max_batches: int
+    :return: number of saved logs
+    :rtype: int
+    """
+    if None in [batch_size, chunk_size, max_batches]:
+        preferences = Preferences.load()
+        batch_size = batch_size or preferences.api_log_batch_size
+        chunk_size = chunk_size or preferences.api_log_insert_chunk_size
+        max_batches = max_batches or preferences.api_log_max_batches
+
+    redis_client = cache._cache.get_client()
+    total = 0
+    for _ in range(max_batches):
+        raw_entries = redis_client.lpop(queue_key, batch_size)
+        if not raw_entries:
+            break
+
+        total += _save_logs(redis_client, queue_key, raw_entries, chunk_size)
+
+        if len(raw_entries) < batch_size:
+            # queue is empty
+            break
+    return total
 
 
 @app.task(name='store_api_logs', ignore_result=True)
 def store_api_logs():
     """Store API Logs from Redis into database."""
-    # pull logs from Redis
-    batch_size = Preferences.load().api_log_batch_size
-    logs = []
-    for _ in range(batch_size):
-        log_entry = cache._cache.get_client().lpop(
-            GAPAPILoggingMixin.CACHE_KEY
-        )
-        if log_entry:
-            entry = json.loads(log_entry)
-            # parse requested_at
-            if entry.get('requested_at', None):
-                entry['requested_at'] = parse_datetime(entry['requested_at'])
-
-            # parse user
-            if entry.get('user', None):
-                user_id = entry['user']
-                entry['user'] = UserModel._default_manager.filter(
-                    id=user_id).first()
-
-            # parse attributes in query_params
-            if entry.get('query_params', None):
-                attributes = entry['query_params'].get('attributes', '')
-                entry['query_params']['attributes'] = (
-                    attributes.replace(' ', '').split(',')
-                )
-
-            logs.append(APIRequestLog(**entry))
-
-    # write logs to the database
-    if logs:
-        APIRequestLog.objects.bulk_create(logs)
+    drain_api_logs()
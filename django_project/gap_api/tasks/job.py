@@ -7,7 +7,6 @@ Tomorrow Now GAP API.
 
 import json
 import logging
-import time
 import pytz
 from typing import Dict
 from datetime import date, datetime, time as time_s
@@ -35,6 +34,8 @@ from gap.utils.reader import (
     DatasetReaderOutputType
 )
 from gap_api.models import Job, JobType, UserFile, Location
+from gap_api.utils.json_cache import MeasurementJSONCache
+from gap_api.utils.job_subscriber import job_status_subscriber
 
 
 logger = logging.getLogger(__name__)
@@ -44,7 +45,6 @@ class BaseJobExecutor:
     """Base class for executing jobs."""
 
     DEFAULT_WAIT_TIME = 20 * 60  # 20 minutes
-    DEFAULT_WAIT_SLEEP = 0.5  # 0.5 seconds
 
     def __init__(self, job: Job, is_main_executor=False):
         """Initialize the job executor."""
@@ -55,9 +55,6 @@ class BaseJobExecutor:
         self.wait_time = self.job_config.get(
             'wait_time', self.DEFAULT_WAIT_TIME
         )
-        self.wait_sleep = self.job_config.get(
-            'wait_sleep', self.DEFAULT_WAIT_SLEEP
-        )
         self.is_main_executor = is_main_executor
 
     def _get_config(self, key, default=None):
@@ -105,16 +102,23 @@ class BaseJobExecutor:
         """Run the job execution logic."""
         raise NotImplementedError("Subclasses must implement this method.")
 
+    def _is_job_finished(self):
+        """Check whether the job is finished in the database."""
+        self.job.refresh_from_db()
+        return self.job.status in [TaskStatus.COMPLETED, TaskStatus.STOPPED]
+
     def _wait_for_completion(self):
-        """Wait for the job to complete."""
-        start_time = time.time()
-        while time.time() - start_time < self.wait_time:
-            self.job.refresh_from_db()
-            if self.job.status in [TaskStatus.COMPLETED, TaskStatus.STOPPED]:
+        """Wait for the job to complete.
+
+        The job status is pushed through Redis pub/sub, the job is
+        checked before and after waiting in case the event is missed.
+        """
+        with job_status_subscriber.listen(self.job.channel_name) as waiter:
+            if self._is_job_finished():
                 return True
-            if self.job.wait_type == 1:
-                time.sleep(self.wait_sleep)
-            # TODO: wait using asleep
+            is_notified = waiter.wait(self.wait_time)
+        if self._is_job_finished() or is_notified:
+            return True
         logger.warning(
             f"Job {self.job.uuid} did not complete within "
             f"the wait time {self.wait_time}."
@@ -400,6 +404,9 @@ class DataRequestJobExecutor(BaseJobExecutor):
             ),
             lon_chunk_size=self._get_config(
                 'lon_chunk_size', None
+            ),
+            location_chunk_size=self._get_config(
+                'location_chunk_size', None
             )
         )
 
@@ -471,6 +478,13 @@ class DataRequestJobExecutor(BaseJobExecutor):
                 json.dumps(json_output, cls=CustomJSONEncoder)
             )
             self.job.save(update_fields=['output_json'])
+            # cache the output for sync and async requests
+            MeasurementJSONCache(
+                user_file,
+                [reader.dataset for reader in dataset_dict.values()],
+                start_dt, end_dt,
+                config=self._preferences.job_executor_config
+            ).set(self.job.output_json)
         elif output_format == DatasetReaderOutputType.NETCDF:
             user_file = self._read_data_as_netcdf(
                 dataset_dict, user_file
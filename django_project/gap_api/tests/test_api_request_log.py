@@ -8,6 +8,9 @@ Tomorrow Now GAP.
 import json
 import mock
 import datetime
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import OperationalError
 from django.test import TestCase, RequestFactory, override_settings
 from django.contrib.admin import ModelAdmin
 from fakeredis import FakeConnection
@@ -15,7 +18,9 @@ from fakeredis import FakeConnection
 from core.factories import UserF
 from gap.models import DatasetType
 from gap_api.models import APIRequestLog
+from gap_api.mixins import GAPAPILoggingMixin
 from gap_api.tasks import store_api_logs
+from gap_api.tasks.api_log import drain_api_logs
 from gap_api.admin import ProductTypeFilter, GapAPIRequestLogAdmin
 from gap_api.factories import APIRequestLogFactory
 
@@ -54,46 +59,138 @@ class TestAPIRequestLog(TestCase):
         self.user = UserF.create()
         self.admin_instance = GapAPIRequestLogAdmin(
             APIRequestLog, admin_site=mock.MagicMock())
+        self.redis_client = cache._cache.get_client()
+        self.redis_client.delete(GAPAPILoggingMixin.CACHE_KEY)
 
-    @mock.patch('django.core.cache.cache._cache.get_client')
-    def test_store_api_logs(self, mock_get_client):
+    def _log_entry(self, user_id):
+        """Return JSON log entry like GAPAPILoggingMixin."""
+        return json.dumps({
+            "requested_at": "2024-10-17 17:56:52.270889+00:00",
+            "data": None,
+            "remote_addr": "127.0.0.1",
+            "view": "gap_api.api_views.measurement.MeasurementAPI",
+            "view_method": "get",
+            "path": "/api/v1/measurement/",
+            "host": "localhost:8000",
+            "user_agent": "PostmanRuntime/7.42.0",
+            "method": "GET",
+            "query_params": {
+                "lat": "-1.404244",
+                "lon": "35.008688",
+                "attributes": (
+                    "max_relative_humidity,min_relative_humidity"
+                ),
+                "start_date": "2019-11-01",
+                "end_date": "2019-11-01",
+                "product": "tahmo_ground_observation",
+                "output_type": "csv"
+            },
+            "user": f"{user_id}" if user_id else None,
+            "username_persistent": "admin",
+            "response_ms": 182,
+            "response": None,
+            "status_code": 200
+        })
+
+    def test_store_api_logs(self):
         """Test store api logs from cache."""
-        mock_redis_client = mock_get_client.return_value
-        mock_redis_client.lpop.side_effect = [
-            json.dumps({
-                "requested_at": "2024-10-17 17:56:52.270889+00:00",
-                "data": None,
-                "remote_addr": "127.0.0.1",
-                "view": "gap_api.api_views.measurement.MeasurementAPI",
-                "view_method": "get",
-                "path": "/api/v1/measurement/",
-                "host": "localhost:8000",
-                "user_agent": "PostmanRuntime/7.42.0",
-                "method": "GET",
-                "query_params": {
-                    "lat": "-1.404244",
-                    "lon": "35.008688",
-                    "attributes": (
-                        "max_relative_humidity,min_relative_humidity"
-                    ),
-                    "start_date": "2019-11-01",
-                    "end_date": "2019-11-01",
-                    "product": "tahmo_ground_observation",
-                    "output_type": "csv"
-                },
-                "user": f"{self.user.id}",
-                "username_persistent": "admin",
-                "response_ms": 182,
-                "response": None,
-                "status_code": 200
-            })
-        ] + [None] * 499
+        self.redis_client.rpush(
+            GAPAPILoggingMixin.CACHE_KEY, self._log_entry(self.user.id)
+        )
         store_api_logs()
-        # default batch size
-        self.assertEqual(mock_redis_client.lpop.call_count, 500)
         logs = APIRequestLog.objects.all()
         self.assertEqual(logs.count(), 1)
         self.assertEqual(logs.first().user, self.user)
+        self.assertEqual(
+            logs.first().query_params['attributes'],
+            ['max_relative_humidity', 'min_relative_humidity']
+        )
+        self.assertEqual(
+            self.redis_client.llen(GAPAPILoggingMixin.CACHE_KEY), 0
+        )
+
+    def test_drain_api_logs_in_batches(self):
+        """Test drain api logs in batches with one user query."""
+        user_2 = UserF.create()
+        entries = [
+            self._log_entry(user_id) for user_id in
+            [self.user.id, user_2.id, None, 99999] * 5
+        ] + ['invalid']
+        self.redis_client.rpush(GAPAPILoggingMixin.CACHE_KEY, *entries)
+
+        # max batches is reached
+        user_manager = get_user_model()._default_manager
+        with mock.patch.object(
+            user_manager, 'in_bulk', wraps=user_manager.in_bulk
+        ) as mock_in_bulk:
+            total = drain_api_logs(
+                batch_size=4, chunk_size=3, max_batches=2
+            )
+        self.assertEqual(total, 8)
+        self.assertEqual(mock_in_bulk.call_count, 2)
+        self.assertEqual(
+            self.redis_client.llen(GAPAPILoggingMixin.CACHE_KEY), 13
+        )
+
+        # drain until the queue is empty
+        total = drain_api_logs(batch_size=4, chunk_size=3, max_batches=10)
+        self.assertEqual(total, 12)
+        self.assertEqual(
+            self.redis_client.llen(GAPAPILoggingMixin.CACHE_KEY), 0
+        )
+        self.assertEqual(
+            APIRequestLog.objects.filter(user=self.user).count(), 5
+        )
+        self.assertEqual(
+            APIRequestLog.objects.filter(user=user_2).count(), 5
+        )
+        self.assertEqual(
+            APIRequestLog.objects.filter(user__isnull=True).count(), 10
+        )
+
+    @mock.patch.object(APIRequestLog.objects, 'bulk_create')
+    def test_drain_api_logs_requeue(self, mock_bulk_create):
+        """Test batch is pushed back to the queue on connection error."""
+        mock_bulk_create.side_effect = OperationalError('error')
+        entries = [self._log_entry(self.user.id), self._log_entry(None)]
+        self.redis_client.rpush(GAPAPILoggingMixin.CACHE_KEY, *entries)
+        with self.assertRaises(OperationalError):
+            drain_api_logs(batch_size=10, chunk_size=10, max_batches=1)
+        self.assertEqual(
+            self.redis_client.lrange(GAPAPILoggingMixin.CACHE_KEY, 0, -1),
+            [entry.encode() for entry in entries]
+        )
+
+    def test_drain_api_logs_dead_letter(self):
+        """Test failed entries are moved to dead letter list."""
+        dead_letter_key = f'{GAPAPILoggingMixin.CACHE_KEY}_dead_letter'
+        self.redis_client.delete(dead_letter_key)
+        long_user_agent = json.loads(self._log_entry(self.user.id))
+        long_user_agent['user_agent'] = 'a' * 300
+        long_user_agent = json.dumps(long_user_agent)
+        unknown_key = json.loads(self._log_entry(None))
+        unknown_key['unknown'] = 'value'
+        unknown_key = json.dumps(unknown_key)
+        entries = [
+            self._log_entry(self.user.id), long_user_agent,
+            self._log_entry(None), unknown_key, 'invalid',
+            self._log_entry(self.user.id)
+        ]
+        self.redis_client.rpush(GAPAPILoggingMixin.CACHE_KEY, *entries)
+
+        total = drain_api_logs(batch_size=4, chunk_size=4, max_batches=10)
+        self.assertEqual(total, 3)
+        self.assertEqual(APIRequestLog.objects.count(), 3)
+        self.assertEqual(
+            self.redis_client.llen(GAPAPILoggingMixin.CACHE_KEY), 0
+        )
+        self.assertCountEqual(
+            self.redis_client.lrange(dead_letter_key, 0, -1),
+            [
+                entry.encode() for entry in
+                [long_user_agent, unknown_key, 'invalid']
+            ]
+        )
 
     def test_product_type_filter(self):
         """Test ProductTypeFilter class."""
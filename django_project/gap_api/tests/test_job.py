@@ -22,23 +22,29 @@ class TestBaseJobExecutor(TestCase):
         self.instance = BaseJobExecutor(self.mock_job)
         self.instance.job = self.mock_job
         self.instance.wait_time = 10.0
-        self.instance.wait_sleep = 1.0
 
     def test_run_raises_not_implemented(self):
         """Test that run method raises NotImplementedError."""
         with self.assertRaises(NotImplementedError):
             self.instance.run()
 
+    def _mock_subscriber(self, mock_subscriber, is_notified):
+        """Mock listen context of job status subscriber."""
+        self.mock_job.channel_name = 'job-status:test-uuid-123'
+        mock_waiter = MagicMock()
+        mock_waiter.wait.return_value = is_notified
+        mock_subscriber.listen.return_value.__enter__.return_value = (
+            mock_waiter
+        )
+        return mock_waiter
+
     @patch('gap_api.tasks.job.logger')
-    @patch('time.sleep')
-    @patch('time.time')
+    @patch('gap_api.tasks.job.job_status_subscriber')
     def test_job_completes_successfully(
-        self, mock_time, mock_sleep, mock_logger
+        self, mock_subscriber, mock_logger
     ):
         """Test that method returns True when job completes successfully."""
-        # Mock time progression: start at 0, then 2 seconds later,
-        # then 4 seconds
-        mock_time.side_effect = [0.0, 2.0, 4.0]
+        mock_waiter = self._mock_subscriber(mock_subscriber, True)
         self.mock_job.wait_type = 1
 
         # Start with RUNNING status
@@ -52,16 +58,32 @@ class TestBaseJobExecutor(TestCase):
 
         self.assertTrue(result)
         self.assertEqual(self.mock_job.refresh_from_db.call_count, 2)
-        mock_sleep.assert_called_once_with(1.0)
+        mock_subscriber.listen.assert_called_once_with(
+            'job-status:test-uuid-123'
+        )
+        mock_waiter.wait.assert_called_once_with(10.0)
         mock_logger.warning.assert_not_called()
 
     @patch('gap_api.tasks.job.logger')
-    @patch('time.sleep')
-    @patch('time.time')
-    def test_job_times_out(self, mock_time, mock_sleep, mock_logger):
+    @patch('gap_api.tasks.job.job_status_subscriber')
+    def test_job_completed_before_wait(self, mock_subscriber, mock_logger):
+        """Test that method does not wait for finished job."""
+        mock_waiter = self._mock_subscriber(mock_subscriber, False)
+        type(self.mock_job).status = PropertyMock(
+            return_value=TaskStatus.STOPPED
+        )
+
+        result = self.instance._wait_for_completion()
+
+        self.assertTrue(result)
+        self.assertEqual(self.mock_job.refresh_from_db.call_count, 1)
+        mock_waiter.wait.assert_not_called()
+
+    @patch('gap_api.tasks.job.logger')
+    @patch('gap_api.tasks.job.job_status_subscriber')
+    def test_job_times_out(self, mock_subscriber, mock_logger):
         """Test that method returns False and logs warning when times out."""
-        # Mock time progression that exceeds wait_time
-        mock_time.side_effect = [0.0, 5.0, 11.0]  # Exceeds 10 second wait_time
+        mock_waiter = self._mock_subscriber(mock_subscriber, False)
         self.mock_job.wait_type = 1
         self.mock_job.uuid = 'test-uuid-123'
 
@@ -72,8 +94,9 @@ class TestBaseJobExecutor(TestCase):
         result = self.instance._wait_for_completion()
 
         self.assertFalse(result)
-        self.assertEqual(self.mock_job.refresh_from_db.call_count, 1)
-        mock_sleep.assert_called_with(1.0)
+        # checked again after the wait time
+        self.assertEqual(self.mock_job.refresh_from_db.call_count, 2)
+        mock_waiter.wait.assert_called_once_with(10.0)
         mock_logger.warning.assert_called_once_with(
             "Job test-uuid-123 did not complete within the wait time 10.0."
         )
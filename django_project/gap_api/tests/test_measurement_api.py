@@ -10,6 +10,7 @@ from typing import List
 from unittest.mock import patch
 
 from django.contrib.gis.geos import Polygon, MultiPolygon, Point
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework.exceptions import ValidationError
 from guardian.shortcuts import assign_perm
@@ -46,7 +47,8 @@ class MockDatasetReaderValue(DatasetReaderValue):
 
     def to_csv(
         self, suffix='.csv', separator=',', date_chunk_size=None,
-        lat_chunk_size=None, lon_chunk_size=None
+        lat_chunk_size=None, lon_chunk_size=None,
+        location_chunk_size=None
     ):
         """Override to_csv method to return mock CSV data."""
         csv_data = "date,test\n"
@@ -353,6 +355,47 @@ class HistoricalAPITest(CommonMeasurementAPITest):
         self.assertEqual(response.status_code, 400)
         self.assertIn('Invalid Request Parameter', response.data)
 
+    @override_settings(
+        CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            }
+        }
+    )
+    @patch('gap_api.api_views.measurement.get_reader_builder')
+    @patch('gap_api.tasks.job.get_reader_builder')
+    def test_read_historical_data_json_cache(
+        self, mocked_builder_1, mocked_builder_2
+    ):
+        """Test async request fills JSON cache for the next request."""
+        view = MeasurementAPI.as_view()
+        dataset = Dataset.objects.get(name='CBAM Climate Reanalysis')
+        attribute1 = DatasetAttribute.objects.filter(
+            dataset=dataset,
+            attribute__variable_name='max_temperature'
+        ).first()
+        for mocked_builder in [mocked_builder_1, mocked_builder_2]:
+            mocked_builder.return_value = MockBaseReaderBuilder(
+                dataset, [attribute1],
+                DatasetReaderInput.from_point(Point(x=29.125, y=-2.215)),
+                datetime.fromisoformat('2024-04-01'),
+                datetime.fromisoformat('2024-04-04'),
+            )
+        request = self._get_measurement_request_point(is_async=True)
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('job_id', response.data)
+        mocked_builder_1.assert_called_once()
+
+        # second request is served from the cache
+        request = self._get_measurement_request_point()
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        mocked_builder_1.assert_called_once()
+        self.assertEqual(
+            response.data['results'][0]['data'][0]['values']['test'], 100
+        )
+
     @patch('gap_api.api_views.measurement.get_reader_builder')
     @patch('gap_api.tasks.job.get_reader_builder')
     def test_read_historical_data_by_polygon(
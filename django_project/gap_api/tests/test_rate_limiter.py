@@ -148,6 +148,34 @@ class TestRateLimiter(TestCase):
         self.assertFalse(
             self.redis_client.hexists(hour_key, current_hour - 25))
 
+    def test_is_rate_limited_does_not_increment(self):
+        """Test checking the limit without incrementing the counter."""
+        rate_limiter = RateLimiter(user_id="user130", rate_limits={1: 1})
+        for _ in range(2):
+            self.assertFalse(rate_limiter.is_rate_limited())
+        self.assertTrue(rate_limiter.is_request_allowed())
+        self.assertTrue(rate_limiter.is_rate_limited())
+        self.assertEqual(rate_limiter.exceeding_limits, [1])
+
+    def test_rate_limiter_without_minute_limit(self):
+        """Test request is counted when there is no minute limit."""
+        rate_limiter = RateLimiter(
+            user_id="user131", rate_limits={60: 2, 1440: 100}
+        )
+        self.assertTrue(rate_limiter.is_request_allowed())
+        self.assertTrue(rate_limiter.is_request_allowed())
+        self.assertFalse(rate_limiter.is_request_allowed())
+        self.assertEqual(rate_limiter.exceeding_limits, [60])
+        hour_key = rate_limiter._get_redis_key('hour')
+        self.assertEqual(
+            int(
+                self.redis_client.hget(
+                    hour_key, rate_limiter._get_current_hour()
+                )
+            ),
+            2
+        )
+
     @patch('time.time', return_value=1730319778)
     def test_get_waiting_time_in_seconds_for_minute_limit(self, mock_time):
         """Test get waiting time for minute limit."""
@@ -0,0 +1,71 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP.
+
+.. note:: Unit tests for job status subscriber.
+"""
+
+from fakeredis import FakeConnection
+from django.test import TestCase, override_settings
+
+from core.models import TaskStatus
+from gap_api.models import Job
+from gap_api.utils.job_subscriber import JobStatusSubscriber
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': [
+                'redis://127.0.0.1:6379',
+            ],
+            'OPTIONS': {
+                'connection_class': FakeConnection
+            }
+        }
+    }
+)
+class TestJobStatusSubscriber(TestCase):
+    """Unit test for JobStatusSubscriber."""
+
+    def setUp(self):
+        """Set test for JobStatusSubscriber."""
+        self.subscriber = JobStatusSubscriber()
+        self.job = Job.objects.create()
+
+    def tearDown(self):
+        """Stop the subscriber thread."""
+        self.subscriber.stop()
+
+    def test_notify_finished_job(self):
+        """Test waiters are woken up when the job is saved as finished."""
+        other_job = Job.objects.create()
+        with self.subscriber.listen(self.job.channel_name) as waiter_1, \
+                self.subscriber.listen(self.job.channel_name) as waiter_2, \
+                self.subscriber.listen(other_job.channel_name) as waiter_3:
+            self.job.status = TaskStatus.RUNNING
+            self.job.save()
+            self.assertFalse(waiter_1.wait(0.2))
+
+            self.job.status = TaskStatus.COMPLETED
+            self.job.output_json = {'data': 1}
+            self.job.save()
+            self.assertTrue(waiter_1.wait(5))
+            self.assertTrue(waiter_2.wait(5))
+            self.assertFalse(waiter_3.wait(0.2))
+            self.assertEqual(waiter_1.payload['status'], TaskStatus.COMPLETED)
+            self.assertEqual(waiter_1.payload['output_json'], {'data': 1})
+        self.assertEqual(self.subscriber._waiters, {})
+        self.assertTrue(self.subscriber.is_running)
+
+    def test_stop(self):
+        """Test subscriber is started again after stopped."""
+        self.subscriber.start()
+        self.subscriber.stop()
+        self.assertFalse(self.subscriber.is_running)
+        with self.subscriber.listen(self.job.channel_name) as waiter:
+            self.assertTrue(self.subscriber.is_running)
+            self.job.status = TaskStatus.STOPPED
+            self.job.save()
+            self.assertTrue(waiter.wait(5))
@@ -0,0 +1,107 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP.
+
+.. note:: Unit tests for JSON measurement cache.
+"""
+
+from datetime import datetime, timedelta
+
+import pytz
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from gap.factories import DatasetFactory, DataSourceFileFactory
+from gap.models import DatasetTimeStep
+from gap_api.models import UserFile
+from gap_api.utils.json_cache import MeasurementJSONCache
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+)
+class TestMeasurementJSONCache(TestCase):
+    """Unit test for MeasurementJSONCache."""
+
+    def setUp(self):
+        """Set test for MeasurementJSONCache."""
+        self.dataset = DatasetFactory.create(
+            time_step=DatasetTimeStep.HOURLY
+        )
+        self.start_dt = datetime(2024, 10, 1, tzinfo=pytz.UTC)
+        self.end_dt = datetime(2024, 10, 2, tzinfo=pytz.UTC)
+        self.data = {
+            'metadata': {'dataset': []},
+            'results': [{'data': [{'max_temperature': 20.5}]}]
+        }
+
+    def _get_cache(self, config=None, **params):
+        query_params = {
+            'product': 'cbam_historical_analysis',
+            'attributes': ['max_temperature'],
+            'start_date': '2024-10-01',
+            'end_date': '2024-10-02',
+            'output_type': 'json',
+            'geom_type': 'point',
+            'geometry': 'POINT (36.8 -1.2)'
+        }
+        query_params.update(params)
+        return MeasurementJSONCache(
+            UserFile(query_params=query_params), [self.dataset],
+            self.start_dt, self.end_dt, config=config
+        )
+
+    def test_get_and_set(self):
+        """Test storing and reading the cached output."""
+        json_cache = self._get_cache()
+        self.assertIsNone(json_cache.get())
+        json_cache.set(self.data)
+        self.assertEqual(self._get_cache().get(), self.data)
+        # different query
+        self.assertIsNone(
+            self._get_cache(geometry='POINT (36.9 -1.2)').get()
+        )
+
+    def test_invalidate_dataset(self):
+        """Test cache is not used after dataset is invalidated."""
+        self._get_cache().set(self.data)
+        self.dataset.invalidate_cache()
+        self.assertIsNone(self._get_cache().get())
+
+    def test_disabled_and_max_size(self):
+        """Test disabled cache and payload larger than max size."""
+        json_cache = self._get_cache(config={'use_json_cache': False})
+        json_cache.set(self.data)
+        self.assertIsNone(self._get_cache().get())
+
+        json_cache = self._get_cache(config={'json_cache_max_size': 10})
+        json_cache.set(self.data)
+        self.assertIsNone(self._get_cache().get())
+
+    def test_get_timeout(self):
+        """Test timeout from time step and latest source file."""
+        # no source file uses the time step
+        self.assertEqual(self._get_cache().get_timeout(), 3600)
+
+        DataSourceFileFactory.create(
+            dataset=self.dataset,
+            created_on=timezone.now() - timedelta(minutes=30)
+        )
+        timeout = self._get_cache().get_timeout()
+        self.assertTrue(1700 < timeout <= 1800)
+
+        # next update is overdue
+        DataSourceFileFactory.create(
+            dataset=self.dataset,
+            created_on=timezone.now() - timedelta(hours=2)
+        )
+        self.assertTrue(1700 < self._get_cache().get_timeout() <= 1800)
+        self.dataset.time_step = DatasetTimeStep.QUARTER_HOURLY
+        self.assertEqual(
+            self._get_cache().get_timeout(),
+            MeasurementJSONCache.DEFAULT_MIN_TTL
+        )
@@ -0,0 +1,184 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP API.
+
+.. note:: Shared subscriber of job status notifications.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from redis.exceptions import RedisError
+
+from core.models.background_task import TaskStatus
+from gap_api.models import Job
+
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatusWaiter:
+    """Waiter of a job that is woken up by the subscriber."""
+
+    def __init__(self):
+        """Initialize JobStatusWaiter class."""
+        self.event = threading.Event()
+        self.payload = None
+
+    def notify(self, payload: dict):
+        """Wake up the waiter with the job payload.
+
+        :param payload: job payload from the channel
+        :type payload: dict
+        """
+        self.payload = payload
+        self.event.set()
+
+    def wait(self, timeout: float) -> bool:
+        """Wait until the job is finished.
+
+        :param timeout: max time to wait in seconds
+        :type timeout: float
+        :return: True if the waiter is notified
+        :rtype: bool
+        """
+        return self.event.wait(timeout)
+
+
+class JobStatusSubscriber:
+    """Shared subscriber of job status channels in a process.
+
+    A single pub/sub connection listens to all job channels in
+    a background thread and wakes up the waiters of the finished job,
+    so many waiters do not need one connection or poll each.
+    The thread is started lazily, so it is created after fork.
+    """
+
+    FINISHED_STATUSES = [TaskStatus.COMPLETED, TaskStatus.STOPPED]
+    LISTEN_TIMEOUT = 1
+    RETRY_SLEEP = 1
+
+    def __init__(self):
+        """Initialize JobStatusSubscriber class."""
+        self._lock = threading.Lock()
+        self._waiters = {}
+        self._pubsub = None
+        self._thread = None
+        self._pid = None
+
+    @property
+    def pattern(self) -> str:
+        """Return channel pattern of all jobs."""
+        return f'{Job.CHANNEL_PREFIX}*'
+
+    @property
+    def is_running(self) -> bool:
+        """Check whether the subscriber is running in this process."""
+        return (
+            self._pid == os.getpid() and
+            self._thread is not None and
+            self._thread.is_alive()
+        )
+
+    def start(self):
+        """Start the subscriber thread if it is not running."""
+        with self._lock:
+            if self.is_running:
+                return
+            # connection of parent process must not be closed in child
+            pubsub = cache._cache.get_client().pubsub()
+            pubsub.psubscribe(self.pattern)
+            # wait for the confirmation, so no event is missed after start
+            pubsub.get_message(timeout=self.LISTEN_TIMEOUT)
+            self._pubsub = pubsub
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._listen, args=(pubsub,),
+                name='job-status-subscriber', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the subscriber thread and close the connection."""
+        with self._lock:
+            pubsub = self._pubsub
+            thread = self._thread
+            self._pubsub = None
+            self._thread = None
+            self._pid = None
+        if pubsub is not None:
+            if thread is not None:
+                thread.join(timeout=self.LISTEN_TIMEOUT * 2)
+            pubsub.close()
+
+    def _listen(self, pubsub):
+        """Read messages until the subscriber is stopped.
+
+        Redis client reconnects and subscribes the pattern again
+        after a connection error.
+        :param pubsub: pub/sub connection
+        :type pubsub: redis.client.PubSub
+        """
+        while self._pubsub is pubsub:
+            try:
+                message = pubsub.get_message(timeout=self.LISTEN_TIMEOUT)
+            except (RedisError, OSError) as ex:
+                logger.warning(f'Job status subscriber error: {ex}')
+                time.sleep(self.RETRY_SLEEP)
+                continue
+            if message and message['type'] == 'pmessage':
+                self._dispatch(message['channel'], message['data'])
+
+    def _dispatch(self, channel, data):
+        """Wake up the waiters of a finished job.
+
+        :param channel: channel name of the job
+        :type channel: bytes or str
+        :param data: job payload in JSON
+        :type data: bytes or str
+        """
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        try:
+            payload = json.loads(data)
+        except ValueError as ex:
+            logger.warning(f'Invalid job status payload {channel}: {ex}')
+            return
+        if payload.get('status') not in self.FINISHED_STATUSES:
+            return
+        with self._lock:
+            waiters = list(self._waiters.get(channel, []))
+        for waiter in waiters:
+            waiter.notify(payload)
+
+    @contextmanager
+    def listen(self, channel: str):
+        """Register a waiter of a job channel.
+
+        The job should be checked after the waiter is registered,
+        in case it is finished before.
+        :param channel: channel name of the job
+        :type channel: str
+        :yield: waiter of the job
+        :rtype: JobStatusWaiter
+        """
+        self.start()
+        waiter = JobStatusWaiter()
+        with self._lock:
+            self._waiters.setdefault(channel, set()).add(waiter)
+        try:
+            yield waiter
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(channel, set())
+                waiters.discard(waiter)
+                if not waiters:
+                    self._waiters.pop(channel, None)
+
+
+job_status_subscriber = JobStatusSubscriber()
@@ -0,0 +1,176 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP API.
+
+.. note:: Cache for JSON measurement results.
+"""
+
+import json
+import zlib
+import hashlib
+import logging
+from functools import cached_property
+from datetime import datetime, timedelta
+from typing import List
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from gap.models import Dataset, DataSourceFile, DatasetTimeStep
+from gap_api.models import UserFile
+
+
+logger = logging.getLogger(__name__)
+
+
+class MeasurementJSONCache:
+    """Cache JSON output of measurement API.
+
+    Cache key is built from the normalized query of UserFile,
+    the requested datetime range and the version of each dataset.
+    Dataset version is changed when an ingestor is finished,
+    so the old results will not be used anymore.
+    Available config in Preferences.job_executor_config:
+    use_json_cache: enable the cache, defaults to True
+    json_cache_max_size: max size of compressed payload in bytes
+    json_cache_min_ttl: min timeout in seconds
+    json_cache_max_ttl: max timeout in seconds
+    """
+
+    CACHE_PREFIX_KEY = 'gap-api-json-'
+    DEFAULT_MAX_SIZE = 1024 * 1024  # 1MB
+    DEFAULT_MIN_TTL = 60
+    DEFAULT_MAX_TTL = 6 * 60 * 60
+    TIME_STEP_SECONDS = {
+        DatasetTimeStep.QUARTER_HOURLY: 15 * 60,
+        DatasetTimeStep.HOURLY: 60 * 60,
+        DatasetTimeStep.DAILY: 24 * 60 * 60
+    }
+
+    def __init__(
+        self, user_file: UserFile, datasets: List[Dataset],
+        start_dt: datetime, end_dt: datetime, config: dict = None
+    ):
+        """Initialize MeasurementJSONCache class.
+
+        :param user_file: UserFile with query params of the request
+        :type user_file: UserFile
+        :param datasets: datasets that are read by the request
+        :type datasets: List[Dataset]
+        :param start_dt: start datetime of the request
+        :type start_dt: datetime
+        :param end_dt: end datetime of the request
+        :type end_dt: datetime
+        :param config: job executor config from Preferences
+        :type config: dict
+        """
+        self.user_file = user_file
+        self.datasets = sorted(datasets, key=lambda d: d.id)
+        self.start_dt = start_dt
+        self.end_dt = end_dt
+        self.config = config or {}
+
+    @property
+    def is_enabled(self) -> bool:
+        """Check whether the cache is enabled."""
+        return self.config.get('use_json_cache', True)
+
+    @property
+    def max_size(self) -> int:
+        """Return max size of compressed payload."""
+        return self.config.get('json_cache_max_size', self.DEFAULT_MAX_SIZE)
+
+    @property
+    def min_ttl(self) -> int:
+        """Return min timeout in seconds."""
+        return self.config.get('json_cache_min_ttl', self.DEFAULT_MIN_TTL)
+
+    @property
+    def max_ttl(self) -> int:
+        """Return max timeout in seconds."""
+        return self.config.get('json_cache_max_ttl', self.DEFAULT_MAX_TTL)
+
+    @cached_property
+    def cache_key(self) -> str:
+        """Return cache key of the request."""
+        if not self.user_file.query_hash:
+            self.user_file.query_hash = self.user_file._calculate_hash()
+        combined_str = self.user_file.query_hash
+        # default start/end date depends on the request date
+        combined_str += f'start_dt:{self.start_dt.isoformat()}'
+        combined_str += f'end_dt:{self.end_dt.isoformat()}'
+        combined_str += (
+            'forecast_date:'
+            f'{self.user_file.query_params.get("forecast_date", "-")}'
+        )
+        for dataset in self.datasets:
+            combined_str += (
+                f'dataset:{dataset.id}:{dataset.get_cache_version()}'
+            )
+        return (
+            f'{self.CACHE_PREFIX_KEY}'
+            f'{hashlib.sha256(combined_str.encode()).hexdigest()}'
+        )
+
+    def get_timeout(self) -> int:
+        """Calculate timeout based on time step and latest source file.
+
+        The result is expected to change when the next source file
+        is ingested, which is estimated from the latest source file
+        and the time step of the dataset.
+        :return: timeout in seconds
+        :rtype: int
+        """
+        now = timezone.now()
+        timeout = self.max_ttl
+        for dataset in self.datasets:
+            time_step = self.TIME_STEP_SECONDS.get(
+                dataset.time_step, self.min_ttl
+            )
+            latest_created_on = DataSourceFile.objects.filter(
+                dataset=dataset
+            ).order_by('-created_on').values_list(
+                'created_on', flat=True
+            ).first()
+            if latest_created_on is None:
+                dataset_timeout = time_step
+            else:
+                dataset_timeout = (
+                    latest_created_on + timedelta(seconds=time_step) - now
+                ).total_seconds()
+            timeout = min(timeout, dataset_timeout)
+        # next update is overdue, keep the result for a short time
+        return int(max(timeout, self.min_ttl))
+
+    def get(self) -> dict:
+        """Get cached JSON output.
+
+        :return: JSON output or None if there is no cache
+        :rtype: dict
+        """
+        if not self.is_enabled:
+            return None
+        payload = cache.get(self.cache_key, None)
+        if payload is None:
+            return None
+        try:
+            return json.loads(zlib.decompress(payload))
+        except (zlib.error, ValueError) as ex:
+            logger.warning(f'Invalid JSON cache payload: {ex}')
+            return None
+
+    def set(self, data: dict):
+        """Store JSON output to the cache.
+
+        Payload that is larger than max_size is not stored.
+        :param data: JSON output
+        :type data: dict
+        """
+        if not self.is_enabled or data is None:
+            return
+        payload = zlib.compress(
+            json.dumps(data, separators=(',', ':')).encode()
+        )
+        if len(payload) > self.max_size:
+            return
+        cache.set(self.cache_key, payload, timeout=self.get_timeout())
@@ -34,6 +34,7 @@ connection.close()
 print('-----------------------------------------------------')
 print('2. Generate plumber.R file')
 from spw.utils.plumber import (  # noqa
+    get_plumber_ports,
     spawn_r_plumber,
     write_plumber_file
 )
@@ -41,7 +42,7 @@ write_plumber_file()
 
 print('-----------------------------------------------------')
 print('3. Spawn initial plumber process')
-ports = [8282]
+ports = get_plumber_ports()
 for index, port in enumerate(ports):
     print(f'Spawn plumber {index + 1} with port {port}')
     plumber_process = spawn_r_plumber(index=index + 1, port=port)
@@ -44,20 +44,14 @@ class PriseMessageContext:
         :return: Dictionary of context
         :rtype: dict
         """
-        ctx = {}
-
         # get farm_group
         farm_group: FarmGroup = self.farm.farmgroup_set.first()
         if farm_group is None:
-            return ctx
-
-        ctx[PriseMessageContextVariable.FARM_GROUP_PHONE] = (
-            farm_group.phone_number
-        )
+            return {}
 
         # return if data_type is None / not TTA1 or TTA2 message
         if self.data_type is None:
-            return ctx
+            return self.build_context(farm_group.phone_number, None)
 
         # get prise data
         prise_data = PriseData.objects.filter(
@@ -77,8 +71,26 @@ class PriseMessageContext:
         if pest_data is None:
             return {}
 
-        # check if pest_data.value is NaN or null
-        if pest_data.value is None or str(pest_data.value).lower() == 'nan':
+        return self.build_context(farm_group.phone_number, pest_data.value)
+
+    def build_context(self, farm_group_phone: str, pest_value: float):
+        """Build context from farm group phone and pest value.
+
+        :param farm_group_phone: phone number of the farm group
+        :type farm_group_phone: str
+        :param pest_value: value of PriseDataByPest for the pest
+        :type pest_value: float
+        :return: Dictionary of context
+        :rtype: dict
+        """
+        ctx = {
+            PriseMessageContextVariable.FARM_GROUP_PHONE: farm_group_phone
+        }
+        if self.data_type is None:
+            return ctx
+
+        # check if pest_value is NaN or null
+        if pest_value is None or str(pest_value).lower() == 'nan':
             return {}
 
         ctx[PriseMessageContextVariable.PLANTING_CURRENT_MONTH] = (
@@ -88,10 +100,10 @@ class PriseMessageContext:
             self._get_previous_month(self.generated_date).strftime('%B')
         )
         ctx[PriseMessageContextVariable.PEST_WINDOW_DAY_1] = (
-            int(pest_data.value) - 1
+            int(pest_value) - 1
         )
         ctx[PriseMessageContextVariable.PEST_WINDOW_DAY_2] = (
-            int(pest_data.value) + 1
+            int(pest_value) + 1
         )
 
         return ctx
@@ -131,3 +143,117 @@ def generate_prise_message(
     # get messages, use default template
     messages = PriseMessage.get_messages(pest, schedule.group, context)
     return [f'"{message}"' for message in messages]
+
+
+class PriseMessageBulkGenerator:
+    """Generate prise messages of many farms with bulk queries.
+
+    The schedule and message templates are fetched once,
+    farm group phone and pest values are fetched by load for
+    a list of farms and the rendered messages are reused
+    for the same context.
+    The result is same with generate_prise_message.
+    """
+
+    def __init__(self, pests: List[Pest], generated_date: date):
+        """Initialize PriseMessageBulkGenerator.
+
+        :param pests: list of pest
+        :type pests: List[Pest]
+        :param generated_date: generated date
+        :type generated_date: date
+        """
+        self.pests = pests
+        self.generated_date = generated_date
+        self.schedule = PriseMessageSchedule.get_schedule(
+            datetime.combine(generated_date, time.min, timezone.utc)
+        )
+        self.contexts = {}
+        if self.schedule is not None:
+            self.contexts = {
+                pest.id: PriseMessageContext(
+                    None, pest, self.schedule.group, generated_date
+                ) for pest in pests
+            }
+        self.message_objects = {}
+        self.messages = {}
+        self.farm_group_phones = {}
+        self.pest_values = {}
+
+    def load(self, farm_ids: List[int]):
+        """Load farm group phone and pest values of the farms.
+
+        :param farm_ids: list of farm id
+        :type farm_ids: List[int]
+        """
+        self.farm_group_phones = {}
+        self.pest_values = {}
+        if self.schedule is None:
+            return
+
+        # first farm group of each farm
+        for farm_id, phone_number in FarmGroup.farms.through.objects.filter(
+            farm_id__in=farm_ids
+        ).order_by('farmgroup__name').values_list(
+            'farm_id', 'farmgroup__phone_number'
+        ):
+            self.farm_group_phones.setdefault(farm_id, phone_number)
+
+        data_type = PriseDataType.get_type_by_message_group(
+            self.schedule.group
+        )
+        if data_type is None:
+            return
+
+        # latest prise data of each farm
+        data_ids = {}
+        for farm_id, data_id in PriseData.objects.filter(
+            farm_id__in=farm_ids,
+            data_type=data_type
+        ).order_by('farm_id', '-generated_at').values_list(
+            'farm_id', 'id'
+        ):
+            data_ids.setdefault(farm_id, data_id)
+
+        data_farms = {
+            data_id: farm_id for farm_id, data_id in data_ids.items()
+        }
+        for data_id, pest_id, value in PriseDataByPest.objects.filter(
+            data_id__in=data_farms.keys(),
+            pest_id__in=self.contexts.keys()
+        ).values_list('data_id', 'pest_id', 'value'):
+            self.pest_values[(data_farms[data_id], pest_id)] = value
+
+    def generate(self, farm_id: int, pest: Pest) -> List[str]:
+        """Generate prise message of a loaded farm.
+
+        :param farm_id: farm id
+        :type farm_id: int
+        :param pest: pest object
+        :type pest: Pest
+        :return: List of message
+        :rtype: List[str]
+        """
+        if self.schedule is None or farm_id not in self.farm_group_phones:
+            return []
+
+        context = self.contexts[pest.id].build_context(
+            self.farm_group_phones[farm_id],
+            self.pest_values.get((farm_id, pest.id))
+        )
+        if len(context) == 0:
+            return []
+
+        key = (pest.id, tuple(context.items()))
+        if key not in self.messages:
+            if pest.id not in self.message_objects:
+                self.message_objects[pest.id] = list(
+                    PriseMessage.get_messages_objects(
+                        pest=pest, message_group=self.schedule.group
+                    )
+                )
+            self.messages[key] = [
+                f'"{message.get_message(context)}"'
+                for message in self.message_objects[pest.id]
+            ]
+        return self.messages[key]
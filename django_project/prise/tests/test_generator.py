@@ -12,17 +12,23 @@ from gap.models import FarmGroup, Pest
 from gap.factories import (
     FarmFactory
 )
+from message.models import MessageTemplate
 from prise.models.data import (
     PriseData,
     PriseDataRawInput,
     PriseDataByPestRawInput
 )
+from prise.models.message import PriseMessage, PriseMessageSchedule
 from prise.variables import (
     PriseDataType,
     PriseMessageGroup,
     PriseMessageContextVariable
 )
-from prise.generator import PriseMessageContext
+from prise.generator import (
+    PriseMessageContext,
+    PriseMessageBulkGenerator,
+    generate_prise_message
+)
 
 
 class PriseGeneratorTest(TestCase):
@@ -156,3 +162,47 @@ class PriseGeneratorTest(TestCase):
             self.date)
         context = ctx.context
         self.assertEqual(len(context), 0)
+
+    def test_bulk_generator(self):
+        """Test bulk generator returns same messages for each farm."""
+        farm_2 = FarmFactory(unique_id='FARM2')
+        farm_3 = FarmFactory(unique_id='FARM3')
+        self.farm_group.farms.add(self.farm_1, farm_2)
+        PriseData.insert_data(
+            PriseDataRawInput(
+                farm_unique_id=self.farm_1.unique_id,
+                generated_at=self.datetime,
+                values=[
+                    PriseDataByPestRawInput(
+                        'ophiomyia_stat_v02_w1_nrt_midpoint',
+                        10
+                    )
+                ],
+                data_type=PriseDataType.CLIMATOLOGY
+            )
+        )
+        prise_message = PriseMessage.objects.create(pest=self.pest)
+        prise_message.messages.add(
+            *MessageTemplate.objects.filter(
+                group=PriseMessageGroup.TIME_TO_ACTION_1
+            )
+        )
+        farms = [self.farm_1, farm_2, farm_3]
+
+        # no schedule
+        generator = PriseMessageBulkGenerator([self.pest], self.date)
+        generator.load([farm.id for farm in farms])
+        self.assertEqual(generator.generate(self.farm_1.id, self.pest), [])
+
+        PriseMessageSchedule.objects.create(
+            group=PriseMessageGroup.TIME_TO_ACTION_1,
+            schedule_date=self.date
+        )
+        generator = PriseMessageBulkGenerator([self.pest], self.date)
+        generator.load([farm.id for farm in farms])
+        for farm in farms:
+            self.assertEqual(
+                generator.generate(farm.id, self.pest),
+                generate_prise_message(farm, self.pest, self.date)
+            )
+        self.assertTrue(generator.generate(self.farm_1.id, self.pest))
@@ -6,6 +6,7 @@ Tomorrow Now GAP.
 """
 
 from datetime import datetime, timedelta, date
+from typing import List
 
 import pytz
 from django.db import transaction
@@ -29,8 +30,18 @@ from spw.utils.plumber import PLUMBER_PORT
 class CropInsightFarmGenerator:
     """Insight Farm Generator."""
 
-    def __init__(self, farm: Farm, farm_group: FarmGroup, port=PLUMBER_PORT):
-        """Init Generator."""
+    BATCH_SIZE = 1000
+
+    def __init__(
+        self, farm: Farm, farm_group: FarmGroup, port=PLUMBER_PORT,
+        attributes_dict: dict = None
+    ):
+        """Init Generator.
+
+        :param attributes_dict: dataset attribute of each variable
+            that is shared across generators, defaults to None
+        :type attributes_dict: dict, optional
+        """
         self.farm = farm
         self.farm_group = farm_group
         self.today = timezone.now()
@@ -38,7 +49,7 @@ class CropInsightFarmGenerator:
         self.today = self.today.date()
 
         self.tomorrow = self.today + timedelta(days=1)
-        self.attributes = calculate_from_point_attrs()
+        self._attributes_dict = attributes_dict
         self.port = port
         self.errors = []
 
@@ -79,71 +90,123 @@ class CropInsightFarmGenerator:
 
         return previous_signal.exists()
 
-    def save_spw(
-            self, farm: Farm, signal, too_wet_indicator, last_4_days,
-            last_2_days, today_tomorrow, is_sent_before
-    ):
-        """Save spw data."""
-        # Save SPW
-        FarmSuitablePlantingWindowSignal.objects.update_or_create(
-            farm=farm,
-            generated_date=self.today,
-            defaults={
-                'signal': signal,
-                'too_wet_indicator': too_wet_indicator,
-                'last_4_days': self.return_float(last_4_days),
-                'last_2_days': self.return_float(last_2_days),
-                'today_tomorrow': self.return_float(today_tomorrow),
-                'is_sent_before': is_sent_before,
-                'prev_reference_date': self.reference_date
-
-            }
+    @staticmethod
+    def get_attributes_dict() -> dict:
+        """Return dataset attribute of each short-term forecast variable.
+
+        :return: Dictionary of SPW variable and DatasetAttribute
+        :rtype: dict
+        """
+        attributes = {}
+        for attr in calculate_from_point_attrs().select_related(
+            'attribute'
+        ).order_by('id'):
+            attributes.setdefault(attr.attribute.variable_name, attr)
+        return {k: attributes.get(v) for k, v in VAR_MAPPING_REVERSE.items()}
+
+    @property
+    def attributes_dict(self) -> dict:
+        """Return dataset attribute of each short-term forecast variable."""
+        if self._attributes_dict is None:
+            self._attributes_dict = self.get_attributes_dict()
+        return self._attributes_dict
+
+    def save_spw(self, farms: List[Farm], output, is_sent_before):
+        """Save spw data of the farms.
+
+        Existing signals of the date are updated, the others are created.
+        :param farms: Farms that use the output
+        :type farms: List[Farm]
+        :param output: SPW output
+        :type output: SPWOutput
+        :param is_sent_before: Whether tier 1 signal has been sent before
+        :type is_sent_before: bool
+        """
+        values = {
+            'signal': output.data.goNoGo,
+            'too_wet_indicator': output.data.tooWet,
+            'last_4_days': self.return_float(output.data.last4Days),
+            'last_2_days': self.return_float(output.data.last2Days),
+            'today_tomorrow': self.return_float(output.data.todayTomorrow),
+            'is_sent_before': is_sent_before,
+            'prev_reference_date': self.reference_date
+        }
+        signals = FarmSuitablePlantingWindowSignal.objects.filter(
+            farm__in=farms,
+            generated_date=self.today
         )
+        existing_farm_ids = set(signals.values_list('farm_id', flat=True))
+        signals.update(**values)
+        FarmSuitablePlantingWindowSignal.objects.bulk_create(
+            [
+                FarmSuitablePlantingWindowSignal(
+                    farm=farm,
+                    generated_date=self.today,
+                    **values
+                ) for farm in farms if farm.id not in existing_farm_ids
+            ],
+            batch_size=self.BATCH_SIZE
+        )
+
+    def save_shortterm_forecast(self, historical_dict, farms: List[Farm]):
+        """Save short term forecast data of the farms.
 
-    def save_shortterm_forecast(self, historical_dict, farm: Farm):
-        """Save spw data."""
+        The data of existing forecast of the date is replaced.
+        :param historical_dict: historical and forecast data of the grid
+        :type historical_dict: dict
+        :param farms: Farms that use the forecast
+        :type farms: List[Farm]
+        """
         # Save the short term forecast
-        c, is_created = FarmShortTermForecast.objects.get_or_create(
-            farm=farm,
+        forecasts = {}
+        for forecast in FarmShortTermForecast.objects.filter(
+            farm__in=farms,
             forecast_date=self.today
-        )
-        if not is_created:
+        ).order_by('id'):
+            forecasts.setdefault(forecast.farm_id, forecast)
+        if forecasts:
             # Delete the FarmShortTermForecastData
             FarmShortTermForecastData.objects.filter(
-                forecast=c
+                forecast__in=list(forecasts.values())
             ).delete()
+        new_forecasts = FarmShortTermForecast.objects.bulk_create(
+            [
+                FarmShortTermForecast(
+                    farm=farm,
+                    forecast_date=self.today
+                ) for farm in farms if farm.id not in forecasts
+            ],
+            batch_size=self.BATCH_SIZE
+        )
+        for forecast in new_forecasts:
+            forecasts[forecast.farm_id] = forecast
 
-        # get the attributes
-        attributes_dict = {}
-        for k, v in VAR_MAPPING_REVERSE.items():
-            attributes_dict[k] = self.attributes.filter(
-                attribute__variable_name=v
-            ).first()
-
-        batch_insert = []
-        # Save the short term forecast data
+        # get the values once, they are same for all farms
+        values = []
         for k, v in historical_dict.items():
             _date = datetime.strptime(v['date'], "%Y-%m-%d")
             _date = _date.replace(tzinfo=pytz.UTC)
             if self.tomorrow <= _date.date():
                 for attr_name, val in v.items():
-                    try:
-                        attr = attributes_dict[attr_name]
-                        if attr and val is not None:
-                            batch_insert.append(
-                                FarmShortTermForecastData(
-                                    forecast=c,
-                                    value_date=_date,
-                                    dataset_attribute=attr,
-                                    value=val
-                                )
-                            )
-                    except KeyError:
-                        pass
+                    attr = self.attributes_dict.get(attr_name)
+                    if attr and val is not None:
+                        values.append((_date, attr, val))
+
+        batch_insert = [
+            FarmShortTermForecastData(
+                forecast=forecast,
+                value_date=_date,
+                dataset_attribute=attr,
+                value=val
+            )
+            for forecast in forecasts.values()
+            for _date, attr, val in values
+        ]
         # Save the batch insert
         if batch_insert:
             FarmShortTermForecastData.objects.bulk_create(
-                batch_insert, ignore_conflicts=True
+                batch_insert, ignore_conflicts=True,
+                batch_size=self.BATCH_SIZE
             )
 
     def generate_spw(self):
@@ -158,18 +221,40 @@ class CropInsightFarmGenerator:
             print(f'Generate SPW Error: {str(e)}')
             raise e
         finally:
-            # save error logs
-            if self.errors:
-                SPWErrorLog.objects.bulk_create(self.errors)
-                self.errors = []
+            self.save_errors()
+
+    def save_errors(self):
+        """Save error logs of SPW."""
+        if self.errors:
+            SPWErrorLog.objects.bulk_create(self.errors)
+            self.errors = []
+
+    def is_generated(self):
+        """Check whether the SPW of the farm is already generated."""
+        return FarmSuitablePlantingWindowSignal.objects.filter(
+            farm=self.farm,
+            generated_date=self.today
+        ).exists()
+
+    def save_output(self, output, historical_dict: dict):
+        """Save SPW output that is calculated outside the generator.
+
+        Do atomic because need all data to be saved.
+        :param output: SPW output, None if the model is failed
+        :type output: SPWOutput
+        :param historical_dict: historical and forecast data of the grid
+        :type historical_dict: dict
+        """
+        try:
+            with transaction.atomic():
+                self._save_output(output, historical_dict)
+        finally:
+            self.save_errors()
 
     def _generate_spw(self):
         """Generate Farm SPW."""
         # Check already being generated, no regenereated!
-        if FarmSuitablePlantingWindowSignal.objects.filter(
-            farm=self.farm,
-            generated_date=self.today
-        ).exists():
+        if self.is_generated():
             return
 
         # Generate the spw
@@ -196,6 +281,10 @@ class CropInsightFarmGenerator:
                     raise e
                 retry += 1
 
+        self._save_output(output, historical_dict)
+
+    def _save_output(self, output, historical_dict: dict):
+        """Save SPW output to the farms that have same grid."""
         if output is None:
             self._add_error('SPW Output is empty')
             return
@@ -210,15 +299,12 @@ class CropInsightFarmGenerator:
                 grid=self.farm.grid
             )
 
+        farms = list(farms)
+
         # Check if previous Tier 1 signal exists
         tier_1_exists = self.check_previous_tier_1_signal()
-        for farm in farms:
-            self.save_spw(
-                farm,
-                output.data.goNoGo, output.data.tooWet, output.data.last4Days,
-                output.data.last2Days, output.data.todayTomorrow, tier_1_exists
-            )
-            self.save_shortterm_forecast(historical_dict, farm)
+        self.save_spw(farms, output, tier_1_exists)
+        self.save_shortterm_forecast(historical_dict, farms)
 
     def _add_error(self, error):
         """Save error log of SPW."""
@@ -5,8 +5,11 @@ Tomorrow Now GAP.
 .. note:: SPW Data Input using GAP.
 """
 from datetime import datetime
+from typing import List
+
 import numpy as np
 import pytz
+import xarray as xr
 from django.contrib.gis.geos import Point
 from django.core.cache import cache
 
@@ -53,15 +56,25 @@ class GapInput(SPWDataInput):
     CHECK_CACHE_KEY_TIO_ZARR_EXPIRY = 60 * 10  # 10 minutes
     CACHE_KEY_TIO_ZARR_EXPIRY = 60 * 60 * 2  # 2 hours
 
+    # LTN values are cached per location for the current date
+    CACHE_PREFIX_KEY_LTN = 'spw-ltn-'
+    CACHE_KEY_LTN_EXPIRY = 60 * 60 * 24  # 1 day
+
     def __init__(
         self, latitude: float, longitude: float, current_date: datetime,
-        is_grid=True
+        is_grid=True, forecast_data: dict = None
     ) -> None:
-        """Initialize the SPWDataInput class."""
+        """Initialize the SPWDataInput class.
+
+        :param forecast_data: preloaded forecast data from GapBatchInput,
+            defaults to None
+        :type forecast_data: dict, optional
+        """
         super().__init__(latitude, longitude, current_date, is_grid)
         self.location_input = DatasetReaderInput.from_point(
             Point(longitude, latitude),
         )
+        self.forecast_data = forecast_data
 
     def _fetch_timelines_data_dataset(self):
         """Return dataset that will be used for _fetch_timelines_data."""
@@ -119,22 +132,18 @@ class GapInput(SPWDataInput):
             results[month_day] = data
         return results
 
-    def _fetch_ltn_data(self, historical_dict: dict) -> dict:
-        """Fetch Long Term Normals data for given location.
+    @property
+    def ltn_cache_key(self) -> str:
+        """Return cache key of LTN values for the location and date."""
+        return (
+            f'{self.CACHE_PREFIX_KEY_LTN}{self.latitude:.4f}-'
+            f'{self.longitude:.4f}-{self.current_date.date().isoformat()}'
+        )
 
-        The resulting data will be merged into historical_dict.
+    def _read_ltn_values(self) -> dict:
+        """Read Long Term Normals values for given location.
 
-        :param location_input: Location for the query
-        :type location_input: DatasetReaderInput
-        :param attrs: List of attributes
-        :type attrs: List[DatasetAttribute]
-        :param start_dt: Start date time
-        :type start_dt: datetime
-        :param end_dt: End date time
-        :type end_dt: datetime
-        :param historical_dict: Dictionary from historical data
-        :type historical_dict: dict
-        :return: Merged dictinoary with LTN data
+        :return: Dictionary of month_day and LTN values
         :rtype: dict
         """
         dataset = Dataset.objects.filter(
@@ -159,12 +168,36 @@ class GapInput(SPWDataInput):
         #     raise Exception(
         #         f'Failed to fetch Tomorrow.io API! {str(reader.errors)}'
         #     )
+        results = {}
         for val in reader.get_raw_results():
             month_day = val.get_datetime_repr('%m-%d')
+            results[month_day] = {
+                v: val.values.get(k, '') for k, v in self.LTN_MAPPING.items()
+            }
+        return results
+
+    def _fetch_ltn_data(self, historical_dict: dict) -> dict:
+        """Fetch Long Term Normals data for given location.
+
+        The resulting data will be merged into historical_dict.
+        LTN values are cached per location and date, so the API is
+        called once a day for each grid.
+
+        :param historical_dict: Dictionary from historical data
+        :type historical_dict: dict
+        :return: Merged dictinoary with LTN data
+        :rtype: dict
+        """
+        ltn_values = cache.get(self.ltn_cache_key)
+        if ltn_values is None:
+            ltn_values = self._read_ltn_values()
+            if ltn_values:
+                cache.set(
+                    self.ltn_cache_key, ltn_values, self.CACHE_KEY_LTN_EXPIRY
+                )
+        for month_day, values in ltn_values.items():
             if month_day in historical_dict:
-                data = historical_dict[month_day]
-                for k, v in self.LTN_MAPPING.items():
-                    data[v] = val.values.get(k, '')
+                historical_dict[month_day].update(values)
         return historical_dict
 
     def _is_date_in_zarr(self, date: datetime) -> bool:
@@ -228,9 +261,26 @@ class GapInput(SPWDataInput):
         )
         reader.read()
         reader_value = reader.get_data_values()
+        # load the values once instead of computing on each access
+        ds = reader_value.xr_dataset[self.ATTRIBUTES].compute()
+        return self._forecast_to_dict(
+            ds['date'].values,
+            {var_name: ds[var_name].values for var_name in self.ATTRIBUTES}
+        )
+
+    @classmethod
+    def _forecast_to_dict(cls, dates: np.ndarray, values: dict) -> dict:
+        """Convert forecast values of a location to dictionary.
+
+        :param dates: Dates of the forecast
+        :type dates: np.ndarray
+        :param values: Dictionary of attribute and values for each date
+        :type values: dict
+        :return: Dictionary of month_day and results
+        :rtype: dict
+        """
         results = {}
-        for dt_idx, dt in enumerate(
-            reader_value.xr_dataset['date'].values):
+        for dt_idx, dt in enumerate(dates):
             timestamp = (
                     (dt - np.datetime64('1970-01-01T00:00:00')) /
                     np.timedelta64(1, 's')
@@ -240,9 +290,9 @@ class GapInput(SPWDataInput):
             data = {
                 'date': dt.strftime('%Y-%m-%d')
             }
-            for var_name in self.ATTRIBUTES:
-                v = reader_value.xr_dataset[var_name].values[dt_idx]
-                var_map = self.VAR_MAPPING.get(var_name)
+            for var_name in cls.ATTRIBUTES:
+                v = values[var_name][dt_idx]
+                var_map = cls.VAR_MAPPING.get(var_name)
                 data[var_map] = (
                     v if not np.isnan(v) else None
                 )
@@ -256,6 +306,9 @@ class GapInput(SPWDataInput):
 
     def load_data(self):
         """Load the input data."""
+        if self.forecast_data is not None:
+            return self._fetch_ltn_data(self.forecast_data)
+
         # use_tio_zarr if only it's grid and config is True
         use_tio_zarr = Preferences.load().crop_plan_config.get(
             'use_tio_zarr',
@@ -273,3 +326,105 @@ class GapInput(SPWDataInput):
 
         final_dict = self._fetch_ltn_data(historical_dict)
         return final_dict
+
+
+class GapBatchInput:
+    """Class to load the input data of SPW generator for many grids.
+
+    T.io forecast zarr is read once for the bbox of all grids,
+    then the values of each grid are selected by nearest point.
+    """
+
+    # buffer of the bbox, so the nearest point of the grid is included
+    BBOX_BUFFER = 0.1
+    GRID_DIM = 'grid'
+
+    def __init__(self, points: List[Point], current_date: datetime) -> None:
+        """Initialize the GapBatchInput class.
+
+        :param points: Grid points
+        :type points: List[Point]
+        :param current_date: Current date
+        :type current_date: datetime
+        """
+        self.points = points
+        self.current_date = current_date
+        self.inputs = [
+            GapInput(point.y, point.x, current_date, is_grid=True)
+            for point in points
+        ]
+
+    def _read_forecast_from_zarr(self) -> List[dict]:
+        """Read forecast data of all grids from T.io zarr.
+
+        :return: Dictionary of month_day and results for each grid
+        :rtype: List[dict]
+        """
+        dataset = Dataset.objects.get(
+            name='Tomorrow.io Short-term Forecast',
+            store_type=DatasetStore.ZARR
+        )
+        attributes = DatasetAttribute.objects.filter(
+            attribute__variable_name__in=GapInput.ATTRIBUTES,
+            dataset=dataset
+        )
+        lats = np.array([point.y for point in self.points])
+        lons = np.array([point.x for point in self.points])
+        location_input = DatasetReaderInput.from_bbox([
+            lons.min() - self.BBOX_BUFFER,
+            lats.min() - self.BBOX_BUFFER,
+            lons.max() + self.BBOX_BUFFER,
+            lats.max() + self.BBOX_BUFFER
+        ])
+        reader = TioZarrReader(
+            dataset,
+            list(attributes),
+            location_input,
+            self.inputs[0].start_date,
+            self.inputs[0].end_date,
+            use_cache=False
+        )
+        reader.read()
+        reader_value = reader.get_data_values()
+        ds = reader_value.xr_dataset[GapInput.ATTRIBUTES].sel(
+            lat=xr.DataArray(lats, dims=self.GRID_DIM),
+            lon=xr.DataArray(lons, dims=self.GRID_DIM),
+            method='nearest'
+        ).transpose(self.GRID_DIM, 'date').compute()
+        dates = ds['date'].values
+        values = {
+            var_name: ds[var_name].values
+            for var_name in GapInput.ATTRIBUTES
+        }
+        return [
+            GapInput._forecast_to_dict(
+                dates,
+                {
+                    var_name: var_values[idx]
+                    for var_name, var_values in values.items()
+                }
+            ) for idx in range(len(self.points))
+        ]
+
+    def get_inputs(self) -> List[GapInput]:
+        """Return input of each grid.
+
+        When the current date is in T.io zarr, the forecast data
+        is preloaded to the inputs. Otherwise each input
+        will fetch the data by itself.
+        :return: Input of each grid
+        :rtype: List[GapInput]
+        """
+        if not self.inputs:
+            return self.inputs
+        use_tio_zarr = Preferences.load().crop_plan_config.get(
+            'use_tio_zarr',
+            True
+        )
+        if use_tio_zarr and self.inputs[0]._is_date_in_zarr(
+            self.current_date
+        ):
+            forecasts = self._read_forecast_from_zarr()
+            for data_input, forecast_data in zip(self.inputs, forecasts):
+                data_input.forecast_data = forecast_data
+        return self.inputs
@@ -5,6 +5,8 @@ Tomorrow Now GAP.
 .. note:: SPW Generator
 """
 
+import csv
+import io
 import logging
 import os
 from datetime import datetime, timedelta
@@ -20,11 +22,12 @@ from gap.providers import TIO_PROVIDER
 from spw.models import RModel, RModelExecutionLog, RModelExecutionStatus
 from spw.utils.plumber import (
     execute_spw_model,
+    execute_spw_model_batch,
     write_plumber_data,
     remove_plumber_data,
     PLUMBER_PORT
 )
-from .gap_input import GapInput
+from .gap_input import GapInput, GapBatchInput
 
 logger = logging.getLogger(__name__)
 ATTRIBUTES = [
@@ -130,6 +133,99 @@ def calculate_from_grid(
     return _calculate_from_point(grid_point, port=port, is_grid=True)
 
 
+def calculate_from_grids(
+    grid_points: List[Point], port=PLUMBER_PORT
+) -> List[Tuple[SPWOutput, dict]]:
+    """Calculate SPW from given grid points with one plumber request.
+
+    :param grid_points: Locations to be queried
+    :type grid_points: List[Point]
+    :return: Output and historical dict of each point
+    :rtype: List[Tuple[SPWOutput, dict]]
+    """
+    today = datetime.now(tz=pytz.UTC)
+    logger.info(
+        f'Calculate SPW for {len(grid_points)} grids at Today: {today}'
+    )
+
+    historical_dicts = []
+    rows_list = []
+    for data_input in GapBatchInput(grid_points, today).get_inputs():
+        historical_dicts.append(data_input.get_data())
+        rows_list.append(data_input.get_spw_data())
+
+    outputs = _execute_spw_model_batch(
+        rows_list, grid_points, port=port, start_time=today
+    )
+    return list(zip(outputs, historical_dicts))
+
+
+def _get_spw_csv_data(rows: List) -> str:
+    """Return CSV content of SPW data rows.
+
+    :param rows: Data rows
+    :type rows: List
+    :return: CSV content with COLUMNS as header
+    :rtype: str
+    """
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(COLUMNS)
+    writer.writerows(rows)
+    return output.getvalue()
+
+
+def _execute_spw_model_batch(
+    rows_list: List[List], points: List[Point], port=PLUMBER_PORT,
+    start_time=None
+) -> List[SPWOutput]:
+    """Execute SPW Model for many locations and return the outputs.
+
+    The execution logs are saved in bulk without input file.
+    :param rows_list: Data rows of each location
+    :type rows_list: List[List]
+    :param points: location inputs
+    :type points: List[Point]
+    :return: SPW Model output of each location, None if failed
+    :rtype: List[SPWOutput]
+    """
+    model = RModel.objects.order_by('-version').first()
+    start_time = start_time if start_time else timezone.now()
+    items = [
+        {
+            'id': str(idx),
+            'data': _get_spw_csv_data(rows),
+            'lat': point.y,
+            'lon': point.x,
+            'place_name': 'gap_place'
+        } for idx, (rows, point) in enumerate(zip(rows_list, points))
+    ]
+    results = execute_spw_model_batch(items, port=port)
+    end_time = timezone.now()
+
+    outputs = []
+    execution_logs = []
+    for point, (success, data) in zip(points, results):
+        execution_log = RModelExecutionLog(
+            model=model,
+            location_input=point,
+            start_date_time=start_time,
+            end_date_time=end_time,
+            status=(
+                RModelExecutionStatus.SUCCESS if success else
+                RModelExecutionStatus.FAILED
+            )
+        )
+        if isinstance(data, dict):
+            execution_log.output = data
+        else:
+            execution_log.errors = data
+        execution_logs.append(execution_log)
+        outputs.append(SPWOutput(point, data) if success else None)
+    RModelExecutionLog.objects.bulk_create(execution_logs)
+    return outputs
+
+
 def _execute_spw_model(
     rows: List, point: Point, port=PLUMBER_PORT, start_time=None
 ) -> SPWOutput:
@@ -16,18 +16,30 @@ from gap.models import (
     Preferences,
     FarmGroup
 )
+from gap.utils.geometry import ST_X, ST_Y
 from core.utils.url_file_checker import file_exists_at_url
 from spw.models import SPWExecutionLog, SPWMethod
 from spw.tamsat.base import TamsatSPWBase
 from spw.tamsat.planting_date_api import (
     routine_operations_v2,
+    get_planting_dst_output,
     get_pfc_filename,
     WRSI_FILENAME,
     RoutineDefaults
 )
 
 logger = logging.getLogger(__name__)
-DEFAULT_MAX_CHUNK_SIZE = 5000
+DEFAULT_MAX_CHUNK_SIZE = 100000
+# columns of farm df and its field in Farm query
+FARM_FIELDS = {
+    'farm_id': 'id',
+    'farm_unique_id': 'unique_id',
+    'country': 'grid__country__name',
+    'grid_id': 'grid_id',
+    'grid_unique_id': 'grid__unique_id',
+    'Latitude': 'farm_lat',
+    'Longitude': 'farm_lon'
+}
 
 
 class TamsatSPWGenerator(TamsatSPWBase):
@@ -47,6 +59,7 @@ class TamsatSPWGenerator(TamsatSPWBase):
         self.preferences = Preferences.load()
         self.spw_logs = {}
         self.cleanup = cleanup
+        self.planting_dst_outputs = {}
 
     def _init_config(self):
         """Initialize configuration for the SPW generator."""
@@ -213,6 +226,24 @@ class TamsatSPWGenerator(TamsatSPWBase):
         )
         conn.execute(sql)
 
+    def _get_planting_dst_output(
+        self, pfc_thresh, pfc_prob_thresh, wrsi_thresh_factor,
+        wrsi_prob_thresh
+    ):
+        """Get planting date DST grid, calculated once for each config."""
+        key = (
+            pfc_thresh, pfc_prob_thresh, wrsi_thresh_factor, wrsi_prob_thresh
+        )
+        if key not in self.planting_dst_outputs:
+            self.planting_dst_outputs[key] = get_planting_dst_output(
+                self.date, self.tamsat_url, self.working_dir,
+                pfc_thresh=pfc_thresh,
+                pfc_prob_thresh=pfc_prob_thresh,
+                wrsi_thresh_factor=wrsi_thresh_factor,
+                wrsi_prob_thresh=wrsi_prob_thresh
+            )
+        return self.planting_dst_outputs[key]
+
     def _get_slices(self, total_count, max_chunk_size=DEFAULT_MAX_CHUNK_SIZE):
         """Create chunk slices of farm groups."""
         chunk_slices = []
@@ -221,6 +252,13 @@ class TamsatSPWGenerator(TamsatSPWBase):
             chunk_slices.append(slice(start, end))
         return chunk_slices
 
+    def _get_farms(self, farm_group: FarmGroup):
+        """Get values of FARM_FIELDS for farms in the farm group."""
+        return farm_group.farms.order_by('id').annotate(
+            farm_lat=ST_Y('geometry'),
+            farm_lon=ST_X('geometry')
+        ).values_list(*FARM_FIELDS.values())
+
     def _execute_spw_model(
         self, farm_group: FarmGroup, farms_slice, chunk_idx,
         pfc_thresh, pfc_prob_thresh, wrsi_thresh_factor, wrsi_prob_thresh
@@ -229,35 +267,20 @@ class TamsatSPWGenerator(TamsatSPWBase):
         # Create df with columns:
         # date, farm_id, farm_unique_id, country, farm_group_id,
         # farm_group, grid_id, grid_unique_id, Latitude, Longitude,
-        df = pd.DataFrame(columns=[
+        df = pd.DataFrame(list(farms_slice), columns=list(FARM_FIELDS))
+        df['date'] = self.date
+        df['farm_group_id'] = farm_group.id
+        df['farm_group'] = farm_group.name
+        df['pfc_thresh'] = pfc_thresh
+        df['pfc_prob_thresh'] = pfc_prob_thresh
+        df['wrsi_thresh_factor'] = wrsi_thresh_factor
+        df['wrsi_prob_thresh'] = wrsi_prob_thresh
+        df = df[[
             'date', 'farm_id', 'farm_unique_id', 'country',
             'farm_group_id', 'farm_group', 'grid_id', 'grid_unique_id',
             'Latitude', 'Longitude', 'pfc_thresh', 'pfc_prob_thresh',
             'wrsi_thresh_factor', 'wrsi_prob_thresh'
-        ])
-
-        # Add farm data to df
-        for farm in farms_slice:
-            new_row = pd.DataFrame({
-                'date': [self.date],
-                'farm_id': [farm.id],
-                'farm_unique_id': [farm.unique_id],
-                'country': [
-                    farm.grid.country.name if
-                    farm.grid and farm.grid.country else None
-                ],
-                'farm_group_id': [farm_group.id],
-                'farm_group': [farm_group.name],
-                'grid_id': [farm.grid.id if farm.grid else None],
-                'grid_unique_id': [farm.grid.unique_id if farm.grid else None],
-                'Latitude': [farm.geometry.y],
-                'Longitude': [farm.geometry.x],
-                'pfc_thresh': [pfc_thresh],
-                'pfc_prob_thresh': [pfc_prob_thresh],
-                'wrsi_thresh_factor': [wrsi_thresh_factor],
-                'wrsi_prob_thresh': [wrsi_prob_thresh]
-            })
-            df = pd.concat([df, new_row], ignore_index=True)
+        ]]
 
         if df.empty:
             logger.warning(
@@ -266,13 +289,6 @@ class TamsatSPWGenerator(TamsatSPWBase):
             )
             return df
 
-        # export to csv file
-        csv_file_path = os.path.join(
-            self.working_dir,
-            f'spw_tamsat_{farm_group.id}_{chunk_idx}.csv'
-        )
-        df.to_csv(csv_file_path, index=False)
-
         logger.info(
             f'Processing farm group: {farm_group.name} '
             f'with chunk index: {chunk_idx} - '
@@ -283,14 +299,18 @@ class TamsatSPWGenerator(TamsatSPWBase):
         )
 
         all_df, basic_df = routine_operations_v2(
-            self.date.year, self.date.month, self.date.day, csv_file_path,
+            self.date.year, self.date.month, self.date.day, df,
             self.tamsat_url, self.working_dir,
             farm_group.name.replace(' ', ''),
             pfc_thresh=pfc_thresh,
             pfc_prob_thresh=pfc_prob_thresh,
             wrsi_thresh_factor=wrsi_thresh_factor,
             wrsi_prob_thresh=wrsi_prob_thresh,
-            csv_output=False
+            csv_output=False,
+            planting_dst_output=self._get_planting_dst_output(
+                pfc_thresh, pfc_prob_thresh,
+                wrsi_thresh_factor, wrsi_prob_thresh
+            )
         )
 
         return all_df
@@ -319,10 +339,7 @@ class TamsatSPWGenerator(TamsatSPWBase):
         }
         spw_log['log'].start()
 
-        farms = (
-            farm_group.farms.select_related('grid', 'grid__country')
-            .all().order_by('id')
-        )
+        farms = self._get_farms(farm_group)
         total_count = farms.count()
 
         if total_count == 0:
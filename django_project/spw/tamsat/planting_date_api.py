@@ -21,6 +21,7 @@ import io
 
 logger = logging.getLogger(__name__)
 WRSI_FILENAME = 'wrsi_daily_allafrica_0.25.nc'
+FARM_DIM = 'farm'
 
 
 class RoutineDefaults:
@@ -47,26 +48,31 @@ def _get_output_variable(
     obsdata,
     variable_name
 ):
-    """Extract output variable from planting data output."""
+    """Extract output variable from planting data output.
+
+    Each location is selected pointwise along farm dimension,
+    so the cost grows linearly with the number of locations.
+    """
     arrayin_xr = planting_dst_output[variable_name]
     tmp = arrayin_xr.sel(
-        longitude=np.array(obsdata['Longitude']),
-        latitude=np.array(obsdata['Latitude']),
+        longitude=xr.DataArray(
+            np.array(obsdata['Longitude']), dims=FARM_DIM
+        ),
+        latitude=xr.DataArray(
+            np.array(obsdata['Latitude']), dims=FARM_DIM
+        ),
         method='nearest'
     )
-    squeezed = tmp.squeeze()
-    if squeezed.ndim == 0:  # 0-dimensional
-        obslist = np.array([squeezed.item()])  # Extract scalar value
-    else:
-        obslist = np.diag(squeezed.values)
-
-    return obslist
+    squeezed = tmp.squeeze(
+        [dim for dim in tmp.dims if dim != FARM_DIM and tmp.sizes[dim] == 1]
+    )
+    return squeezed.transpose(FARM_DIM, ...).values
 
 
 def sm_decision(
     planting_dst_output, column_name_pfc_mean, column_name_pfc_sd,
     pfc_thresh, pfc_prob_thresh, wrsi_thresh_factor, wrsi_prob_thresh,
-    working_dir
+    working_dir, wrsi_all=None
 ):
     """Calculate decision based on planting data output."""
     pfc_mean = planting_dst_output[column_name_pfc_mean].values
@@ -90,9 +96,10 @@ def sm_decision(
     wrsi_mean = planting_dst_output['wrsi_mean'].values
     wrsi_sd = planting_dst_output['wrsi_std'].values
 
-    wrsi_all = xr.open_dataset(os.path.join(
-        working_dir, WRSI_FILENAME
-    ))
+    if wrsi_all is None:
+        wrsi_all = xr.open_dataset(os.path.join(
+            working_dir, WRSI_FILENAME
+        ))
     wrsi_thresh = wrsi_thresh_factor * np.nanmax(
         wrsi_all['clim_mean_wrsi'], axis=2
     )
@@ -123,7 +130,8 @@ def routine_operations_v2(
     pfc_prob_thresh=RoutineDefaults.PFC_PROB_THRESH,
     wrsi_thresh_factor=RoutineDefaults.WRSI_THRESH_FACTOR,
     wrsi_prob_thresh=RoutineDefaults.WRSI_PROB_THRESH,
-    ecmwf_flag=1, local_flag=0, user_col=None, csv_output=True
+    ecmwf_flag=1, local_flag=0, user_col=None, csv_output=True,
+    planting_dst_output=None
 ):
     """
     Calculate the TAMSAT-ALERT planting date DST (Decision Support Tool).
@@ -145,8 +153,9 @@ def routine_operations_v2(
         Month for which the DST will be run.
     dayin : int
         Day for which the DST will be run.
-    obsfile : str
-        Full path to the CSV file containing the locations of the sites.
+    obsfile : str or pandas.DataFrame
+        Full path to the CSV file containing the locations of the sites,
+        or a DataFrame with the same columns.
         This file must contain a column called 'Longitude' and a column
         called 'Latitude' (case sensitive).
         Other columns (e.g. farmer identifiers) may also be present.
@@ -184,6 +193,9 @@ def routine_operations_v2(
         from the original input file.
     csv_output : bool, optional (default=True)
         If True, the output will be saved as a CSV file.
+    planting_dst_output : xarray.Dataset, optional (default=None)
+        Output of get_planting_dst_output to be reused, so the forecast
+        files are not opened again for each set of locations.
 
     Output
     ------
@@ -256,8 +268,94 @@ def routine_operations_v2(
     datein = dtmod.datetime(int(yearin), int(monthin), int(dayin))
 
     # Read in the observed data
-    obsdata = pds.read_csv(obsfile)
+    if isinstance(obsfile, pds.DataFrame):
+        obsdata = obsfile.copy()
+    else:
+        obsdata = pds.read_csv(obsfile)
+
+    if planting_dst_output is None:
+        planting_dst_output = get_planting_dst_output(
+            datein, tamsat_url, working_dir,
+            pfc_thresh=pfc_thresh,
+            pfc_prob_thresh=pfc_prob_thresh,
+            wrsi_thresh_factor=wrsi_thresh_factor,
+            wrsi_prob_thresh=wrsi_prob_thresh,
+            local_flag=local_flag
+        )
+        if planting_dst_output is None:
+            return None, None
+
+    obsdata = extract_planting_dst_output(
+        planting_dst_output, obsdata, ecmwf_flag=ecmwf_flag
+    )
+
+    # Select columns correctly using a list
+    if user_col is not None:
+        obsdata_basic = obsdata[
+            [
+                'Longitude',
+                'Latitude',
+                'sm_25',
+                'sm_50',
+                'sm_70',
+                'spw_20',
+                'spw_40',
+                'spw_60',
+                user_col
+            ]
+        ]
+    else:
+        obsdata_basic = obsdata[
+            [
+                'Longitude',
+                'Latitude',
+                'sm_25',
+                'sm_50',
+                'sm_70',
+                'spw_20',
+                'spw_40',
+                'spw_60'
+            ]
+        ]
+
+    # Round values
+    obsdata_basic = obsdata_basic.round(2)
+    obsdata = obsdata.round(2)
+    if csv_output:
+        csv_out = (
+            str(output_domain) + str(datein.year) + str('_') +
+            str(datein.month).zfill(2) + str('_') + str(datein.day).zfill(2) +
+            str('_') + str('PFC') + str(pfc_thresh) + str('.csv')
+        )
+        csv_out_basic = (
+            str(output_domain) + str(datein.year) + str('_') +
+            str(datein.month).zfill(2) + str('_') + str(datein.day).zfill(2) +
+            str('.csv')
+        )
+        # Write full obsdata
+        obsdata.to_csv(os.path.join(working_dir, csv_out), index=False)
+        # Write basic obsdata
+        obsdata_basic.to_csv(
+            os.path.join(working_dir, csv_out_basic), index=False
+        )
+
+    return obsdata, obsdata_basic
 
+
+def get_planting_dst_output(
+    datein, tamsat_url, working_dir,
+    pfc_thresh=RoutineDefaults.PFC_THRESH,
+    pfc_prob_thresh=RoutineDefaults.PFC_PROB_THRESH,
+    wrsi_thresh_factor=RoutineDefaults.WRSI_THRESH_FACTOR,
+    wrsi_prob_thresh=RoutineDefaults.WRSI_PROB_THRESH,
+    local_flag=0
+):
+    """Calculate the planting date DST grid for a date.
+
+    The forecast files are downloaded and opened once, so the returned
+    dataset can be reused for multiple sets of locations.
+    Returns None if the soil moisture forecast file is not available.
+    """
     # Assign file names for the preliminary and non-preliminary data
     filename_pfc = get_pfc_filename(datein)
     pfc_filepath = os.path.join(working_dir, filename_pfc)
@@ -296,13 +394,13 @@ def routine_operations_v2(
                     f"Error downloading or decompressing PFC data: {e}",
                     exc_info=True
                 )
-                return None, None
+                return None
 
             # Assign the filename variable to either the preliminary or
             # non-preliminary file and exit if neither exist
             if not os.path.isfile(pfc_filepath):
                 print('soil moisture forecast file does not exist')
-                return None, None
+                return None
 
         # Make a local copy of the wrsi file if we don't have it
         if not os.path.exists(wrsi_filepath):
@@ -315,6 +413,7 @@ def routine_operations_v2(
                 outfile.write(wrsi_file.read())
 
     planting_dst_output = xr.open_dataset(pfc_filepath)
+    wrsi_all = xr.open_dataset(wrsi_filepath)
 
     # select the Correct cumulation and extract the data for this cumulation
     column_name_pfc_mean = str('pfc_mean')
@@ -325,7 +424,7 @@ def routine_operations_v2(
     ) = sm_decision(
         planting_dst_output, column_name_pfc_mean, column_name_pfc_sd,
         pfc_thresh, pfc_prob_thresh, wrsi_thresh_factor, wrsi_prob_thresh,
-        working_dir
+        working_dir, wrsi_all=wrsi_all
     )
 
     column_name_pfc_mean = str('pfc_ecmwf_mean')
@@ -336,7 +435,7 @@ def routine_operations_v2(
     ) = sm_decision(
         planting_dst_output, column_name_pfc_mean, column_name_pfc_sd,
         pfc_thresh, pfc_prob_thresh, wrsi_thresh_factor, wrsi_prob_thresh,
-        working_dir
+        working_dir, wrsi_all=wrsi_all
     )
 
     # Set up pre-determined thresholds
@@ -353,7 +452,7 @@ def routine_operations_v2(
     ) = sm_decision(
         planting_dst_output, column_name_pfc_mean, column_name_pfc_sd,
         pfc_thresh_in, pfc_prob_thresh_in, wrsi_thresh_factor_in,
-        wrsi_prob_thresh, working_dir
+        wrsi_prob_thresh, working_dir, wrsi_all=wrsi_all
     )
 
     column_name_pfc_mean = str('pfc_ecmwf_mean')
@@ -369,7 +468,7 @@ def routine_operations_v2(
     ) = sm_decision(
         planting_dst_output, column_name_pfc_mean, column_name_pfc_sd,
         pfc_thresh_in, pfc_prob_thresh_in, wrsi_thresh_factor_in,
-        wrsi_prob_thresh, working_dir
+        wrsi_prob_thresh, working_dir, wrsi_all=wrsi_all
     )
 
     column_name_pfc_mean = str('pfc_ecmwf_mean')
@@ -385,7 +484,7 @@ def routine_operations_v2(
     ) = sm_decision(
         planting_dst_output, column_name_pfc_mean, column_name_pfc_sd,
         pfc_thresh_in, pfc_prob_thresh_in, wrsi_thresh_factor_in,
-        wrsi_prob_thresh, working_dir
+        wrsi_prob_thresh, working_dir, wrsi_all=wrsi_all
     )
 
     # 70PFC
@@ -467,6 +566,11 @@ def routine_operations_v2(
         ['longitude', 'latitude'], overall_ecmwf_sm_decision
     )
 
+    return planting_dst_output
+
+
+def extract_planting_dst_output(planting_dst_output, obsdata, ecmwf_flag=1):
+    """Extract planting date DST variables at the locations of obsdata."""
     obsdata['sm_25'] = _get_output_variable(
         planting_dst_output, obsdata, 'overall_sm_decision_25'
     )
@@ -533,54 +637,4 @@ def routine_operations_v2(
             planting_dst_output, obsdata, 'overall_ecmwf_sm_decision'
         )
 
-    # Select columns correctly using a list
-    if user_col is not None:
-        obsdata_basic = obsdata[
-            [
-                'Longitude',
-                'Latitude',
-                'sm_25',
-                'sm_50',
-                'sm_70',
-                'spw_20',
-                'spw_40',
-                'spw_60',
-                user_col
-            ]
-        ]
-    else:
-        obsdata_basic = obsdata[
-            [
-                'Longitude',
-                'Latitude',
-                'sm_25',
-                'sm_50',
-                'sm_70',
-                'spw_20',
-                'spw_40',
-                'spw_60'
-            ]
-        ]
-
-    # Round values
-    obsdata_basic = obsdata_basic.round(2)
-    obsdata = obsdata.round(2)
-    if csv_output:
-        csv_out = (
-            str(output_domain) + str(datein.year) + str('_') +
-            str(datein.month).zfill(2) + str('_') + str(datein.day).zfill(2) +
-            str('_') + str('PFC') + str(pfc_thresh) + str('.csv')
-        )
-        csv_out_basic = (
-            str(output_domain) + str(datein.year) + str('_') +
-            str(datein.month).zfill(2) + str('_') + str(datein.day).zfill(2) +
-            str('.csv')
-        )
-        # Write full obsdata
-        obsdata.to_csv(os.path.join(working_dir, csv_out), index=False)
-        # Write basic obsdata
-        obsdata_basic.to_csv(
-            os.path.join(working_dir, csv_out_basic), index=False
-        )
-
-    return obsdata, obsdata_basic
+    return obsdata
@@ -13,6 +13,7 @@ from django.db.models import Max
 from gap.models import FarmShortTermForecast
 from spw.models import RModelExecutionLog
 from spw.utils.plumber import (
+    get_plumber_ports,
     kill_r_plumber_process,
     spawn_r_plumber,
     write_plumber_file
@@ -28,9 +29,9 @@ def start_plumber_process():
     """Start plumber process when there is R code change."""
     logger.info('Starting plumber process')
     # kill existing process
-    ports = [8282]
+    ports = get_plumber_ports()
     for index, port in enumerate(ports):
-        kill_r_plumber_process(index=index)
+        kill_r_plumber_process(index=index + 1)
     # Generate plumber.R file
     write_plumber_file()
     # spawn the process
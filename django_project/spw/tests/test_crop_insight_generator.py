@@ -20,7 +20,7 @@ from gap.factories.farm import FarmFactory, FarmGroupFactory
 from gap.factories.grid import GridFactory
 from gap.models.crop_insight import (
     FarmSuitablePlantingWindowSignal, FarmGroupIsNotSetException,
-    FarmShortTermForecast
+    FarmShortTermForecast, FarmShortTermForecastData
 )
 from gap.models.pest import Pest
 from gap.models.preferences import Preferences
@@ -30,6 +30,7 @@ from gap.tasks.crop_insight import (
 )
 from spw.factories import RModelFactory
 from spw.generator.crop_insight import CropInsightFarmGenerator
+from spw.generator.main import SPWOutput
 from spw.tasks import clean_duplicate_farm_short_term_forecast
 
 ltn_returns = {
@@ -177,17 +178,18 @@ class TestCropInsightGenerator(TestCase):
             field__startswith=f'prise_{self.pest.short_name}_'
         ).update(active=True)
 
+    @patch('spw.generator.main.execute_spw_model_batch')
     @patch('gap.models.crop_insight.timezone')
     @patch('spw.generator.crop_insight.timezone')
     @patch('spw.generator.main.datetime')
-    @patch('prise.generator.generate_prise_message')
+    @patch('prise.generator.PriseMessageBulkGenerator.generate')
     @patch('spw.generator.main.execute_spw_model')
     @patch('spw.generator.gap_input.GapInput._fetch_timelines_data')
     @patch('spw.generator.gap_input.GapInput._fetch_ltn_data')
     def test_spw_generator(
             self, mock_fetch_ltn_data, mock_fetch_timelines_data,
             mock_execute_spw_model, mock_prise, mock_now, mock_timezone,
-            mock_timezone_2
+            mock_timezone_2, mock_execute_spw_model_batch
     ):
         """Test calculate_from_point function."""
         mock_dt = datetime(
@@ -196,6 +198,11 @@ class TestCropInsightGenerator(TestCase):
         mock_now.now.return_value = mock_dt
         mock_timezone.now.return_value = mock_dt
         mock_timezone_2.now.return_value = mock_dt
+        mock_execute_spw_model_batch.side_effect = (
+            lambda items, port: (
+                [mock_execute_spw_model.return_value] * len(items)
+            )
+        )
         last_day = self.today + timedelta(days=12)
 
         def create_timeline_data(
@@ -538,6 +545,80 @@ class TestCropInsightGenerator(TestCase):
                 [parent.user_1.email, parent.user_2.email]
             )
 
+    @patch('spw.generator.crop_insight.timezone')
+    def test_save_output_to_farms_in_grid(self, mock_timezone):
+        """Test saving SPW output to all farms in the grid in bulk."""
+        mock_timezone.now.return_value = datetime(
+            2023, 7, 18, 0, 0, 0, tzinfo=pytz.UTC
+        )
+        # existing signal and forecast of the date are replaced
+        FarmSuitablePlantingWindowSignal.objects.create(
+            farm=self.farm_2,
+            generated_date=self.today,
+            signal='Old signal'
+        )
+        generator = CropInsightFarmGenerator(self.farm_2, self.farm_group)
+        old_forecast = FarmShortTermForecast.objects.create(
+            farm=self.farm_4,
+            forecast_date=self.today
+        )
+        FarmShortTermForecastData.objects.create(
+            forecast=old_forecast,
+            dataset_attribute=generator.attributes_dict[
+                'rainAccumulationSum'
+            ],
+            value_date=self.today + timedelta(days=1),
+            value=100
+        )
+        output = SPWOutput(
+            Point(0, 0),
+            {
+                'metadata': {},
+                'goNoGo': ['Plant NOW Tier 1b'],
+                'tooWet': ['Likely too wet to plant'],
+                'last4Days': [80],
+                'last2Days': [60],
+                'todayTomorrow': [40]
+            }
+        )
+        historical_dict = {}
+        for day in range(0, 3):
+            _date = self.today + timedelta(days=day)
+            historical_dict[_date.strftime('%m-%d')] = {
+                'date': _date.isoformat(),
+                'rainAccumulationSum': 5,
+                'precipitationProbability': None,
+                'LTNPrecip': 3
+            }
+
+        generator.save_output(output, historical_dict)
+
+        signals = FarmSuitablePlantingWindowSignal.objects.filter(
+            generated_date=self.today
+        )
+        self.assertEqual(
+            sorted(signals.values_list('farm_id', flat=True)),
+            sorted([self.farm_2.id, self.farm_4.id])
+        )
+        for signal in signals:
+            self.assertEqual(signal.signal, 'Plant NOW Tier 1b')
+            self.assertEqual(signal.last_4_days, 80)
+        forecasts = FarmShortTermForecast.objects.filter(
+            forecast_date=self.today
+        )
+        self.assertEqual(forecasts.count(), 2)
+        self.assertIn(old_forecast, forecasts)
+        # only tomorrow onward with rainAccumulationSum value
+        for forecast in forecasts:
+            self.assertEqual(
+                list(
+                    forecast.farmshorttermforecastdata_set.values_list(
+                        'value', flat=True
+                    )
+                ),
+                [5, 5]
+            )
+
     def test_clean_duplicate_farm_short_term_forecast(self):
         """Test clean_duplicate_farm_short_term_forecast task."""
         # create FarmShortTermForecast
@@ -576,7 +657,7 @@ class TestCropInsightGenerator(TestCase):
     @patch('gap.models.crop_insight.timezone')
     @patch('spw.generator.crop_insight.timezone')
     @patch('spw.generator.main.datetime')
-    @patch('prise.generator.generate_prise_message')
+    @patch('prise.generator.PriseMessageBulkGenerator.generate')
     @patch('spw.generator.main.execute_spw_model')
     @patch('spw.generator.gap_input.GapInput._fetch_timelines_data')
     @patch('spw.generator.gap_input.GapInput._fetch_ltn_data')
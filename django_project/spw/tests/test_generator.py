@@ -9,7 +9,7 @@ from unittest.mock import patch, MagicMock
 
 import pytz
 from django.contrib.gis.geos import Point
-from django.test import TestCase
+from django.test import TestCase, override_settings
 import xarray as xr
 import numpy as np
 import pandas as pd
@@ -32,10 +32,11 @@ from gap.utils.reader import (
 from spw.factories import (
     RModelFactory
 )
-from spw.generator.gap_input import GapInput
+from spw.generator.gap_input import GapInput, GapBatchInput
 from spw.generator.main import (
     SPWOutput,
     calculate_from_point,
+    calculate_from_grids,
     calculate_from_point_attrs,
     VAR_MAPPING_REVERSE
 )
@@ -291,6 +292,93 @@ class TestSPWFetchDataFunctions(TestCase):
         # check if the values are correct
         self.assertEqual(result['07-20'], expected_result['07-20'])
 
+    @patch.object(TioZarrReader, 'read')
+    @patch.object(TioZarrReader, 'get_data_values')
+    def test_fetch_batch_from_zarr(self, mocked_results, mocked_read):
+        """Test fetch data of many grids for SPW from zarr."""
+        mocked_read.side_effect = MagicMock()
+        new_lat = [0, 1]
+        new_lon = [0, 1, 2]
+        forecast_date_array = pd.date_range('2023-07-14', periods=16)
+        shape = (16, len(new_lat), len(new_lon))
+        grid_values = np.arange(6).reshape(1, 2, 3) * np.ones(shape)
+        data_vars = {
+            var_name: (('date', 'lat', 'lon'), grid_values + idx * 10)
+            for idx, var_name in enumerate(GapInput.ATTRIBUTES)
+        }
+        xr_ds = xr.Dataset(
+            data_vars=data_vars,
+            coords={
+                'date': ('date', forecast_date_array),
+                'lat': ('lat', new_lat),
+                'lon': ('lon', new_lon)
+            }
+        )
+        mocked_results.return_value = TioZarrReaderValue(
+            xr_ds, self.location_input, [],
+            self.start_dt, None, None
+        )
+        batch_input = GapBatchInput(
+            [Point(0, 0), Point(2.04, 0.98)], self.dt_now
+        )
+        results = batch_input._read_forecast_from_zarr()
+        mocked_read.assert_called_once()
+        self.assertEqual(len(results), 2)
+        self.assertEqual(
+            results[0]['07-20'],
+            {
+                'date': '2023-07-20',
+                'evapotranspirationSum': 0,
+                'rainAccumulationSum': 10,
+                'temperatureMax': 20,
+                'temperatureMin': 30,
+                'precipitationProbability': 40
+            }
+        )
+        # nearest grid is lat=1, lon=2
+        self.assertEqual(results[1]['07-20']['evapotranspirationSum'], 5)
+        self.assertEqual(results[1]['07-20']['rainAccumulationSum'], 15)
+
+        # preloaded forecast data is used by the input
+        data_input = GapInput(
+            0, 0, self.dt_now, forecast_data=results[0]
+        )
+        with patch.object(GapInput, '_fetch_ltn_data') as mock_ltn:
+            mock_ltn.side_effect = lambda historical_dict: historical_dict
+            self.assertEqual(data_input.load_data(), results[0])
+
+    @override_settings(
+        CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            }
+        }
+    )
+    @patch.object(TomorrowIODatasetReader, 'read')
+    @patch.object(TomorrowIODatasetReader, 'get_raw_results')
+    def test_fetch_ltn_data_cache(self, mocked_results, mocked_read):
+        """Test LTN data is cached per grid and date."""
+        mocked_results.return_value = [
+            DatasetTimelineValue(
+                datetime(2023, 7, 20),
+                {'total_evapotranspiration_flux': 8, 'total_rainfall': 3},
+                self.location_input.point
+            )
+        ]
+        for _ in range(2):
+            result = GapInput(0, 0, self.dt_now)._fetch_ltn_data({
+                '07-20': {'date': '2023-07-20'}
+            })
+            self.assertEqual(
+                result['07-20'],
+                {'date': '2023-07-20', 'LTNPET': 8, 'LTNPrecip': 3}
+            )
+        mocked_read.assert_called_once()
+
+        # different grid
+        GapInput(1, 1, self.dt_now)._fetch_ltn_data({})
+        self.assertEqual(mocked_read.call_count, 2)
+
 
 class TestSPWGenerator(TestCase):
     """Test SPW Generator functions."""
@@ -370,6 +458,69 @@ class TestSPWGenerator(TestCase):
         self.assertEqual(log.status, RModelExecutionStatus.SUCCESS)
 
 
+    @patch('spw.generator.main.datetime')
+    @patch('spw.generator.main.execute_spw_model_batch')
+    @patch('spw.generator.gap_input.GapInput._fetch_timelines_data')
+    @patch('spw.generator.gap_input.GapInput._fetch_ltn_data')
+    def test_calculate_from_grids(
+            self, mock_fetch_ltn_data, mock_fetch_timelines_data,
+            mock_execute_spw_model_batch, mock_now):
+        """Test calculate_from_grids function."""
+        mock_now.now.return_value = datetime(
+            2023, 7, 20, 0, 0, 0, tzinfo=pytz.UTC
+        )
+        mock_fetch_ltn_data.return_value = {
+            '07-20': {
+                'date': '2023-07-20',
+                'evapotranspirationSum': 10,
+                'rainAccumulationSum': 5,
+                'LTNPET': 8,
+                'LTNPrecip': 3
+            }
+        }
+        mock_fetch_timelines_data.return_value = {
+            '07-20': {
+                'date': '2023-07-20',
+                'evapotranspirationSum': 10,
+                'rainAccumulationSum': 5
+            }
+        }
+        r_data = {
+            'metadata': {
+                'test': 'abcdef'
+            },
+            'goNoGo': ['Do not plant Tier 1a']
+        }
+        mock_execute_spw_model_batch.return_value = [
+            (True, r_data),
+            (False, 'Invalid data')
+        ]
+        points = [Point(0, 0), Point(1, 1)]
+
+        results = calculate_from_grids(points)
+        mock_execute_spw_model_batch.assert_called_once()
+        items = mock_execute_spw_model_batch.call_args[0][0]
+        self.assertEqual([item['id'] for item in items], ['0', '1'])
+        self.assertTrue(
+            items[0]['data'].startswith(
+                'month_day,date,evapotranspirationSum'
+            )
+        )
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0][0].data.goNoGo, 'Do not plant Tier 1a')
+        self.assertIn('07-20', results[0][1])
+        self.assertIsNone(results[1][0])
+
+        # execution logs are saved without input file
+        logs = RModelExecutionLog.objects.filter(model=self.r_model)
+        self.assertEqual(logs.count(), 2)
+        self.assertEqual(logs.filter(input_file='').count(), 2)
+        self.assertEqual(
+            logs.filter(status=RModelExecutionStatus.FAILED).first().errors,
+            'Invalid data'
+        )
+
+
 class TestSPWAttrs(TestCase):
     """Test fetch attributes for SPW Tio."""
 
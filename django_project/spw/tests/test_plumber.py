@@ -20,7 +20,9 @@ from spw.utils.plumber import (
     plumber_health_check,
     kill_r_plumber_process,
     spawn_r_plumber,
-    execute_spw_model
+    execute_spw_model,
+    execute_spw_model_batch,
+    get_plumber_ports
 )
 from spw.utils.process import write_pidfile
 from spw.factories import (
@@ -146,6 +148,51 @@ class TestPlumberUtils(TestCase):
             self.assertEqual('Invalid response content type: text/plain',
                              response)
 
+    def test_execute_spw_model_batch(self):
+        """Test execute SPW R Model for multiple locations."""
+        items = [
+            {'id': '0', 'data': 'a,b\n1,2\n', 'lat': 0.0, 'lon': 0.0},
+            {'id': '1', 'data': 'a,b\n3,4\n', 'lat': 1.0, 'lon': 1.0},
+            {'id': '2', 'data': 'a,b\n5,6\n', 'lat': 2.0, 'lon': 2.0}
+        ]
+        with requests_mock.Mocker() as m:
+            m.post(
+                f'http://plumber:{PLUMBER_PORT}/spw/generic_batch',
+                json={
+                    '0': {'goNoGo': ['Plant NOW Tier 1a']},
+                    '1': {'error': ['Invalid data']}
+                },
+                headers={'Content-Type': 'application/json'},
+                status_code=200
+            )
+            results = execute_spw_model_batch(items)
+            self.assertEqual(m.call_count, 1)
+            self.assertEqual(m.last_request.json(), {'items': items})
+            self.assertEqual(
+                results[0], (True, {'goNoGo': ['Plant NOW Tier 1a']})
+            )
+            self.assertEqual(results[1], (False, {'error': ['Invalid data']}))
+            self.assertFalse(results[2][0])
+        with requests_mock.Mocker() as m:
+            m.post(
+                f'http://plumber:{PLUMBER_PORT}/spw/generic_batch',
+                json={'error': 'Internal server error'},
+                headers={'Content-Type': 'application/json'},
+                status_code=500
+            )
+            results = execute_spw_model_batch(items)
+            self.assertEqual(len(results), 3)
+            self.assertEqual(
+                results[2], (False, {'error': 'Internal server error'})
+            )
+
+    @mock.patch.dict(os.environ, {'PLUMBER_PORTS': '8282, 8283,'})
+    def test_get_plumber_ports(self):
+        """Test plumber ports from environment variable."""
+        self.assertEqual(get_plumber_ports(), [8282, 8283])
+        with mock.patch.dict(os.environ, {'PLUMBER_PORTS': ''}):
+            self.assertEqual(get_plumber_ports(), [int(PLUMBER_PORT)])
+
     def test_write_plumber_file(self):
         """Test writing plumber R file."""
         r_model = RModelFactory.create()
@@ -159,6 +206,8 @@ class TestPlumberUtils(TestCase):
         with open(r_file_path, 'r') as f:
             lines = f.readlines()
         self.assertTrue(find_r_line_code(lines, '@get /statistical/echo'))
+        self.assertTrue(find_r_line_code(lines, '@post /spw/generic\n'))
+        self.assertTrue(find_r_line_code(lines, '@post /spw/generic_batch'))
         if os.path.exists(r_file_path):
             os.remove(r_file_path)
 
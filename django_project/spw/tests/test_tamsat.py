@@ -6,11 +6,21 @@ Tomorrow Now GAP.
 """
 
 from datetime import date
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+import xarray as xr
 from django.test import TestCase
+from django.contrib.gis.geos import Point
 
 from core.models.background_task import TaskStatus
 from spw.models import SPWExecutionLog, SPWMethod
-from gap.factories import FarmGroupFactory
+from gap.factories import FarmGroupFactory, FarmFactory, GridFactory
+from spw.tamsat.generator import TamsatSPWGenerator
+from spw.tamsat.planting_date_api import (
+    _get_output_variable,
+    extract_planting_dst_output
+)
 
 
 class SPWExecutionLogTest(TestCase):
@@ -51,3 +61,128 @@ class SPWExecutionLogTest(TestCase):
         self.assertEqual(log2.errors, "Test error message")
         log2.success()
         self.assertEqual(log2.status, TaskStatus.COMPLETED)
+
+
+class PlantingDateOutputTest(TestCase):
+    """Test case for extracting planting date output."""
+
+    def setUp(self):
+        """Set the planting date output dataset."""
+        lon = np.arange(30, 32, 0.25)
+        lat = np.arange(-1, 1, 0.25)
+        grid = np.arange(lon.size * lat.size, dtype=float).reshape(
+            lon.size, lat.size
+        )
+        variables = [
+            'overall_sm_decision_25', 'overall_sm_decision_50',
+            'overall_sm_decision_70', 'spw_20', 'spw_40', 'spw_60',
+            'pfc_ecmwf_risk_out', 'wrsi_risk_out', 'pfc_ecmwf_decision',
+            'wrsi_decision', 'overall_ecmwf_sm_decision'
+        ]
+        self.ds = xr.Dataset(
+            {
+                name: (['longitude', 'latitude'], grid)
+                for name in variables
+            },
+            coords={'longitude': lon, 'latitude': lat}
+        )
+        # variable with extra time dimension
+        self.ds['spw_20'] = (
+            ['time', 'latitude', 'longitude'], np.expand_dims(grid.T, 0)
+        )
+        self.ds = self.ds.assign_coords(time=[0])
+        self.obsdata = pd.DataFrame({
+            'Longitude': [30.1, 31.6, 30.5],
+            'Latitude': [-0.9, 0.6, -0.9]
+        })
+        # (lon index, lat index) of the nearest cells
+        self.expected = [0 * 8 + 0, 6 * 8 + 6, 2 * 8 + 0]
+
+    def test_get_output_variable(self):
+        """Test pointwise extraction of the locations."""
+        np.testing.assert_array_equal(
+            _get_output_variable(
+                self.ds, self.obsdata, 'overall_sm_decision_25'
+            ),
+            self.expected
+        )
+        np.testing.assert_array_equal(
+            _get_output_variable(self.ds, self.obsdata, 'spw_20'),
+            self.expected
+        )
+        # single location
+        np.testing.assert_array_equal(
+            _get_output_variable(self.ds, self.obsdata.iloc[1:2], 'spw_20'),
+            self.expected[1:2]
+        )
+
+    def test_extract_planting_dst_output(self):
+        """Test extracting all output columns."""
+        obsdata = extract_planting_dst_output(
+            self.ds, self.obsdata.copy(), ecmwf_flag=1
+        )
+        for column in [
+            'sm_25', 'sm_50', 'sm_70', 'spw_20', 'spw_40', 'spw_60',
+            'pfc_user_probability', 'wrsi_user_probability',
+            'pfc_user_decision', 'wrsi_user_decision', 'sm_user_decision'
+        ]:
+            self.assertEqual(obsdata[column].tolist(), self.expected)
+
+
+class TamsatSPWGeneratorTest(TestCase):
+    """Test case for TamsatSPWGenerator."""
+
+    fixtures = [
+        '1.object_storage_manager.json',
+        '2.provider.json',
+        '3.station_type.json',
+        '4.dataset_type.json',
+        '5.dataset.json',
+        '6.unit.json',
+        '7.attribute.json',
+        '8.dataset_attribute.json'
+    ]
+
+    @patch('spw.tamsat.generator.routine_operations_v2')
+    @patch('spw.tamsat.generator.get_planting_dst_output')
+    def test_execute_spw_model(self, mock_dst_output, mock_routine):
+        """Test building farm dataframe for a chunk."""
+        mock_routine.side_effect = lambda *args, **kwargs: (args[3], None)
+        farm_group = FarmGroupFactory()
+        grid = GridFactory()
+        farm_1 = FarmFactory(geometry=Point(36.5, -1.5), grid=grid)
+        farm_2 = FarmFactory(geometry=Point(37.5, -0.5))
+        farm_group.farms.add(farm_1, farm_2)
+
+        generator = TamsatSPWGenerator(
+            date=date(2025, 6, 3), cleanup=False
+        )
+        generator.tamsat_url = 'http://test/'
+        farms = generator._get_farms(farm_group)
+        self.assertEqual(farms.count(), 2)
+        df = generator._execute_spw_model(
+            farm_group, farms[0:2], 1, 70, 0.8, 0.75, 0.5
+        )
+
+        self.assertEqual(df['farm_id'].tolist(), [farm_1.id, farm_2.id])
+        self.assertEqual(
+            df['farm_unique_id'].tolist(),
+            [farm_1.unique_id, farm_2.unique_id]
+        )
+        self.assertEqual(df['grid_unique_id'].iloc[0], grid.unique_id)
+        self.assertIsNone(df['grid_unique_id'].iloc[1])
+        self.assertEqual(df['Latitude'].tolist(), [-1.5, -0.5])
+        self.assertEqual(df['Longitude'].tolist(), [36.5, 37.5])
+        self.assertTrue((df['farm_group'] == farm_group.name).all())
+        self.assertTrue((df['date'] == date(2025, 6, 3)).all())
+        self.assertTrue((df['pfc_thresh'] == 70).all())
+        self.assertEqual(
+            mock_routine.call_args.kwargs['planting_dst_output'],
+            mock_dst_output.return_value
+        )
+
+        # grid is calculated once
+        generator._execute_spw_model(
+            farm_group, farms[0:1], 2, 70, 0.8, 0.75, 0.5
+        )
+        mock_dst_output.assert_called_once()
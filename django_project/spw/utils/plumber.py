@@ -10,7 +10,9 @@ import os
 import time
 import csv
 import subprocess
+import threading
 import requests
+from typing import List, Tuple
 from uuid import uuid4
 
 from core.settings.utils import absolute_path
@@ -23,6 +25,36 @@ from spw.utils.process import (
 
 logger = logging.getLogger(__name__)
 PLUMBER_PORT = os.getenv('PLUMBER_PORT', 8282)
+_thread_local = threading.local()
+
+
+def get_plumber_ports() -> List[int]:
+    """Return ports of the plumber processes.
+
+    The ports are configured in PLUMBER_PORTS as comma separated values,
+    defaults to PLUMBER_PORT.
+    :return: list of port
+    :rtype: List[int]
+    """
+    ports = [
+        int(port) for port in os.getenv('PLUMBER_PORTS', '').split(',')
+        if port.strip()
+    ]
+    return ports or [int(PLUMBER_PORT)]
+
+
+def get_plumber_session() -> requests.Session:
+    """Return requests session of the current thread.
+
+    The session keeps the connection to plumber alive between requests.
+    :return: requests session
+    :rtype: requests.Session
+    """
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        _thread_local.session = session
+    return session
 
 
 def plumber_health_check(port = PLUMBER_PORT, max_retry=5):
@@ -148,6 +180,46 @@ def execute_spw_model(
     return False, error
 
 
+def execute_spw_model_batch(
+        items: List[dict], port = PLUMBER_PORT) -> List[Tuple[bool, dict]]:
+    """Execute SPW model for multiple locations in one request.
+
+    The input data is sent in the request body, so it does not need
+    to be uploaded to the storage.
+    :param items: list of dict with id, data (CSV content), lat, lon
+        and place_name
+    :type items: List[dict]
+    :return: list of success flag and spw model output or error,
+        in the same order as items
+    :rtype: List[Tuple[bool, dict]]
+    """
+    request_url = f'http://plumber:{port}/spw/generic_batch'
+    response = get_plumber_session().post(
+        request_url, json={'items': items}
+    )
+    content_type = response.headers['Content-Type']
+    if content_type != 'application/json':
+        logger.error(f'Invalid response content type: {content_type}')
+        error = f'Invalid response content type: {content_type}'
+        return [(False, error)] * len(items)
+    if response.status_code != 200:
+        logger.error(
+            f'Plumber error response: {str(response.json())}')
+        return [(False, response.json())] * len(items)
+
+    outputs = response.json()
+    results = []
+    for item in items:
+        output = outputs.get(item['id'])
+        if output is None:
+            results.append((False, f'Missing output of {item["id"]}'))
+        elif 'error' in output:
+            results.append((False, output))
+        else:
+            results.append((True, output))
+    return results
+
+
 def write_plumber_file(file_path = None):
     """Write R codes to plumber.R."""
     r_file_path = file_path if file_path else os.path.join(
@@ -162,24 +234,21 @@ def write_plumber_file(file_path = None):
     model = RModel.objects.order_by('-version').first()
     if model:
         lines.append('\n')
-        lines.append('#* Generic Model\n')
-        lines.append('#* @post /spw/generic\n')
-
-        lines.append('function(data_url, filename, lat, lon, place_name) {\n')
+        lines.append('# Generic Model function\n')
+        lines.append(
+            'spw_generic_model <- '
+            'function(data_filename, lat, lon, place_name) {\n'
+        )
         lines.append(f'  metadata <- list(version={model.version}, '
                      'lat=lat, lon=lon, place_name=place_name, '
                      'generated_on=format(Sys.time(), '
                      '"%Y-%m-%d %H:%M:%S %Z"))\n')
         lines.append('  time_start <- Sys.time()\n')
-        lines.append(
-            '  data_filename <- paste(\'/tmp/\', filename, sep="")\n')
-        lines.append('  download.file(data_url, data_filename)\n')
         code_lines = model.code.splitlines()
         for code in code_lines:
             lines.append(f'  {code}\n')
         lines.append('  metadata[\'total_execution_time\'] '
                      '<- Sys.time() - time_start\n')
-        lines.append('unlink(data_filename)\n')
         # add output
         model_outputs = RModelOutput.objects.filter(
             model=model
@@ -192,6 +261,48 @@ def write_plumber_file(file_path = None):
             f'  list({output_list_str})\n'
         )
         lines.append('}\n')
+
+        lines.append('\n')
+        lines.append('#* Generic Model\n')
+        lines.append('#* @post /spw/generic\n')
+        lines.append('function(data_url, filename, lat, lon, place_name) {\n')
+        lines.append(
+            '  data_filename <- paste(\'/tmp/\', filename, sep="")\n')
+        lines.append('  download.file(data_url, data_filename)\n')
+        lines.append(
+            '  output <- spw_generic_model('
+            'data_filename, lat, lon, place_name)\n'
+        )
+        lines.append('  unlink(data_filename)\n')
+        lines.append('  output\n')
+        lines.append('}\n')
+
+        lines.append('\n')
+        lines.append('#* Generic Model for multiple locations\n')
+        lines.append('#* @post /spw/generic_batch\n')
+        lines.append('function(req) {\n')
+        lines.append(
+            '  body <- jsonlite::fromJSON('
+            'req$postBody, simplifyVector = FALSE)\n'
+        )
+        lines.append('  outputs <- list()\n')
+        lines.append('  for (item in body$items) {\n')
+        lines.append('    data_filename <- tempfile(fileext = ".csv")\n')
+        lines.append('    writeLines(item$data, data_filename, sep = "")\n')
+        lines.append('    outputs[[item$id]] <- tryCatch(\n')
+        lines.append(
+            '      spw_generic_model(data_filename, item$lat, item$lon, '
+            'item$place_name),\n'
+        )
+        lines.append(
+            '      error = function(err) '
+            'list(error = conditionMessage(err))\n'
+        )
+        lines.append('    )\n')
+        lines.append('    unlink(data_filename)\n')
+        lines.append('  }\n')
+        lines.append('  outputs\n')
+        lines.append('}\n')
     with open(r_file_path, 'w') as f:
         for line in lines:
             f.write(line)
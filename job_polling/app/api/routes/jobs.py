@@ -27,11 +27,13 @@ async def wait_for_job_completion(
     poll_interval: float = Query(default=1, ge=0.5, le=60),
     job_service: JobService = Depends(get_job_service)
 ):
-    """Wait for job completion via polling."""
+    """Wait for job completion via pub/sub.
+
+    poll_interval is kept for compatibility with existing clients.
+    """
     return await job_service.wait_for_completion(
         job_id,
-        max_wait_time,
-        poll_interval
+        max_wait_time
     )
 
 
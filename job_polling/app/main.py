@@ -10,9 +10,10 @@ import sentry_sdk
 from sentry_sdk.integrations.asgi import SentryAsgiMiddleware
 
 from app.core.config import get_settings
-from app.core.database import init_redis
+from app.core.database import init_redis, close_redis
 from app.core.exceptions import setup_exception_handlers
 from app.api.routes import jobs, health, admin
+from app.services.job_subscriber import job_status_subscriber
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -53,10 +54,13 @@ def create_app() -> FastAPI:
     async def startup_event():
         logger.info(f"Starting {settings.PROJECT_NAME}")
         await init_redis()
+        await job_status_subscriber.start()
 
     @app.on_event("shutdown")
     async def shutdown_event():
         logger.info("Shutting down application")
+        await job_status_subscriber.stop()
+        await close_redis()
 
     return app
 
@@ -19,6 +19,10 @@ from app.core.exceptions import (
     JobFailedError
 )
 from app.models.job import JobData, JobStatus, JobWaitResponse
+from app.services.job_subscriber import (
+    FINISHED_STATUSES,
+    job_status_subscriber
+)
 
 
 class JobService:
@@ -98,60 +102,52 @@ class JobService:
     async def wait_for_completion(
         self,
         job_id: str,
-        max_wait_time: int,
-        poll_interval: float
+        max_wait_time: int
     ) -> JobWaitResponse:
-        """Poll job until completion or timeout."""
-        start_time = time.time()
-        poll_count = 0
-
-        # Initial check
-        initial_data = await self.get_job_data(job_id)
-        if initial_data is None:
-            # Wait briefly in case job was just created
-            await asyncio.sleep(1)
-            initial_data = await self.get_job_data(job_id)
-
-        if initial_data is None:
-            raise JobNotFoundError(job_id)
-
-        # Check if already completed
-        if initial_data.status == JobStatus.COMPLETED:
-            if not initial_data.url and not initial_data.output_json:
-                raise JobFailedError(job_id, "COMPLETED_NO_DATA")
-
-            return self.prepare_response(
-                job_id,
-                initial_data,
-                polling_time=0.0,
-                polls_count=1
-            )
+        """Wait for job completion or timeout.
 
-        # Start polling
-        while True:
-            poll_count += 1
-            elapsed_time = time.time() - start_time
-
-            # Check timeout
-            if elapsed_time >= max_wait_time:
-                raise JobTimeoutError(job_id, max_wait_time)
+        Job status is pushed through Redis pub/sub, the job is
+        read before waiting and once more after the wait time
+        in case the event is missed.
+        """
+        start_time = time.time()
+        polls_count = 1
 
-            # Get current job data
+        async with job_status_subscriber.listen(job_id) as waiter:
+            # Initial check
             job_data = await self.get_job_data(job_id)
-
-            if job_data:
-                if job_data.status == JobStatus.COMPLETED:
-                    if not job_data.url and not job_data.output_json:
-                        raise JobFailedError(job_id, "COMPLETED_NO_DATA")
-
-                    return self.prepare_response(
-                        job_id,
-                        job_data,
-                        polling_time=round(elapsed_time, 1),
-                        polls_count=poll_count
-                    )
-                elif job_data.status in [JobStatus.STOPPED]:
-                    raise JobFailedError(job_id, job_data.status.value)
-
-            # Wait before next poll
-            await asyncio.sleep(poll_interval)
+            if job_data is None:
+                # Wait briefly in case job was just created
+                await asyncio.sleep(1)
+                polls_count += 1
+                job_data = await self.get_job_data(job_id)
+
+            if job_data is None:
+                raise JobNotFoundError(job_id)
+
+            if job_data.status not in FINISHED_STATUSES:
+                timeout = max(max_wait_time - (time.time() - start_time), 0)
+                try:
+                    payload = await asyncio.wait_for(waiter, timeout)
+                    job_data = JobData(**payload)
+                except asyncio.TimeoutError:
+                    # Final check in case the event is missed
+                    polls_count += 1
+                    job_data = await self.get_job_data(job_id)
+
+        elapsed_time = time.time() - start_time
+        if job_data is None or job_data.status not in FINISHED_STATUSES:
+            raise JobTimeoutError(job_id, max_wait_time)
+
+        if job_data.status == JobStatus.STOPPED:
+            raise JobFailedError(job_id, job_data.status.value)
+
+        if not job_data.url and not job_data.output_json:
+            raise JobFailedError(job_id, "COMPLETED_NO_DATA")
+
+        return self.prepare_response(
+            job_id,
+            job_data,
+            polling_time=round(elapsed_time, 1),
+            polls_count=polls_count
+        )
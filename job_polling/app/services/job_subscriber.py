@@ -0,0 +1,124 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP.
+
+.. note:: Job Polling API - Job Status Subscriber
+"""
+import json
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Set
+
+from app.core.database import get_redis
+from app.models.job import JobStatus
+
+logger = logging.getLogger(__name__)
+
+JOB_CHANNEL_PREFIX = "job-status:"
+FINISHED_STATUSES = [JobStatus.COMPLETED, JobStatus.STOPPED]
+
+
+class JobStatusSubscriber:
+    """Shared subscriber of job status channels in a worker.
+
+    A single pub/sub connection listens to all job channels and
+    resolves the waiters of the finished job, so the waiters
+    do not poll Redis.
+    """
+
+    LISTEN_TIMEOUT = 1.0
+    RETRY_SLEEP = 1.0
+
+    def __init__(self):
+        """Initialize JobStatusSubscriber."""
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """Check whether the listener task is running."""
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Subscribe to job channels if not running."""
+        async with self._lock:
+            if self.is_running:
+                return
+            redis_client = await get_redis()
+            pubsub = redis_client.pubsub()
+            await pubsub.psubscribe(f"{JOB_CHANNEL_PREFIX}*")
+            # Wait for confirmation, so no event is missed after start
+            await pubsub.get_message(timeout=self.LISTEN_TIMEOUT)
+            self._pubsub = pubsub
+            self._task = asyncio.create_task(self._listen(pubsub))
+
+    async def stop(self):
+        """Stop the listener task and close the connection."""
+        async with self._lock:
+            pubsub, task = self._pubsub, self._task
+            self._pubsub = None
+            self._task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if pubsub is not None:
+            await pubsub.aclose()
+
+    async def _listen(self, pubsub):
+        """Read messages until the subscriber is stopped."""
+        while self._pubsub is pubsub:
+            try:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=self.LISTEN_TIMEOUT
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logger.warning(f"Job status subscriber error: {ex}")
+                await asyncio.sleep(self.RETRY_SLEEP)
+                continue
+            if message and message["type"] == "pmessage":
+                self._dispatch(message["channel"], message["data"])
+
+    def _dispatch(self, channel: str, data: str):
+        """Resolve the waiters of a finished job."""
+        try:
+            payload = json.loads(data)
+        except ValueError as ex:
+            logger.warning(f"Invalid job status payload {channel}: {ex}")
+            return
+        if payload.get("status") not in FINISHED_STATUSES:
+            return
+        job_id = channel[len(JOB_CHANNEL_PREFIX):]
+        for waiter in self._waiters.get(job_id, set()):
+            if not waiter.done():
+                waiter.set_result(payload)
+
+    @asynccontextmanager
+    async def listen(self, job_id: str):
+        """Register a waiter of a job.
+
+        The job should be checked after the waiter is registered,
+        in case it is finished before.
+        Yields a future that is resolved with the job payload.
+        """
+        await self.start()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(job_id, set()).add(waiter)
+        try:
+            yield waiter
+        finally:
+            waiters = self._waiters.get(job_id, set())
+            waiters.discard(waiter)
+            if not waiters:
+                self._waiters.pop(job_id, None)
+
+
+job_status_subscriber = JobStatusSubscriber()
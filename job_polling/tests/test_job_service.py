@@ -0,0 +1,93 @@
+# coding=utf-8
+"""
+Tomorrow Now GAP.
+
+.. note:: Job Polling API - Unit tests for Job Service
+"""
+import json
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from fakeredis import FakeAsyncRedis
+
+from app.core import database
+from app.core.exceptions import JobFailedError, JobTimeoutError
+from app.models.job import JobStatus
+from app.services.job_service import JobService
+from app.services.job_subscriber import job_status_subscriber
+
+
+class TestJobService(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for JobService.wait_for_completion."""
+
+    async def asyncSetUp(self):
+        """Set up fake Redis client."""
+        self.redis = FakeAsyncRedis(decode_responses=True)
+        database._redis_client = self.redis
+        self.service = JobService()
+        self.job_id = "test-job"
+
+    async def asyncTearDown(self):
+        """Stop the subscriber and close Redis client."""
+        await job_status_subscriber.stop()
+        await database.close_redis()
+
+    async def _save_job(self, status, publish=True, **kwargs):
+        """Write job payload like Job.save in Django."""
+        payload = json.dumps({
+            "status": status,
+            "url": kwargs.get("url"),
+            "output_json": kwargs.get("output_json"),
+            "content_type": "application/json",
+            "updated_on": 1
+        })
+        await self.redis.set(f"job:{self.job_id}", payload)
+        if publish:
+            await self.redis.publish(f"job-status:{self.job_id}", payload)
+
+    async def test_wait_for_published_status(self):
+        """Test waiter is resolved by the published status."""
+        await self._save_job(JobStatus.RUNNING.value)
+
+        async def complete_job():
+            await asyncio.sleep(0.1)
+            await self._save_job(JobStatus.RUNNING.value)
+            await self._save_job(
+                JobStatus.COMPLETED.value, output_json={"data": 1}
+            )
+
+        with patch.object(self.redis, "get", wraps=self.redis.get) as get:
+            task = asyncio.create_task(complete_job())
+            result = await self.service.wait_for_completion(self.job_id, 5)
+            await task
+        self.assertEqual(result, {"data": 1})
+        # only the initial read, no polling
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(job_status_subscriber._waiters, {})
+
+    async def test_final_check_after_missed_event(self):
+        """Test final read when the event is missed."""
+        await self._save_job(JobStatus.RUNNING.value)
+
+        async def complete_job():
+            await asyncio.sleep(0.1)
+            await self._save_job(
+                JobStatus.COMPLETED.value, publish=False,
+                output_json={"data": 1}
+            )
+
+        task = asyncio.create_task(complete_job())
+        result = await self.service.wait_for_completion(self.job_id, 0.5)
+        await task
+        self.assertEqual(result, {"data": 1})
+
+    async def test_stopped_and_timeout(self):
+        """Test stopped job and job that does not finish in time."""
+        await self._save_job(JobStatus.RUNNING.value)
+        with self.assertRaises(JobTimeoutError):
+            await self.service.wait_for_completion(self.job_id, 0.2)
+
+        await self._save_job(JobStatus.STOPPED.value)
+        with self.assertRaises(JobFailedError):
+            await self.service.wait_for_completion(self.job_id, 1)